@@ -0,0 +1,65 @@
+"""Add denormalized engagement counters to posts
+
+Revision ID: 202610170001
+Revises: 202603180001
+Create Date: 2026-10-17 10:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "202610170001"
+down_revision: Union[str, None] = "202603180001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE posts ADD COLUMN IF NOT EXISTS likes_count INTEGER NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE posts ADD COLUMN IF NOT EXISTS comment_count INTEGER NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE posts ADD COLUMN IF NOT EXISTS bookmark_count INTEGER NOT NULL DEFAULT 0")
+
+    op.execute(
+        """
+        UPDATE posts AS p
+        SET likes_count = c.cnt
+        FROM (SELECT post_id, COUNT(*) AS cnt FROM likes GROUP BY post_id) AS c
+        WHERE c.post_id = p.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE posts AS p
+        SET comment_count = c.cnt
+        FROM (SELECT post_id, COUNT(*) AS cnt FROM comments GROUP BY post_id) AS c
+        WHERE c.post_id = p.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE posts AS p
+        SET bookmark_count = c.cnt
+        FROM (SELECT post_id, COUNT(*) AS cnt FROM bookmarks GROUP BY post_id) AS c
+        WHERE c.post_id = p.id
+        """
+    )
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_posts_likes_count_created_at "
+        "ON posts (likes_count, created_at, id)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_posts_comment_count_created_at "
+        "ON posts (comment_count, created_at, id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_posts_comment_count_created_at")
+    op.execute("DROP INDEX IF EXISTS ix_posts_likes_count_created_at")
+    op.execute("ALTER TABLE posts DROP COLUMN IF EXISTS bookmark_count")
+    op.execute("ALTER TABLE posts DROP COLUMN IF EXISTS comment_count")
+    op.execute("ALTER TABLE posts DROP COLUMN IF EXISTS likes_count")
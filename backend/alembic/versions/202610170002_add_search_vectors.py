@@ -0,0 +1,60 @@
+"""Add full-text search vectors and trigram indexes
+
+Revision ID: 202610170002
+Revises: 202610170001
+Create Date: 2026-10-17 12:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "202610170002"
+down_revision: Union[str, None] = "202610170001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table -> ((column, weight), ...); must match the SearchSpec fields in app/crud.
+SEARCH_FIELDS = {
+    "posts": (("title", "A"), ("content", "B")),
+    "blog_posts": (("title", "A"), ("summary", "B"), ("content", "C")),
+    "mcp_servers": (("name", "A"), ("short_description", "B"), ("description", "C")),
+}
+
+
+def _vector_expression(fields) -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('simple'::regconfig, coalesce({column}, '')), '{weight}')"
+        for column, weight in fields
+    )
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for table, fields in SEARCH_FIELDS.items():
+        # Generated column: maintained by Postgres on every INSERT/UPDATE.
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({_vector_expression(fields)}) STORED"
+        )
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+            f"ON {table} USING gin (search_vector)"
+        )
+        for column, _weight in fields:
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_{column}_trgm "
+                f"ON {table} USING gin ({column} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    for table, fields in SEARCH_FIELDS.items():
+        for column, _weight in fields:
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_{column}_trgm")
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
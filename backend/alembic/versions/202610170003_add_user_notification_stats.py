@@ -0,0 +1,45 @@
+"""Add materialized per-user notification counters
+
+Revision ID: 202610170003
+Revises: 202610170002
+Create Date: 2026-10-17 14:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "202610170003"
+down_revision: Union[str, None] = "202610170002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_notification_stats (
+            user_id INTEGER PRIMARY KEY REFERENCES users (id) ON DELETE CASCADE,
+            total_count INTEGER NOT NULL DEFAULT 0,
+            unread_count INTEGER NOT NULL DEFAULT 0,
+            read_through_id INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO user_notification_stats (user_id, total_count, unread_count)
+        SELECT user_id, COUNT(*), COUNT(*) FILTER (WHERE is_read = FALSE)
+        FROM notifications
+        GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET total_count = EXCLUDED.total_count,
+            unread_count = EXCLUDED.unread_count
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS user_notification_stats")
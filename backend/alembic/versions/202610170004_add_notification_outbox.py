@@ -0,0 +1,50 @@
+"""Add notification outbox
+
+Revision ID: 202610170004
+Revises: 202610170003
+Create Date: 2026-10-17 16:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "202610170004"
+down_revision: Union[str, None] = "202610170003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS notification_outbox (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            type VARCHAR(50) NOT NULL,
+            content TEXT NOT NULL,
+            actor_name VARCHAR(50),
+            related_post_id INTEGER REFERENCES posts (id) ON DELETE CASCADE,
+            related_comment_id INTEGER REFERENCES comments (id) ON DELETE CASCADE,
+            coalesce_key VARCHAR(120),
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            available_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_notification_outbox_available_at "
+        "ON notification_outbox (available_at)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_notification_outbox_coalesce_key "
+        "ON notification_outbox (coalesce_key)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS notification_outbox")
@@ -0,0 +1,61 @@
+"""Add notifications archive and keyset index
+
+Revision ID: 202610170005
+Revises: 202610170004
+Create Date: 2026-10-17 18:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "202610170005"
+down_revision: Union[str, None] = "202610170004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS notifications_archive (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            type VARCHAR(50) NOT NULL,
+            content TEXT NOT NULL,
+            related_post_id INTEGER,
+            related_comment_id INTEGER,
+            is_read BOOLEAN DEFAULT FALSE,
+            created_at TIMESTAMP WITH TIME ZONE,
+            archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_notifications_archive_user_id "
+        "ON notifications_archive (user_id)"
+    )
+
+    # Keyset pagination seeks on (user_id, created_at, id). The unread counter made the
+    # (user_id, is_read) index dead weight, and the old two-column index is a prefix.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_notifications_user_created_at_id "
+        "ON notifications (user_id, created_at, id)"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_notifications_user_created_at")
+    op.execute("DROP INDEX IF EXISTS ix_notifications_user_is_read")
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_notifications_user_is_read "
+        "ON notifications (user_id, is_read)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_notifications_user_created_at "
+        "ON notifications (user_id, created_at)"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_notifications_user_created_at_id")
+    op.execute("DROP TABLE IF EXISTS notifications_archive")
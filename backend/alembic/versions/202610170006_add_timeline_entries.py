@@ -0,0 +1,58 @@
+"""Add following timeline tables
+
+Revision ID: 202610170006
+Revises: 202610170005
+Create Date: 2026-10-17 20:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "202610170006"
+down_revision: Union[str, None] = "202610170005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS timeline_entries (
+            follower_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            post_id INTEGER NOT NULL REFERENCES posts (id) ON DELETE CASCADE,
+            author_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            PRIMARY KEY (follower_id, post_id)
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_timeline_entries_follower_created_at_post "
+        "ON timeline_entries (follower_id, created_at, post_id)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_timeline_entries_follower_author "
+        "ON timeline_entries (follower_id, author_id)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_timeline_entries_post_id "
+        "ON timeline_entries (post_id)"
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS timeline_pull_authors (
+            author_id INTEGER PRIMARY KEY REFERENCES users (id) ON DELETE CASCADE,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+        """
+    )
+    # Existing timelines start empty; the feed reads older posts straight from the
+    # followed authors until new posts fill them.
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS timeline_pull_authors")
+    op.execute("DROP TABLE IF EXISTS timeline_entries")
@@ -0,0 +1,34 @@
+"""Add comments keyset index
+
+Revision ID: 202610170007
+Revises: 202610170006
+Create Date: 2026-10-17 21:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "202610170007"
+down_revision: Union[str, None] = "202610170006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Comment pages seek on (post_id, created_at, id); the old two-column index is a prefix.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_comments_post_created_at_id "
+        "ON comments (post_id, created_at, id)"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_comments_post_created_at")
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_comments_post_created_at "
+        "ON comments (post_id, created_at)"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_comments_post_created_at_id")
@@ -0,0 +1,44 @@
+"""Add AI usage rollups
+
+Revision ID: 202610170008
+Revises: 202610170007
+Create Date: 2026-10-17 22:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "202610170008"
+down_revision: Union[str, None] = "202610170007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The primary key leads with bucket_start, so "last N hours" reads are a range scan.
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ai_usage_rollups (
+            bucket_start TIMESTAMP WITH TIME ZONE NOT NULL,
+            model VARCHAR(120) NOT NULL,
+            intent VARCHAR(40) NOT NULL,
+            latency_le_ms INTEGER NOT NULL,
+            requests INTEGER NOT NULL DEFAULT 0,
+            failures INTEGER NOT NULL DEFAULT 0,
+            prompt_tokens INTEGER NOT NULL DEFAULT 0,
+            completion_tokens INTEGER NOT NULL DEFAULT 0,
+            total_tokens INTEGER NOT NULL DEFAULT 0,
+            cost_usd DOUBLE PRECISION NOT NULL DEFAULT 0,
+            latency_ms_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+            PRIMARY KEY (bucket_start, model, intent, latency_le_ms)
+        )
+        """
+    )
+    # Earlier logs are not backfilled; the usage summary covers calls from here on.
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS ai_usage_rollups")
@@ -1,11 +1,14 @@
+import json
 import time
-from typing import Any
+from typing import Any, AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user_optional
-from app.crud.ai_action_log import create_ai_action_log
+from app.api.deps import get_current_active_admin, get_current_user_optional
+from app.crud import ai_action_log as crud_ai_action_log
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.ai import (
@@ -19,12 +22,17 @@ from app.schemas.ai import (
     AiEditorTitleResponse,
     AiRouteRequest,
     AiRouteResponse,
+    AiUsageSummaryResponse,
 )
+from app.services.ai_cache import CachedAiResponse
+from app.services.ai_log_writer import ai_log_writer
+from app.services.ai_rate_limit import TIER_ADMIN, TIER_ANON, TIER_USER
 from app.services.ai_service import (
     INTENT_DEV_QNA,
     INTENT_EDITOR_HELP,
     INTENT_OUT_OF_SCOPE,
     INTENT_SITE_HELP,
+    ModelCallResult,
     ai_service,
 )
 
@@ -32,6 +40,14 @@ router = APIRouter()
 
 CHAT_ALLOWED_INTENTS = {INTENT_DEV_QNA, INTENT_SITE_HELP, INTENT_OUT_OF_SCOPE}
 ALL_INTENTS = {INTENT_DEV_QNA, INTENT_SITE_HELP, INTENT_EDITOR_HELP, INTENT_OUT_OF_SCOPE}
+EDITOR_RESPONSE_MODELS: dict[str, type[BaseModel]] = {
+    "proofread": AiEditorProofreadResponse,
+    "title": AiEditorTitleResponse,
+    "template": AiEditorTemplateResponse,
+    "tags": AiEditorTagsResponse,
+    "mask": AiEditorMaskResponse,
+}
+EDITOR_FAILED_DETAIL = "AI 생성 결과를 처리하지 못했습니다. 잠시 후 다시 시도해 주세요."
 
 
 def _identity_key(request: Request, current_user: User | None) -> str:
@@ -41,8 +57,13 @@ def _identity_key(request: Request, current_user: User | None) -> str:
     return f"ip:{client_host}"
 
 
+def _rate_limit_tier(current_user: User | None) -> str:
+    if current_user is None:
+        return TIER_ANON
+    return TIER_ADMIN if current_user.is_admin else TIER_USER
+
+
 def _safe_log(
-    db: Session,
     *,
     user_id: int | None,
     endpoint: str,
@@ -59,8 +80,10 @@ def _safe_log(
     cost_usd: float | None = None,
     error_message: str | None = None,
 ) -> None:
-    create_ai_action_log(
-        db,
+    # Every model call is logged exactly once, so its cost is charged to the budgets here.
+    # The row itself is buffered and written in batches off the request path.
+    ai_service.record_spend(user_id, cost_usd)
+    ai_log_writer.record(
         user_id=user_id,
         endpoint=endpoint,
         source=source,
@@ -78,36 +101,59 @@ def _safe_log(
     )
 
 
-def _require_rate_limit(
+async def _require_rate_limit(
     *,
     endpoint: str,
     request: Request,
-    db: Session,
     current_user: User | None,
     source: str,
     action: str | None,
     input_hash: str,
 ) -> None:
     identity = _identity_key(request, current_user)
-    if ai_service.allow_request(endpoint, identity):
+    user_id = current_user.id if current_user else None
+    decision = await ai_service.check_rate_limit(endpoint, identity, _rate_limit_tier(current_user), user_id)
+    if decision.allowed:
         return
+    over_budget = decision.reason == "budget"
     _safe_log(
-        db,
-        user_id=current_user.id if current_user else None,
+        user_id=user_id,
         endpoint=endpoint,
         source=source,
         intent=None,
         action=action,
         input_hash=input_hash,
-        status_text="rate_limited",
-        error_message="Too many AI requests",
+        status_text="budget_exceeded" if over_budget else "rate_limited",
+        error_message="Daily AI budget exhausted" if over_budget else "Too many AI requests",
     )
     raise HTTPException(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-        detail="Too many AI requests. Please retry in a minute.",
+        detail=(
+            "AI usage limit for today has been reached. Please try again tomorrow."
+            if over_budget
+            else "Too many AI requests. Please retry in a minute."
+        ),
+        headers={"Retry-After": str(decision.retry_after_seconds)},
     )
 
 
+def _sse_message(event_type: str, data: dict[str, Any]) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+
+def _sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _replay_cached(intent: str, response: BaseModel) -> AsyncIterator[str]:
+    yield _sse_message("meta", {"intent": intent, "cached": True})
+    yield _sse_message("done", response.model_dump(mode="json"))
+
+
 def _split_meta(payload: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
     copied = dict(payload)
     meta = copied.pop("_meta", {}) or {}
@@ -115,10 +161,9 @@ def _split_meta(payload: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]
 
 
 @router.post("/route", response_model=AiRouteResponse)
-def route_ai_intent(
+async def route_ai_intent(
     payload: AiRouteRequest,
     request: Request,
-    db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
 ):
     input_hash = ai_service.build_input_hash(
@@ -129,10 +174,9 @@ def route_ai_intent(
             "message": payload.message,
         }
     )
-    _require_rate_limit(
+    await _require_rate_limit(
         endpoint="route",
         request=request,
-        db=db,
         current_user=current_user,
         source=payload.source,
         action=payload.action,
@@ -142,9 +186,8 @@ def route_ai_intent(
     cache_key = f"route:{input_hash}"
     cached = ai_service.get_cached(cache_key)
     if cached:
-        response = AiRouteResponse(**cached, cached=True)
+        response = AiRouteResponse(**cached.value, cached=True)
         _safe_log(
-            db,
             user_id=current_user.id if current_user else None,
             endpoint="route",
             source=payload.source,
@@ -156,7 +199,7 @@ def route_ai_intent(
         return response
 
     start = time.perf_counter()
-    decision_raw = ai_service.classify_intent(
+    decision_raw = await ai_service.classify_intent(
         message=payload.message,
         source=payload.source,
         action=payload.action,
@@ -165,11 +208,14 @@ def route_ai_intent(
     )
     decision, meta = _split_meta(decision_raw)
     response = AiRouteResponse(**decision, cached=False)
-    ai_service.set_cached(cache_key, response.model_dump(exclude={"cached"}))
+    ai_service.set_cached(
+        cache_key,
+        response.model_dump(exclude={"cached"}),
+        negative=ai_service.is_model_failure(meta.get("status")),
+    )
     elapsed_ms = (time.perf_counter() - start) * 1000
 
     _safe_log(
-        db,
         user_id=current_user.id if current_user else None,
         endpoint="route",
         source=payload.source,
@@ -189,10 +235,9 @@ def route_ai_intent(
 
 
 @router.post("/chat", response_model=AiChatResponse)
-def chat_ai(
+async def chat_ai(
     payload: AiChatRequest,
     request: Request,
-    db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
 ):
     input_hash = ai_service.build_input_hash(
@@ -202,10 +247,9 @@ def chat_ai(
             "message": payload.message,
         }
     )
-    _require_rate_limit(
+    await _require_rate_limit(
         endpoint="chat",
         request=request,
-        db=db,
         current_user=current_user,
         source=payload.source,
         action=None,
@@ -215,9 +259,8 @@ def chat_ai(
     cache_key = f"chat:{input_hash}"
     cached = ai_service.get_cached(cache_key)
     if cached:
-        response = AiChatResponse(**cached, cached=True)
+        response = AiChatResponse(**cached.value, cached=True)
         _safe_log(
-            db,
             user_id=current_user.id if current_user else None,
             endpoint="chat",
             source=payload.source,
@@ -228,8 +271,104 @@ def chat_ai(
         )
         return response
 
+    async def build() -> tuple[dict[str, Any], ModelCallResult]:
+        decision_raw = await ai_service.classify_intent(
+            message=payload.message,
+            source=payload.source,
+            action=None,
+            allowed_intents=CHAT_ALLOWED_INTENTS,
+            allow_model=True,
+        )
+        decision, route_meta = _split_meta(decision_raw)
+        intent = decision["intent"]
+        reply, model_result = await ai_service.chat_reply(intent=intent, message=payload.message)
+
+        response = _chat_response(source=payload.source, intent=intent, reply=reply)
+        _cache_chat_response(cache_key, response, model_result)
+        # Route meta reflects optional low-cost route model call.
+        return {
+            "response": response.model_dump(exclude={"cached"}),
+            "route_latency_ms": float(route_meta.get("latency_ms") or 0.0),
+        }, model_result
+
+    start = time.perf_counter()
+    outcome, model_result, coalesced = await ai_service.coalesce(cache_key, "chat", build)
+    response = AiChatResponse(**outcome["response"], cached=False)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    _log_chat_result(
+        user_id=current_user.id if current_user else None,
+        source=payload.source,
+        intent=response.intent,
+        input_hash=input_hash,
+        model_result=model_result,
+        latency_ms=elapsed_ms if coalesced else elapsed_ms + outcome["route_latency_ms"],
+        coalesced=coalesced,
+    )
+    return response
+
+
+@router.post("/chat/stream")
+async def stream_chat_ai(
+    payload: AiChatRequest,
+    request: Request,
+    current_user: User | None = Depends(get_current_user_optional),
+):
+    """
+    Server-Sent Events variant of /chat: `meta` (intent), `delta` chunks as the model
+    writes, `reset` when a failed answer is replaced by the fallback, then `done` with
+    the same body /chat returns.
+    """
+    input_hash = ai_service.build_input_hash(
+        {
+            "endpoint": "chat",
+            "source": payload.source,
+            "message": payload.message,
+        }
+    )
+    await _require_rate_limit(
+        endpoint="chat",
+        request=request,
+        current_user=current_user,
+        source=payload.source,
+        action=None,
+        input_hash=input_hash,
+    )
+
+    cache_key = f"chat:{input_hash}"
+    cached = ai_service.get_cached(cache_key)
+    if cached:
+        response = AiChatResponse(**cached.value, cached=True)
+        _safe_log(
+            user_id=current_user.id if current_user else None,
+            endpoint="chat",
+            source=payload.source,
+            intent=response.intent,
+            action=None,
+            input_hash=input_hash,
+            status_text="cached",
+        )
+        return _sse_response(_replay_cached(response.intent, response))
+
+    return _sse_response(
+        _stream_chat_events(
+            payload=payload,
+            user_id=current_user.id if current_user else None,
+            input_hash=input_hash,
+            cache_key=cache_key,
+        )
+    )
+
+
+async def _stream_chat_events(
+    *,
+    payload: AiChatRequest,
+    user_id: int | None,
+    input_hash: str,
+    cache_key: str,
+) -> AsyncIterator[str]:
     start = time.perf_counter()
-    decision_raw = ai_service.classify_intent(
+    decision_raw = await ai_service.classify_intent(
         message=payload.message,
         source=payload.source,
         action=None,
@@ -238,10 +377,46 @@ def chat_ai(
     )
     decision, route_meta = _split_meta(decision_raw)
     intent = decision["intent"]
-    reply, model_result = ai_service.chat_reply(intent=intent, message=payload.message)
+    yield _sse_message("meta", {"intent": intent, "cached": False})
+
+    reply, model_result = None, None
+    async for event in ai_service.stream_chat_reply(intent=intent, message=payload.message):
+        if event.kind == "delta":
+            yield _sse_message("delta", {"text": event.text})
+        elif event.kind == "reset":
+            yield _sse_message("reset", {})
+        else:
+            reply, model_result = event.data, event.result
+
+    response = _chat_response(source=payload.source, intent=intent, reply=reply)
+    _cache_chat_response(cache_key, response, model_result)
+    elapsed_ms = (time.perf_counter() - start) * 1000
 
-    response = AiChatResponse(
+    _log_chat_result(
+        user_id=user_id,
         source=payload.source,
+        intent=intent,
+        input_hash=input_hash,
+        model_result=model_result,
+        latency_ms=elapsed_ms + float(route_meta.get("latency_ms") or 0.0),
+    )
+    yield _sse_message("done", response.model_dump(mode="json"))
+
+
+def _cache_chat_response(cache_key: str, response: AiChatResponse, model_result: ModelCallResult) -> None:
+    # A fallback answer after a failed call is only kept for the negative TTL.
+    failed = response.intent != INTENT_OUT_OF_SCOPE and ai_service.is_model_failure(model_result.status)
+    ai_service.set_cached(
+        cache_key,
+        response.model_dump(exclude={"cached"}),
+        intent=response.intent,
+        negative=failed,
+    )
+
+
+def _chat_response(*, source: str, intent: str, reply: dict[str, Any]) -> AiChatResponse:
+    return AiChatResponse(
+        source=source,
         intent=intent,  # type: ignore[arg-type]
         answer=reply["answer"],
         suggested_question=(
@@ -252,44 +427,91 @@ def chat_ai(
         out_of_scope=intent == INTENT_OUT_OF_SCOPE,
         cached=False,
     )
-    ai_service.set_cached(cache_key, response.model_dump(exclude={"cached"}))
-    elapsed_ms = (time.perf_counter() - start) * 1000
 
-    # Route meta reflects optional low-cost route model call.
-    route_latency = float(route_meta.get("latency_ms") or 0.0)
-    total_latency = elapsed_ms + route_latency
+
+def _log_chat_result(
+    *,
+    user_id: int | None,
+    source: str,
+    intent: str,
+    input_hash: str,
+    model_result: ModelCallResult,
+    latency_ms: float,
+    coalesced: bool = False,
+) -> None:
+    if coalesced:
+        _log_coalesced(
+            user_id=user_id,
+            endpoint="chat",
+            source=source,
+            intent=intent,
+            action=None,
+            input_hash=input_hash,
+            model_result=model_result,
+            latency_ms=latency_ms,
+        )
+        return
+
     status_text = model_result.status
     if intent == INTENT_OUT_OF_SCOPE:
         status_text = "success"
 
     _safe_log(
-        db,
-        user_id=current_user.id if current_user else None,
+        user_id=user_id,
         endpoint="chat",
-        source=payload.source,
+        source=source,
         intent=intent,
         action=None,
         input_hash=input_hash,
         status_text=status_text,
         model=model_result.model,
-        latency_ms=round(total_latency, 2),
+        latency_ms=round(latency_ms, 2),
         prompt_tokens=model_result.prompt_tokens,
         completion_tokens=model_result.completion_tokens,
         total_tokens=model_result.total_tokens,
         cost_usd=model_result.cost_usd,
         error_message=model_result.error_message,
     )
-    return response
 
 
-def _handle_editor_action(
+def _log_coalesced(
+    *,
+    user_id: int | None,
+    endpoint: str,
+    source: str,
+    intent: str,
+    action: str | None,
+    input_hash: str,
+    model_result: ModelCallResult,
+    latency_ms: float,
+) -> None:
+    # The leading request logged the call with its tokens and cost; this one spent none.
+    _safe_log(
+        user_id=user_id,
+        endpoint=endpoint,
+        source=source,
+        intent=intent,
+        action=action,
+        input_hash=input_hash,
+        status_text="coalesced",
+        model=model_result.model,
+        latency_ms=round(latency_ms, 2),
+        prompt_tokens=0,
+        completion_tokens=0,
+        total_tokens=0,
+        cost_usd=0.0,
+        error_message=model_result.error_message,
+    )
+
+
+async def _prepare_editor_request(
     *,
     action: str,
     payload: AiEditorRequest,
     request: Request,
-    db: Session,
     current_user: User | None,
-) -> dict[str, Any]:
+) -> tuple[str, str]:
+    """Validate and rate-limit an editor request; returns its input hash and cache key."""
     if payload.action != action:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -304,78 +526,75 @@ def _handle_editor_action(
             "title": payload.title,
             "text": payload.text,
             "category_slug": payload.category_slug,
-        }
+        },
+        fold=False,
     )
-    _require_rate_limit(
+    await _require_rate_limit(
         endpoint=f"editor:{action}",
         request=request,
-        db=db,
         current_user=current_user,
         source=payload.source,
         action=payload.action,
         input_hash=input_hash,
     )
+    return input_hash, f"editor:v2:{action}:{input_hash}"
 
-    cache_key = f"editor:v2:{action}:{input_hash}"
-    cached = ai_service.get_cached(cache_key)
-    if cached:
-        cached_payload = {**cached, "cached": True}
-        _safe_log(
-            db,
-            user_id=current_user.id if current_user else None,
-            endpoint=f"editor:{action}",
-            source=payload.source,
-            intent=INTENT_EDITOR_HELP,
-            action=action,
-            input_hash=input_hash,
-            status_text="cached",
-        )
-        return cached_payload
 
-    start = time.perf_counter()
-    data, model_result = ai_service.editor_reply(
+def _log_editor_cached(
+    *,
+    action: str,
+    payload: AiEditorRequest,
+    user_id: int | None,
+    input_hash: str,
+    cached: CachedAiResponse,
+) -> None:
+    _safe_log(
+        user_id=user_id,
+        endpoint=f"editor:{action}",
+        source=payload.source,
+        intent=INTENT_EDITOR_HELP,
         action=action,
-        text=payload.text,
-        title=payload.title,
-        category_slug=payload.category_slug,
+        input_hash=input_hash,
+        status_text="cached_failure" if cached.negative else "cached",
+        error_message=cached.value.get("error_message") if cached.negative else None,
     )
-    elapsed_ms = (time.perf_counter() - start) * 1000
 
-    if model_result.status not in {"success", "recovered_non_json"}:
-        _safe_log(
-            db,
-            user_id=current_user.id if current_user else None,
+
+def _cache_editor_failure(cache_key: str, model_result: ModelCallResult) -> None:
+    # Identical retries within the negative TTL get the 502 without another model call.
+    if ai_service.is_model_failure(model_result.status):
+        ai_service.set_cached(
+            cache_key,
+            {"status": model_result.status, "error_message": model_result.error_message},
+            negative=True,
+        )
+
+
+def _log_editor_result(
+    *,
+    action: str,
+    payload: AiEditorRequest,
+    user_id: int | None,
+    input_hash: str,
+    model_result: ModelCallResult,
+    latency_ms: float,
+    coalesced: bool = False,
+) -> None:
+    if coalesced:
+        _log_coalesced(
+            user_id=user_id,
             endpoint=f"editor:{action}",
             source=payload.source,
             intent=INTENT_EDITOR_HELP,
             action=action,
             input_hash=input_hash,
-            status_text=model_result.status,
-            model=model_result.model,
-            latency_ms=round(elapsed_ms + model_result.latency_ms, 2),
-            prompt_tokens=model_result.prompt_tokens,
-            completion_tokens=model_result.completion_tokens,
-            total_tokens=model_result.total_tokens,
-            cost_usd=model_result.cost_usd,
-            error_message=model_result.error_message,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail="AI 생성 결과를 처리하지 못했습니다. 잠시 후 다시 시도해 주세요.",
+            model_result=model_result,
+            latency_ms=latency_ms,
         )
-
-    response_payload = {
-        "source": payload.source,
-        "intent": INTENT_EDITOR_HELP,
-        "action": action,
-        **data,
-        "cached": False,
-    }
-    ai_service.set_cached(cache_key, {**response_payload, "cached": False})
+        return
 
     _safe_log(
-        db,
-        user_id=current_user.id if current_user else None,
+        user_id=user_id,
         endpoint=f"editor:{action}",
         source=payload.source,
         intent=INTENT_EDITOR_HELP,
@@ -383,91 +602,257 @@ def _handle_editor_action(
         input_hash=input_hash,
         status_text=model_result.status,
         model=model_result.model,
-        latency_ms=round(elapsed_ms + model_result.latency_ms, 2),
+        latency_ms=round(latency_ms, 2),
         prompt_tokens=model_result.prompt_tokens,
         completion_tokens=model_result.completion_tokens,
         total_tokens=model_result.total_tokens,
         cost_usd=model_result.cost_usd,
         error_message=model_result.error_message,
     )
-    return response_payload
+
+
+def _editor_succeeded(model_result: ModelCallResult) -> bool:
+    return model_result.status in {"success", "recovered_non_json"}
+
+
+def _editor_response_payload(*, action: str, payload: AiEditorRequest, data: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "source": payload.source,
+        "intent": INTENT_EDITOR_HELP,
+        "action": action,
+        **data,
+        "cached": False,
+    }
+
+
+async def _handle_editor_action(
+    *,
+    action: str,
+    payload: AiEditorRequest,
+    request: Request,
+    current_user: User | None,
+) -> dict[str, Any]:
+    input_hash, cache_key = await _prepare_editor_request(
+        action=action,
+        payload=payload,
+        request=request,
+        current_user=current_user,
+    )
+    user_id = current_user.id if current_user else None
+
+    cached = ai_service.get_cached(cache_key)
+    if cached:
+        _log_editor_cached(
+            action=action, payload=payload, user_id=user_id, input_hash=input_hash, cached=cached
+        )
+        if cached.negative:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=EDITOR_FAILED_DETAIL,
+            )
+        return {**cached.value, "cached": True}
+
+    async def build() -> tuple[dict[str, Any], ModelCallResult]:
+        data, model_result = await ai_service.editor_reply(
+            action=action,
+            text=payload.text,
+            title=payload.title,
+            category_slug=payload.category_slug,
+        )
+        if _editor_succeeded(model_result):
+            response_payload = _editor_response_payload(action=action, payload=payload, data=data)
+            ai_service.set_cached(cache_key, {**response_payload, "cached": False}, intent=INTENT_EDITOR_HELP)
+        else:
+            _cache_editor_failure(cache_key, model_result)
+        return data, model_result
+
+    start = time.perf_counter()
+    data, model_result, coalesced = await ai_service.coalesce(cache_key, f"editor:{action}", build)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    _log_editor_result(
+        action=action,
+        payload=payload,
+        user_id=user_id,
+        input_hash=input_hash,
+        model_result=model_result,
+        latency_ms=elapsed_ms if coalesced else elapsed_ms + model_result.latency_ms,
+        coalesced=coalesced,
+    )
+    if not _editor_succeeded(model_result):
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=EDITOR_FAILED_DETAIL,
+        )
+
+    return _editor_response_payload(action=action, payload=payload, data=data)
+
+
+@router.post("/editor/{action}/stream")
+async def stream_editor_action(
+    payload: AiEditorRequest,
+    request: Request,
+    action: str = Path(..., pattern="^(proofread|title|template|tags|mask)$"),
+    current_user: User | None = Depends(get_current_user_optional),
+):
+    """
+    Server-Sent Events variant of /editor/{action}: raw model output as `delta` chunks
+    (cut off as soon as it breaks the action's JSON schema), `reset` before the next
+    model or the fallback, then `done` with the normalized body, or `error`.
+    """
+    input_hash, cache_key = await _prepare_editor_request(
+        action=action,
+        payload=payload,
+        request=request,
+        current_user=current_user,
+    )
+    user_id = current_user.id if current_user else None
+
+    cached = ai_service.get_cached(cache_key)
+    if cached:
+        _log_editor_cached(
+            action=action, payload=payload, user_id=user_id, input_hash=input_hash, cached=cached
+        )
+        if cached.negative:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=EDITOR_FAILED_DETAIL,
+            )
+        response = EDITOR_RESPONSE_MODELS[action](**{**cached.value, "cached": True})
+        return _sse_response(_replay_cached(INTENT_EDITOR_HELP, response))
+
+    return _sse_response(
+        _stream_editor_events(
+            action=action,
+            payload=payload,
+            user_id=user_id,
+            input_hash=input_hash,
+            cache_key=cache_key,
+        )
+    )
+
+
+async def _stream_editor_events(
+    *,
+    action: str,
+    payload: AiEditorRequest,
+    user_id: int | None,
+    input_hash: str,
+    cache_key: str,
+) -> AsyncIterator[str]:
+    yield _sse_message("meta", {"intent": INTENT_EDITOR_HELP, "cached": False})
+
+    start = time.perf_counter()
+    data, model_result = None, None
+    async for event in ai_service.stream_editor_reply(
+        action=action,
+        text=payload.text,
+        title=payload.title,
+        category_slug=payload.category_slug,
+    ):
+        if event.kind == "delta":
+            yield _sse_message("delta", {"text": event.text})
+        elif event.kind == "reset":
+            yield _sse_message("reset", {})
+        else:
+            data, model_result = event.data, event.result
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    _log_editor_result(
+        action=action,
+        payload=payload,
+        user_id=user_id,
+        input_hash=input_hash,
+        model_result=model_result,
+        latency_ms=elapsed_ms,
+    )
+    if not _editor_succeeded(model_result):
+        _cache_editor_failure(cache_key, model_result)
+        yield _sse_message("error", {"status_code": status.HTTP_502_BAD_GATEWAY, "detail": EDITOR_FAILED_DETAIL})
+        return
+
+    response_payload = _editor_response_payload(action=action, payload=payload, data=data)
+    ai_service.set_cached(cache_key, {**response_payload, "cached": False}, intent=INTENT_EDITOR_HELP)
+    response = EDITOR_RESPONSE_MODELS[action](**response_payload)
+    yield _sse_message("done", response.model_dump(mode="json"))
 
 
 @router.post("/editor/proofread", response_model=AiEditorProofreadResponse)
-def editor_proofread(
+async def editor_proofread(
     payload: AiEditorRequest,
     request: Request,
-    db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
 ):
-    return _handle_editor_action(
+    return await _handle_editor_action(
         action="proofread",
         payload=payload,
         request=request,
-        db=db,
         current_user=current_user,
     )
 
 
 @router.post("/editor/title", response_model=AiEditorTitleResponse)
-def editor_title(
+async def editor_title(
     payload: AiEditorRequest,
     request: Request,
-    db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
 ):
-    return _handle_editor_action(
+    return await _handle_editor_action(
         action="title",
         payload=payload,
         request=request,
-        db=db,
         current_user=current_user,
     )
 
 
 @router.post("/editor/template", response_model=AiEditorTemplateResponse)
-def editor_template(
+async def editor_template(
     payload: AiEditorRequest,
     request: Request,
-    db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
 ):
-    return _handle_editor_action(
+    return await _handle_editor_action(
         action="template",
         payload=payload,
         request=request,
-        db=db,
         current_user=current_user,
     )
 
 
 @router.post("/editor/tags", response_model=AiEditorTagsResponse)
-def editor_tags(
+async def editor_tags(
     payload: AiEditorRequest,
     request: Request,
-    db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
 ):
-    return _handle_editor_action(
+    return await _handle_editor_action(
         action="tags",
         payload=payload,
         request=request,
-        db=db,
         current_user=current_user,
     )
 
 
 @router.post("/editor/mask", response_model=AiEditorMaskResponse)
-def editor_mask(
+async def editor_mask(
     payload: AiEditorRequest,
     request: Request,
-    db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
 ):
-    return _handle_editor_action(
+    return await _handle_editor_action(
         action="mask",
         payload=payload,
         request=request,
-        db=db,
         current_user=current_user,
     )
+
+
+@router.get("/admin/usage", response_model=AiUsageSummaryResponse)
+def get_ai_usage_summary(
+    hours: int = Query(24, ge=1, le=24 * 90),
+    db: Session = Depends(get_db),
+    _admin: User = Depends(get_current_active_admin),
+):
+    # Read from the hourly rollups; percentiles are interpolated within latency buckets.
+    summary = crud_ai_action_log.get_usage_summary(db, hours=hours)
+    return AiUsageSummaryResponse(**summary)
@@ -3,9 +3,8 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.db.session import get_db
-from app.core.security import decode_access_token
-from app.crud import user as crud_user
 from app.models.user import User
+from app.services.principal_cache import principal_cache
 
 security = HTTPBearer()
 optional_security = HTTPBearer(auto_error=False)
@@ -16,7 +15,7 @@ def get_current_user(
     db: Session = Depends(get_db),
 ) -> User:
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = principal_cache.decode_token(token)
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -30,7 +29,7 @@ def get_current_user(
             detail="Invalid authentication credentials",
         )
 
-    user = crud_user.get_user_by_id(db, int(user_id))
+    user = principal_cache.get_user(db, int(user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,16 +39,12 @@ def get_current_user(
     return user
 
 
-def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
-    db: Session = Depends(get_db),
-) -> Optional[User]:
-    """Get current user if authenticated, otherwise return None"""
-    if not credentials:
+def get_user_for_token(db: Session, token: Optional[str]) -> Optional[User]:
+    """Resolve a raw access token to a user, or None"""
+    if not token:
         return None
 
-    token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = principal_cache.decode_token(token)
     if not payload:
         return None
 
@@ -57,10 +52,20 @@ def get_current_user_optional(
     if not user_id:
         return None
 
-    user = crud_user.get_user_by_id(db, int(user_id))
+    user = principal_cache.get_user(db, int(user_id))
     return user
 
 
+def get_current_user_optional(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: Session = Depends(get_db),
+) -> Optional[User]:
+    """Get current user if authenticated, otherwise return None"""
+    if not credentials:
+        return None
+    return get_user_for_token(db, credentials.credentials)
+
+
 def get_current_active_admin(current_user: User = Depends(get_current_user)) -> User:
     if not current_user.is_admin:
         raise HTTPException(
@@ -11,6 +11,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.metrics import OG_IMAGE_RENDER_SECONDS
 from app.db.session import get_db
 from app.models.category import Category
 from app.models.post import Post
@@ -174,7 +175,8 @@ def post_og_image(post_id: int, db: Session = Depends(get_db)) -> Response:
 
     from app.services.og_image import generate_post_og
 
-    png_bytes = generate_post_og(title=title, category_name=category_name)
+    with OG_IMAGE_RENDER_SECONDS.labels("post").time():
+        png_bytes = generate_post_og(title=title, category_name=category_name)
 
     headers = {
         "Cache-Control": "public, max-age=1800",
@@ -186,7 +188,8 @@ def post_og_image(post_id: int, db: Session = Depends(get_db)) -> Response:
 def default_og_image() -> Response:
     from app.services.og_image import generate_default_og
 
-    png_bytes = generate_default_og()
+    with OG_IMAGE_RENDER_SECONDS.labels("default").time():
+        png_bytes = generate_default_og()
     headers = {
         "Cache-Control": "public, max-age=86400",
     }
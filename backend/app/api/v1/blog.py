@@ -3,14 +3,14 @@ import os
 import uuid
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File as FastAPIFile
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, UploadFile, File as FastAPIFile
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_admin, get_current_user_optional
 from app.crud import blog_post as crud_blog
 from app.crud import blog_category as crud_blog_cat
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.user import User
 from app.schemas.blog_post import (
     BlogPostCreate,
@@ -20,6 +20,15 @@ from app.schemas.blog_post import (
     BlogPostUpdate,
 )
 from app.schemas.blog_category import BlogCategoryCreate, BlogCategoryResponse
+from app.services.response_cache import (
+    TAG_BLOG,
+    blog_post_tag,
+    build_cache_key,
+    cached_json_response,
+    response_cache,
+)
+from app.services.search import first_snippet
+from app.services.view_counter import VIEW_TARGET_BLOG, build_viewer_key, view_counter
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -64,21 +73,34 @@ def delete_blog_category(
 
 @router.get("/", response_model=BlogPostListResponse)
 def get_blog_posts(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=50),
     search: Optional[str] = Query(None),
     tag: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    posts, total = crud_blog.get_blog_posts(
-        db, page=page, page_size=page_size, search=search, tag=tag, published_only=True
-    )
-    return BlogPostListResponse(
-        items=[BlogPostListItem.model_validate(p) for p in posts],
-        total=total,
-        page=page,
-        page_size=page_size,
+    def build():
+        posts, total = crud_blog.get_blog_posts(
+            db, page=page, page_size=page_size, search=search, tag=tag, published_only=True
+        )
+        items = [BlogPostListItem.model_validate(p) for p in posts]
+        if search:
+            for item, post in zip(items, posts):
+                item.search_snippet = first_snippet([post.summary, post.content, post.title], search)
+        payload = BlogPostListResponse(
+            items=items,
+            total=total,
+            page=page,
+            page_size=page_size,
+        )
+        return payload, {TAG_BLOG, *[blog_post_tag(p.id) for p in posts]}
+
+    cache_key = build_cache_key(
+        "blog",
+        {"page": page, "page_size": page_size, "search": search, "tag": tag},
     )
+    return cached_json_response(request, response_cache.get_or_build(cache_key, build))
 
 
 @router.get("/drafts", response_model=BlogPostListResponse)
@@ -114,6 +136,7 @@ async def serve_blog_image(filename: str):
 @router.get("/{slug}", response_model=BlogPostResponse)
 def get_blog_post(
     slug: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user_optional),
 ):
@@ -125,9 +148,17 @@ def get_blog_post(
         if not current_user or not current_user.is_admin:
             raise HTTPException(status_code=404, detail="Blog post not found")
 
-    crud_blog.increment_views(db, post.id)
-    db.refresh(post)
-    return BlogPostResponse.model_validate(post)
+    pending_views = view_counter.count_view(
+        VIEW_TARGET_BLOG,
+        post.id,
+        build_viewer_key(
+            current_user.id if current_user else None,
+            request.client.host if request.client else None,
+        ),
+    )
+    response = BlogPostResponse.model_validate(post)
+    response.views = (post.views or 0) + pending_views
+    return response
 
 
 @router.post("/", response_model=BlogPostResponse, status_code=status.HTTP_201_CREATED)
@@ -137,6 +168,7 @@ def create_blog_post(
     db: Session = Depends(get_db),
 ):
     db_post = crud_blog.create_blog_post(db, post, current_user.id)
+    response_cache.invalidate(TAG_BLOG)
     return BlogPostResponse.model_validate(db_post)
 
 
@@ -150,6 +182,7 @@ def update_blog_post(
     db_post = crud_blog.update_blog_post(db, post_id, post_update)
     if not db_post:
         raise HTTPException(status_code=404, detail="Blog post not found")
+    response_cache.invalidate(TAG_BLOG, blog_post_tag(post_id))
     return BlogPostResponse.model_validate(db_post)
 
 
@@ -161,6 +194,7 @@ def delete_blog_post(
 ):
     if not crud_blog.delete_blog_post(db, post_id):
         raise HTTPException(status_code=404, detail="Blog post not found")
+    response_cache.invalidate(TAG_BLOG, blog_post_tag(post_id))
 
 
 @router.post("/upload-image")
@@ -1,25 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 from app.crud import category as crud_category
 from app.api.deps import get_current_user
 from app.models.user import User
+from app.services.response_cache import (
+    TAG_BOARD,
+    TAG_CATEGORIES,
+    build_cache_key,
+    cached_json_response,
+    category_tag,
+    response_cache,
+)
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[CategoryResponse])
 def get_categories(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all categories with today's post count"""
-    categories = crud_category.get_categories_with_today_count(db, skip=skip, limit=limit)
-    return categories
+    def build():
+        categories = crud_category.get_categories_with_today_count(db, skip=skip, limit=limit)
+        return [CategoryResponse.model_validate(c) for c in categories], {TAG_CATEGORIES}
+
+    entry = response_cache.get_or_build(
+        build_cache_key("categories", {"skip": skip, "limit": limit}), build
+    )
+    return cached_json_response(request, entry)
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
@@ -58,7 +73,9 @@ def create_category(
             detail="Category name already exists"
         )
 
-    return crud_category.create_category(db, category)
+    created = crud_category.create_category(db, category)
+    response_cache.invalidate(TAG_CATEGORIES)
+    return created
 
 
 @router.put("/{category_id}", response_model=CategoryResponse)
@@ -82,6 +99,8 @@ def update_category(
             detail="Category not found"
         )
 
+    # Post lists embed the category name, so they go stale too.
+    response_cache.invalidate(TAG_CATEGORIES, TAG_BOARD, category_tag(category_id))
     return updated_category
 
 
@@ -104,3 +123,5 @@ def delete_category(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
         )
+
+    response_cache.invalidate(TAG_CATEGORIES, TAG_BOARD, category_tag(category_id))
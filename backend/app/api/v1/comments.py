@@ -1,19 +1,34 @@
+import json
 import logging
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Iterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.api.deps import get_current_user, get_current_verified_user
-from app.schemas.comment import CommentCreate, CommentResponse
-from app.schemas.notification import NotificationCreate
+from app.core.config import settings
+from app.db.base import ReadSessionLocal
+from app.db.pool import with_statement_timeout
+from app.db.session import get_async_read_db, get_db
+from app.api.deps import (
+    get_current_active_admin,
+    get_current_user,
+    get_current_user_optional,
+    get_current_verified_user,
+)
+from app.schemas.comment import CommentCreate, CommentPageResponse, CommentResponse
+from app.schemas.notification import NotificationEvent
 from app.models.user import User
 from app.crud import comment as crud_comment
-from app.crud import notification as crud_notification
+from app.crud import follow as crud_follow
 from app.crud import post as crud_post
+from app.services.hot_score import COMMENT_WEIGHT, hot_score_board
+from app.services.response_cache import TAG_RANKINGS, post_tag, response_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 COMMENT_NOTIFICATION_PREVIEW_LIMIT = 30
+COMMENT_EXPORT_BATCH_SIZE = 1000
+COMMENT_PAGE_MAX_LIMIT = 100
 
 
 def _build_comment_preview(content: str, limit: int = COMMENT_NOTIFICATION_PREVIEW_LIMIT) -> str:
@@ -26,29 +41,113 @@ def _build_comment_preview(content: str, limit: int = COMMENT_NOTIFICATION_PREVI
     return f"{normalized[:limit]}..."
 
 
-@router.get("/post/{post_id}", response_model=List[CommentResponse])
-def get_comments(post_id: int, db: Session = Depends(get_db)):
-    # Check if post exists
-    post = crud_post.get_post(db, post_id)
-    if not post:
+def _ensure_post_exists(db: Session, post_id: int) -> None:
+    if not crud_post.get_post(db, post_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="게시글을 찾을 수 없습니다.",
         )
 
-    comments = crud_comment.get_comments_by_post(db, post_id)
-    return [
-        CommentResponse(
-            id=comment.id,
-            content=comment.content,
-            post_id=comment.post_id,
-            user_id=comment.user_id,
-            created_at=comment.created_at,
-            author_username=comment.author.username if comment.author else None,
-            author_profile_image_url=comment.author.profile_image_url if comment.author else None,
+
+def _build_comment_response(comment) -> CommentResponse:
+    return CommentResponse(
+        id=comment.id,
+        content=comment.content,
+        post_id=comment.post_id,
+        user_id=comment.user_id,
+        created_at=comment.created_at,
+        author_username=comment.author.username if comment.author else None,
+        author_profile_image_url=comment.author.profile_image_url if comment.author else None,
+    )
+
+
+def _blocked_ids(db: Session, viewer_id: Optional[int]):
+    return crud_follow.get_blocked_user_ids(db, viewer_id) if viewer_id else None
+
+
+def _load_comments(db: Session, post_id: int, limit: int, viewer_id: Optional[int] = None) -> List[CommentResponse]:
+    _ensure_post_exists(db, post_id)
+    comments = crud_comment.get_comments_by_post(
+        db, post_id, exclude_author_ids=_blocked_ids(db, viewer_id), limit=limit
+    )
+    return [_build_comment_response(comment) for comment in comments]
+
+
+def _load_comment_page(
+    db: Session,
+    post_id: int,
+    cursor: Optional[str],
+    limit: int,
+    viewer_id: Optional[int],
+) -> CommentPageResponse:
+    _ensure_post_exists(db, post_id)
+    try:
+        comments, next_cursor = crud_comment.get_comments_by_post_cursor(
+            db,
+            post_id,
+            cursor=cursor or None,
+            limit=limit,
+            exclude_author_ids=_blocked_ids(db, viewer_id),
         )
-        for comment in comments
-    ]
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+    return CommentPageResponse(
+        comments=[_build_comment_response(comment) for comment in comments],
+        next_cursor=next_cursor,
+    )
+
+
+def _stream_comment_export(post_id: int) -> Iterator[str]:
+    """The whole thread as one JSON array, written row by row from its own session."""
+    db = ReadSessionLocal()
+    try:
+        with_statement_timeout(db, settings.DB_EXPORT_STATEMENT_TIMEOUT_MS)
+        yield "["
+        for index, row in enumerate(crud_comment.iter_comment_rows(db, post_id, COMMENT_EXPORT_BATCH_SIZE)):
+            item = CommentResponse.model_validate(row._mapping).model_dump(mode="json")
+            yield ("," if index else "") + json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+        yield "]"
+    finally:
+        db.close()
+
+
+@router.get("/post/{post_id}", response_model=List[CommentResponse], deprecated=True)
+async def get_comments(
+    post_id: int,
+    limit: int = Query(COMMENT_PAGE_MAX_LIMIT, ge=1, le=COMMENT_PAGE_MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+):
+    """Deprecated: only the newest `limit` comments. Use `/post/{post_id}/page` to read a whole thread."""
+    return await db.run_sync(_load_comments, post_id, limit, current_user.id if current_user else None)
+
+
+@router.get("/post/{post_id}/page", response_model=CommentPageResponse)
+async def get_comment_page(
+    post_id: int,
+    cursor: Optional[str] = Query(None, max_length=512),
+    limit: int = Query(50, ge=1, le=COMMENT_PAGE_MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+):
+    """Newest-first comments, one page at a time; pass back `next_cursor` for the next page."""
+    return await db.run_sync(
+        _load_comment_page, post_id, cursor, limit, current_user.id if current_user else None
+    )
+
+
+@router.get("/post/{post_id}/export")
+def export_comments(
+    post_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_admin),
+):
+    """Moderator export of a full thread (oldest first), streamed as a JSON array."""
+    _ensure_post_exists(db, post_id)
+    return StreamingResponse(_stream_comment_export(post_id), media_type="application/json")
 
 
 @router.post("/", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
@@ -65,28 +164,24 @@ def create_comment(
             detail="게시글을 찾을 수 없습니다.",
         )
 
-    db_comment = crud_comment.create_comment(db, comment, current_user.id)
-
+    notification = None
     if post.user_id != current_user.id:
-        try:
-            preview = _build_comment_preview(db_comment.content)
-            notification_content = (
+        preview = _build_comment_preview(comment.content)
+        notification = NotificationEvent(
+            user_id=post.user_id,
+            type="comment",
+            content=(
                 f"{current_user.username}님이 댓글을 남겼습니다: {preview}"
                 if preview
                 else f"{current_user.username}님이 회원님의 게시글에 댓글을 남겼습니다."
-            )
-            crud_notification.create_notification(
-                db,
-                NotificationCreate(
-                    user_id=post.user_id,
-                    type="comment",
-                    content=notification_content,
-                    related_post_id=post.id,
-                    related_comment_id=db_comment.id,
-                ),
-            )
-        except Exception as exc:
-            logger.warning("Failed to create comment notification: %s", exc)
+            ),
+            related_post_id=post.id,
+            actor_name=current_user.username,
+        )
+
+    db_comment = crud_comment.create_comment(db, comment, current_user.id, notification=notification)
+    hot_score_board.bump(post.id, COMMENT_WEIGHT)
+    response_cache.invalidate(post_tag(post.id), TAG_RANKINGS)
 
     return CommentResponse(
         id=db_comment.id,
@@ -119,5 +214,8 @@ def delete_comment(
             detail="권한이 없습니다.",
         )
 
-    crud_comment.delete_comment(db, comment_id)
+    post_id = db_comment.post_id
+    if crud_comment.delete_comment(db, comment_id):
+        hot_score_board.bump(post_id, -COMMENT_WEIGHT)
+        response_cache.invalidate(post_tag(post_id), TAG_RANKINGS)
     return None
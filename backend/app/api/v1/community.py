@@ -1,18 +1,32 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-from fastapi import APIRouter, Depends, Query
+from typing import Collection, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_async_read_db
 from app.api.deps import get_current_user_optional
 from app.schemas.community import CommunityStatsResponse, CommunityWeeklySummaryResponse
 from app.schemas.post import PostResponse
 from app.crud import community as crud_community
+from app.crud import follow as crud_follow
 from app.crud import post as crud_post
 from app.models.user import User
+from app.api.v1.posts import cached_response_for_viewer
+from app.services.hot_score import hot_score_board
+from app.services.response_cache import (
+    TAG_BOARD,
+    TAG_RANKINGS,
+    build_cache_key,
+    post_tag,
+    response_cache,
+)
 
 router = APIRouter()
 
+# Hot-board candidates fetched per requested post when the viewer has blocked authors.
+HOT_BLOCKED_OVERFETCH = 3
+
 
 def _serialize_recruit_meta(post) -> Optional[dict]:
     recruit_meta = post.recruit_meta
@@ -36,11 +50,9 @@ def _build_hot_post_responses(
 ) -> list[PostResponse]:
     post_ids = [result["post"].id for result in results]
     (
-        _comment_count_by_post_id,
-        _likes_count_by_post_id,
         liked_post_ids_for_user,
         bookmarked_post_ids_for_user,
-    ) = crud_post.get_post_engagement_maps(
+    ) = crud_post.get_viewer_engagement_flags(
         db,
         post_ids=post_ids,
         user_id=current_user.id if current_user else None,
@@ -72,33 +84,44 @@ def _build_hot_post_responses(
     ]
 
 
-@router.get("/stats", response_model=CommunityStatsResponse)
-def get_community_stats(
-    db: Session = Depends(get_db),
-):
-    return crud_community.get_community_stats(db)
+async def _rank_hot_posts(
+    window: str,
+    limit: int,
+    category_id: Optional[int] = None,
+    exclude_author_ids: Optional[Collection[int]] = None,
+) -> Optional[list[tuple[int, float]]]:
+    """Board candidates for `_get_hot_results`, fetched before entering `run_sync`."""
+    # Over-fetch from the board when some authors are blocked; only if the blocked
+    # authors crowd out the whole candidate list do we fall back to the SQL ranking.
+    candidates = limit * HOT_BLOCKED_OVERFETCH if exclude_author_ids else limit
+    return await hot_score_board.atop(window, candidates, category_id=category_id)
 
 
-@router.get("/pinned", response_model=list[PostResponse])
-def get_pinned_posts(
-    limit: int = Query(3, ge=1, le=10),
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user_optional),
-):
-    posts = crud_community.get_pinned_posts(db, limit=limit)
-    post_ids = [post.id for post in posts]
-    (
-        comment_count_by_post_id,
-        likes_count_by_post_id,
-        liked_post_ids_for_user,
-        bookmarked_post_ids_for_user,
-    ) = crud_post.get_post_engagement_maps(
+def _get_hot_results(
+    db: Session,
+    ranked: Optional[list[tuple[int, float]]],
+    window: str,
+    limit: int,
+    category_id: Optional[int] = None,
+    exclude_author_ids: Optional[Collection[int]] = None,
+) -> list[dict]:
+    candidates = limit * HOT_BLOCKED_OVERFETCH if exclude_author_ids else limit
+    if ranked is not None:
+        results = crud_community.get_ranked_posts(db, ranked, exclude_author_ids)
+        if len(results) >= limit or len(ranked) < candidates:
+            return results[:limit]
+    return crud_community.get_hot_posts(
         db,
-        post_ids=post_ids,
-        user_id=current_user.id if current_user else None,
+        window=window,
+        limit=limit,
+        category_id=category_id,
+        exclude_author_ids=exclude_author_ids,
     )
 
-    return [
+
+def _build_pinned_posts(db: Session, limit: int) -> tuple[list[PostResponse], set[str]]:
+    posts = crud_community.get_pinned_posts(db, limit=limit)
+    payload = [
         PostResponse(
             id=p.id,
             title=p.title,
@@ -112,42 +135,112 @@ def get_pinned_posts(
             updated_at=p.updated_at,
             author_username=p.author.username if p.author else None,
             author_profile_image_url=p.author.profile_image_url if p.author else None,
-            comment_count=comment_count_by_post_id.get(p.id, 0),
-            likes_count=likes_count_by_post_id.get(p.id, 0),
-            is_liked=p.id in liked_post_ids_for_user,
-            is_bookmarked=p.id in bookmarked_post_ids_for_user,
+            comment_count=p.comment_count or 0,
+            likes_count=p.likes_count or 0,
+            is_liked=False,
+            is_bookmarked=False,
             is_pinned=p.is_pinned or False,
             category_name=p.category.name if p.category else None,
             category_slug=p.category.slug if p.category else None,
         )
         for p in posts
     ]
+    return payload, {TAG_BOARD, *[post_tag(p.id) for p in posts]}
+
+
+def _build_hot_posts(
+    db: Session,
+    ranked: Optional[list[tuple[int, float]]],
+    window: str,
+    limit: int,
+    category_id: Optional[int],
+) -> tuple[list[PostResponse], set[str]]:
+    results = _get_hot_results(db, ranked, window=window, limit=limit, category_id=category_id)
+    payload = _build_hot_post_responses(db, results, None)
+    return payload, {TAG_BOARD, TAG_RANKINGS, *[post_tag(r["post"].id) for r in results]}
+
+
+@router.get("/stats", response_model=CommunityStatsResponse)
+async def get_community_stats(
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await db.run_sync(crud_community.get_community_stats)
+
+
+@router.get("/pinned", response_model=list[PostResponse])
+async def get_pinned_posts(
+    request: Request,
+    limit: int = Query(3, ge=1, le=10),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+):
+    entry = await response_cache.aget_or_build(
+        build_cache_key("community:pinned", {"limit": limit}),
+        lambda: db.run_sync(_build_pinned_posts, limit),
+    )
+    return await cached_response_for_viewer(db, request, entry, current_user)
 
 
 @router.get("/hot", response_model=list[PostResponse])
-def get_hot_posts(
+async def get_hot_posts(
+    request: Request,
     window: str = Query("24h", pattern="^(24h|7d|30d)$"),
     limit: int = Query(6, ge=1, le=20),
     category_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Optional[User] = Depends(get_current_user_optional),
 ):
-    results = crud_community.get_hot_posts(
-        db, window=window, limit=limit, category_id=category_id
+    blocked_ids = (
+        await db.run_sync(crud_follow.get_blocked_user_ids, current_user.id)
+        if current_user
+        else frozenset()
     )
-    return _build_hot_post_responses(db, results, current_user)
+    if blocked_ids:
+        # Block-filtered rankings are per viewer; never share them through the cache.
+        ranked = await _rank_hot_posts(window, limit, category_id, blocked_ids)
+        return await db.run_sync(
+            lambda session: _build_hot_post_responses(
+                session,
+                _get_hot_results(session, ranked, window, limit, category_id, blocked_ids),
+                current_user,
+            )
+        )
+
+    async def build():
+        ranked = await _rank_hot_posts(window, limit, category_id)
+        return await db.run_sync(_build_hot_posts, ranked, window, limit, category_id)
+
+    entry = await response_cache.aget_or_build(
+        build_cache_key(
+            "community:hot",
+            {"window": window, "limit": limit, "category_id": category_id},
+        ),
+        build,
+    )
+    return await cached_response_for_viewer(db, request, entry, current_user)
 
 
 @router.get("/weekly-summary", response_model=CommunityWeeklySummaryResponse)
-def get_weekly_summary(
+async def get_weekly_summary(
     limit: int = Query(5, ge=1, le=10),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Optional[User] = Depends(get_current_user_optional),
 ):
     now_utc = datetime.now(timezone.utc)
     period_start = now_utc - timedelta(days=7)
-    results = crud_community.get_hot_posts(db, window="7d", limit=limit)
-    posts = _build_hot_post_responses(db, results, current_user)
+    blocked_ids = (
+        await db.run_sync(crud_follow.get_blocked_user_ids, current_user.id)
+        if current_user
+        else None
+    )
+    ranked = await _rank_hot_posts("7d", limit, exclude_author_ids=blocked_ids)
+    posts = await db.run_sync(
+        lambda session: _build_hot_post_responses(
+            session,
+            _get_hot_results(session, ranked, window="7d", limit=limit, exclude_author_ids=blocked_ids),
+            current_user,
+        )
+    )
 
     return CommunityWeeklySummaryResponse(
         window="7d",
@@ -37,6 +37,7 @@ def _build_follow_user_list_response(
     total: int,
     page: int,
     page_size: int,
+    followed_by_viewer: set[int],
 ) -> FollowUserListResponse:
     users = [
         FollowUserSummary(
@@ -44,6 +45,7 @@ def _build_follow_user_list_response(
             username=user.username,
             profile_image_url=user.profile_image_url,
             followed_at=follow.created_at,
+            is_following=user.id in followed_by_viewer,
         )
         for user, follow in rows
     ]
@@ -78,6 +80,12 @@ def _build_block_user_list_response(
     )
 
 
+def _followed_by_viewer(db: Session, viewer: User | None, rows: list[tuple[User, UserFollow]]) -> set[int]:
+    if not viewer:
+        return set()
+    return crud_follow.get_following_among(db, viewer.id, [user.id for user, _follow in rows])
+
+
 @router.post("/users/{user_id}", response_model=FollowResponse, status_code=status.HTTP_201_CREATED)
 def follow_user(
     user_id: int,
@@ -194,11 +202,12 @@ def block_user(
         return existing_block
 
     try:
-        return crud_follow.create_block(
+        block = crud_follow.create_block(
             db,
             blocker_id=current_user.id,
             blocked_id=user_id,
         )
+        return block
     except IntegrityError:
         db.rollback()
         existing_block = crud_follow.get_block(
@@ -261,16 +270,21 @@ def get_follow_status(
     current_user: User | None = Depends(get_current_user_optional),
 ):
     _get_user_or_404(db, user_id)
+    followers_count, following_count = crud_follow.get_follow_counts(db, user_id)
 
-    if not current_user or current_user.id == user_id:
-        return FollowStatusResponse(user_id=user_id, is_following=False)
-
-    is_following = crud_follow.is_following(
-        db,
-        follower_id=current_user.id,
-        following_id=user_id,
+    is_following = False
+    if current_user and current_user.id != user_id:
+        is_following = crud_follow.is_following(
+            db,
+            follower_id=current_user.id,
+            following_id=user_id,
+        )
+    return FollowStatusResponse(
+        user_id=user_id,
+        is_following=is_following,
+        followers_count=followers_count,
+        following_count=following_count,
     )
-    return FollowStatusResponse(user_id=user_id, is_following=is_following)
 
 
 @router.get("/users/{user_id}/followers", response_model=FollowUserListResponse)
@@ -279,11 +293,18 @@ def get_followers(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_optional),
 ):
     _get_user_or_404(db, user_id)
     skip = (page - 1) * page_size
     rows, total = crud_follow.get_followers(db, user_id=user_id, skip=skip, limit=page_size)
-    return _build_follow_user_list_response(rows, total=total, page=page, page_size=page_size)
+    return _build_follow_user_list_response(
+        rows,
+        total=total,
+        page=page,
+        page_size=page_size,
+        followed_by_viewer=_followed_by_viewer(db, current_user, rows),
+    )
 
 
 @router.get("/users/{user_id}/following", response_model=FollowUserListResponse)
@@ -292,8 +313,15 @@ def get_following(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_optional),
 ):
     _get_user_or_404(db, user_id)
     skip = (page - 1) * page_size
     rows, total = crud_follow.get_followings(db, user_id=user_id, skip=skip, limit=page_size)
-    return _build_follow_user_list_response(rows, total=total, page=page, page_size=page_size)
+    return _build_follow_user_list_response(
+        rows,
+        total=total,
+        page=page,
+        page_size=page_size,
+        followed_by_viewer=_followed_by_viewer(db, current_user, rows),
+    )
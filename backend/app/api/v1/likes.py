@@ -5,12 +5,13 @@ from sqlalchemy.exc import IntegrityError
 
 from app.db.session import get_db
 from app.schemas.like import LikeResponse
-from app.schemas.notification import NotificationCreate
+from app.schemas.notification import NotificationEvent
 from app.crud import like as crud_like
-from app.crud import notification as crud_notification
 from app.crud import post as crud_post
 from app.api.deps import get_current_user
 from app.models.user import User
+from app.services.hot_score import LIKE_WEIGHT, hot_score_board
+from app.services.response_cache import TAG_RANKINGS, post_tag, response_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -39,21 +40,20 @@ def like_post(
             detail="이미 좋아요한 게시글입니다.",
         )
 
+    notification = None
+    if post.user_id != current_user.id:
+        notification = NotificationEvent(
+            user_id=post.user_id,
+            type="like",
+            content=f"{current_user.username}님이 회원님의 게시글을 좋아합니다.",
+            related_post_id=post.id,
+            actor_name=current_user.username,
+        )
+
     try:
-        like = crud_like.create_like(db, post_id, current_user.id)
-        if post.user_id != current_user.id:
-            try:
-                crud_notification.create_notification(
-                    db,
-                    NotificationCreate(
-                        user_id=post.user_id,
-                        type="like",
-                        content=f"{current_user.username}님이 회원님의 게시글을 좋아합니다.",
-                        related_post_id=post.id,
-                    ),
-                )
-            except Exception as exc:
-                logger.warning("Failed to create like notification: %s", exc)
+        like = crud_like.create_like(db, post_id, current_user.id, notification=notification)
+        hot_score_board.bump(post_id, LIKE_WEIGHT)
+        response_cache.invalidate(post_tag(post_id), TAG_RANKINGS)
         return like
     except IntegrityError:
         db.rollback()
@@ -84,6 +84,8 @@ def unlike_post(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="좋아요를 찾을 수 없습니다.",
         )
+    hot_score_board.bump(post_id, -LIKE_WEIGHT)
+    response_cache.invalidate(post_tag(post_id), TAG_RANKINGS)
 
 
 @router.get("/posts/{post_id}/likes/count")
@@ -7,6 +7,7 @@ from app.schemas.mcp_category import McpCategoryCreate, McpCategoryUpdate, McpCa
 from app.crud import mcp_category as crud_mcp_category
 from app.api.deps import get_current_user
 from app.models.user import User
+from app.services.response_cache import TAG_MCP_SERVERS, response_cache
 
 router = APIRouter()
 
@@ -108,6 +109,8 @@ def update_mcp_category(
             detail="MCP category not found",
         )
 
+    # Server lists embed the category name.
+    response_cache.invalidate(TAG_MCP_SERVERS)
     return McpCategoryResponse(
         id=updated.id,
         name=updated.name,
@@ -138,3 +141,5 @@ def delete_mcp_category(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="MCP category not found",
         )
+
+    response_cache.invalidate(TAG_MCP_SERVERS)
@@ -9,6 +9,7 @@ from app.crud import mcp_review as crud_mcp_review
 from app.crud import mcp_server as crud_mcp_server
 from app.api.deps import get_current_user
 from app.models.user import User
+from app.services.response_cache import TAG_MCP_SERVERS, mcp_server_tag, response_cache
 
 router = APIRouter()
 
@@ -73,6 +74,7 @@ def create_review(
 
     try:
         db_review = crud_mcp_review.create_review(db, review, current_user.id)
+        response_cache.invalidate(TAG_MCP_SERVERS, mcp_server_tag(db_review.server_id))
         return McpReviewResponse(
             id=db_review.id,
             rating=db_review.rating,
@@ -113,6 +115,7 @@ def update_review(
         )
 
     updated = crud_mcp_review.update_review(db, review_id, review_update)
+    response_cache.invalidate(TAG_MCP_SERVERS, mcp_server_tag(updated.server_id))
     return McpReviewResponse(
         id=updated.id,
         rating=updated.rating,
@@ -145,5 +148,7 @@ def delete_review(
             detail="Not enough permissions",
         )
 
+    server_id = db_review.server_id
     crud_mcp_review.delete_review(db, review_id)
+    response_cache.invalidate(TAG_MCP_SERVERS, mcp_server_tag(server_id))
     return None
@@ -1,8 +1,8 @@
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.api.deps import get_current_user, get_current_user_optional
 from app.schemas.mcp_server import (
     McpServerCreate, McpServerUpdate, McpServerResponse, McpServerListResponse,
@@ -14,12 +14,20 @@ from app.crud import mcp_tool as crud_mcp_tool
 from app.crud import mcp_install_guide as crud_mcp_install_guide
 from app.services.github import GitHubService
 from app.services.github_sync import sync_all_github_stats
+from app.services.response_cache import (
+    TAG_MCP_SERVERS,
+    build_cache_key,
+    cached_json_response,
+    mcp_server_tag,
+    response_cache,
+)
+from app.services.search import first_snippet
 from app.core.config import settings
 
 router = APIRouter()
 
 
-def _build_server_response(server) -> McpServerResponse:
+def _build_server_response(server, search_snippet: Optional[str] = None) -> McpServerResponse:
     return McpServerResponse(
         id=server.id,
         name=server.name,
@@ -45,36 +53,59 @@ def _build_server_response(server) -> McpServerResponse:
         updated_at=server.updated_at,
         tools=[McpToolResponse(id=t.id, name=t.name, description=t.description, input_schema=t.input_schema, sample_output=t.sample_output) for t in server.tools],
         install_guides=[McpInstallGuideResponse(id=g.id, client_name=g.client_name, config_json=g.config_json, instructions=g.instructions) for g in server.install_guides],
+        search_snippet=search_snippet,
     )
 
 
 @router.get("/", response_model=McpServerListResponse)
 def get_mcp_servers(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(12, ge=1, le=100),
     search: Optional[str] = Query(None),
     category_id: Optional[int] = Query(None),
     is_featured: Optional[bool] = Query(None),
     sort_by: Optional[str] = Query("newest"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    skip = (page - 1) * page_size
-    servers, total = crud_mcp_server.get_mcp_servers(
-        db,
-        skip=skip,
-        limit=page_size,
-        search=search,
-        category_id=category_id,
-        is_featured=is_featured,
-        sort_by=sort_by or "newest",
+    def build():
+        servers, total = crud_mcp_server.get_mcp_servers(
+            db,
+            skip=(page - 1) * page_size,
+            limit=page_size,
+            search=search,
+            category_id=category_id,
+            is_featured=is_featured,
+            sort_by=sort_by or "newest",
+        )
+        payload = {
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "servers": [
+                _build_server_response(
+                    s,
+                    search_snippet=first_snippet([s.short_description, s.description, s.name], search)
+                    if search
+                    else None,
+                )
+                for s in servers
+            ],
+        }
+        return payload, {TAG_MCP_SERVERS, *[mcp_server_tag(s.id) for s in servers]}
+
+    cache_key = build_cache_key(
+        "mcp-servers",
+        {
+            "page": page,
+            "page_size": page_size,
+            "search": search,
+            "category_id": category_id,
+            "is_featured": is_featured,
+            "sort_by": sort_by or "newest",
+        },
     )
-
-    return {
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "servers": [_build_server_response(s) for s in servers],
-    }
+    return cached_json_response(request, response_cache.get_or_build(cache_key, build))
 
 
 @router.post("/sync-github-all")
@@ -88,6 +119,7 @@ async def sync_all_github(
             detail="Not enough permissions",
         )
     await sync_all_github_stats(db)
+    await response_cache.ainvalidate(TAG_MCP_SERVERS)
     return {"status": "ok", "message": "GitHub sync completed"}
 
 
@@ -127,6 +159,7 @@ def create_mcp_server(
             )
 
     db.refresh(db_server)
+    response_cache.invalidate(TAG_MCP_SERVERS)
     return _build_server_response(db_server)
 
 
@@ -151,6 +184,7 @@ def update_mcp_server(
         )
 
     updated = crud_mcp_server.update_mcp_server(db, server_id, server_update)
+    response_cache.invalidate(TAG_MCP_SERVERS, mcp_server_tag(server_id))
     return _build_server_response(updated)
 
 
@@ -174,6 +208,7 @@ def delete_mcp_server(
         )
 
     crud_mcp_server.delete_mcp_server(db, server_id)
+    response_cache.invalidate(TAG_MCP_SERVERS, mcp_server_tag(server_id))
     return None
 
 
@@ -207,6 +242,7 @@ async def sync_github(
     readme = await github.get_readme(db_server.github_url)
 
     crud_mcp_server.update_github_stats(db, server_id, stars=repo_info["stars"], readme=readme)
+    await response_cache.ainvalidate(TAG_MCP_SERVERS, mcp_server_tag(server_id))
     db.refresh(db_server)
     return _build_server_response(db_server)
 
@@ -251,6 +287,7 @@ def create_server_tool(
     db_tool = crud_mcp_tool.create_mcp_tool(
         db, name=tool.name, description=tool.description, input_schema=tool.input_schema, server_id=server_id,
     )
+    response_cache.invalidate(mcp_server_tag(server_id))
     return McpToolResponse(id=db_tool.id, name=db_tool.name, description=db_tool.description, input_schema=db_tool.input_schema, sample_output=db_tool.sample_output)
 
 
@@ -295,4 +332,5 @@ def create_install_guide(
         db, client_name=guide.client_name, config_json=guide.config_json,
         instructions=guide.instructions, server_id=server_id,
     )
+    response_cache.invalidate(mcp_server_tag(server_id))
     return McpInstallGuideResponse(id=db_guide.id, client_name=db_guide.client_name, config_json=db_guide.config_json, instructions=db_guide.instructions)
@@ -1,22 +1,32 @@
+import asyncio
+import json
 import re
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_user_for_token, optional_security
 from app.crud import notification as crud_notification
 from app.crud import post as crud_post
-from app.db.session import get_db
+from app.db.base import AsyncSessionLocal
+from app.db.session import get_async_db, get_db
 from app.models.post import Post
 from app.models.user import User
 from app.schemas.notification import (
     NotificationListResponse,
     NotificationResponse,
+    NotificationStreamTicketResponse,
     NotificationUnreadCountResponse,
 )
+from app.services.notification_hub import NotificationSubscription, notification_hub
 
 router = APIRouter()
+SSE_RETRY_MS = 5000
 
 
 def _localize_notification_content(notification_type: str, content: str | None) -> str:
@@ -41,18 +51,31 @@ def _localize_notification_content(notification_type: str, content: str | None)
     return content
 
 
-@router.get("/me", response_model=NotificationListResponse)
-def get_my_notifications(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    skip = (page - 1) * page_size
-    notifications = crud_notification.get_user_notifications(
-        db, user_id=current_user.id, skip=skip, limit=page_size
-    )
-    total = crud_notification.get_user_notifications_count(db, current_user.id)
+def _build_notification_list(
+    db: Session,
+    user_id: int,
+    page: int,
+    page_size: int,
+    use_cursor: bool = False,
+    cursor: Optional[str] = None,
+) -> dict:
+    next_cursor = None
+    if use_cursor:
+        try:
+            notifications, next_cursor = crud_notification.get_user_notifications_by_cursor(
+                db, user_id=user_id, cursor=cursor or None, limit=page_size
+            )
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+    else:
+        notifications = crud_notification.get_user_notifications(
+            db, user_id=user_id, skip=(page - 1) * page_size, limit=page_size
+        )
+    stats = crud_notification.get_notification_stats(db, user_id)
+    total = stats.total_count if stats else 0
 
     related_post_ids = {
         item.related_post_id
@@ -83,7 +106,7 @@ def get_my_notifications(
                 related_post_id=notification.related_post_id,
                 related_comment_id=notification.related_comment_id,
                 post_title=post_title,
-                is_read=notification.is_read,
+                is_read=crud_notification.is_notification_read(notification, stats),
                 created_at=notification.created_at,
             )
         )
@@ -93,15 +116,33 @@ def get_my_notifications(
         "page": page,
         "page_size": page_size,
         "notifications": notification_items,
+        "next_cursor": next_cursor,
     }
 
 
+@router.get("/me", response_model=NotificationListResponse)
+async def get_my_notifications(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    pagination: Optional[str] = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: Optional[str] = Query(None, max_length=512),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    use_cursor = pagination == "cursor" or cursor is not None
+    return await db.run_sync(
+        _build_notification_list, current_user.id, page, page_size, use_cursor, cursor
+    )
+
+
 @router.get("/me/unread-count", response_model=NotificationUnreadCountResponse)
-def get_my_unread_count(
+async def get_my_unread_count(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    unread_count = crud_notification.get_unread_notifications_count(db, current_user.id)
+    unread_count = await db.run_sync(
+        crud_notification.get_unread_notifications_count, current_user.id
+    )
     return {"unread_count": unread_count}
 
 
@@ -183,3 +224,137 @@ def delete_notification(
         )
 
     return None
+
+
+def _format_push_event(event: dict) -> dict:
+    if event.get("type") != "notification":
+        return event
+    notification = dict(event["notification"])
+    notification["content"] = _localize_notification_content(
+        notification["type"], notification["content"]
+    )
+    return {**event, "notification": notification}
+
+
+async def _resolve_stream_user_id(
+    ticket: Optional[str],
+    credentials: Optional[HTTPAuthorizationCredentials] = None,
+) -> Optional[int]:
+    """Header token for API clients, otherwise a stream ticket; never a token in the URL."""
+    if credentials is None:
+        return await notification_hub.redeem_ticket(ticket)
+    async with AsyncSessionLocal() as db:
+        user = await db.run_sync(get_user_for_token, credentials.credentials)
+        return user.id if user else None
+
+
+async def _load_unread_count(user_id: int) -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.run_sync(crud_notification.get_unread_notifications_count, user_id)
+
+
+def _sse_message(event: dict) -> str:
+    lines = [f"event: {event['type']}"]
+    if event.get("type") == "notification":
+        lines.append(f"id: {event['notification']['id']}")
+    lines.append(f"data: {json.dumps(event, ensure_ascii=False, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _stream_events(subscription: NotificationSubscription):
+    """Initial unread count, then pushed events; heartbeats while idle."""
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        unread_count = await _load_unread_count(subscription.user_id)
+        yield _sse_message({"type": "unread_count", "unread_count": unread_count})
+        while True:
+            event = await subscription.next_event(notification_hub.heartbeat_seconds)
+            if event is None:
+                yield ": ping\n\n"
+                continue
+            yield _sse_message(_format_push_event(event))
+            if event["type"] == "shutdown":
+                return
+    finally:
+        notification_hub.disconnect(subscription)
+
+
+@router.post("/stream-ticket", response_model=NotificationStreamTicketResponse)
+async def create_stream_ticket(current_user: User = Depends(get_current_user)):
+    """Single-use ticket for opening /stream or /ws from a browser (EventSource cannot send headers)"""
+    ticket = await notification_hub.issue_ticket(current_user.id)
+    return {"ticket": ticket, "expires_in": notification_hub.ticket_ttl_seconds}
+
+
+@router.get("/stream")
+async def stream_my_notifications(
+    ticket: Optional[str] = Query(None, description="From POST /stream-ticket"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+):
+    """Server-Sent Events: new notifications and unread-count changes for the caller"""
+    user_id = await _resolve_stream_user_id(ticket, credentials)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+        )
+
+    subscription = notification_hub.connect(user_id)
+    if subscription is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="알림 연결이 너무 많습니다. 잠시 후 다시 시도해주세요.",
+        )
+
+    return StreamingResponse(
+        _stream_events(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _send_ws_events(websocket: WebSocket, subscription: NotificationSubscription) -> None:
+    unread_count = await _load_unread_count(subscription.user_id)
+    await websocket.send_json({"type": "unread_count", "unread_count": unread_count})
+    while True:
+        event = await subscription.next_event(notification_hub.heartbeat_seconds)
+        await websocket.send_json(_format_push_event(event) if event else {"type": "ping"})
+        if event and event["type"] == "shutdown":
+            return
+
+
+async def _wait_ws_disconnect(websocket: WebSocket) -> None:
+    # Clients only listen; anything they send is ignored.
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+@router.websocket("/ws")
+async def notifications_websocket(websocket: WebSocket, ticket: Optional[str] = Query(None)):
+    """WebSocket variant of /stream (same events as JSON messages)"""
+    user_id = await _resolve_stream_user_id(ticket)
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    subscription = notification_hub.connect(user_id)
+    if subscription is None:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+
+    await websocket.accept()
+    tasks = [
+        asyncio.create_task(_send_ws_events(websocket, subscription)),
+        asyncio.create_task(_wait_ws_disconnect(websocket)),
+    ]
+    try:
+        done, _pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            # A failed send only means the client already went away.
+            task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        notification_hub.disconnect(subscription)
@@ -1,21 +1,36 @@
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, get_current_user_optional, get_current_verified_user
 from app.crud import follow as crud_follow
-from app.crud import notification as crud_notification
 from app.crud import post as crud_post
 from app.crud import recruit_application as crud_recruit_application
-from app.db.session import get_db
+from app.db.session import get_async_read_db, get_db
 from app.models.category import Category
 from app.models.post import Post
 from app.models.user import User
-from app.schemas.notification import NotificationCreate
+from app.schemas.notification import NotificationEvent
+from app.services.hot_score import hot_score_board
+from app.services.response_cache import (
+    TAG_BOARD,
+    TAG_CATEGORIES,
+    TAG_RANKINGS,
+    CachedBody,
+    build_cache_key,
+    cached_json_response,
+    category_tag,
+    post_tag,
+    response_cache,
+)
+from app.services.search import first_snippet
+from app.services.view_counter import VIEW_TARGET_POST, build_viewer_key, view_counter
 from app.schemas.post import (
     POST_TYPE_RECRUIT,
     RECRUIT_APPLICATION_STATUS_ACCEPTED,
@@ -33,6 +48,8 @@ router = APIRouter()
 NOTICE_CATEGORY_SLUG = "notice"
 RECRUIT_CATEGORY_SLUG = "team-recruit"
 RECRUIT_CATEGORY_NAME = "팀 모집"
+# Sorts whose order moves with likes/comments/views; their pages carry TAG_RANKINGS.
+ENGAGEMENT_SORTS = frozenset({"views", "likes", "comments", "hot"})
 
 
 def get_category_or_404(db: Session, category_id: int) -> Category:
@@ -104,11 +121,10 @@ def _serialize_recruit_meta(post: Post) -> Optional[dict]:
 
 def _build_post_response(
     post: Post,
-    comment_count: int,
-    likes_count: int,
     is_liked: bool,
     is_bookmarked: bool,
     views: Optional[int] = None,
+    search_snippet: Optional[str] = None,
 ) -> PostResponse:
     return PostResponse(
         id=post.id,
@@ -123,13 +139,14 @@ def _build_post_response(
         updated_at=post.updated_at,
         author_username=post.author.username if post.author else None,
         author_profile_image_url=post.author.profile_image_url if post.author else None,
-        comment_count=comment_count,
-        likes_count=likes_count,
+        comment_count=post.comment_count or 0,
+        likes_count=post.likes_count or 0,
         is_liked=is_liked,
         is_bookmarked=is_bookmarked,
         is_pinned=post.is_pinned or False,
         category_name=post.category.name if post.category else None,
         category_slug=post.category.slug if post.category else None,
+        search_snippet=search_snippet,
     )
 
 
@@ -165,8 +182,154 @@ def _build_application_response(application) -> RecruitApplicationResponse:
     )
 
 
+def build_viewer_flags_overlay(
+    db: Session,
+    current_user: Optional[User],
+    posts_key: Optional[str] = None,
+):
+    """
+    Overlay for `cached_json_response`: patch is_liked/is_bookmarked for the viewer
+    into a shared (anonymous) post list body. `posts_key` selects the list inside a
+    dict body; None means the body itself is the list.
+    """
+    if current_user is None:
+        return None
+
+    def overlay(body):
+        post_items = body[posts_key] if posts_key else body
+        (
+            liked_post_ids_for_user,
+            bookmarked_post_ids_for_user,
+        ) = crud_post.get_viewer_engagement_flags(
+            db,
+            post_ids=[item["id"] for item in post_items],
+            user_id=current_user.id,
+        )
+        for item in post_items:
+            item["is_liked"] = item["id"] in liked_post_ids_for_user
+            item["is_bookmarked"] = item["id"] in bookmarked_post_ids_for_user
+        return body
+
+    return overlay
+
+
+async def cached_response_for_viewer(
+    db: AsyncSession,
+    request: Request,
+    entry: CachedBody,
+    current_user: Optional[User],
+    posts_key: Optional[str] = None,
+) -> Response:
+    """`cached_json_response` with the viewer flags overlay, for async routes."""
+    if current_user is None:
+        return cached_json_response(request, entry)
+    return await db.run_sync(
+        lambda session: cached_json_response(
+            request,
+            entry,
+            build_viewer_flags_overlay(session, current_user, posts_key=posts_key),
+        )
+    )
+
+
+def _build_post_listing(
+    db: Session,
+    page: int,
+    page_size: int,
+    use_cursor: bool,
+    cursor: Optional[str],
+    total_mode: Optional[str],
+    listing_filters: dict,
+) -> tuple[dict, set[str]]:
+    """Listing payload plus the cache tags it depends on (only cached when viewer-independent)."""
+    next_cursor = None
+    if use_cursor:
+        try:
+            posts, total, next_cursor = crud_post.get_posts_by_cursor(
+                db,
+                cursor=cursor or None,
+                limit=page_size,
+                total_mode=total_mode or crud_post.TOTAL_MODE_NONE,
+                **listing_filters,
+            )
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+    else:
+        posts, total = crud_post.get_posts(
+            db,
+            skip=(page - 1) * page_size,
+            limit=page_size,
+            total_mode=total_mode or crud_post.TOTAL_MODE_EXACT,
+            **listing_filters,
+        )
+
+    search = listing_filters.get("search")
+    post_responses = [
+        _build_post_response(
+            post=post,
+            is_liked=False,
+            is_bookmarked=False,
+            search_snippet=first_snippet([post.content, post.title], search) if search else None,
+        )
+        for post in posts
+    ]
+    payload = {
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "posts": post_responses,
+        "next_cursor": next_cursor,
+    }
+    # A category-filtered list only changes with that category; unfiltered lists with
+    # the whole board. Edits to any listed post are covered by its post tag.
+    category_id = listing_filters.get("category_id")
+    tags = {category_tag(category_id) if category_id else TAG_BOARD}
+    tags.update(post_tag(post.id) for post in posts)
+    if (listing_filters.get("sort") or "").lower() in ENGAGEMENT_SORTS:
+        tags.add(TAG_RANKINGS)
+    return payload, tags
+
+
+def _build_for_viewer_timeline(
+    db: Session,
+    viewer: User,
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+) -> dict:
+    try:
+        posts, next_cursor = crud_post.get_following_timeline(
+            db,
+            follower_id=viewer.id,
+            cursor=cursor or None,
+            limit=page_size,
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+    payload = {
+        "total": None,
+        "page": page,
+        "page_size": page_size,
+        "posts": [
+            _build_post_response(post=post, is_liked=False, is_bookmarked=False)
+            for post in posts
+        ],
+        "next_cursor": next_cursor,
+    }
+    overlay = build_viewer_flags_overlay(db, viewer, posts_key="posts")
+    return overlay(jsonable_encoder(payload))
+
+
 @router.get("/", response_model=PostListResponse)
-def get_posts(
+async def get_posts(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     search: Optional[str] = Query(None),
@@ -178,11 +341,14 @@ def get_posts(
     recruit_status: Optional[str] = Query(None, pattern="^(OPEN|CLOSED)$"),
     recruit_is_online: Optional[bool] = Query(None),
     scope: Optional[str] = Query("all", pattern="^(all|following)$"),
-    db: Session = Depends(get_db),
+    pagination: Optional[str] = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: Optional[str] = Query(None, max_length=512),
+    total_mode: Optional[str] = Query(None, pattern="^(exact|estimate|none)$"),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Optional[User] = Depends(get_current_user_optional),
 ):
-    skip = (page - 1) * page_size
     normalized_scope = (scope or "all").lower()
+    use_cursor = pagination == "cursor" or cursor is not None
     author_ids: Optional[list[int]] = None
 
     if normalized_scope == "following":
@@ -193,7 +359,22 @@ def get_posts(
                 "page_size": page_size,
                 "posts": [],
             }
-        author_ids = crud_follow.get_following_user_ids(db, follower_id=current_user.id)
+        uses_timeline = (
+            use_cursor
+            and (sort or "latest") == "latest"
+            and total_mode in (None, crud_post.TOTAL_MODE_NONE)
+            and not any(
+                (search, category_id, post_type, recruit_type, recruit_status, recruit_is_online is not None)
+            )
+        )
+        if uses_timeline:
+            # Plain newest-first pages come from the precomputed home timeline.
+            return await db.run_sync(
+                _build_for_viewer_timeline, current_user, page, page_size, cursor
+            )
+        author_ids = await db.run_sync(
+            crud_follow.get_following_user_ids, follower_id=current_user.id
+        )
         if not author_ids:
             return {
                 "total": 0,
@@ -202,10 +383,14 @@ def get_posts(
                 "posts": [],
             }
 
-    posts, total = crud_post.get_posts(
-        db,
-        skip=skip,
-        limit=page_size,
+    # Blocked users are filtered in SQL; viewers without blocks share the cached listing.
+    blocked_ids = (
+        await db.run_sync(crud_follow.get_blocked_user_ids, current_user.id)
+        if current_user
+        else frozenset()
+    )
+
+    listing_filters = dict(
         search=search,
         category_id=category_id,
         sort=sort or "latest",
@@ -215,45 +400,45 @@ def get_posts(
         recruit_status=recruit_status,
         recruit_is_online=recruit_is_online,
         author_ids=author_ids,
+        exclude_author_ids=blocked_ids or None,
     )
 
-    post_ids = [post.id for post in posts]
-    (
-        comment_count_by_post_id,
-        likes_count_by_post_id,
-        liked_post_ids_for_user,
-        bookmarked_post_ids_for_user,
-    ) = crud_post.get_post_engagement_maps(
-        db,
-        post_ids=post_ids,
-        user_id=current_user.id if current_user else None,
-    )
+    if author_ids is not None or blocked_ids:
+        # The following feed and block-filtered lists are per viewer; never share them through the cache.
+        def build_for_viewer(session: Session) -> dict:
+            payload, _tags = _build_post_listing(
+                session, page, page_size, use_cursor, cursor, total_mode, listing_filters
+            )
+            overlay = build_viewer_flags_overlay(session, current_user, posts_key="posts")
+            return overlay(jsonable_encoder(payload))
 
-    post_responses = [
-        _build_post_response(
-            post=post,
-            comment_count=comment_count_by_post_id.get(post.id, 0),
-            likes_count=likes_count_by_post_id.get(post.id, 0),
-            is_liked=post.id in liked_post_ids_for_user,
-            is_bookmarked=post.id in bookmarked_post_ids_for_user,
+        return await db.run_sync(build_for_viewer)
+
+    async def build():
+        return await db.run_sync(
+            _build_post_listing, page, page_size, use_cursor, cursor, total_mode, listing_filters
         )
-        for post in posts
-    ]
 
-    return {
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "posts": post_responses,
-    }
+    cache_key = build_cache_key(
+        "posts",
+        {
+            **listing_filters,
+            "page": None if use_cursor else page,
+            "page_size": page_size,
+            "cursor": cursor,
+            "use_cursor": use_cursor,
+            "total_mode": total_mode,
+        },
+    )
+    entry = await response_cache.aget_or_build(cache_key, build)
+    return await cached_response_for_viewer(db, request, entry, current_user, posts_key="posts")
 
 
-@router.get("/{post_id}", response_model=PostResponse)
-def get_post(
+def _load_post_detail(
+    db: Session,
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user_optional),
-):
+    viewer_id: Optional[int],
+) -> PostResponse:
     post = crud_post.get_post(db, post_id)
     if not post:
         raise HTTPException(
@@ -261,29 +446,38 @@ def get_post(
             detail="Post not found",
         )
 
-    crud_post.increment_views(db, post_id)
-
     (
-        comment_count_by_post_id,
-        likes_count_by_post_id,
         liked_post_ids_for_user,
         bookmarked_post_ids_for_user,
-    ) = crud_post.get_post_engagement_maps(
+    ) = crud_post.get_viewer_engagement_flags(
         db,
         post_ids=[post.id],
-        user_id=current_user.id if current_user else None,
+        user_id=viewer_id,
     )
 
     return _build_post_response(
         post=post,
-        comment_count=comment_count_by_post_id.get(post.id, 0),
-        likes_count=likes_count_by_post_id.get(post.id, 0),
         is_liked=post.id in liked_post_ids_for_user,
         is_bookmarked=post.id in bookmarked_post_ids_for_user,
-        views=post.views + 1,
+        views=post.views or 0,
     )
 
 
+@router.get("/{post_id}", response_model=PostResponse)
+async def get_post(
+    post_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+):
+    viewer_id = current_user.id if current_user else None
+    viewer_key = build_viewer_key(viewer_id, request.client.host if request.client else None)
+    response = await db.run_sync(_load_post_detail, post_id, viewer_id)
+    # Outside run_sync: that runs on the event loop, and this may be a redis round trip.
+    response.views += await view_counter.acount_view(VIEW_TARGET_POST, post_id, viewer_key)
+    return response
+
+
 @router.post("/", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
 def create_post(
     post: PostCreate,
@@ -303,10 +497,10 @@ def create_post(
             detail=str(exc),
         ) from exc
 
+    hot_score_board.track_post(db_post)
+    response_cache.invalidate(TAG_BOARD, TAG_CATEGORIES, category_tag(db_post.category_id))
     return _build_post_response(
         post=db_post,
-        comment_count=0,
-        likes_count=0,
         is_liked=False,
         is_bookmarked=False,
     )
@@ -340,6 +534,7 @@ def update_post(
     target_post_type = post_update.post_type if post_update.post_type is not None else db_post.post_type
     ensure_recruit_category_rule(db, target_category, target_post_type)
 
+    previous_category_id = db_post.category_id
     try:
         updated_post = crud_post.update_post(db, post_id, post_update)
     except ValueError as exc:
@@ -349,10 +544,14 @@ def update_post(
             detail=str(exc),
         ) from exc
 
+    response_cache.invalidate(
+        post_tag(post_id),
+        TAG_BOARD,
+        category_tag(previous_category_id),
+        category_tag(updated_post.category_id),
+    )
     return _build_post_response(
         post=updated_post,
-        comment_count=crud_post.get_comment_count(db, post_id),
-        likes_count=crud_post.get_likes_count(db, post_id),
         is_liked=crud_post.check_user_liked(db, post_id, current_user.id),
         is_bookmarked=crud_post.check_user_bookmarked(db, post_id, current_user.id),
     )
@@ -404,6 +603,16 @@ def apply_recruit_post(
             detail="이미 지원한 모집글입니다.",
         )
 
+    notification = None
+    if post.user_id != current_user.id:
+        notification = NotificationEvent(
+            user_id=post.user_id,
+            type="recruit_application",
+            content=f"{current_user.username}님이 모집글에 지원했습니다.",
+            related_post_id=post.id,
+            actor_name=current_user.username,
+        )
+
     try:
         created = crud_recruit_application.create_application(
             db,
@@ -411,6 +620,7 @@ def apply_recruit_post(
             applicant_id=current_user.id,
             message=application.message.strip(),
             link=application.link.strip() if application.link else None,
+            notification=notification,
         )
     except IntegrityError as exc:
         db.rollback()
@@ -419,20 +629,6 @@ def apply_recruit_post(
             detail="이미 지원한 모집글입니다.",
         ) from exc
 
-    if post.user_id != current_user.id:
-        try:
-            crud_notification.create_notification(
-                db,
-                NotificationCreate(
-                    user_id=post.user_id,
-                    type="recruit_application",
-                    content=f"{current_user.username}님이 모집글에 지원했습니다.",
-                    related_post_id=post.id,
-                ),
-            )
-        except Exception:
-            pass
-
     refreshed = crud_recruit_application.get_application(db, created.id)
     return _build_application_response(refreshed)
 
@@ -479,33 +675,29 @@ def update_recruit_application_status(
             detail="지원 내역을 찾을 수 없습니다.",
         )
 
+    notification = None
+    if application.applicant_id != current_user.id:
+        status_label = (
+            "수락"
+            if payload.status == RECRUIT_APPLICATION_STATUS_ACCEPTED
+            else "거절"
+            if payload.status == RECRUIT_APPLICATION_STATUS_REJECTED
+            else payload.status
+        )
+        notification = NotificationEvent(
+            user_id=application.applicant_id,
+            type="recruit_application_status",
+            content=f"모집 지원 결과가 {status_label}되었습니다.",
+            related_post_id=post.id,
+        )
+
     updated = crud_recruit_application.update_application_status(
         db,
         application=application,
         status=payload.status,
+        notification=notification,
     )
 
-    if updated.applicant_id != current_user.id:
-        try:
-            status_label = (
-                "수락"
-                if payload.status == RECRUIT_APPLICATION_STATUS_ACCEPTED
-                else "거절"
-                if payload.status == RECRUIT_APPLICATION_STATUS_REJECTED
-                else payload.status
-            )
-            crud_notification.create_notification(
-                db,
-                NotificationCreate(
-                    user_id=updated.applicant_id,
-                    type="recruit_application_status",
-                    content=f"모집 지원 결과가 {status_label}되었습니다.",
-                    related_post_id=post.id,
-                ),
-            )
-        except Exception:
-            pass
-
     refreshed = crud_recruit_application.get_application(db, updated.id)
     return _build_application_response(refreshed)
 
@@ -529,5 +721,8 @@ def delete_post(
             detail="Not enough permissions",
         )
 
+    category_id = db_post.category_id
     crud_post.delete_post(db, post_id)
+    hot_score_board.untrack_post(post_id)
+    response_cache.invalidate(post_tag(post_id), TAG_BOARD, TAG_CATEGORIES, category_tag(category_id))
     return None
@@ -7,8 +7,25 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
     DATABASE_URL: str
+    # Async driver URL for get_async_db; derived from DATABASE_URL (asyncpg / aiosqlite) when unset
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Optional read replica for GET routes (get_read_db / get_async_read_db); primary when unset
+    DATABASE_READ_REPLICA_URL: Optional[str] = None
     REDIS_URL: str
 
+    # Connection pool, per engine and per worker (PostgreSQL only)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # 0 disables; applied to every transaction with SET LOCAL, so one can override it
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    # Override for long admin exports (0 = no limit)
+    DB_EXPORT_STATEMENT_TIMEOUT_MS: int = 300000
+    # pgbouncer pool_mode=transaction: no server-side prepared statements or session SETs
+    DB_PGBOUNCER_TRANSACTION_MODE: bool = False
+
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
@@ -31,7 +48,86 @@ class Settings(BaseSettings):
     # Monitoring
     REQUEST_LOG_ENABLED: bool = True
     SLOW_REQUEST_THRESHOLD_MS: int = 500
+    # X-DB-Statements / X-DB-Time-Ms / X-DB-Slowest-Ms / X-DB-Pool-Wait-Ms response headers (debugging only)
+    REQUEST_DB_DEBUG_HEADERS: bool = False
     API_DOCS_ENABLED: bool = True
+    # Prometheus exposition at /metrics (set PROMETHEUS_MULTIPROC_DIR when running several workers)
+    METRICS_ENABLED: bool = True
+
+    # Buffered view counter ("memory" per worker, or "redis" shared via REDIS_URL)
+    VIEW_COUNT_BACKEND: str = "memory"
+    VIEW_COUNT_FLUSH_INTERVAL_SECONDS: int = 10
+    VIEW_COUNT_DEDUPE_WINDOW_SECONDS: int = 1800
+    VIEW_COUNT_DEDUPE_MAX_ITEMS: int = 100_000
+
+    # Hot-post leaderboard ("redis" sorted sets shared via REDIS_URL; "memory" only sees
+    # this worker's likes/comments/views, so it needs a single worker to rank consistently)
+    HOT_SCORE_BACKEND: str = "redis"
+    HOT_SCORE_REBUILD_INTERVAL_SECONDS: int = 300
+    HOT_SCORE_DECAY_HALF_LIFE_HOURS: float = 0.0
+
+    # Full-text search ("auto" = tsvector + pg_trgm on PostgreSQL, ILIKE elsewhere; or "postgres"/"basic")
+    SEARCH_BACKEND: str = "auto"
+
+    # Shared response cache for public list endpoints ("redis" L1 + shared L2 and shared
+    # invalidations; "memory" is L1 only and needs a single worker to stay consistent)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_BACKEND: str = "redis"
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_L1_MAX_ITEMS: int = 2000
+    RESPONSE_CACHE_LOCK_TIMEOUT_SECONDS: float = 2.0
+
+    # Cached token -> user resolution for get_current_user ("memory" per worker, or "redis" shared L2).
+    # Other workers see an invalidation only once their L1 entry expires, with either backend.
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_BACKEND: str = "memory"
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_L1_TTL_SECONDS: int = 5
+    PRINCIPAL_CACHE_MAX_ITEMS: int = 10_000
+    TOKEN_CACHE_MAX_ITEMS: int = 10_000
+
+    # Cached follow/block adjacency and follower counts ("memory" per worker, or "redis" shared L2).
+    # As above, the L1 TTL bounds how long other workers can serve a graph after a change.
+    FOLLOW_GRAPH_CACHE_ENABLED: bool = True
+    FOLLOW_GRAPH_CACHE_BACKEND: str = "memory"
+    FOLLOW_GRAPH_CACHE_TTL_SECONDS: int = 300
+    FOLLOW_GRAPH_CACHE_L1_TTL_SECONDS: int = 10
+    FOLLOW_GRAPH_CACHE_MAX_ITEMS: int = 10_000
+
+    # Notification push (SSE/WebSocket); "redis" fans out across workers via pub/sub.
+    # "memory" only reaches streams on the publishing worker: single-worker dev setups only
+    NOTIFICATION_PUSH_BACKEND: str = "redis"
+    NOTIFICATION_PUSH_QUEUE_SIZE: int = 100
+    NOTIFICATION_PUSH_HEARTBEAT_SECONDS: float = 25.0
+    NOTIFICATION_PUSH_MAX_CONNECTIONS: int = 20_000
+    # Lifetime of the single-use ticket a browser trades for one stream connection
+    NOTIFICATION_STREAM_TICKET_TTL_SECONDS: int = 30
+
+    # Materialized per-user notification counters; drift repair period (0 disables)
+    NOTIFICATION_COUNTER_RECONCILE_INTERVAL_SECONDS: int = 900
+
+    # Notification outbox: like/comment/application events are dispatched by a background worker
+    NOTIFICATION_OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    NOTIFICATION_OUTBOX_BATCH_SIZE: int = 500
+    NOTIFICATION_OUTBOX_COALESCE_WINDOW_SECONDS: float = 3.0
+    NOTIFICATION_OUTBOX_MAX_ATTEMPTS: int = 8
+    NOTIFICATION_OUTBOX_RETRY_BASE_SECONDS: float = 2.0
+
+    # Notification retention: read ones older than N days, and anything past a user's newest
+    # N items, move to notifications_archive (0 disables either limit)
+    NOTIFICATION_RETENTION_DAYS: int = 90
+    NOTIFICATION_INBOX_MAX_ITEMS: int = 1000
+    NOTIFICATION_ARCHIVE_INTERVAL_SECONDS: int = 3600
+    NOTIFICATION_ARCHIVE_BATCH_SIZE: int = 5000
+
+    # Following timeline: posts are fanned out to followers' timeline_entries on write,
+    # except for authors past the follower limit (merged at read time). Timelines are
+    # trimmed to their newest N entries (0 disables trimming)
+    TIMELINE_FANOUT_MAX_FOLLOWERS: int = 5000
+    TIMELINE_BACKFILL_POSTS: int = 50
+    TIMELINE_MAX_ENTRIES: int = 800
+    TIMELINE_TRIM_INTERVAL_SECONDS: int = 3600
+    TIMELINE_TRIM_BATCH_SIZE: int = 5000
 
     # OAuth (optional)
     GOOGLE_OAUTH_CLIENT_ID: Optional[str] = None
@@ -81,12 +177,48 @@ class Settings(BaseSettings):
     AI_ROUTE_MAX_TOKENS: int = 120
     AI_CHAT_MAX_TOKENS: int = 600
     AI_EDITOR_MAX_TOKENS: int = 900
+    # Pooled upstream client: keep-alive connections shared by all AI calls in a worker
+    AI_HTTP2_ENABLED: bool = True
+    AI_HTTP_MAX_CONNECTIONS: int = 50
+    AI_HTTP_KEEPALIVE_SECONDS: int = 60
+    # Concurrent upstream calls per model, per worker; callers queue up to the timeout, then fall back
+    AI_MODEL_MAX_CONCURRENCY: int = 8
+    AI_MODEL_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    # Identical concurrent AI requests share one upstream call ("redis" coalesces across workers);
+    # followers waiting longer than the timeout make their own call
+    AI_SINGLE_FLIGHT_ENABLED: bool = True
+    AI_SINGLE_FLIGHT_BACKEND: str = "memory"
+    AI_SINGLE_FLIGHT_TIMEOUT_SECONDS: float = 60.0
+    # AI request limits per window and identity: anonymous (per IP), signed-in users
+    # (AI_RATE_LIMIT_MAX_REQUESTS) and admins. "redis" shares the buckets and budgets across
+    # workers; "memory" is per worker, so N workers allow N times the limits: dev only
+    AI_RATE_LIMIT_BACKEND: str = "redis"
     AI_RATE_LIMIT_WINDOW_SECONDS: int = 60
+    AI_RATE_LIMIT_ANON_MAX_REQUESTS: int = 10
     AI_RATE_LIMIT_MAX_REQUESTS: int = 20
+    AI_RATE_LIMIT_ADMIN_MAX_REQUESTS: int = 120
+    # Daily (UTC) model spend caps from the logged cost_usd; 0 disables. Admins skip the per-user cap
+    AI_DAILY_BUDGET_USD: float = 0.0
+    AI_DAILY_USER_BUDGET_USD: float = 0.0
+    # AI response cache: per-worker L1 ("memory"), plus a shared Redis L2 with "redis".
+    # TTLs are per intent; failed model calls are cached briefly (negative TTL)
+    AI_CACHE_BACKEND: str = "memory"
     AI_CACHE_TTL_SECONDS: int = 180
+    AI_CACHE_DEV_QNA_TTL_SECONDS: int = 900
+    AI_CACHE_SITE_HELP_TTL_SECONDS: int = 3600
+    AI_CACHE_EDITOR_TTL_SECONDS: int = 600
+    AI_CACHE_OUT_OF_SCOPE_TTL_SECONDS: int = 3600
+    AI_CACHE_NEGATIVE_TTL_SECONDS: int = 20
     AI_CACHE_MAX_ITEMS: int = 500
+    AI_CACHE_MAX_BYTES: int = 8_000_000
+    AI_CACHE_MAX_ENTRY_BYTES: int = 256_000
     AI_INPUT_COST_PER_1K_USD: float = 0.0
     AI_OUTPUT_COST_PER_1K_USD: float = 0.0
+    # AI action logs are buffered per worker and written in batches: every N rows or M ms,
+    # whichever comes first. Rows past the buffer cap are dropped (and counted)
+    AI_LOG_BATCH_SIZE: int = 200
+    AI_LOG_FLUSH_INTERVAL_MS: int = 1000
+    AI_LOG_MAX_BUFFER: int = 10_000
 
 
 settings = Settings()
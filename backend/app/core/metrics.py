@@ -0,0 +1,139 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.requests import Request
+
+from app.db.query_stats import QueryStats
+
+# With several uvicorn workers, point this at an empty per-container directory
+# (wiped on start) so each worker writes its samples there and /metrics sums them.
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DB_STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233)
+DB_SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status",
+    ["method", "route", "status"],
+    buckets=REQUEST_SECONDS_BUCKETS,
+)
+
+REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "SQL statements executed per request",
+    ["method", "route"],
+    buckets=DB_STATEMENT_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Total SQL execution time per request",
+    ["method", "route"],
+    buckets=DB_SECONDS_BUCKETS,
+)
+REQUEST_DB_SLOWEST_SECONDS = Histogram(
+    "http_request_db_slowest_statement_seconds",
+    "Slowest single SQL statement per request",
+    ["method", "route"],
+    buckets=DB_SECONDS_BUCKETS,
+)
+REQUEST_DB_POOL_WAIT_SECONDS = Histogram(
+    "http_request_db_pool_wait_seconds",
+    "Time spent waiting for pooled connections per request",
+    ["method", "route"],
+    buckets=DB_SECONDS_BUCKETS,
+)
+
+AI_CACHE_LOOKUPS = Counter(
+    "ai_cache_lookups_total",
+    "AI response cache lookups by endpoint; result is hit_l1, hit_l2, negative_hit or miss",
+    ["endpoint", "result"],
+)
+AI_RATE_LIMITED = Counter(
+    "ai_rate_limited_total",
+    "AI requests rejected by the rate limiter; reason is rate or budget",
+    ["endpoint", "reason"],
+)
+AI_COALESCED_REQUESTS = Counter(
+    "ai_coalesced_requests_total",
+    "AI requests answered by an identical in-flight call (scope: local worker or remote via redis)",
+    ["endpoint", "scope"],
+)
+AI_COALESCED_TOKENS_SAVED = Counter(
+    "ai_coalesced_tokens_saved_total",
+    "Model tokens not spent because identical requests shared one upstream call",
+    ["endpoint"],
+)
+AI_MODEL_CALL_SECONDS = Histogram(
+    "ai_model_call_duration_seconds",
+    "Upstream chat completion latency, including time queued for a model slot",
+    ["model", "status"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 45.0, 90.0),
+)
+MCP_PLAYGROUND_CONNECTIONS = Gauge(
+    "mcp_playground_connections",
+    "Live MCP server subprocess connections held by the playground",
+    multiprocess_mode="livesum",
+)
+GITHUB_SYNC_SECONDS = Histogram(
+    "github_sync_duration_seconds",
+    "Duration of a full GitHub stars/README sync",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200),
+)
+OG_IMAGE_RENDER_SECONDS = Histogram(
+    "og_image_render_seconds",
+    "Open Graph image render time",
+    ["kind"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+def route_template(request: Request) -> str:
+    """The matched route's path template (`/api/v1/posts/{post_id}`), never the raw path."""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def observe_query_stats(method: str, route: str, stats: QueryStats) -> None:
+    REQUEST_DB_STATEMENTS.labels(method, route).observe(stats.statements)
+    REQUEST_DB_SECONDS.labels(method, route).observe(stats.db_time_ms / 1000)
+    REQUEST_DB_SLOWEST_SECONDS.labels(method, route).observe(stats.slowest_ms / 1000)
+    REQUEST_DB_POOL_WAIT_SECONDS.labels(method, route).observe(stats.pool_wait_ms / 1000)
+
+
+def observe_request(method: str, route: str, status_code: int, duration_seconds: float) -> None:
+    status = str(status_code)
+    HTTP_REQUESTS.labels(method, route, status).inc()
+    HTTP_REQUEST_SECONDS.labels(method, route, status).observe(duration_seconds)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Exposition for /metrics: this process's registry, or every worker's in multiprocess mode."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the shared directory on shutdown."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(os.getpid())
@@ -1,46 +1,123 @@
-from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, insert
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from app.models.ai_action_log import AiActionLog
+from app.models.ai_usage_rollup import AiUsageRollup
+
+# Upper bounds of the rollup latency buckets; slower calls land in the last one.
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2000, 4000, 8000, 15000, 30000, 60000, 120000)
+
+ROLLUP_KEY_COLUMNS = ["bucket_start", "model", "intent", "latency_le_ms"]
+ROLLUP_SUM_COLUMNS = [
+    "requests",
+    "failures",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "cost_usd",
+    "latency_ms_sum",
+]
+
+
+def latency_bucket(latency_ms: float | None) -> int:
+    latency = latency_ms or 0.0
+    for upper_bound in LATENCY_BUCKETS_MS:
+        if latency <= upper_bound:
+            return upper_bound
+    return LATENCY_BUCKETS_MS[-1]
+
+
+def insert_ai_action_logs(db: Session, rows: list[dict]) -> None:
+    """One executemany INSERT for a batch of log rows. Does not commit."""
+    if rows:
+        db.execute(insert(AiActionLog.__table__), rows)
+
+
+def upsert_ai_usage_rollups(db: Session, rollups: list[dict]) -> None:
+    """Add pre-aggregated deltas onto the hourly rollup rows. Does not commit."""
+    if not rollups:
+        return
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(AiUsageRollup)
+    statement = statement.on_conflict_do_update(
+        index_elements=ROLLUP_KEY_COLUMNS,
+        set_={
+            column: getattr(AiUsageRollup, column) + getattr(statement.excluded, column)
+            for column in ROLLUP_SUM_COLUMNS
+        },
+    )
+    db.execute(statement, rollups)
 
 
-def create_ai_action_log(
-    db: Session,
-    *,
-    user_id: int | None,
-    endpoint: str,
-    source: str,
-    intent: str | None,
-    action: str | None,
-    input_hash: str | None,
-    status: str,
-    model: str | None = None,
-    latency_ms: float | None = None,
-    prompt_tokens: int | None = None,
-    completion_tokens: int | None = None,
-    total_tokens: int | None = None,
-    cost_usd: float | None = None,
-    error_message: str | None = None,
-) -> None:
-    try:
-        db.add(
-            AiActionLog(
-                user_id=user_id,
-                endpoint=endpoint,
-                source=source,
-                intent=intent,
-                action=action,
-                input_hash=input_hash,
-                status=status,
-                model=model,
-                latency_ms=latency_ms,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=total_tokens,
-                cost_usd=cost_usd,
-                error_message=error_message,
-            )
+def _percentile(buckets: list[tuple[int, int]], quantile: float) -> float | None:
+    """Interpolated percentile from (upper bound ms, count) pairs sorted by bound."""
+    total = sum(count for _bound, count in buckets)
+    if total == 0:
+        return None
+    rank = quantile * total
+    lower_bound, seen = 0, 0
+    for upper_bound, count in buckets:
+        if count and seen + count >= rank:
+            return round(lower_bound + (upper_bound - lower_bound) * (rank - seen) / count, 1)
+        lower_bound, seen = upper_bound, seen + count
+    return float(buckets[-1][0])
+
+
+def get_usage_summary(db: Session, hours: int = 24) -> dict:
+    """Tokens, cost and latency percentiles per (model, intent), read from the rollups."""
+    now_utc = datetime.now(timezone.utc)
+    from_date = (now_utc - timedelta(hours=hours)).replace(minute=0, second=0, microsecond=0)
+
+    rows = (
+        db.query(
+            AiUsageRollup.model,
+            AiUsageRollup.intent,
+            AiUsageRollup.latency_le_ms,
+            *[func.sum(getattr(AiUsageRollup, column)) for column in ROLLUP_SUM_COLUMNS],
+        )
+        .filter(AiUsageRollup.bucket_start >= from_date)
+        .group_by(AiUsageRollup.model, AiUsageRollup.intent, AiUsageRollup.latency_le_ms)
+        .all()
+    )
+
+    groups: dict[tuple[str, str], dict] = {}
+    for model, intent, latency_le_ms, *sums in rows:
+        group = groups.setdefault(
+            (model, intent), {**{column: 0 for column in ROLLUP_SUM_COLUMNS}, "buckets": []}
+        )
+        for column, value in zip(ROLLUP_SUM_COLUMNS, sums):
+            group[column] += value or 0
+        group["buckets"].append((int(latency_le_ms), int(sums[0] or 0)))
+
+    items = []
+    for (model, intent), group in groups.items():
+        buckets = sorted(group["buckets"])
+        requests = int(group["requests"])
+        items.append(
+            {
+                "model": model,
+                "intent": intent or None,
+                "requests": requests,
+                "failures": int(group["failures"]),
+                "prompt_tokens": int(group["prompt_tokens"]),
+                "completion_tokens": int(group["completion_tokens"]),
+                "total_tokens": int(group["total_tokens"]),
+                "cost_usd": round(float(group["cost_usd"]), 6),
+                "avg_latency_ms": round(group["latency_ms_sum"] / requests, 1) if requests else None,
+                "p50_latency_ms": _percentile(buckets, 0.5),
+                "p95_latency_ms": _percentile(buckets, 0.95),
+            }
         )
-        db.commit()
-    except SQLAlchemyError:
-        db.rollback()
+    items.sort(key=lambda item: (-item["cost_usd"], -item["requests"], item["model"], item["intent"] or ""))
+
+    return {
+        "from_date": from_date,
+        "to_date": now_utc,
+        "total_requests": sum(item["requests"] for item in items),
+        "total_tokens": sum(item["total_tokens"] for item in items),
+        "total_cost_usd": round(sum(item["cost_usd"] for item in items), 6),
+        "items": items,
+    }
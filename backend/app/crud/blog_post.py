@@ -8,6 +8,12 @@ from sqlalchemy.orm import Session
 
 from app.models.blog_post import BlogPost
 from app.schemas.blog_post import BlogPostCreate, BlogPostUpdate
+from app.services.search import SearchSpec, apply_search, search_rank
+
+BLOG_SEARCH = SearchSpec(
+    table="blog_posts",
+    fields=((BlogPost.title, "A"), (BlogPost.summary, "B"), (BlogPost.content, "C")),
+)
 
 
 def _generate_slug(title: str) -> str:
@@ -58,17 +64,18 @@ def get_blog_posts(
     elif published_only:
         query = query.filter(BlogPost.is_published == True)
 
-    if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            (BlogPost.title.ilike(search_filter)) | (BlogPost.summary.ilike(search_filter))
-        )
+    query = apply_search(db, query, BLOG_SEARCH, search)
 
     if tag:
         query = query.filter(BlogPost.tags.ilike(f"%{tag}%"))
 
     total = query.count()
 
+    # Search results are ranked by relevance first, newest first otherwise.
+    rank = search_rank(db, BLOG_SEARCH, search)
+    if rank is not None:
+        query = query.order_by(rank.desc())
+
     posts = (
         query.order_by(BlogPost.created_at.desc())
         .offset((page - 1) * page_size)
@@ -133,10 +140,3 @@ def delete_blog_post(db: Session, post_id: int) -> bool:
     db.delete(db_post)
     db.commit()
     return True
-
-
-def increment_views(db: Session, post_id: int) -> None:
-    db.query(BlogPost).filter(BlogPost.id == post_id).update(
-        {BlogPost.views: BlogPost.views + 1}
-    )
-    db.commit()
@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from app.crud.post import adjust_engagement_counter
 from app.models.bookmark import Bookmark
 from app.models.post import Post
 from sqlalchemy.orm import joinedload
@@ -8,6 +9,8 @@ def create_bookmark(db: Session, post_id: int, user_id: int):
     """Create a bookmark for a post by a user"""
     db_bookmark = Bookmark(post_id=post_id, user_id=user_id)
     db.add(db_bookmark)
+    db.flush()
+    adjust_engagement_counter(db, post_id, "bookmark_count", 1)
     db.commit()
     db.refresh(db_bookmark)
     return db_bookmark
@@ -15,16 +18,18 @@ def create_bookmark(db: Session, post_id: int, user_id: int):
 
 def delete_bookmark(db: Session, post_id: int, user_id: int):
     """Delete a bookmark (remove bookmark from a post)"""
-    db_bookmark = db.query(Bookmark).filter(
+    # Only the request whose DELETE removed the row may decrement the counter.
+    deleted = db.query(Bookmark).filter(
         Bookmark.post_id == post_id,
         Bookmark.user_id == user_id
-    ).first()
+    ).delete(synchronize_session=False)
 
-    if db_bookmark:
-        db.delete(db_bookmark)
-        db.commit()
-        return True
-    return False
+    if not deleted:
+        db.rollback()
+        return False
+    adjust_engagement_counter(db, post_id, "bookmark_count", -1)
+    db.commit()
+    return True
 
 
 def get_bookmark(db: Session, post_id: int, user_id: int):
@@ -1,30 +1,140 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+import base64
+import json
+from datetime import datetime
+from typing import Collection, Iterator, List, Optional
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, asc, desc, or_, select
+from app.crud.notification import discard_related_notifications, enqueue_notification
+from app.crud.post import adjust_engagement_counter, exclude_authors
 from app.models.comment import Comment
+from app.models.user import User
 from app.schemas.comment import CommentCreate
+from app.schemas.notification import NotificationEvent
+
+COMMENT_CURSOR_VERSION = 1
+# Author columns a comment listing renders; the rest of `users` is never loaded.
+COMMENT_AUTHOR_COLUMNS = (User.id, User.username, User.profile_image_url)
 
 
 def get_comment(db: Session, comment_id: int) -> Optional[Comment]:
     return db.query(Comment).filter(Comment.id == comment_id).first()
 
 
-def get_comments_by_post(db: Session, post_id: int) -> List[Comment]:
-    return (
+def _listing_query(db: Session, post_id: int, exclude_author_ids: Optional[Collection[int]]):
+    """Comments of a post with their authors batch-loaded in one extra SELECT."""
+    query = (
         db.query(Comment)
         .filter(Comment.post_id == post_id)
-        .order_by(desc(Comment.created_at))
+        .options(selectinload(Comment.author).load_only(*COMMENT_AUTHOR_COLUMNS))
+    )
+    return exclude_authors(query, Comment.user_id, exclude_author_ids)
+
+
+def get_comments_by_post(
+    db: Session,
+    post_id: int,
+    exclude_author_ids: Optional[Collection[int]] = None,
+    limit: Optional[int] = None,
+) -> List[Comment]:
+    return (
+        _listing_query(db, post_id, exclude_author_ids)
+        .order_by(desc(Comment.created_at), desc(Comment.id))
+        .limit(limit)
         .all()
     )
 
 
-def create_comment(db: Session, comment: CommentCreate, user_id: int) -> Comment:
+def encode_comment_cursor(comment: Comment) -> str:
+    """Opaque, URL-safe cursor pointing just past `comment` in the latest-first order."""
+    payload = {"v": COMMENT_CURSOR_VERSION, "k": [comment.created_at.isoformat(), comment.id]}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_comment_cursor(cursor: str) -> tuple[datetime, int]:
+    """Parse a cursor produced by `encode_comment_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        created_at, comment_id = payload["k"]
+        if payload.get("v") != COMMENT_CURSOR_VERSION or not isinstance(comment_id, int):
+            raise ValueError("Invalid cursor")
+        return datetime.fromisoformat(created_at), comment_id
+    except (ValueError, UnicodeError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def get_comments_by_post_cursor(
+    db: Session,
+    post_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    exclude_author_ids: Optional[Collection[int]] = None,
+) -> tuple[List[Comment], Optional[str]]:
+    """
+    Keyset variant of `get_comments_by_post`: one page, seeking past the row encoded
+    in `cursor` on the (post_id, created_at, id) index.
+    Returns (comments, next_cursor). Raises ValueError for a malformed cursor.
+    """
+    query = _listing_query(db, post_id, exclude_author_ids)
+    if cursor:
+        created_at, comment_id = decode_comment_cursor(cursor)
+        query = query.filter(
+            or_(
+                Comment.created_at < created_at,
+                and_(Comment.created_at == created_at, Comment.id < comment_id),
+            )
+        )
+    comments = query.order_by(desc(Comment.created_at), desc(Comment.id)).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(comments) > limit:
+        comments = comments[:limit]
+        next_cursor = encode_comment_cursor(comments[-1])
+    return comments, next_cursor
+
+
+def iter_comment_rows(db: Session, post_id: int, batch_size: int = 1000) -> Iterator:
+    """
+    Every comment of a post, oldest first, as flat rows (comment columns plus the
+    author's username and image) streamed from a server-side cursor in `batch_size`
+    chunks, for full-thread exports that must not build the thread in memory.
+    """
+    statement = (
+        select(
+            Comment.id,
+            Comment.content,
+            Comment.post_id,
+            Comment.user_id,
+            Comment.created_at,
+            User.username.label("author_username"),
+            User.profile_image_url.label("author_profile_image_url"),
+        )
+        .outerjoin(User, User.id == Comment.user_id)
+        .where(Comment.post_id == post_id)
+        .order_by(asc(Comment.created_at), asc(Comment.id))
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in db.execute(statement).partitions():
+        yield from partition
+
+
+def create_comment(
+    db: Session,
+    comment: CommentCreate,
+    user_id: int,
+    notification: Optional[NotificationEvent] = None,
+) -> Comment:
     db_comment = Comment(
         content=comment.content,
         post_id=comment.post_id,
         user_id=user_id,
     )
     db.add(db_comment)
+    db.flush()
+    adjust_engagement_counter(db, comment.post_id, "comment_count", 1)
+    if notification is not None:
+        enqueue_notification(db, notification.model_copy(update={"related_comment_id": db_comment.id}))
     db.commit()
     db.refresh(db_comment)
     return db_comment
@@ -34,6 +144,12 @@ def delete_comment(db: Session, comment_id: int) -> bool:
     db_comment = get_comment(db, comment_id)
     if not db_comment:
         return False
-    db.delete(db_comment)
+    post_id = db_comment.post_id
+    discard_related_notifications(db, comment_ids=[comment_id])
+    # A concurrent delete of the same comment finds no row left and must not decrement.
+    if not db.query(Comment).filter(Comment.id == comment_id).delete(synchronize_session=False):
+        db.rollback()
+        return False
+    adjust_engagement_counter(db, post_id, "comment_count", -1)
     db.commit()
     return True
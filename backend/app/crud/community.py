@@ -1,11 +1,11 @@
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Collection, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, case
 
+from app.crud.post import exclude_authors, with_listing_relations
 from app.models.post import Post
 from app.models.comment import Comment
-from app.models.like import Like
 from app.models.user import User
 
 
@@ -41,7 +41,7 @@ def get_community_stats(db: Session) -> dict:
 def get_pinned_posts(db: Session, limit: int = 3) -> List[Post]:
     """is_pinned=True, pinned_order ASC NULLS LAST, created_at DESC"""
     return (
-        db.query(Post)
+        with_listing_relations(db.query(Post))
         .filter(Post.is_pinned == True)
         .order_by(
             case(
@@ -73,53 +73,34 @@ def get_hot_posts(
     window: str = "24h",
     limit: int = 6,
     category_id: Optional[int] = None,
+    exclude_author_ids: Optional[Collection[int]] = None,
 ) -> List[dict]:
     """
     score = likes_count*3 + comment_count*2 + views*0.2
     window 기간 내 글만 대상, score DESC 정렬
+    exclude_author_ids 작성자의 글은 제외 (차단 목록)
     """
     window_start = _get_window_start(window)
 
-    likes_sub = (
-        db.query(
-            Like.post_id,
-            func.count(Like.id).label("likes_count"),
-        )
-        .group_by(Like.post_id)
-        .subquery()
-    )
-
-    comments_sub = (
-        db.query(
-            Comment.post_id,
-            func.count(Comment.id).label("comment_count"),
-        )
-        .group_by(Comment.post_id)
-        .subquery()
-    )
-
-    likes_col = func.coalesce(likes_sub.c.likes_count, 0)
-    comments_col = func.coalesce(comments_sub.c.comment_count, 0)
     score_expr = (
-        likes_col * 3 + comments_col * 2 + Post.views * 0.2
+        Post.likes_count * 3 + Post.comment_count * 2 + Post.views * 0.2
     ).label("score")
 
     query = (
         db.query(
             Post,
-            likes_col.label("likes_count"),
-            comments_col.label("comment_count"),
+            Post.likes_count,
+            Post.comment_count,
             score_expr,
         )
-        .outerjoin(likes_sub, Post.id == likes_sub.c.post_id)
-        .outerjoin(comments_sub, Post.id == comments_sub.c.post_id)
         .filter(Post.created_at >= window_start)
     )
 
     if category_id:
         query = query.filter(Post.category_id == category_id)
+    query = exclude_authors(query, Post.user_id, exclude_author_ids)
 
-    results = query.order_by(desc("score")).limit(limit).all()
+    results = with_listing_relations(query).order_by(desc("score")).limit(limit).all()
 
     return [
         {
@@ -130,3 +111,29 @@ def get_hot_posts(
         }
         for row in results
     ]
+
+
+def get_ranked_posts(
+    db: Session,
+    ranked: List[tuple[int, float]],
+    exclude_author_ids: Optional[Collection[int]] = None,
+) -> List[dict]:
+    """
+    (post_id, score) 순위 목록을 받아 get_hot_posts 와 같은 형태로 반환.
+    이미 삭제된 글과 exclude_author_ids 작성자의 글은 건너뛰고 순위 순서는 유지한다.
+    """
+    if not ranked:
+        return []
+    query = with_listing_relations(db.query(Post)).filter(Post.id.in_([post_id for post_id, _ in ranked]))
+    posts = exclude_authors(query, Post.user_id, exclude_author_ids).all()
+    posts_by_id = {post.id: post for post in posts}
+    return [
+        {
+            "post": posts_by_id[post_id],
+            "likes_count": posts_by_id[post_id].likes_count or 0,
+            "comment_count": posts_by_id[post_id].comment_count or 0,
+            "score": float(score),
+        }
+        for post_id, score in ranked
+        if post_id in posts_by_id
+    ]
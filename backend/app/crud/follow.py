@@ -1,11 +1,54 @@
-from typing import List, Tuple
+from typing import Iterable, List, Set, Tuple
 
-from sqlalchemy import and_, desc, or_
+from sqlalchemy import and_, desc, func, or_
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.crud.timeline import backfill_timeline, remove_author_from_timeline
 from app.models.user_block import UserBlock
 from app.models.user import User
 from app.models.user_follow import UserFollow
+from app.services.follow_graph import FollowGraph, follow_graph_cache
+
+
+def _load_follow_graph(db: Session, user_id: int) -> FollowGraph:
+    following = db.query(UserFollow.following_id).filter(UserFollow.follower_id == user_id)
+    blocked = (
+        db.query(UserBlock.blocked_id)
+        .filter(UserBlock.blocker_id == user_id)
+        .union(db.query(UserBlock.blocker_id).filter(UserBlock.blocked_id == user_id))
+    )
+    followers_count = (
+        db.query(func.count(UserFollow.id))
+        .filter(UserFollow.following_id == user_id)
+        .scalar()
+    )
+    return FollowGraph(
+        following=frozenset(following_id for (following_id,) in following),
+        blocked=frozenset(blocked_id for (blocked_id,) in blocked),
+        followers_count=int(followers_count or 0),
+    )
+
+
+def get_follow_graph(db: Session, user_id: int) -> FollowGraph:
+    """The user's followings, block relations and follower count, via follow_graph_cache."""
+    return follow_graph_cache.get(user_id, lambda uid: _load_follow_graph(db, uid))
+
+
+def get_follow_counts(db: Session, user_id: int) -> Tuple[int, int]:
+    """(followers, following) for a user."""
+    graph = get_follow_graph(db, user_id)
+    return graph.followers_count, graph.following_count
+
+
+def get_blocked_user_ids(db: Session, user_id: int) -> frozenset:
+    """Users hidden from this user's listings: everyone they blocked or who blocked them."""
+    return get_follow_graph(db, user_id).blocked
+
+
+def get_following_among(db: Session, follower_id: int, user_ids: Iterable[int]) -> Set[int]:
+    """Which of `user_ids` the follower follows, for rendering lists in one lookup."""
+    return get_follow_graph(db, follower_id).following.intersection(user_ids)
 
 
 def get_follow(db: Session, follower_id: int, following_id: int) -> UserFollow | None:
@@ -22,7 +65,10 @@ def get_follow(db: Session, follower_id: int, following_id: int) -> UserFollow |
 def create_follow(db: Session, follower_id: int, following_id: int) -> UserFollow:
     db_follow = UserFollow(follower_id=follower_id, following_id=following_id)
     db.add(db_follow)
+    db.flush()
+    backfill_timeline(db, follower_id, following_id, settings.TIMELINE_BACKFILL_POSTS)
     db.commit()
+    follow_graph_cache.invalidate(follower_id, following_id)
     db.refresh(db_follow)
     return db_follow
 
@@ -33,21 +79,18 @@ def delete_follow(db: Session, follower_id: int, following_id: int) -> bool:
         return False
 
     db.delete(db_follow)
+    remove_author_from_timeline(db, follower_id, following_id)
     db.commit()
+    follow_graph_cache.invalidate(follower_id, following_id)
     return True
 
 
 def is_following(db: Session, follower_id: int, following_id: int) -> bool:
-    return get_follow(db, follower_id=follower_id, following_id=following_id) is not None
+    return following_id in get_follow_graph(db, follower_id).following
 
 
 def get_following_user_ids(db: Session, follower_id: int) -> List[int]:
-    rows = (
-        db.query(UserFollow.following_id)
-        .filter(UserFollow.follower_id == follower_id)
-        .all()
-    )
-    return [following_id for (following_id,) in rows]
+    return sorted(get_follow_graph(db, follower_id).following)
 
 
 def remove_follower(db: Session, user_id: int, follower_id: int) -> bool:
@@ -55,7 +98,9 @@ def remove_follower(db: Session, user_id: int, follower_id: int) -> bool:
     if not db_follow:
         return False
     db.delete(db_follow)
+    remove_author_from_timeline(db, follower_id, user_id)
     db.commit()
+    follow_graph_cache.invalidate(user_id, follower_id)
     return True
 
 
@@ -76,7 +121,10 @@ def delete_follow_pair(db: Session, user_a_id: int, user_b_id: int) -> int:
         )
         .delete(synchronize_session=False)
     )
+    remove_author_from_timeline(db, user_a_id, user_b_id)
+    remove_author_from_timeline(db, user_b_id, user_a_id)
     db.commit()
+    follow_graph_cache.invalidate(user_a_id, user_b_id)
     return int(deleted_count or 0)
 
 
@@ -92,23 +140,7 @@ def get_block(db: Session, blocker_id: int, blocked_id: int) -> UserBlock | None
 
 
 def is_blocked_between(db: Session, user_a_id: int, user_b_id: int) -> bool:
-    return (
-        db.query(UserBlock)
-        .filter(
-            or_(
-                and_(
-                    UserBlock.blocker_id == user_a_id,
-                    UserBlock.blocked_id == user_b_id,
-                ),
-                and_(
-                    UserBlock.blocker_id == user_b_id,
-                    UserBlock.blocked_id == user_a_id,
-                ),
-            )
-        )
-        .first()
-        is not None
-    )
+    return user_b_id in get_follow_graph(db, user_a_id).blocked
 
 
 def create_block(db: Session, blocker_id: int, blocked_id: int) -> UserBlock:
@@ -129,9 +161,12 @@ def create_block(db: Session, blocker_id: int, blocked_id: int) -> UserBlock:
         )
         .delete(synchronize_session=False)
     )
+    remove_author_from_timeline(db, blocker_id, blocked_id)
+    remove_author_from_timeline(db, blocked_id, blocker_id)
     db_block = UserBlock(blocker_id=blocker_id, blocked_id=blocked_id)
     db.add(db_block)
     db.commit()
+    follow_graph_cache.invalidate(blocker_id, blocked_id)
     db.refresh(db_block)
     return db_block
 
@@ -142,6 +177,7 @@ def delete_block(db: Session, blocker_id: int, blocked_id: int) -> bool:
         return False
     db.delete(db_block)
     db.commit()
+    follow_graph_cache.invalidate(blocker_id, blocked_id)
     return True
 
 
@@ -178,7 +214,7 @@ def get_followers(
         .join(UserFollow, UserFollow.follower_id == User.id)
         .filter(UserFollow.following_id == user_id)
     )
-    total = query.count()
+    total = get_follow_graph(db, user_id).followers_count
     rows = (
         query
         .order_by(desc(UserFollow.created_at))
@@ -200,7 +236,7 @@ def get_followings(
         .join(UserFollow, UserFollow.following_id == User.id)
         .filter(UserFollow.follower_id == user_id)
     )
-    total = query.count()
+    total = get_follow_graph(db, user_id).following_count
     rows = (
         query
         .order_by(desc(UserFollow.created_at))
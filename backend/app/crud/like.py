@@ -1,11 +1,19 @@
+from typing import Optional
 from sqlalchemy.orm import Session
+from app.crud.notification import enqueue_notification
+from app.crud.post import adjust_engagement_counter
 from app.models.like import Like
+from app.schemas.notification import NotificationEvent
 
 
-def create_like(db: Session, post_id: int, user_id: int):
-    """Create a like for a post by a user"""
+def create_like(db: Session, post_id: int, user_id: int, notification: Optional[NotificationEvent] = None):
+    """Create a like for a post by a user (and queue `notification` in the same transaction)"""
     db_like = Like(post_id=post_id, user_id=user_id)
     db.add(db_like)
+    db.flush()
+    adjust_engagement_counter(db, post_id, "likes_count", 1)
+    if notification is not None:
+        enqueue_notification(db, notification)
     db.commit()
     db.refresh(db_like)
     return db_like
@@ -13,16 +21,18 @@ def create_like(db: Session, post_id: int, user_id: int):
 
 def delete_like(db: Session, post_id: int, user_id: int):
     """Delete a like (unlike a post)"""
-    db_like = db.query(Like).filter(
+    # Only the request whose DELETE removed the row may decrement the counter.
+    deleted = db.query(Like).filter(
         Like.post_id == post_id,
         Like.user_id == user_id
-    ).first()
+    ).delete(synchronize_session=False)
 
-    if db_like:
-        db.delete(db_like)
-        db.commit()
-        return True
-    return False
+    if not deleted:
+        db.rollback()
+        return False
+    adjust_engagement_counter(db, post_id, "likes_count", -1)
+    db.commit()
+    return True
 
 
 def get_like(db: Session, post_id: int, user_id: int):
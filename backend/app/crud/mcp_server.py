@@ -1,12 +1,22 @@
 import re
 from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import case, desc, or_, func as sa_func
+from sqlalchemy import case, desc, func as sa_func
 from app.models.mcp_server import McpServer
 from app.models.mcp_review import McpReview
 from app.models.mcp_tool import McpTool
 from app.models.mcp_install_guide import McpInstallGuide
 from app.schemas.mcp_server import McpServerCreate, McpServerUpdate
+from app.services.search import SearchSpec, apply_search, search_rank
+
+MCP_SERVER_SEARCH = SearchSpec(
+    table="mcp_servers",
+    fields=(
+        (McpServer.name, "A"),
+        (McpServer.short_description, "B"),
+        (McpServer.description, "C"),
+    ),
+)
 
 
 def _slugify(name: str) -> str:
@@ -80,14 +90,7 @@ def get_mcp_servers(
 ) -> Tuple[List[McpServer], int]:
     query = db.query(McpServer)
 
-    if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            or_(
-                McpServer.name.ilike(search_filter),
-                McpServer.description.ilike(search_filter),
-            )
-        )
+    query = apply_search(db, query, MCP_SERVER_SEARCH, search)
 
     if category_id:
         query = query.filter(McpServer.category_id == category_id)
@@ -97,7 +100,10 @@ def get_mcp_servers(
 
     total = query.count()
 
-    if sort_by == "stars":
+    rank = search_rank(db, MCP_SERVER_SEARCH, search) if sort_by == "relevance" else None
+    if rank is not None:
+        query = query.order_by(desc(rank), desc(McpServer.created_at))
+    elif sort_by == "stars":
         query = query.order_by(desc(McpServer.github_stars))
     elif sort_by == "rating":
         query = query.order_by(desc(McpServer.avg_rating))
@@ -1,18 +1,256 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.notification import Notification
-from app.schemas.notification import NotificationCreate
-from sqlalchemy import desc
+from app.models.notification_archive import NotificationArchive
+from app.models.notification_outbox import NotificationOutbox
+from app.models.user_notification_stats import UserNotificationStats
+from app.schemas.notification import NotificationCreate, NotificationEvent
+from app.services.notification_hub import notification_hub
+from sqlalchemy import and_, case, desc, func, insert, or_, select
+
+NOTIFICATION_CURSOR_VERSION = 1
+ARCHIVED_COLUMNS = (
+    "id",
+    "user_id",
+    "type",
+    "content",
+    "related_post_id",
+    "related_comment_id",
+    "is_read",
+    "created_at",
+)
+
+# Notification types whose bursts are merged into one notification by the outbox worker.
+COALESCED_CONTENT = {
+    "like": "{actor}님 외 {others}명이 회원님의 게시글을 좋아합니다.",
+}
+
+
+def publish_unread_count(db: Session, user_id: int):
+    """Push the user's current unread count to their open notification streams"""
+    notification_hub.publish(
+        user_id,
+        {"type": "unread_count", "unread_count": get_unread_notifications_count(db, user_id)},
+    )
+
+
+def _lock_counters(db: Session, user_ids: Iterable[int]) -> dict[int, int]:
+    """
+    Create missing counter rows and lock them for the rest of the transaction.
+    Returns {user_id: read_through_id}. Rows are locked in id order so concurrent
+    multi-user writers cannot deadlock.
+    """
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return {}
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    db.execute(
+        dialect.insert(UserNotificationStats)
+        .values([{"user_id": user_id} for user_id in user_ids])
+        .on_conflict_do_nothing(index_elements=["user_id"])
+    )
+    rows = db.execute(
+        select(UserNotificationStats.user_id, UserNotificationStats.read_through_id)
+        .where(UserNotificationStats.user_id.in_(user_ids))
+        .order_by(UserNotificationStats.user_id)
+        .with_for_update()
+    ).all()
+    return {user_id: read_through_id for user_id, read_through_id in rows}
+
+
+def _shift_counters(db: Session, user_id: int, total: int = 0, unread: int = 0) -> None:
+    """Atomically shift a user's counters (clamped at zero). Does not commit."""
+    values = {}
+    for column, delta in (
+        (UserNotificationStats.total_count, total),
+        (UserNotificationStats.unread_count, unread),
+    ):
+        if delta > 0:
+            values[column] = column + delta
+        elif delta < 0:
+            values[column] = case((column >= -delta, column + delta), else_=0)
+    if values:
+        db.query(UserNotificationStats).filter(
+            UserNotificationStats.user_id == user_id
+        ).update(values, synchronize_session=False)
+
+
+def _is_unread(notification: Notification, read_through_id: int) -> bool:
+    return notification.is_read is False and notification.id > read_through_id
+
+
+def _push_payload(notification: Notification) -> dict:
+    return {
+        "id": notification.id,
+        "user_id": notification.user_id,
+        "type": notification.type,
+        "content": notification.content,
+        "related_post_id": notification.related_post_id,
+        "related_comment_id": notification.related_comment_id,
+        "is_read": notification.is_read,
+        "created_at": notification.created_at,
+    }
+
+
+def create_notifications(db: Session, rows: list[dict]) -> list[Notification]:
+    """
+    Insert notifications with one multi-row INSERT and shift their owners' counters.
+    Does not commit.
+    """
+    if not rows:
+        return []
+    # Insert first, then take the counter row locks: a concurrent mark-all that already
+    # holds a lock cannot see these rows, so they must not be folded into its watermark.
+    # (If a lower id than an already-committed one got folded in anyway, it is read.)
+    notifications = list(
+        db.scalars(insert(Notification).returning(Notification, sort_by_parameter_order=True), rows)
+    )
+    read_through_ids = _lock_counters(db, [item.user_id for item in notifications])
+    totals: dict[int, int] = {}
+    unreads: dict[int, int] = {}
+    for item in notifications:
+        totals[item.user_id] = totals.get(item.user_id, 0) + 1
+        if _is_unread(item, read_through_ids[item.user_id]):
+            unreads[item.user_id] = unreads.get(item.user_id, 0) + 1
+    for user_id, total in totals.items():
+        _shift_counters(db, user_id, total=total, unread=unreads.get(user_id, 0))
+    return notifications
+
+
+def publish_notifications(db: Session, payloads: list[dict]) -> None:
+    """Push committed notifications (see _push_payload) to their recipients' open streams"""
+    unread_counts: dict[int, int] = {}
+    for payload in payloads:
+        user_id = payload["user_id"]
+        if user_id not in unread_counts:
+            unread_counts[user_id] = get_unread_notifications_count(db, user_id)
+        notification_hub.publish(
+            user_id,
+            {"type": "notification", "notification": payload, "unread_count": unread_counts[user_id]},
+        )
 
 
 def create_notification(db: Session, notification: NotificationCreate):
-    """Create a notification"""
-    db_notification = Notification(**notification.model_dump())
-    db.add(db_notification)
+    """Create a notification and push it to the recipient's open streams"""
+    (db_notification,) = create_notifications(db, [notification.model_dump()])
+    payload = _push_payload(db_notification)
     db.commit()
-    db.refresh(db_notification)
+    publish_notifications(db, [payload])
     return db_notification
 
 
+def enqueue_notification(db: Session, notification: NotificationEvent) -> NotificationOutbox:
+    """
+    Queue a notification in the outbox. Does not commit: callers fold it into the
+    transaction that writes the like/comment/application that caused it.
+    """
+    now = datetime.now(timezone.utc)
+    coalesce_key = None
+    available_at = now
+    if notification.type in COALESCED_CONTENT and notification.related_post_id is not None:
+        coalesce_key = f"{notification.type}:{notification.user_id}:{notification.related_post_id}"
+        # Hold mergeable events briefly so a burst becomes one notification.
+        available_at = now + timedelta(seconds=settings.NOTIFICATION_OUTBOX_COALESCE_WINDOW_SECONDS)
+    event = NotificationOutbox(
+        **notification.model_dump(),
+        coalesce_key=coalesce_key,
+        available_at=available_at,
+    )
+    db.add(event)
+    return event
+
+
+def claim_outbox_events(
+    db: Session,
+    limit: int,
+    now: datetime,
+    max_attempts: int,
+) -> list[NotificationOutbox]:
+    """
+    Lock up to `limit` due outbox events, plus not-yet-due events that can be merged
+    into them. Locked rows are skipped, so several workers can drain concurrently.
+    """
+    live = NotificationOutbox.attempts < max_attempts
+    events = list(
+        db.scalars(
+            select(NotificationOutbox)
+            .where(live, NotificationOutbox.available_at <= now)
+            .order_by(NotificationOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+    )
+    keys = {event.coalesce_key for event in events if event.coalesce_key}
+    if keys:
+        events.extend(
+            db.scalars(
+                select(NotificationOutbox)
+                .where(
+                    live,
+                    NotificationOutbox.coalesce_key.in_(keys),
+                    NotificationOutbox.id.notin_([event.id for event in events]),
+                )
+                .order_by(NotificationOutbox.id)
+                .with_for_update(skip_locked=True)
+            )
+        )
+    return events
+
+
+def lock_outbox_events(db: Session, event_ids: list[int]) -> list[NotificationOutbox]:
+    """Re-lock specific outbox events; rows gone or held by another worker are left out"""
+    return list(
+        db.scalars(
+            select(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(event_ids))
+            .with_for_update(skip_locked=True)
+        )
+    )
+
+
+def dispatch_outbox_events(db: Session, rows: list[dict], event_ids: list[int]) -> list[dict]:
+    """
+    Write the notifications for a set of claimed outbox events and drop the events.
+    Does not commit; returns the push payloads to publish once committed.
+    """
+    notifications = create_notifications(db, rows)
+    payloads = [_push_payload(item) for item in notifications]
+    db.query(NotificationOutbox).filter(
+        NotificationOutbox.id.in_(event_ids)
+    ).delete(synchronize_session=False)
+    return payloads
+
+
+def record_outbox_failure(db: Session, event_ids: list[int], error: str, retry_at: datetime) -> None:
+    """Count a failed dispatch attempt and push the events back. Does not commit."""
+    db.query(NotificationOutbox).filter(
+        NotificationOutbox.id.in_(event_ids)
+    ).update(
+        {
+            NotificationOutbox.attempts: NotificationOutbox.attempts + 1,
+            NotificationOutbox.last_error: error[:1000],
+            NotificationOutbox.available_at: retry_at,
+        },
+        synchronize_session=False,
+    )
+
+
+def get_outbox_depth(db: Session, max_attempts: int) -> dict:
+    """Pending/dead outbox event counts and the oldest pending event's creation time"""
+    live = NotificationOutbox.attempts < max_attempts
+    pending, oldest = db.execute(
+        select(func.count(NotificationOutbox.id), func.min(NotificationOutbox.created_at)).where(live)
+    ).one()
+    dead = db.execute(select(func.count(NotificationOutbox.id)).where(~live)).scalar()
+    return {"pending": pending, "dead": dead, "oldest_created_at": oldest}
+
+
 def get_notification(db: Session, notification_id: int):
     """Get a notification by ID"""
     return db.query(Notification).filter(Notification.id == notification_id).first()
@@ -22,20 +260,84 @@ def get_user_notifications(db: Session, user_id: int, skip: int = 0, limit: int
     """Get all notifications for a user (ordered by latest first)"""
     return db.query(Notification).filter(
         Notification.user_id == user_id
-    ).order_by(desc(Notification.created_at)).offset(skip).limit(limit).all()
+    ).order_by(desc(Notification.created_at), desc(Notification.id)).offset(skip).limit(limit).all()
+
+
+def encode_notification_cursor(notification: Notification) -> str:
+    """Opaque, URL-safe cursor pointing just past `notification` in the latest-first order."""
+    payload = {"v": NOTIFICATION_CURSOR_VERSION, "k": [notification.created_at.isoformat(), notification.id]}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_notification_cursor(cursor: str) -> tuple[datetime, int]:
+    """Parse a cursor produced by `encode_notification_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        created_at, notification_id = payload["k"]
+        if payload.get("v") != NOTIFICATION_CURSOR_VERSION or not isinstance(notification_id, int):
+            raise ValueError("Invalid cursor")
+        return datetime.fromisoformat(created_at), notification_id
+    except (ValueError, UnicodeError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def get_user_notifications_by_cursor(
+    db: Session,
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+) -> tuple[list[Notification], Optional[str]]:
+    """
+    Keyset variant of `get_user_notifications`: seeks past the row encoded in `cursor`
+    on the (user_id, created_at, id) index instead of using OFFSET.
+    Returns (notifications, next_cursor). Raises ValueError for a malformed cursor.
+    """
+    query = db.query(Notification).filter(Notification.user_id == user_id)
+    if cursor:
+        created_at, notification_id = decode_notification_cursor(cursor)
+        query = query.filter(
+            or_(
+                Notification.created_at < created_at,
+                and_(Notification.created_at == created_at, Notification.id < notification_id),
+            )
+        )
+    notifications = query.order_by(
+        desc(Notification.created_at), desc(Notification.id)
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(notifications) > limit:
+        notifications = notifications[:limit]
+        next_cursor = encode_notification_cursor(notifications[-1])
+    return notifications, next_cursor
+
+
+def get_notification_stats(db: Session, user_id: int) -> Optional[UserNotificationStats]:
+    """Get the materialized counter row for a user (None if they never had a notification)"""
+    return db.get(UserNotificationStats, user_id)
+
+
+def is_notification_read(notification: Notification, stats: Optional[UserNotificationStats]) -> bool:
+    """Whether a notification is read, counting the user's mark-all watermark"""
+    return bool(notification.is_read) or (
+        stats is not None and notification.id <= stats.read_through_id
+    )
 
 
 def get_user_notifications_count(db: Session, user_id: int):
     """Get all notifications count for a user"""
-    return db.query(Notification).filter(Notification.user_id == user_id).count()
+    return db.execute(
+        select(UserNotificationStats.total_count).where(UserNotificationStats.user_id == user_id)
+    ).scalar() or 0
 
 
 def get_unread_notifications_count(db: Session, user_id: int):
     """Get the count of unread notifications for a user"""
-    return db.query(Notification).filter(
-        Notification.user_id == user_id,
-        Notification.is_read == False
-    ).count()
+    return db.execute(
+        select(UserNotificationStats.unread_count).where(UserNotificationStats.user_id == user_id)
+    ).scalar() or 0
 
 
 def mark_notification_as_read(db: Session, notification_id: int):
@@ -45,20 +347,39 @@ def mark_notification_as_read(db: Session, notification_id: int):
     ).first()
 
     if db_notification:
-        db_notification.is_read = True
+        user_id = db_notification.user_id
+        read_through_id = _lock_counters(db, [user_id])[user_id]
+        # Only the request that actually flips the flag may decrement the counter.
+        flipped = db.query(Notification).filter(
+            Notification.id == notification_id,
+            Notification.is_read == False
+        ).update({"is_read": True}, synchronize_session=False)
+        if flipped and notification_id > read_through_id:
+            _shift_counters(db, user_id, unread=-1)
         db.commit()
-        db.refresh(db_notification)
-        return db_notification
+        publish_unread_count(db, user_id)
+        # None if a concurrent request deleted it in the meantime.
+        return get_notification(db, notification_id)
     return None
 
 
 def mark_all_notifications_as_read(db: Session, user_id: int):
-    """Mark all notifications as read for a user"""
-    db.query(Notification).filter(
-        Notification.user_id == user_id,
-        Notification.is_read == False
-    ).update({"is_read": True})
+    """Mark all notifications as read for a user by moving the read watermark"""
+    read_through_id = _lock_counters(db, [user_id])[user_id]
+    latest_id = db.query(func.max(Notification.id)).filter(
+        Notification.user_id == user_id
+    ).scalar()
+    db.query(UserNotificationStats).filter(
+        UserNotificationStats.user_id == user_id
+    ).update(
+        {
+            "unread_count": 0,
+            "read_through_id": max(latest_id or 0, read_through_id),
+        },
+        synchronize_session=False,
+    )
     db.commit()
+    publish_unread_count(db, user_id)
     return True
 
 
@@ -69,7 +390,227 @@ def delete_notification(db: Session, notification_id: int):
     ).first()
 
     if db_notification:
+        user_id = db_notification.user_id
+        read_through_id = _lock_counters(db, [user_id])[user_id]
+        # Re-read under the lock: a concurrent mark-read/delete may have committed meanwhile.
+        db_notification = db.query(Notification).filter(
+            Notification.id == notification_id
+        ).populate_existing().first()
+        if db_notification is None:
+            db.rollback()
+            return False
+        was_unread = _is_unread(db_notification, read_through_id)
         db.delete(db_notification)
+        _shift_counters(db, user_id, total=-1, unread=-1 if was_unread else 0)
         db.commit()
+        publish_unread_count(db, user_id)
         return True
     return False
+
+
+def discard_related_notifications(
+    db: Session,
+    post_id: Optional[int] = None,
+    comment_ids: Optional[Iterable[int]] = None,
+) -> None:
+    """
+    Delete the notifications that point at a post/comments about to be deleted and
+    take them off their owners' counters (the FK cascade would skip the counters).
+    Does not commit: callers fold it into the transaction that deletes the post/comment.
+    """
+    criteria = []
+    if post_id is not None:
+        criteria.append(Notification.related_post_id == post_id)
+    comment_ids = list(comment_ids or [])
+    if comment_ids:
+        criteria.append(Notification.related_comment_id.in_(comment_ids))
+    if not criteria:
+        return
+
+    _remove_notifications(db, or_(*criteria))
+
+
+def _remove_notifications(db: Session, condition, archive: bool = False) -> int:
+    """
+    Delete the notifications matching `condition` (optionally copying them to the
+    archive first) and take them off their owners' counters. Does not commit.
+    Returns the number of rows removed.
+    """
+    user_ids = [
+        user_id for (user_id,) in db.query(Notification.user_id).filter(condition).distinct()
+    ]
+    read_through_ids = _lock_counters(db, user_ids)
+    if not read_through_ids:
+        return 0
+
+    # Re-read under the counter locks: is_read may have changed since the lookup above.
+    rows = db.query(Notification.id, Notification.user_id, Notification.is_read).filter(condition).all()
+    totals: dict[int, int] = {}
+    unreads: dict[int, int] = {}
+    for notification_id, user_id, is_read in rows:
+        totals[user_id] = totals.get(user_id, 0) + 1
+        if is_read is False and notification_id > read_through_ids.get(user_id, 0):
+            unreads[user_id] = unreads.get(user_id, 0) + 1
+
+    notification_ids = [notification_id for notification_id, _, _ in rows]
+    if archive:
+        db.execute(
+            insert(NotificationArchive).from_select(
+                ARCHIVED_COLUMNS,
+                select(*[getattr(Notification, column) for column in ARCHIVED_COLUMNS]).where(
+                    Notification.id.in_(notification_ids)
+                ),
+            )
+        )
+    db.query(Notification).filter(
+        Notification.id.in_(notification_ids)
+    ).delete(synchronize_session=False)
+    for user_id, total in totals.items():
+        _shift_counters(db, user_id, total=-total, unread=-unreads.get(user_id, 0))
+    return len(notification_ids)
+
+
+def archive_notifications(
+    db: Session,
+    retention_days: int,
+    inbox_max_items: int,
+    batch_size: int = 5000,
+) -> int:
+    """
+    Move notifications out of the hot table into notifications_archive:
+    read ones older than `retention_days`, and anything beyond each user's newest
+    `inbox_max_items`. Works in committed batches of at most `batch_size` rows.
+    Returns the number of notifications archived.
+    """
+    archived = 0
+
+    if retention_days > 0:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        read_through_id = (
+            select(UserNotificationStats.read_through_id)
+            .where(UserNotificationStats.user_id == Notification.user_id)
+            .correlate(Notification)
+            .scalar_subquery()
+        )
+        expired = and_(
+            Notification.created_at < cutoff,
+            or_(Notification.is_read == True, Notification.id <= func.coalesce(read_through_id, 0)),
+        )
+        while True:
+            ids = [
+                notification_id
+                for (notification_id,) in db.query(Notification.id)
+                .filter(expired)
+                .order_by(Notification.id)
+                .limit(batch_size)
+            ]
+            if not ids:
+                break
+            moved = _remove_notifications(db, and_(Notification.id.in_(ids), expired), archive=True)
+            db.commit()
+            archived += moved
+            if len(ids) < batch_size:
+                break
+
+    if inbox_max_items > 0:
+        over_cap = [
+            user_id
+            for (user_id,) in db.query(UserNotificationStats.user_id).filter(
+                UserNotificationStats.total_count > inbox_max_items
+            )
+        ]
+        for user_id in over_cap:
+            while True:
+                ids = [
+                    notification_id
+                    for (notification_id,) in db.query(Notification.id)
+                    .filter(Notification.user_id == user_id)
+                    .order_by(desc(Notification.created_at), desc(Notification.id))
+                    .offset(inbox_max_items)
+                    .limit(batch_size)
+                ]
+                if not ids:
+                    break
+                archived += _remove_notifications(db, Notification.id.in_(ids), archive=True)
+                db.commit()
+                if len(ids) < batch_size:
+                    break
+
+    db.rollback()
+    return archived
+
+
+def reconcile_notification_counters(
+    db: Session,
+    user_ids: Optional[Iterable[int]] = None,
+    batch_size: int = 500,
+) -> int:
+    """
+    Recompute the materialized counters from `notifications` and fix drifted rows
+    (e.g. from seed scripts or user deletes that bypass the CRUD paths).
+    Counts are taken only after locking each batch's counter rows, so in-flight
+    notification writes are either already counted or land on top afterwards.
+    Returns the number of users whose counters were updated.
+    """
+    normalized_ids = (
+        None if user_ids is None else [int(user_id) for user_id in user_ids if user_id is not None]
+    )
+    if normalized_ids is not None and not normalized_ids:
+        return 0
+
+    actual_total = (
+        select(func.count(Notification.id))
+        .where(Notification.user_id == UserNotificationStats.user_id)
+        .correlate(UserNotificationStats)
+        .scalar_subquery()
+    )
+    actual_unread = (
+        select(func.count(Notification.id))
+        .where(
+            Notification.user_id == UserNotificationStats.user_id,
+            Notification.is_read == False,
+            Notification.id > UserNotificationStats.read_through_id,
+        )
+        .correlate(UserNotificationStats)
+        .scalar_subquery()
+    )
+
+    # Users with notifications but no counter row yet, plus rows whose counts drifted.
+    missing_query = db.query(Notification.user_id).outerjoin(
+        UserNotificationStats,
+        UserNotificationStats.user_id == Notification.user_id,
+    ).filter(UserNotificationStats.user_id.is_(None))
+    drifted_query = db.query(UserNotificationStats.user_id).filter(
+        or_(
+            UserNotificationStats.total_count != actual_total,
+            UserNotificationStats.unread_count != actual_unread,
+        )
+    )
+    if normalized_ids is not None:
+        missing_query = missing_query.filter(Notification.user_id.in_(normalized_ids))
+        drifted_query = drifted_query.filter(UserNotificationStats.user_id.in_(normalized_ids))
+    candidate_ids = sorted(
+        {user_id for (user_id,) in missing_query.distinct()}
+        | {user_id for (user_id,) in drifted_query}
+    )
+    db.rollback()
+
+    repaired = 0
+    for start in range(0, len(candidate_ids), batch_size):
+        batch = candidate_ids[start:start + batch_size]
+        _lock_counters(db, batch)
+        repaired += db.query(UserNotificationStats).filter(
+            UserNotificationStats.user_id.in_(batch),
+            or_(
+                UserNotificationStats.total_count != actual_total,
+                UserNotificationStats.unread_count != actual_unread,
+            ),
+        ).update(
+            {
+                UserNotificationStats.total_count: actual_total,
+                UserNotificationStats.unread_count: actual_unread,
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+    return repaired
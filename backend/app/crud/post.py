@@ -1,15 +1,32 @@
+import base64
+import json
 from datetime import datetime, timedelta, timezone
-from typing import Iterable, List, Optional, Sequence, Set
-
-from sqlalchemy import asc, case, desc, false, func, or_
-from sqlalchemy.orm import Session
-
+from decimal import Decimal
+from typing import Collection, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import and_, asc, case, desc, false, func, or_, select, true
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.core.config import settings
+from app.crud.notification import discard_related_notifications
+from app.crud.timeline import (
+    discard_post_from_timelines,
+    fan_out_post,
+    get_followed_pull_author_ids,
+    oldest_entries_by_author,
+)
 from app.models.bookmark import Bookmark
 from app.models.comment import Comment
 from app.models.like import Like
 from app.models.post import Post
 from app.models.recruit_meta import RecruitMeta
+from app.models.timeline_entry import TimelineEntry
+from app.models.user_follow import UserFollow
 from app.schemas.post import POST_TYPE_NORMAL, POST_TYPE_RECRUIT, PostCreate, PostUpdate
+from app.services.search import SearchSpec, apply_search, search_rank
+
+POST_SORTS = ("latest", "views", "likes", "comments", "hot", "deadline", "relevance")
+POST_SEARCH = SearchSpec(table="posts", fields=((Post.title, "A"), (Post.content, "B")))
 
 
 def get_post(db: Session, post_id: int) -> Optional[Post]:
@@ -40,16 +57,10 @@ def _apply_base_filters(
     category_id: Optional[int],
     post_type: Optional[str],
     author_ids: Optional[Sequence[int]] = None,
+    exclude_author_ids: Optional[Collection[int]] = None,
 ):
-    """Apply search/category/post-type filters to a query."""
-    if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            or_(
-                Post.title.ilike(search_filter),
-                Post.content.ilike(search_filter),
-            )
-        )
+    """Apply search/category/post-type/author filters to a query."""
+    query = apply_search(query.session, query, POST_SEARCH, search)
     if category_id:
         query = query.filter(Post.category_id == category_id)
     if post_type:
@@ -60,7 +71,30 @@ def _apply_base_filters(
             query = query.filter(Post.user_id.in_(normalized_author_ids))
         else:
             query = query.filter(false())
-    return query
+    return exclude_authors(query, Post.user_id, exclude_author_ids)
+
+
+def exclude_authors(query, author_column, author_ids: Optional[Collection[int]]):
+    """
+    Drop rows written by `author_ids` (a viewer's block list) with one NOT IN, so
+    hiding blocked users costs the same single query however long the list is.
+    """
+    if not author_ids:
+        return query
+    return query.filter(author_column.notin_(sorted(author_ids)))
+
+
+def with_listing_relations(query):
+    """
+    Eager-load what a listing card renders (author, category, recruit meta) so a page
+    of PostResponse costs a fixed number of queries rather than one per post.
+    Apply after counting; the options only matter for the row-returning query.
+    """
+    return query.options(
+        joinedload(Post.author),
+        joinedload(Post.category),
+        selectinload(Post.recruit_meta),
+    )
 
 
 def _apply_recruit_filters(
@@ -90,52 +124,103 @@ def _apply_recruit_filters(
     return query
 
 
-def get_posts(
-    db: Session,
-    skip: int = 0,
-    limit: int = 10,
-    search: Optional[str] = None,
-    category_id: Optional[int] = None,
-    sort: str = "latest",
-    window: str = "24h",
-    post_type: Optional[str] = None,
-    recruit_type: Optional[str] = None,
-    recruit_status: Optional[str] = None,
-    recruit_is_online: Optional[bool] = None,
-    author_ids: Optional[Sequence[int]] = None,
-) -> tuple[List[Post], int]:
-    normalized_post_type = _normalize_post_type(post_type)
-    normalized_sort = (sort or "latest").lower()
+POST_CURSOR_VERSION = 1
+TOTAL_MODE_EXACT = "exact"
+TOTAL_MODE_ESTIMATE = "estimate"
+TOTAL_MODE_NONE = "none"
+
+_HOT_WINDOW_MAP = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
+
+
+def _encode_cursor_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"num": str(value)}
+    return value
+
+
+def _decode_cursor_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "num" in value:
+            return Decimal(value["num"])
+        raise ValueError("Invalid cursor")
+    if value is None or isinstance(value, (int, float)):
+        return value
+    raise ValueError("Invalid cursor")
+
+
+def encode_post_cursor(sort: str, values: Sequence) -> str:
+    """Serialize the sort key of the last row into an opaque, URL-safe cursor."""
+    payload = {
+        "v": POST_CURSOR_VERSION,
+        "s": sort,
+        "k": [_encode_cursor_value(value) for value in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
 
-    # deadline sorting is meaningful only for recruit posts
-    if normalized_sort == "deadline" and not normalized_post_type:
-        normalized_post_type = POST_TYPE_RECRUIT
 
-    is_recruit_listing = bool(
-        normalized_post_type == POST_TYPE_RECRUIT
-        or recruit_type
-        or recruit_status
-        or recruit_is_online is not None
-        or normalized_sort == "deadline"
-    )
+def decode_post_cursor(cursor: str, sort: str, key_count: int) -> list:
+    """Parse a cursor produced by `encode_post_cursor` for the given sort."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
 
-    # --- Pinned posts (page 1 only, normal board only) ---
-    pinned_posts: List[Post] = []
-    if skip == 0 and not is_recruit_listing:
-        pinned_q = db.query(Post).filter(Post.is_pinned == True)  # noqa: E712
-        pinned_q = _apply_base_filters(
-            pinned_q,
-            search,
-            category_id,
-            normalized_post_type,
-            author_ids=author_ids,
-        )
-        pinned_posts = pinned_q.order_by(
-            func.coalesce(Post.pinned_order, 9999),
-            desc(Post.created_at),
-        ).all()
+    if not isinstance(payload, dict) or payload.get("v") != POST_CURSOR_VERSION:
+        raise ValueError("Invalid cursor")
+    if payload.get("s") != sort:
+        raise ValueError("Cursor does not match the requested sort")
+    keys = payload.get("k")
+    if not isinstance(keys, list) or len(keys) != key_count:
+        raise ValueError("Invalid cursor")
+    return [_decode_cursor_value(value) for value in keys]
 
-    # --- Normal (non-pinned) posts ---
+
+def _keyset_condition(sort_keys: Sequence[tuple], values: Sequence):
+    """
+    Build the "strictly after this row" predicate for a lexicographic sort.
+    `sort_keys` is a list of (expression, descending) pairs ending with a unique key.
+    """
+    clauses = []
+    ties = []
+    for (expr, descending), value in zip(sort_keys, values):
+        if value is None:
+            # NULL keys are always preceded by a null-flag key, so every row in the
+            # NULL group ties on this column and ordering falls through to the next key.
+            ties.append(expr.is_(None))
+            continue
+        comparison = expr < value if descending else expr > value
+        clauses.append(and_(*ties, comparison))
+        ties.append(expr == value)
+    if not clauses:
+        return false()
+    return or_(*clauses)
+
+
+def _build_listing_query(
+    db: Session,
+    search: Optional[str],
+    category_id: Optional[int],
+    normalized_sort: str,
+    window: str,
+    normalized_post_type: Optional[str],
+    recruit_type: Optional[str],
+    recruit_status: Optional[str],
+    recruit_is_online: Optional[bool],
+    is_recruit_listing: bool,
+    author_ids: Optional[Sequence[int]],
+    exclude_author_ids: Optional[Collection[int]] = None,
+):
+    """Non-pinned listing query with every filter applied but no ordering."""
     query = db.query(Post).filter(
         or_(Post.is_pinned == False, Post.is_pinned == None)  # noqa: E711,E712
     )
@@ -145,6 +230,7 @@ def get_posts(
         category_id,
         normalized_post_type,
         author_ids=author_ids,
+        exclude_author_ids=exclude_author_ids,
     )
     query = _apply_recruit_filters(
         query,
@@ -154,80 +240,335 @@ def get_posts(
         ensure_join=is_recruit_listing,
     )
 
-    # Time window for hot sort
-    window_map = {
-        "24h": timedelta(hours=24),
-        "7d": timedelta(days=7),
-        "30d": timedelta(days=30),
-    }
     if normalized_sort == "hot":
-        window_delta = window_map.get(window, timedelta(hours=24))
+        window_delta = _HOT_WINDOW_MAP.get(window, timedelta(hours=24))
         window_start = datetime.now(timezone.utc) - window_delta
         query = query.filter(Post.created_at >= window_start)
 
-    normal_total = query.count()
-    total = len(pinned_posts) + normal_total
+    return query
+
+
+def _apply_sort_keys(db: Session, query, normalized_sort: str, search: Optional[str] = None):
+    """
+    Join whatever the sort needs and return (query, sort_keys).
+    Every key list ends with Post.id so the order is total and usable as a keyset.
+    """
+    created_key = (Post.created_at, True)
+    id_key = (Post.id, True)
+
+    if normalized_sort == "relevance":
+        rank = search_rank(db, POST_SEARCH, search)
+        if rank is not None:
+            return query, [(rank, True), created_key, id_key]
+        return query, [created_key, id_key]
 
-    # Apply sort
     if normalized_sort == "views":
-        query = query.order_by(desc(Post.views), desc(Post.created_at))
-    elif normalized_sort == "likes":
-        likes_sub = (
-            db.query(Like.post_id, func.count(Like.id).label("lc"))
-            .group_by(Like.post_id)
-            .subquery()
-        )
-        query = (
-            query.outerjoin(likes_sub, Post.id == likes_sub.c.post_id)
-            .order_by(desc(func.coalesce(likes_sub.c.lc, 0)), desc(Post.created_at))
-        )
-    elif normalized_sort == "comments":
-        comments_sub = (
-            db.query(Comment.post_id, func.count(Comment.id).label("cnt"))
-            .group_by(Comment.post_id)
-            .subquery()
-        )
-        query = (
-            query.outerjoin(comments_sub, Post.id == comments_sub.c.post_id)
-            .order_by(desc(func.coalesce(comments_sub.c.cnt, 0)), desc(Post.created_at))
-        )
-    elif normalized_sort == "hot":
-        likes_sub = (
-            db.query(Like.post_id, func.count(Like.id).label("lc"))
-            .group_by(Like.post_id)
-            .subquery()
-        )
-        comments_sub = (
-            db.query(Comment.post_id, func.count(Comment.id).label("cc"))
-            .group_by(Comment.post_id)
-            .subquery()
-        )
+        return query, [(func.coalesce(Post.views, 0), True), created_key, id_key]
+
+    if normalized_sort == "likes":
+        return query, [(Post.likes_count, True), created_key, id_key]
+
+    if normalized_sort == "comments":
+        return query, [(Post.comment_count, True), created_key, id_key]
+
+    if normalized_sort == "hot":
+        # likes*3 + comments*2 + views*0.2, scaled by 5 so the key stays an exact integer.
         score = (
-            func.coalesce(likes_sub.c.lc, 0) * 3
-            + func.coalesce(comments_sub.c.cc, 0) * 2
-            + Post.views * 0.2
+            Post.likes_count * 15
+            + Post.comment_count * 10
+            + func.coalesce(Post.views, 0)
         )
-        query = (
-            query
-            .outerjoin(likes_sub, Post.id == likes_sub.c.post_id)
-            .outerjoin(comments_sub, Post.id == comments_sub.c.post_id)
-            .order_by(desc(score), desc(Post.created_at))
-        )
-    elif normalized_sort == "deadline":
-        query = query.order_by(
-            case((RecruitMeta.deadline_at.is_(None), 1), else_=0),
-            asc(RecruitMeta.deadline_at),
-            desc(Post.created_at),
+        return query, [(score, True), created_key, id_key]
+
+    if normalized_sort == "deadline":
+        return query, [
+            (case((RecruitMeta.deadline_at.is_(None), 1), else_=0), False),
+            (RecruitMeta.deadline_at, False),
+            created_key,
+            id_key,
+        ]
+
+    # latest (default)
+    return query, [created_key, id_key]
+
+
+def _order_by_sort_keys(query, sort_keys: Sequence[tuple]):
+    return query.order_by(
+        *[desc(expr) if descending else asc(expr) for expr, descending in sort_keys]
+    )
+
+
+def _estimate_row_count(db: Session, query) -> int:
+    """Planner row estimate on PostgreSQL; exact COUNT(*) on other dialects."""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return query.order_by(None).count()
+
+    # Expanding IN parameters are only filled in at execution; render them inline.
+    compiled = query.order_by(None).statement.compile(
+        dialect=bind.dialect,
+        compile_kwargs={"render_postcompile": True},
+    )
+    plan = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}",
+        compiled.params,
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _count_listing(db: Session, query, total_mode: str) -> Optional[int]:
+    if total_mode == TOTAL_MODE_NONE:
+        return None
+    if total_mode == TOTAL_MODE_ESTIMATE:
+        return _estimate_row_count(db, query)
+    return query.count()
+
+
+def _resolve_listing_flags(
+    sort: str,
+    post_type: Optional[str],
+    recruit_type: Optional[str],
+    recruit_status: Optional[str],
+    recruit_is_online: Optional[bool],
+) -> tuple[str, Optional[str], bool]:
+    normalized_post_type = _normalize_post_type(post_type)
+    normalized_sort = (sort or "latest").lower()
+
+    # deadline sorting is meaningful only for recruit posts
+    if normalized_sort == "deadline" and not normalized_post_type:
+        normalized_post_type = POST_TYPE_RECRUIT
+
+    is_recruit_listing = bool(
+        normalized_post_type == POST_TYPE_RECRUIT
+        or recruit_type
+        or recruit_status
+        or recruit_is_online is not None
+        or normalized_sort == "deadline"
+    )
+    return normalized_sort, normalized_post_type, is_recruit_listing
+
+
+def _get_pinned_listing_posts(
+    db: Session,
+    search: Optional[str],
+    category_id: Optional[int],
+    normalized_post_type: Optional[str],
+    author_ids: Optional[Sequence[int]],
+    exclude_author_ids: Optional[Collection[int]] = None,
+) -> List[Post]:
+    pinned_q = db.query(Post).filter(Post.is_pinned == True)  # noqa: E712
+    pinned_q = _apply_base_filters(
+        pinned_q,
+        search,
+        category_id,
+        normalized_post_type,
+        author_ids=author_ids,
+        exclude_author_ids=exclude_author_ids,
+    )
+    return with_listing_relations(pinned_q).order_by(
+        func.coalesce(Post.pinned_order, 9999),
+        desc(Post.created_at),
+    ).all()
+
+
+def get_posts(
+    db: Session,
+    skip: int = 0,
+    limit: int = 10,
+    search: Optional[str] = None,
+    category_id: Optional[int] = None,
+    sort: str = "latest",
+    window: str = "24h",
+    post_type: Optional[str] = None,
+    recruit_type: Optional[str] = None,
+    recruit_status: Optional[str] = None,
+    recruit_is_online: Optional[bool] = None,
+    author_ids: Optional[Sequence[int]] = None,
+    exclude_author_ids: Optional[Collection[int]] = None,
+    total_mode: str = TOTAL_MODE_EXACT,
+) -> tuple[List[Post], Optional[int]]:
+    normalized_sort, normalized_post_type, is_recruit_listing = _resolve_listing_flags(
+        sort, post_type, recruit_type, recruit_status, recruit_is_online
+    )
+
+    # --- Pinned posts (page 1 only, normal board only) ---
+    pinned_posts: List[Post] = []
+    if skip == 0 and not is_recruit_listing:
+        pinned_posts = _get_pinned_listing_posts(
+            db, search, category_id, normalized_post_type, author_ids, exclude_author_ids
         )
-    else:
-        # latest (default)
-        query = query.order_by(desc(Post.created_at))
 
-    normal_posts = query.offset(skip).limit(limit).all()
+    # --- Normal (non-pinned) posts ---
+    query = _build_listing_query(
+        db,
+        search,
+        category_id,
+        normalized_sort,
+        window,
+        normalized_post_type,
+        recruit_type,
+        recruit_status,
+        recruit_is_online,
+        is_recruit_listing,
+        author_ids,
+        exclude_author_ids,
+    )
+
+    normal_total = _count_listing(db, query, total_mode)
+    total = None if normal_total is None else len(pinned_posts) + normal_total
+
+    query, sort_keys = _apply_sort_keys(db, query, normalized_sort, search)
+    query = _order_by_sort_keys(query, sort_keys)
+
+    normal_posts = with_listing_relations(query).offset(skip).limit(limit).all()
     posts = pinned_posts + normal_posts
     return posts, total
 
 
+def get_posts_by_cursor(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    search: Optional[str] = None,
+    category_id: Optional[int] = None,
+    sort: str = "latest",
+    window: str = "24h",
+    post_type: Optional[str] = None,
+    recruit_type: Optional[str] = None,
+    recruit_status: Optional[str] = None,
+    recruit_is_online: Optional[bool] = None,
+    author_ids: Optional[Sequence[int]] = None,
+    exclude_author_ids: Optional[Collection[int]] = None,
+    total_mode: str = TOTAL_MODE_NONE,
+) -> tuple[List[Post], Optional[int], Optional[str]]:
+    """
+    Keyset variant of `get_posts`: seeks past the row encoded in `cursor` instead of
+    using OFFSET, so page N costs the same as page 1.
+    Returns (posts, total, next_cursor). Raises ValueError for a malformed cursor.
+    """
+    normalized_sort, normalized_post_type, is_recruit_listing = _resolve_listing_flags(
+        sort, post_type, recruit_type, recruit_status, recruit_is_online
+    )
+    if normalized_sort not in POST_SORTS:
+        normalized_sort = "latest"
+
+    pinned_posts: List[Post] = []
+    if cursor is None and not is_recruit_listing:
+        pinned_posts = _get_pinned_listing_posts(
+            db, search, category_id, normalized_post_type, author_ids, exclude_author_ids
+        )
+
+    query = _build_listing_query(
+        db,
+        search,
+        category_id,
+        normalized_sort,
+        window,
+        normalized_post_type,
+        recruit_type,
+        recruit_status,
+        recruit_is_online,
+        is_recruit_listing,
+        author_ids,
+        exclude_author_ids,
+    )
+
+    total = None
+    normal_total = _count_listing(db, query, total_mode)
+    if normal_total is not None:
+        total = len(pinned_posts) + normal_total
+
+    query, sort_keys = _apply_sort_keys(db, query, normalized_sort, search)
+    if cursor:
+        values = decode_post_cursor(cursor, normalized_sort, len(sort_keys))
+        query = query.filter(_keyset_condition(sort_keys, values))
+
+    rows = (
+        _order_by_sort_keys(
+            with_listing_relations(query).add_columns(*[expr for expr, _ in sort_keys]),
+            sort_keys,
+        )
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_post_cursor(normalized_sort, list(rows[-1][1:]))
+
+    posts = pinned_posts + [row[0] for row in rows]
+    return posts, total, next_cursor
+
+
+def get_following_timeline(
+    db: Session,
+    follower_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+) -> tuple[List[Post], Optional[str]]:
+    """
+    Home timeline for `scope=following`, newest first, with the same cursor as the
+    "latest" listing. Pages come from the follower's `timeline_entries`, merged with
+    the followed authors' posts that the entries do not cover: everything by read-time
+    authors (see TimelinePullAuthor) or by authors with no entries, and each author's
+    posts older than their oldest entry (past the follow-time backfill, or trimmed).
+    Returns (posts, next_cursor). Raises ValueError for a malformed cursor.
+    """
+    values = decode_post_cursor(cursor, "latest", 2) if cursor else None
+
+    def after(sort_keys: list, boundary):
+        return _keyset_condition(sort_keys, boundary) if boundary else true()
+
+    entry_keys = [(TimelineEntry.created_at, True), (TimelineEntry.post_id, True)]
+    post_keys = [(Post.created_at, True), (Post.id, True)]
+
+    candidates = (
+        db.query(TimelineEntry.created_at, TimelineEntry.post_id)
+        .filter(TimelineEntry.follower_id == follower_id, after(entry_keys, values))
+        .order_by(desc(TimelineEntry.created_at), desc(TimelineEntry.post_id))
+        .limit(limit + 1)
+        .all()
+    )
+    oldest = oldest_entries_by_author(follower_id)
+    uncovered = or_(oldest.c.oldest.is_(None), Post.created_at <= oldest.c.oldest)
+    pull_author_ids = get_followed_pull_author_ids(db, follower_id)
+    if pull_author_ids:
+        uncovered = or_(uncovered, Post.user_id.in_(pull_author_ids))
+    # Posts at an author's oldest entry are read twice; the merge below dedupes them.
+    candidates.extend(
+        db.query(Post.created_at, Post.id)
+        .join(
+            UserFollow,
+            and_(UserFollow.following_id == Post.user_id, UserFollow.follower_id == follower_id),
+        )
+        .outerjoin(oldest, oldest.c.author_id == Post.user_id)
+        .filter(uncovered, after(post_keys, values))
+        .order_by(desc(Post.created_at), desc(Post.id))
+        .limit(limit + 1)
+        .all()
+    )
+
+    created_at_by_id = {post_id: created_at for created_at, post_id in candidates}
+    page = sorted(created_at_by_id.items(), key=lambda item: (item[1], item[0]), reverse=True)[: limit + 1]
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        last_id, last_created_at = page[-1]
+        next_cursor = encode_post_cursor("latest", [last_created_at, last_id])
+
+    post_ids = [post_id for post_id, _created_at in page]
+    posts_by_id = (
+        {post.id: post for post in with_listing_relations(db.query(Post)).filter(Post.id.in_(post_ids))}
+        if post_ids
+        else {}
+    )
+    return [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id], next_cursor
+
+
 def create_post(db: Session, post: PostCreate, user_id: int) -> Post:
     post_data = post.model_dump(exclude={"recruit_meta"})
     recruit_meta_data = (
@@ -249,6 +590,7 @@ def create_post(db: Session, post: PostCreate, user_id: int) -> Post:
             recruit_meta_data["location_text"] = None
         db.add(RecruitMeta(post_id=db_post.id, **recruit_meta_data))
 
+    fan_out_post(db, db_post.id, user_id, settings.TIMELINE_FANOUT_MAX_FOLLOWERS)
     db.commit()
     db.refresh(db_post)
     return db_post
@@ -311,83 +653,108 @@ def delete_post(db: Session, post_id: int) -> bool:
     db_post = get_post(db, post_id)
     if not db_post:
         return False
+    comment_ids = [comment_id for (comment_id,) in db.query(Comment.id).filter(Comment.post_id == post_id)]
+    discard_related_notifications(db, post_id=post_id, comment_ids=comment_ids)
+    discard_post_from_timelines(db, post_id)
     db.delete(db_post)
     db.commit()
     return True
 
 
-def increment_views(db: Session, post_id: int) -> None:
-    db_post = get_post(db, post_id)
-    if db_post:
-        db_post.views += 1
-        db.commit()
+ENGAGEMENT_COUNTER_COLUMNS = {
+    "likes_count": (Like, Post.likes_count),
+    "comment_count": (Comment, Post.comment_count),
+    "bookmark_count": (Bookmark, Post.bookmark_count),
+}
+
 
+def adjust_engagement_counter(db: Session, post_id: int, counter: str, delta: int) -> None:
+    """
+    Atomically shift one of the denormalized counters on `posts`.
+    Does not commit: callers fold it into the transaction that writes the like/comment/bookmark row.
+    """
+    _model, column = ENGAGEMENT_COUNTER_COLUMNS[counter]
+    query = db.query(Post).filter(Post.id == post_id)
+    if delta < 0:
+        query = query.filter(column >= -delta)
+    query.update({column: column + delta}, synchronize_session=False)
 
-def get_post_engagement_maps(
+
+def reconcile_engagement_counters(
+    db: Session,
+    post_ids: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    Recompute the denormalized counters from the source tables and fix drifted rows.
+    Returns the number of posts that were updated.
+    """
+    normalized_ids = (
+        None if post_ids is None else [int(post_id) for post_id in post_ids if post_id is not None]
+    )
+    if normalized_ids is not None and not normalized_ids:
+        return 0
+
+    actual_counts = {}
+    for counter, (model, column) in ENGAGEMENT_COUNTER_COLUMNS.items():
+        actual_counts[counter] = (
+            select(func.count(model.id))
+            .where(model.post_id == Post.id)
+            .correlate(Post)
+            .scalar_subquery()
+        )
+
+    drift_filter = or_(
+        *[
+            ENGAGEMENT_COUNTER_COLUMNS[counter][1] != actual
+            for counter, actual in actual_counts.items()
+        ]
+    )
+    query = db.query(Post).filter(drift_filter)
+    if normalized_ids is not None:
+        query = query.filter(Post.id.in_(normalized_ids))
+
+    updated = query.update(
+        {
+            ENGAGEMENT_COUNTER_COLUMNS[counter][1]: actual
+            for counter, actual in actual_counts.items()
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+    return int(updated or 0)
+
+
+def get_viewer_engagement_flags(
     db: Session,
     post_ids: Iterable[int],
     user_id: Optional[int] = None,
-) -> tuple[dict[int, int], dict[int, int], Set[int], Set[int]]:
+) -> tuple[Set[int], Set[int]]:
     """
-    Fetch engagement metrics in bulk to avoid per-post N+1 queries.
+    Fetch the viewer's like/bookmark state in bulk to avoid per-post N+1 queries.
+    Counts are read from the denormalized Post columns instead.
     Returns:
-      - comment_count_by_post_id
-      - likes_count_by_post_id
       - liked_post_ids_for_user
       - bookmarked_post_ids_for_user
     """
     normalized_ids = [int(post_id) for post_id in post_ids if post_id is not None]
-    if not normalized_ids:
-        return {}, {}, set(), set()
+    if not normalized_ids or user_id is None:
+        return set(), set()
 
-    comment_rows = (
-        db.query(Comment.post_id, func.count(Comment.id))
-        .filter(Comment.post_id.in_(normalized_ids))
-        .group_by(Comment.post_id)
+    liked_rows = (
+        db.query(Like.post_id)
+        .filter(Like.user_id == user_id, Like.post_id.in_(normalized_ids))
         .all()
     )
-    comment_count_by_post_id = {post_id: count for post_id, count in comment_rows}
+    liked_post_ids_for_user = {post_id for (post_id,) in liked_rows}
 
-    like_rows = (
-        db.query(Like.post_id, func.count(Like.id))
-        .filter(Like.post_id.in_(normalized_ids))
-        .group_by(Like.post_id)
+    bookmarked_rows = (
+        db.query(Bookmark.post_id)
+        .filter(Bookmark.user_id == user_id, Bookmark.post_id.in_(normalized_ids))
         .all()
     )
-    likes_count_by_post_id = {post_id: count for post_id, count in like_rows}
-
-    liked_post_ids_for_user: Set[int] = set()
-    bookmarked_post_ids_for_user: Set[int] = set()
-
-    if user_id is not None:
-        liked_rows = (
-            db.query(Like.post_id)
-            .filter(Like.user_id == user_id, Like.post_id.in_(normalized_ids))
-            .all()
-        )
-        liked_post_ids_for_user = {post_id for (post_id,) in liked_rows}
-
-        bookmarked_rows = (
-            db.query(Bookmark.post_id)
-            .filter(Bookmark.user_id == user_id, Bookmark.post_id.in_(normalized_ids))
-            .all()
-        )
-        bookmarked_post_ids_for_user = {post_id for (post_id,) in bookmarked_rows}
-
-    return (
-        comment_count_by_post_id,
-        likes_count_by_post_id,
-        liked_post_ids_for_user,
-        bookmarked_post_ids_for_user,
-    )
-
-
-def get_comment_count(db: Session, post_id: int) -> int:
-    return db.query(func.count(Comment.id)).filter(Comment.post_id == post_id).scalar()
-
+    bookmarked_post_ids_for_user = {post_id for (post_id,) in bookmarked_rows}
 
-def get_likes_count(db: Session, post_id: int) -> int:
-    return db.query(func.count(Like.id)).filter(Like.post_id == post_id).scalar()
+    return liked_post_ids_for_user, bookmarked_post_ids_for_user
 
 
 def check_user_liked(db: Session, post_id: int, user_id: int) -> bool:
@@ -3,7 +3,9 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 
+from app.crud.notification import enqueue_notification
 from app.models.recruit_application import RecruitApplication
+from app.schemas.notification import NotificationEvent
 
 
 def get_application(db: Session, application_id: int) -> Optional[RecruitApplication]:
@@ -31,6 +33,7 @@ def create_application(
     applicant_id: int,
     message: str,
     link: Optional[str] = None,
+    notification: Optional[NotificationEvent] = None,
 ) -> RecruitApplication:
     application = RecruitApplication(
         recruit_post_id=recruit_post_id,
@@ -39,6 +42,8 @@ def create_application(
         link=link,
     )
     db.add(application)
+    if notification is not None:
+        enqueue_notification(db, notification)
     db.commit()
     db.refresh(application)
     return application
@@ -57,8 +62,11 @@ def update_application_status(
     db: Session,
     application: RecruitApplication,
     status: str,
+    notification: Optional[NotificationEvent] = None,
 ) -> RecruitApplication:
     application.status = status
+    if notification is not None:
+        enqueue_notification(db, notification)
     db.commit()
     db.refresh(application)
     return application
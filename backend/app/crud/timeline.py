@@ -0,0 +1,160 @@
+from typing import List
+
+from sqlalchemy import desc, exists, func, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.post import Post
+from app.models.timeline_entry import TimelineEntry
+from app.models.timeline_pull_author import TimelinePullAuthor
+from app.models.user_follow import UserFollow
+
+TIMELINE_ENTRY_COLUMNS = ["follower_id", "post_id", "author_id", "created_at"]
+
+
+def is_pull_author(db: Session, author_id: int) -> bool:
+    return db.get(TimelinePullAuthor, author_id) is not None
+
+
+def get_followed_pull_author_ids(db: Session, follower_id: int) -> List[int]:
+    """Authors this user follows whose posts are merged in at read time."""
+    rows = (
+        db.query(TimelinePullAuthor.author_id)
+        .join(UserFollow, UserFollow.following_id == TimelinePullAuthor.author_id)
+        .filter(UserFollow.follower_id == follower_id)
+        .all()
+    )
+    return [author_id for (author_id,) in rows]
+
+
+def oldest_entries_by_author(follower_id: int):
+    """
+    Subquery of (author_id, oldest): the created_at of each author's oldest post in the
+    follower's timeline. An author's entries have no gaps from there up (backfill copies
+    their latest posts, fan-out adds each new one, trimming only cuts the oldest), so
+    older posts by that author must be read from `posts`.
+    """
+    return (
+        select(TimelineEntry.author_id, func.min(TimelineEntry.created_at).label("oldest"))
+        .where(TimelineEntry.follower_id == follower_id)
+        .group_by(TimelineEntry.author_id)
+        .subquery()
+    )
+
+
+def fan_out_post(db: Session, post_id: int, author_id: int, max_followers: int) -> int:
+    """
+    Write a new post into every follower's timeline with one INSERT ... SELECT.
+    Authors past `max_followers` are switched to read-time merging instead.
+    Does not commit; returns the number of timelines written.
+    """
+    if is_pull_author(db, author_id):
+        return 0
+    follower_count = (
+        db.query(func.count(UserFollow.id))
+        .filter(UserFollow.following_id == author_id)
+        .scalar()
+        or 0
+    )
+    if follower_count == 0:
+        return 0
+    if follower_count > max_followers:
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        db.execute(
+            dialect.insert(TimelinePullAuthor)
+            .values(author_id=author_id)
+            .on_conflict_do_nothing(index_elements=["author_id"])
+        )
+        return 0
+
+    rows = (
+        select(UserFollow.follower_id, Post.id, Post.user_id, Post.created_at)
+        .where(Post.id == post_id, UserFollow.following_id == Post.user_id)
+    )
+    result = db.execute(TimelineEntry.__table__.insert().from_select(TIMELINE_ENTRY_COLUMNS, rows))
+    return int(result.rowcount or 0)
+
+
+def backfill_timeline(db: Session, follower_id: int, author_id: int, limit: int) -> int:
+    """Copy the author's latest `limit` posts into a new follower's timeline. Does not commit."""
+    if limit <= 0 or is_pull_author(db, author_id):
+        return 0
+    already_listed = exists().where(
+        TimelineEntry.follower_id == follower_id,
+        TimelineEntry.post_id == Post.id,
+    )
+    rows = (
+        select(literal(follower_id), Post.id, Post.user_id, Post.created_at)
+        .where(Post.user_id == author_id, ~already_listed)
+        .order_by(desc(Post.created_at), desc(Post.id))
+        .limit(limit)
+    )
+    result = db.execute(TimelineEntry.__table__.insert().from_select(TIMELINE_ENTRY_COLUMNS, rows))
+    return int(result.rowcount or 0)
+
+
+def remove_author_from_timeline(db: Session, follower_id: int, author_id: int) -> int:
+    """Drop an author's posts from one follower's timeline (unfollow/block). Does not commit."""
+    return int(
+        db.query(TimelineEntry)
+        .filter(
+            TimelineEntry.follower_id == follower_id,
+            TimelineEntry.author_id == author_id,
+        )
+        .delete(synchronize_session=False)
+        or 0
+    )
+
+
+def discard_post_from_timelines(db: Session, post_id: int) -> int:
+    """Drop a deleted post from every timeline. Does not commit."""
+    return int(
+        db.query(TimelineEntry)
+        .filter(TimelineEntry.post_id == post_id)
+        .delete(synchronize_session=False)
+        or 0
+    )
+
+
+def trim_timelines(db: Session, max_entries: int, batch_size: int = 5000) -> int:
+    """
+    Cap every timeline at its newest `max_entries` posts, in committed batches of at
+    most `batch_size` rows. Older history is still served by the read-time fallback.
+    Returns the number of entries removed.
+    """
+    if max_entries <= 0:
+        return 0
+    over_cap = [
+        follower_id
+        for (follower_id,) in db.query(TimelineEntry.follower_id)
+        .group_by(TimelineEntry.follower_id)
+        .having(func.count() > max_entries)
+    ]
+    trimmed = 0
+    for follower_id in over_cap:
+        while True:
+            post_ids = [
+                post_id
+                for (post_id,) in db.query(TimelineEntry.post_id)
+                .filter(TimelineEntry.follower_id == follower_id)
+                .order_by(desc(TimelineEntry.created_at), desc(TimelineEntry.post_id))
+                .offset(max_entries)
+                .limit(batch_size)
+            ]
+            if not post_ids:
+                break
+            trimmed += int(
+                db.query(TimelineEntry)
+                .filter(
+                    TimelineEntry.follower_id == follower_id,
+                    TimelineEntry.post_id.in_(post_ids),
+                )
+                .delete(synchronize_session=False)
+                or 0
+            )
+            db.commit()
+            if len(post_ids) < batch_size:
+                break
+
+    db.rollback()
+    return trimmed
@@ -1,11 +1,67 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool import engine_options, instrument_engine
 
-engine = create_engine(settings.DATABASE_URL)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def build_async_database_url(database_url: str) -> str:
+    """Swap the sync driver of DATABASE_URL for its async counterpart (asyncpg / aiosqlite)."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def _create_engine(database_url: str, name: str):
+    return instrument_engine(create_engine(database_url, **engine_options(database_url)), name)
+
+
+def _create_async_engine(database_url: str, name: str):
+    async_engine = create_async_engine(database_url, **engine_options(database_url, is_async=True))
+    instrument_engine(async_engine.sync_engine, name)
+    return async_engine
+
+
+engine = _create_engine(settings.DATABASE_URL, "primary")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for routes ported to `async def` (see app.db.session.get_async_db).
+# The engine connects lazily, so importing this module never needs the database.
+async_engine = _create_async_engine(
+    settings.ASYNC_DATABASE_URL or build_async_database_url(settings.DATABASE_URL),
+    "async_primary",
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Read-only GET routes may go to a replica; without one they share the primary engines.
+if settings.DATABASE_READ_REPLICA_URL:
+    read_engine = _create_engine(settings.DATABASE_READ_REPLICA_URL, "replica")
+    async_read_engine = _create_async_engine(
+        build_async_database_url(settings.DATABASE_READ_REPLICA_URL), "async_replica"
+    )
+else:
+    read_engine = engine
+    async_read_engine = async_engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 # Ensure all models are imported so SQLAlchemy can resolve relationship strings.
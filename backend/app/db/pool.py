@@ -0,0 +1,173 @@
+import threading
+import time
+from typing import Optional
+from uuid import uuid4
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.config import settings
+from app.db.query_stats import instrument_statements, record_pool_wait
+
+
+class PoolMetrics:
+    """Checkout counts and time spent waiting for a pooled connection, per engine."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.pool: Optional[Pool] = None
+
+    def record_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def record_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            payload = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_ms_total / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_ms_max": round(self.wait_ms_max, 3),
+            }
+        pool = self.pool
+        if isinstance(pool, QueuePool):
+            payload.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        return payload
+
+
+class _TimedCheckoutMixin:
+    """Times `_do_get`, i.e. how long a checkout waited for a free (or new) connection."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        if self.metrics is None:
+            return super()._do_get()
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        wait_ms = (time.perf_counter() - started) * 1000
+        self.metrics.record_wait(wait_ms)
+        record_pool_wait(wait_ms)
+        return record
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+_pool_metrics: dict[str, PoolMetrics] = {}
+
+# Connection execution option that replaces DB_STATEMENT_TIMEOUT_MS for one transaction.
+STATEMENT_TIMEOUT_OPTION = "statement_timeout_ms"
+
+
+def engine_options(database_url: str, is_async: bool = False) -> dict:
+    """
+    create_engine / create_async_engine keyword arguments for `database_url`.
+    Pool sizing only applies to PostgreSQL; SQLite keeps SQLAlchemy's default pools.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        return {}
+
+    options = {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    connect_args: dict = {}
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE and is_async:
+        # Transaction pooling hands each transaction to an arbitrary server
+        # connection: named prepared statements don't survive.
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def instrument_engine(engine: Engine, name: str) -> Engine:
+    """
+    Register pool metrics and per-request statement timing for `engine` (the sync
+    engine; pass `.sync_engine` for async ones) and, on PostgreSQL, scope the
+    statement timeout to every transaction with SET LOCAL.
+    """
+    metrics = PoolMetrics(name)
+    pool = engine.pool
+    metrics.pool = pool
+    if isinstance(pool, _TimedCheckoutMixin):
+        pool.metrics = metrics
+    else:
+        event.listen(pool, "checkout", lambda *_args: metrics.record_checkout())
+    _pool_metrics[name] = metrics
+    instrument_statements(engine)
+
+    if engine.dialect.name == "postgresql":
+        event.listen(engine, "begin", _set_local_statement_timeout)
+
+    return engine
+
+
+def _set_local_statement_timeout(connection) -> None:
+    """
+    SET LOCAL survives transaction pooling and lets one transaction override the
+    default; a per-connection setting could do neither.
+    """
+    default_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    timeout_ms = connection.get_execution_options().get(STATEMENT_TIMEOUT_OPTION, default_ms)
+    if timeout_ms or default_ms:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+def with_statement_timeout(db: Session, timeout_ms: int) -> Session:
+    """
+    Begin `db`'s transaction with its own statement timeout (0 = none), e.g. for a
+    long export. Call before the first query; later transactions use the default.
+    """
+    db.connection(execution_options={STATEMENT_TIMEOUT_OPTION: timeout_ms})
+    return db
+
+
+def pool_stats() -> dict:
+    return {name: metrics.stats() for name, metrics in _pool_metrics.items()}
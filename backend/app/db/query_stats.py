@@ -0,0 +1,77 @@
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SLOWEST_STATEMENT_MAX_CHARS = 300
+
+
+class QueryStats:
+    """SQL statements one request sent, how long they took and how long it waited for connections."""
+
+    __slots__ = ("statements", "db_time_ms", "slowest_ms", "slowest_statement", "pool_wait_ms")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.pool_wait_ms = 0.0
+
+    def record_statement(self, statement: str, elapsed_ms: float) -> None:
+        self.statements += 1
+        self.db_time_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+    def record_pool_wait(self, wait_ms: float) -> None:
+        self.pool_wait_ms += wait_ms
+
+    def slowest_statement_preview(self) -> Optional[str]:
+        if self.slowest_statement is None:
+            return None
+        return " ".join(self.slowest_statement.split())[:SLOWEST_STATEMENT_MAX_CHARS]
+
+
+# Set per request by the metrics middleware. Threadpool routes, run_sync greenlets and
+# asyncio tasks inherit a copy of the context, so they all update the same object.
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def begin_request_stats() -> tuple[QueryStats, Token]:
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+
+def end_request_stats(token: Token) -> None:
+    _current.reset(token)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def record_pool_wait(wait_ms: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.record_pool_wait(wait_ms)
+
+
+def instrument_statements(engine: Engine) -> None:
+    """Time every statement `engine` executes into the current request's QueryStats."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(_conn, _cursor, _statement, _parameters, context, _executemany):
+        if context is not None and _current.get() is not None:
+            context._query_stats_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop_timer(_conn, _cursor, statement, _parameters, context, _executemany):
+        stats = _current.get()
+        started = getattr(context, "_query_stats_started", None)
+        if stats is None or started is None:
+            return
+        stats.record_statement(statement, (time.perf_counter() - started) * 1000)
@@ -1,5 +1,8 @@
-from typing import Generator
-from app.db.base import SessionLocal
+from typing import AsyncGenerator, Generator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import AsyncReadSessionLocal, AsyncSessionLocal, ReadSessionLocal, SessionLocal
 
 
 def get_db() -> Generator:
@@ -8,3 +11,28 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+def get_read_db() -> Generator:
+    """get_db for read-only routes; uses DATABASE_READ_REPLICA_URL when configured."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async counterpart of get_db. Existing sync CRUD helpers are reused through
+    `await db.run_sync(fn, *args)`; ORM objects must be read (including lazy
+    relationships) inside that call, not after it returns.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """get_async_db for read-only routes; replica-backed when one is configured."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -2,10 +2,10 @@ import logging
 import time
 from datetime import datetime, timezone
 
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
@@ -27,10 +27,32 @@ from app.api.v1 import mcp_categories, mcp_playground, mcp_reviews, mcp_servers
 from app.api.v1 import analytics
 from app.api.v1 import blog
 from app.core.config import settings
+from app.core.metrics import (
+    mark_worker_dead,
+    observe_query_stats,
+    observe_request,
+    render_metrics,
+    route_template,
+)
 from app.core.security import get_password_hash, verify_password
+from app.db.base import async_engine, async_read_engine
+from app.db.pool import pool_stats
+from app.db.query_stats import begin_request_stats, end_request_stats
 from app.db.session import SessionLocal
 from app.models.user import User
+from app.services.ai_log_writer import ai_log_writer
+from app.services.ai_service import ai_service
+from app.services.follow_graph import follow_graph_cache
 from app.services.github_sync import sync_all_github_stats
+from app.services.hot_score import hot_score_board
+from app.services.notification_counters import notification_counter_reconciler
+from app.services.notification_hub import notification_hub
+from app.services.notification_outbox import notification_outbox_worker
+from app.services.notification_retention import notification_archiver
+from app.services.principal_cache import principal_cache
+from app.services.response_cache import response_cache
+from app.services.timeline import timeline_trimmer
+from app.services.view_counter import view_counter
 
 logger = logging.getLogger(__name__)
 
@@ -51,31 +73,64 @@ app = FastAPI(
 @app.middleware("http")
 async def request_metrics_middleware(request: Request, call_next):
     start = time.perf_counter()
+    query_stats, query_stats_token = begin_request_stats()
     try:
         response = await call_next(request)
     except Exception:
         duration_ms = (time.perf_counter() - start) * 1000
+        route = route_template(request)
+        observe_request(request.method, route, 500, duration_ms / 1000)
+        observe_query_stats(request.method, route, query_stats)
         if settings.REQUEST_LOG_ENABLED:
             logger.exception(
-                "request_error method=%s path=%s duration_ms=%.2f",
+                "request_error method=%s path=%s duration_ms=%.2f db_statements=%d db_ms=%.2f",
                 request.method,
                 request.url.path,
                 duration_ms,
+                query_stats.statements,
+                query_stats.db_time_ms,
             )
         raise
+    finally:
+        end_request_stats(query_stats_token)
 
     duration_ms = (time.perf_counter() - start) * 1000
+    route = route_template(request)
+    observe_request(request.method, route, response.status_code, duration_ms / 1000)
+    observe_query_stats(request.method, route, query_stats)
     response.headers["X-Process-Time-Ms"] = f"{duration_ms:.2f}"
+    if settings.REQUEST_DB_DEBUG_HEADERS:
+        response.headers["X-DB-Statements"] = str(query_stats.statements)
+        response.headers["X-DB-Time-Ms"] = f"{query_stats.db_time_ms:.2f}"
+        response.headers["X-DB-Slowest-Ms"] = f"{query_stats.slowest_ms:.2f}"
+        response.headers["X-DB-Pool-Wait-Ms"] = f"{query_stats.pool_wait_ms:.2f}"
 
     if settings.REQUEST_LOG_ENABLED:
-        log_fn = logger.warning if duration_ms >= settings.SLOW_REQUEST_THRESHOLD_MS else logger.info
-        log_fn(
-            "request method=%s path=%s status=%s duration_ms=%.2f",
-            request.method,
-            request.url.path,
-            response.status_code,
-            duration_ms,
-        )
+        if duration_ms >= settings.SLOW_REQUEST_THRESHOLD_MS:
+            logger.warning(
+                "slow_request method=%s path=%s route=%s status=%s duration_ms=%.2f "
+                "db_statements=%d db_ms=%.2f db_slowest_ms=%.2f db_pool_wait_ms=%.2f db_slowest=%r",
+                request.method,
+                request.url.path,
+                route,
+                response.status_code,
+                duration_ms,
+                query_stats.statements,
+                query_stats.db_time_ms,
+                query_stats.slowest_ms,
+                query_stats.pool_wait_ms,
+                query_stats.slowest_statement_preview(),
+            )
+        else:
+            logger.info(
+                "request method=%s path=%s status=%s duration_ms=%.2f db_statements=%d db_ms=%.2f",
+                request.method,
+                request.url.path,
+                response.status_code,
+                duration_ms,
+                query_stats.statements,
+                query_stats.db_time_ms,
+            )
 
     return response
 
@@ -232,12 +287,13 @@ def ensure_performance_indexes(db: Session) -> None:
         "CREATE INDEX IF NOT EXISTS ix_posts_created_at ON posts (created_at)",
         "CREATE INDEX IF NOT EXISTS ix_posts_category_id ON posts (category_id)",
         "CREATE INDEX IF NOT EXISTS ix_posts_category_created_at ON posts (category_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_posts_created_at_id ON posts (created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_posts_views_created_at_id ON posts (views, created_at, id)",
         "CREATE INDEX IF NOT EXISTS ix_posts_is_pinned_pinned_order_created_at ON posts (is_pinned, pinned_order, created_at)",
         "CREATE INDEX IF NOT EXISTS ix_comments_post_id ON comments (post_id)",
-        "CREATE INDEX IF NOT EXISTS ix_comments_post_created_at ON comments (post_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_comments_post_created_at_id ON comments (post_id, created_at, id)",
         "CREATE INDEX IF NOT EXISTS ix_bookmarks_user_id ON bookmarks (user_id)",
-        "CREATE INDEX IF NOT EXISTS ix_notifications_user_created_at ON notifications (user_id, created_at)",
-        "CREATE INDEX IF NOT EXISTS ix_notifications_user_is_read ON notifications (user_id, is_read)",
+        "CREATE INDEX IF NOT EXISTS ix_notifications_user_created_at_id ON notifications (user_id, created_at, id)",
     ]
 
     for statement in index_statements:
@@ -268,6 +324,15 @@ async def startup_sync_github():
     finally:
         db.close()
 
+    view_counter.start(SessionLocal)
+    hot_score_board.start(SessionLocal)
+    notification_hub.start()
+    notification_counter_reconciler.start(SessionLocal)
+    notification_outbox_worker.start(SessionLocal)
+    notification_archiver.start(SessionLocal)
+    timeline_trimmer.start(SessionLocal)
+    ai_log_writer.start(SessionLocal)
+
 
 @app.on_event("shutdown")
 async def shutdown_mcp_connections():
@@ -276,6 +341,63 @@ async def shutdown_mcp_connections():
     await playground_service.shutdown()
 
 
+@app.on_event("shutdown")
+async def shutdown_view_counter():
+    await view_counter.shutdown(SessionLocal)
+
+
+@app.on_event("shutdown")
+async def shutdown_hot_score_board():
+    await hot_score_board.shutdown()
+
+
+@app.on_event("shutdown")
+async def shutdown_notification_hub():
+    await notification_hub.shutdown()
+
+
+@app.on_event("shutdown")
+async def shutdown_notification_outbox_worker():
+    await notification_outbox_worker.shutdown()
+
+
+@app.on_event("shutdown")
+async def shutdown_notification_archiver():
+    await notification_archiver.shutdown()
+
+
+@app.on_event("shutdown")
+async def shutdown_timeline_trimmer():
+    await timeline_trimmer.shutdown()
+
+
+@app.on_event("shutdown")
+async def shutdown_notification_counter_reconciler():
+    await notification_counter_reconciler.shutdown()
+
+
+@app.on_event("shutdown")
+async def shutdown_ai_log_writer():
+    await ai_log_writer.shutdown(SessionLocal)
+
+
+@app.on_event("shutdown")
+async def shutdown_ai_service():
+    await ai_service.aclose()
+
+
+@app.on_event("shutdown")
+def shutdown_metrics():
+    mark_worker_dead()
+
+
+@app.on_event("shutdown")
+async def shutdown_async_engine():
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
+
 @app.get("/")
 def root():
     return {"message": "jion MCP Marketplace API", "version": "2.0.0"}
@@ -286,6 +408,15 @@ def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    # Scraped straight from the backend; nginx does not route /metrics publicly.
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/health/detailed")
 def detailed_health():
     db_status = "ok"
@@ -306,6 +437,19 @@ def detailed_health():
         "checks": {
             "database": db_status,
         },
+        "view_counter": view_counter.stats(),
+        "hot_score": hot_score_board.stats(),
+        "response_cache": response_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+        "follow_graph_cache": follow_graph_cache.stats(),
+        "notification_push": notification_hub.stats(),
+        "notification_counters": notification_counter_reconciler.stats(),
+        "notification_outbox": notification_outbox_worker.stats(),
+        "notification_retention": notification_archiver.stats(),
+        "timeline": timeline_trimmer.stats(),
+        "ai": ai_service.stats(),
+        "ai_log_writer": ai_log_writer.stats(),
+        "db_pools": pool_stats(),
     }
     if db_error:
         payload["checks"]["database_error"] = db_error
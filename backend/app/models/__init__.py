@@ -6,6 +6,9 @@ from app.models.like import Like
 from app.models.file import File
 from app.models.bookmark import Bookmark
 from app.models.notification import Notification
+from app.models.user_notification_stats import UserNotificationStats
+from app.models.notification_outbox import NotificationOutbox
+from app.models.notification_archive import NotificationArchive
 from app.models.mcp_category import McpCategory
 from app.models.mcp_server import McpServer
 from app.models.mcp_tool import McpTool
@@ -17,19 +20,25 @@ from app.models.recruit_meta import RecruitMeta
 from app.models.recruit_application import RecruitApplication
 from app.models.user_follow import UserFollow
 from app.models.user_block import UserBlock
+from app.models.timeline_entry import TimelineEntry
+from app.models.timeline_pull_author import TimelinePullAuthor
 from app.models.email_verification_token import EmailVerificationToken
 from app.models.signup_email_verification import SignupEmailVerification
 from app.models.ai_action_log import AiActionLog
+from app.models.ai_usage_rollup import AiUsageRollup
 from app.models.blog_post import BlogPost
 from app.models.blog_category import BlogCategory
 
 __all__ = [
     "User", "Post", "Comment", "Category", "Like", "File", "Bookmark", "Notification",
+    "UserNotificationStats", "NotificationOutbox", "NotificationArchive",
     "McpCategory", "McpServer", "McpTool", "McpReview", "McpInstallGuide",
     "PlaygroundUsage", "AnalyticsEvent", "RecruitMeta", "RecruitApplication", "UserFollow", "UserBlock",
+    "TimelineEntry", "TimelinePullAuthor",
     "EmailVerificationToken",
     "SignupEmailVerification",
     "AiActionLog",
+    "AiUsageRollup",
     "BlogPost",
     "BlogCategory",
 ]
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, DateTime, Float, Integer, String
+
+from app.db.base import Base
+
+
+class AiUsageRollup(Base):
+    """
+    Hourly per-model, per-intent totals of upstream AI calls, split by latency bucket
+    so percentiles can be read back without scanning `ai_action_logs`. Written by the
+    AI log writer in the same transaction as the log rows it summarizes.
+    """
+
+    __tablename__ = "ai_usage_rollups"
+
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    model = Column(String(120), primary_key=True)
+    intent = Column(String(40), primary_key=True)  # "" when the call had no intent
+    latency_le_ms = Column(Integer, primary_key=True)  # upper bound of the latency bucket
+    requests = Column(Integer, nullable=False, default=0)
+    failures = Column(Integer, nullable=False, default=0)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    total_tokens = Column(Integer, nullable=False, default=0)
+    cost_usd = Column(Float, nullable=False, default=0.0)
+    latency_ms_sum = Column(Float, nullable=False, default=0.0)
@@ -0,0 +1,24 @@
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class NotificationArchive(Base):
+    """
+    Cold storage for notifications moved out of `notifications` by the archive job
+    (read and past retention, or beyond a user's inbox cap). Ids are kept; related
+    post/comment ids are plain columns so deleting content never touches this table.
+    """
+
+    __tablename__ = "notifications_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    type = Column(String(50), nullable=False)
+    content = Column(Text, nullable=False)
+    related_post_id = Column(Integer, nullable=True)
+    related_comment_id = Column(Integer, nullable=True)
+    is_read = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
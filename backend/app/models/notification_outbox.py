@@ -0,0 +1,29 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class NotificationOutbox(Base):
+    """
+    Notification events written in the same transaction as the like/comment/
+    application that caused them, and turned into `notifications` rows by the
+    outbox worker. Rows are deleted once dispatched; rows that exhausted their
+    attempts stay behind for inspection.
+    """
+
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    type = Column(String(50), nullable=False)
+    content = Column(Text, nullable=False)
+    actor_name = Column(String(50), nullable=True)
+    related_post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=True)
+    related_comment_id = Column(Integer, ForeignKey("comments.id", ondelete="CASCADE"), nullable=True)
+    # Events sharing a key (e.g. likes on one post for one recipient) may be merged.
+    coalesce_key = Column(String(120), nullable=True, index=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+    available_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
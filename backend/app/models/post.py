@@ -22,6 +22,12 @@ class Post(Base):
     pinned_order = Column(Integer, nullable=True, index=True)
     post_type = Column(String(20), nullable=False, default="NORMAL", server_default="NORMAL", index=True)
 
+    # Denormalized engagement counters, kept in step by the like/comment/bookmark CRUD paths.
+    # `python -m app.repair_post_counters` reconciles any drift against the source tables.
+    likes_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    bookmark_count = Column(Integer, nullable=False, default=0, server_default="0")
+
     author = relationship("User", back_populates="posts")
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
     likes = relationship("Like", back_populates="post", cascade="all, delete-orphan")
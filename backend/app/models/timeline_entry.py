@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+
+from app.db.base import Base
+
+
+class TimelineEntry(Base):
+    """
+    One post in one follower's home timeline, written when the post is created
+    (fan-out on write) or when the follow is made (backfill). `created_at` is the
+    post's, copied so the (follower_id, created_at, post_id) index can serve a page.
+    """
+
+    __tablename__ = "timeline_entries"
+    __table_args__ = (
+        Index("ix_timeline_entries_follower_created_at_post", "follower_id", "created_at", "post_id"),
+        Index("ix_timeline_entries_follower_author", "follower_id", "author_id"),
+    )
+
+    follower_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True, index=True)
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
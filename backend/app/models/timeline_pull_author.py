@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class TimelinePullAuthor(Base):
+    """
+    Authors with too many followers to fan out to. Their posts are merged into
+    timelines at read time instead; once listed an author stays listed, since their
+    earlier posts were never written to anyone's timeline.
+    """
+
+    __tablename__ = "timeline_pull_authors"
+
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
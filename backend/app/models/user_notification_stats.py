@@ -0,0 +1,19 @@
+from sqlalchemy import Column, ForeignKey, Integer
+
+from app.db.base import Base
+
+
+class UserNotificationStats(Base):
+    """
+    Materialized notification counters, one row per user.
+
+    Notifications with id <= read_through_id count as read even if their own
+    is_read flag is still false; "mark all as read" only moves this watermark.
+    """
+
+    __tablename__ = "user_notification_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_count = Column(Integer, nullable=False, default=0, server_default="0")
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0")
+    read_through_id = Column(Integer, nullable=False, default=0, server_default="0")
@@ -0,0 +1,26 @@
+import argparse
+
+from app.crud.notification import reconcile_notification_counters
+from app.db.session import SessionLocal
+
+
+def repair_notification_counters(user_ids: list[int] | None = None) -> int:
+    db = SessionLocal()
+    try:
+        return reconcile_notification_counters(db, user_ids=user_ids)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Reconcile user_notification_stats.total_count/unread_count with the notifications table."
+    )
+    parser.add_argument("user_ids", nargs="*", type=int, help="limit the repair to these users")
+    args = parser.parse_args()
+
+    repaired = repair_notification_counters(args.user_ids or None)
+    print(f"Notification counter repair completed: repaired={repaired}")
@@ -0,0 +1,26 @@
+import argparse
+
+from app.crud.post import reconcile_engagement_counters
+from app.db.session import SessionLocal
+
+
+def repair_post_counters(post_ids: list[int] | None = None) -> int:
+    db = SessionLocal()
+    try:
+        return reconcile_engagement_counters(db, post_ids=post_ids)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Reconcile posts.likes_count/comment_count/bookmark_count with the source tables."
+    )
+    parser.add_argument("post_ids", nargs="*", type=int, help="limit the repair to these posts")
+    args = parser.parse_args()
+
+    repaired = repair_post_counters(args.post_ids or None)
+    print(f"Post engagement counter repair completed: repaired={repaired}")
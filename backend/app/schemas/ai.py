@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Literal, Optional
 
 from pydantic import BaseModel, Field, model_validator
@@ -93,3 +94,26 @@ class AiEditorMaskResponse(BaseModel):
     masked_text: str
     redactions: list[str] = Field(default_factory=list)
     cached: bool = False
+
+
+class AiUsageItem(BaseModel):
+    model: str
+    intent: Optional[str] = None
+    requests: int
+    failures: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    cost_usd: float
+    avg_latency_ms: Optional[float] = None
+    p50_latency_ms: Optional[float] = None
+    p95_latency_ms: Optional[float] = None
+
+
+class AiUsageSummaryResponse(BaseModel):
+    from_date: datetime
+    to_date: datetime
+    total_requests: int
+    total_tokens: int
+    total_cost_usd: float
+    items: list[AiUsageItem]
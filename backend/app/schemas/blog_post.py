@@ -62,6 +62,7 @@ class BlogPostListItem(BaseModel):
     views: int
     created_at: datetime
     author: AuthorSummary
+    search_snippet: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -21,3 +21,9 @@ class CommentResponse(CommentBase):
 
     class Config:
         from_attributes = True
+
+
+class CommentPageResponse(BaseModel):
+    comments: List[CommentResponse]
+    # None on the last page.
+    next_cursor: Optional[str] = None
@@ -17,6 +17,8 @@ class FollowResponse(BaseModel):
 class FollowStatusResponse(BaseModel):
     user_id: int
     is_following: bool
+    followers_count: int = 0
+    following_count: int = 0
 
 
 class FollowUserSummary(BaseModel):
@@ -24,6 +26,8 @@ class FollowUserSummary(BaseModel):
     username: str
     profile_image_url: Optional[str] = None
     followed_at: datetime
+    # Whether the requesting user follows this user (False when anonymous).
+    is_following: bool = False
 
 
 class FollowUserListResponse(BaseModel):
@@ -86,6 +86,7 @@ class McpServerResponse(McpServerBase):
     updated_at: datetime
     tools: list[McpToolResponse] = []
     install_guides: list[McpInstallGuideResponse] = []
+    search_snippet: str | None = None
 
     class Config:
         from_attributes = True
@@ -11,6 +11,11 @@ class NotificationCreate(BaseModel):
     related_comment_id: Optional[int] = None
 
 
+class NotificationEvent(NotificationCreate):
+    """A notification queued in the outbox; actor_name lets bursts be coalesced."""
+    actor_name: Optional[str] = None
+
+
 class NotificationResponse(BaseModel):
     id: int
     user_id: int
@@ -35,7 +40,13 @@ class NotificationListResponse(BaseModel):
     page: int
     page_size: int
     notifications: List[NotificationResponse]
+    next_cursor: Optional[str] = None
 
 
 class NotificationUnreadCountResponse(BaseModel):
     unread_count: int
+
+
+class NotificationStreamTicketResponse(BaseModel):
+    ticket: str
+    expires_in: int
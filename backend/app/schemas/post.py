@@ -109,16 +109,20 @@ class PostResponse(PostBase):
     category_name: Optional[str] = None
     category_slug: Optional[str] = None
     recruit_meta: Optional[RecruitMetaResponse] = None
+    # HTML-escaped excerpt with <mark> around hits; only set on search listings.
+    search_snippet: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 
 class PostListResponse(BaseModel):
-    total: int
+    # None when the client opted out of counting (total_mode=none).
+    total: Optional[int] = None
     page: int
     page_size: int
     posts: List[PostResponse]
+    next_cursor: Optional[str] = None
 
 
 class RecruitApplicationCreate(BaseModel):
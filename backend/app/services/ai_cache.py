@@ -0,0 +1,242 @@
+import heapq
+import json
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.metrics import AI_CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+REDIS_ENTRY_KEY = "ai:cache:{key}"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(text: str, *, fold: bool = True) -> str:
+    """
+    Canonical form of user text for cache keys: Unicode NFC, and with `fold` also
+    collapsed whitespace and casefolding, so "FastAPI  에러" and "fastapi 에러" share
+    an entry. Editor text keeps its case and layout since the output echoes it.
+    """
+    normalized = unicodedata.normalize("NFC", text).strip()
+    if fold:
+        normalized = _WHITESPACE_RE.sub(" ", normalized).casefold()
+    return normalized
+
+
+def endpoint_label(key: str) -> str:
+    """`chat:<hash>` -> `chat`, `editor:v2:tags:<hash>` -> `editor:v2:tags`."""
+    return key.rsplit(":", 1)[0] if ":" in key else key
+
+
+@dataclass
+class CachedAiResponse:
+    value: Any
+    expires_at: float
+    negative: bool = False
+    tier: str = "l1"
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"value": self.value, "expires_at": self.expires_at, "negative": self.negative},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, raw) -> "CachedAiResponse":
+        data = json.loads(raw)
+        return cls(
+            value=data["value"],
+            expires_at=float(data["expires_at"]),
+            negative=bool(data.get("negative")),
+            tier="l2",
+        )
+
+
+class AiResponseCache:
+    """
+    Two-tier cache for AI responses.
+
+    L1 is a per-process LRU bounded by both entry count and serialized size; expiry is
+    tracked in a min-heap so a write only pops the entries that are actually due
+    instead of scanning everything. With the redis backend, entries are also written
+    to a shared L2 so every worker can answer a prompt any of them has seen.
+    Negative entries (model failures) are stored with a short TTL so a burst of
+    retries does not hammer a failing upstream.
+    """
+
+    def __init__(self, backend: str, max_items: int, max_bytes: int, max_entry_bytes: int):
+        self.backend = backend
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._l1: OrderedDict[str, tuple[CachedAiResponse, int]] = OrderedDict()
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._l1_bytes = 0
+        self._lock = threading.Lock()
+        self._redis: Optional[redis.Redis] = None
+        self.metrics = {
+            "hits_l1": 0,
+            "hits_l2": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "oversized": 0,
+            "errors": 0,
+        }
+        self._endpoint_lookups: dict[str, dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+    def _get_redis(self) -> Optional[redis.Redis]:
+        if self.backend != "redis":
+            return None
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5)
+        return self._redis
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def _record_lookup(self, key: str, entry: Optional[CachedAiResponse]) -> None:
+        endpoint = endpoint_label(key)
+        if entry is None:
+            result = "miss"
+        elif entry.negative:
+            result = "negative_hit"
+        else:
+            result = f"hit_{entry.tier}"
+        with self._lock:
+            if entry is None:
+                self.metrics["misses"] += 1
+            elif entry.negative:
+                self.metrics["negative_hits"] += 1
+            else:
+                self.metrics[f"hits_{entry.tier}"] += 1
+            self._endpoint_lookups[endpoint]["misses" if entry is None else "hits"] += 1
+        AI_CACHE_LOOKUPS.labels(endpoint, result).inc()
+
+    # --- L1 -----------------------------------------------------------------
+
+    def _pop_l1(self, key: str) -> None:
+        item = self._l1.pop(key, None)
+        if item is not None:
+            self._l1_bytes -= item[1]
+
+    def _expire_l1(self, now: float) -> None:
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            item = self._l1.get(key)
+            # A rewritten key leaves its old heap entry behind; only drop the live one.
+            if item is not None and item[0].expires_at == expires_at:
+                self._pop_l1(key)
+
+    def _store_l1(self, key: str, entry: CachedAiResponse, size: int, now: float) -> None:
+        with self._lock:
+            self._expire_l1(now)
+            self._pop_l1(key)
+            self._l1[key] = (entry, size)
+            self._l1_bytes += size
+            heapq.heappush(self._expiry_heap, (entry.expires_at, key))
+            while self._l1 and (len(self._l1) > self.max_items or self._l1_bytes > self.max_bytes):
+                oldest = next(iter(self._l1))
+                self._pop_l1(oldest)
+                self.metrics["evictions"] += 1
+            # Heap entries for evicted keys are skipped lazily; rebuild if they pile up.
+            if len(self._expiry_heap) > 2 * self.max_items:
+                self._expiry_heap = [(item.expires_at, k) for k, (item, _size) in self._l1.items()]
+                heapq.heapify(self._expiry_heap)
+
+    def _read_l1(self, key: str, now: float) -> Optional[CachedAiResponse]:
+        with self._lock:
+            item = self._l1.get(key)
+            if item is None:
+                return None
+            entry = item[0]
+            if entry.expires_at <= now:
+                self._pop_l1(key)
+                return None
+            self._l1.move_to_end(key)
+            return entry
+
+    # --- public API ---------------------------------------------------------
+
+    def get(self, key: str) -> Optional[CachedAiResponse]:
+        now = time.time()
+        entry = self._read_l1(key, now)
+        if entry is None:
+            entry = self._read_l2(key, now)
+        self._record_lookup(key, entry)
+        return entry
+
+    def _read_l2(self, key: str, now: float) -> Optional[CachedAiResponse]:
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            raw = client.get(REDIS_ENTRY_KEY.format(key=key))
+        except redis.RedisError as exc:
+            self._count("errors")
+            logger.warning("AI cache read failed: %s", exc)
+            return None
+        if raw is None:
+            return None
+        entry = CachedAiResponse.from_json(raw)
+        if entry.expires_at <= now:
+            return None
+        self._store_l1(key, CachedAiResponse(entry.value, entry.expires_at, entry.negative), len(raw), now)
+        return entry
+
+    def set(self, key: str, value: Any, ttl_seconds: int, *, negative: bool = False) -> None:
+        now = time.time()
+        entry = CachedAiResponse(value=value, expires_at=now + ttl_seconds, negative=negative)
+        raw = entry.to_json()
+        size = len(raw.encode("utf-8"))
+        if size > self.max_entry_bytes:
+            self._count("oversized")
+            return
+        self._store_l1(key, entry, size, now)
+        client = self._get_redis()
+        if client is not None:
+            try:
+                client.set(REDIS_ENTRY_KEY.format(key=key), raw, ex=max(1, int(ttl_seconds)))
+            except redis.RedisError as exc:
+                self._count("errors")
+                logger.warning("AI cache write failed: %s", exc)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._l1.clear()
+            self._expiry_heap.clear()
+            self._l1_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            metrics = dict(self.metrics)
+            endpoints = {name: dict(counts) for name, counts in self._endpoint_lookups.items()}
+            l1_items, l1_bytes = len(self._l1), self._l1_bytes
+        hits = metrics["hits_l1"] + metrics["hits_l2"] + metrics["negative_hits"]
+        lookups = hits + metrics["misses"]
+        return {
+            "backend": self.backend,
+            "l1_items": l1_items,
+            "l1_bytes": l1_bytes,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            **metrics,
+            "endpoints": {
+                name: {
+                    **counts,
+                    "hit_ratio": round(counts["hits"] / (counts["hits"] + counts["misses"]), 4),
+                }
+                for name, counts in endpoints.items()
+            },
+        }
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import ai_action_log as crud_ai_action_log
+from app.services.ai_service import MODEL_FAILURE_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# A batch that keeps failing (e.g. a bad row) is dropped instead of retried forever.
+MAX_FLUSH_ATTEMPTS = 3
+
+
+def _rollups(rows: list[dict]) -> list[dict]:
+    """Sum a batch into hourly (model, intent, latency bucket) deltas for the rollup table."""
+    rollups: dict[tuple, dict] = {}
+    for row in rows:
+        # Only upstream calls count; coalesced followers share the leader's call.
+        if not row.get("model") or row["status"] == "coalesced":
+            continue
+        key = (
+            row["created_at"].replace(minute=0, second=0, microsecond=0),
+            row["model"],
+            row.get("intent") or "",
+            crud_ai_action_log.latency_bucket(row.get("latency_ms")),
+        )
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = dict(zip(crud_ai_action_log.ROLLUP_KEY_COLUMNS, key))
+            rollup.update({column: 0 for column in crud_ai_action_log.ROLLUP_SUM_COLUMNS})
+            rollups[key] = rollup
+        rollup["requests"] += 1
+        rollup["failures"] += int(row["status"] in MODEL_FAILURE_STATUSES)
+        rollup["prompt_tokens"] += row.get("prompt_tokens") or 0
+        rollup["completion_tokens"] += row.get("completion_tokens") or 0
+        rollup["total_tokens"] += row.get("total_tokens") or 0
+        rollup["cost_usd"] += row.get("cost_usd") or 0.0
+        rollup["latency_ms_sum"] += row.get("latency_ms") or 0.0
+    return list(rollups.values())
+
+
+class AiLogWriter:
+    """
+    Buffers AI action log rows in memory and writes them off the request path.
+
+    A background task flushes every `flush_interval_ms`, or as soon as `batch_size`
+    rows are waiting, with one multi-row INSERT per batch; the hourly usage rollups
+    for the batch are upserted in the same transaction. The buffer holds at most
+    `max_buffer` rows: past that new rows are dropped and counted rather than
+    growing memory or blocking requests. Failed batches are put back at the front
+    and retried a few times. Shutdown writes out whatever is still buffered.
+    """
+
+    def __init__(self, batch_size: int, flush_interval_ms: int, max_buffer: int):
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.max_buffer = max_buffer
+        self._buffer: deque[tuple[int, dict]] = deque()
+        self._lock = threading.Lock()
+        self._wake: Optional[asyncio.Event] = None
+        self._wake_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self.metrics = {
+            "recorded": 0,
+            "written": 0,
+            "batches": 0,
+            "dropped_full": 0,
+            "dropped_failed": 0,
+            "flush_failures": 0,
+            "last_batch_ms": 0.0,
+        }
+
+    def record(self, **row) -> bool:
+        """Queue one `ai_action_logs` row; returns False when the buffer is full and it was dropped."""
+        row["created_at"] = datetime.now(timezone.utc)
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                self.metrics["dropped_full"] += 1
+                return False
+            self._buffer.append((0, row))
+            self.metrics["recorded"] += 1
+            full_batch = len(self._buffer) >= self.batch_size
+        if full_batch and self._wake is not None:
+            self._wake_loop.call_soon_threadsafe(self._wake.set)
+        return True
+
+    def _take_batch(self) -> list[tuple[int, dict]]:
+        with self._lock:
+            return [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+
+    def _requeue(self, batch: list[tuple[int, dict]]) -> None:
+        with self._lock:
+            room = self.max_buffer - len(self._buffer)
+            retry = [(attempts + 1, row) for attempts, row in batch if attempts + 1 < MAX_FLUSH_ATTEMPTS]
+            kept = retry[:max(0, room)]
+            self._buffer.extendleft(reversed(kept))
+            self.metrics["dropped_failed"] += len(batch) - len(kept)
+
+    def flush(self, db: Session) -> int:
+        """Write everything buffered so far in `batch_size` chunks; returns rows written."""
+        written = 0
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return written
+            started = time.perf_counter()
+            rows = [row for _attempts, row in batch]
+            try:
+                crud_ai_action_log.insert_ai_action_logs(db, rows)
+                crud_ai_action_log.upsert_ai_usage_rollups(db, _rollups(rows))
+                db.commit()
+            except Exception as exc:
+                db.rollback()
+                self._requeue(batch)
+                with self._lock:
+                    self.metrics["flush_failures"] += 1
+                logger.warning("AI action log flush failed for %d rows: %s", len(rows), exc)
+                return written
+            written += len(rows)
+            with self._lock:
+                self.metrics["written"] += len(rows)
+                self.metrics["batches"] += 1
+                self.metrics["last_batch_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    def flush_with_session(self, session_factory: Callable[[], Session]) -> int:
+        db = session_factory()
+        try:
+            return self.flush(db)
+        finally:
+            db.close()
+
+    async def _flush_loop(self, session_factory: Callable[[], Session]) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await asyncio.to_thread(self.flush_with_session, session_factory)
+            except Exception as exc:
+                logger.warning("AI action log flush loop error: %s", exc)
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._wake_loop = asyncio.get_running_loop()
+            self._task = asyncio.create_task(self._flush_loop(session_factory))
+
+    async def shutdown(self, session_factory: Callable[[], Session]) -> None:
+        """Stop the periodic flush and write out whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._wake = None
+        await asyncio.to_thread(self.flush_with_session, session_factory)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "batch_size": self.batch_size,
+                "max_buffer": self.max_buffer,
+                "buffered": len(self._buffer),
+                **self.metrics,
+            }
+
+
+ai_log_writer = AiLogWriter(
+    batch_size=settings.AI_LOG_BATCH_SIZE,
+    flush_interval_ms=settings.AI_LOG_FLUSH_INTERVAL_MS,
+    max_buffer=settings.AI_LOG_MAX_BUFFER,
+)
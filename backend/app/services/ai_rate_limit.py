@@ -0,0 +1,266 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+import redis
+import redis.asyncio as redis_async
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TIER_ANON = "anon"
+TIER_USER = "user"
+TIER_ADMIN = "admin"
+
+REDIS_TAT_KEY = "ai:rl:{key}"
+REDIS_SPEND_KEY = "ai:spend:{day}:{scope}"
+SPEND_KEY_TTL_SECONDS = 2 * 24 * 3600
+GLOBAL_SCOPE = "all"
+
+# GCRA: one key holds the bucket's theoretical arrival time (TAT) in ms. A request is
+# allowed while TAT - now stays within the burst; the key expires when the bucket is
+# full again, so idle identities cost nothing.
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - burst
+if allow_at > now then
+    return {0, allow_at - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, 0}
+"""
+
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    reason: Optional[str] = None  # "rate" or "budget" when rejected
+    retry_after_seconds: int = 0
+
+
+def _utc_day() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+def _seconds_until_utc_midnight() -> int:
+    now = datetime.now(timezone.utc)
+    return max(1, 24 * 3600 - (now.hour * 3600 + now.minute * 60 + now.second))
+
+
+class AiRateLimiter:
+    """
+    Per-identity GCRA (token bucket) limits for AI endpoints plus daily USD budgets.
+
+    Limits are tiered: anonymous callers by IP, signed-in users and admins each get
+    `max_requests` per `window_seconds` with the same burst. With the redis backend the
+    bucket check is one atomic Lua call shared by every worker; the memory backend
+    (and the fallback when redis is down) keeps per-process buckets that are dropped
+    once idle, so with N workers it allows N times the limit and N budgets. Spend is
+    the `cost_usd` of each logged model call, summed per UTC day globally and per user;
+    admins are exempt from the per-user budget only.
+
+    Redis is reached through redis.asyncio so a check never blocks the event loop;
+    `record_spend` is called from sync logging code and sends its increment from a
+    background task on the running loop.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        window_seconds: int,
+        tier_limits: dict[str, int],
+        daily_budget_usd: float,
+        daily_user_budget_usd: float,
+    ):
+        self.backend = backend
+        self.window_seconds = window_seconds
+        self.tier_limits = tier_limits
+        self.daily_budget_usd = daily_budget_usd
+        self.daily_user_budget_usd = daily_user_budget_usd
+        self._tats: OrderedDict[str, float] = OrderedDict()
+        self._spend_day = ""
+        self._spend: dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+        self._redis: Optional[redis_async.Redis] = None
+        self._redis_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._gcra = None
+        self._spend_tasks: set[asyncio.Task] = set()
+        # Global spend as last read from (or written to) redis, for stats().
+        self._redis_spent_today: tuple[str, float] = ("", 0.0)
+
+    def _get_redis(self) -> Optional[redis_async.Redis]:
+        if self.backend != "redis":
+            return None
+        loop = asyncio.get_running_loop()
+        if self._redis is None or self._redis_loop is not loop:
+            self._redis = redis_async.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5)
+            self._redis_loop = loop
+            self._gcra = self._redis.register_script(GCRA_SCRIPT)
+        return self._redis
+
+    async def aclose(self) -> None:
+        if self._spend_tasks:
+            await asyncio.gather(*self._spend_tasks, return_exceptions=True)
+        client, self._redis, self._redis_loop = self._redis, None, None
+        if client is not None:
+            await client.aclose()
+
+    def _bucket(self, tier: str) -> tuple[float, float]:
+        """(emission interval, burst) in ms for `tier`."""
+        max_requests = max(1, int(self.tier_limits.get(tier, self.tier_limits[TIER_ANON])))
+        interval = self.window_seconds * 1000 / max_requests
+        return interval, interval * max_requests
+
+    # --- request rate -------------------------------------------------------
+
+    def _take_memory(self, key: str, interval: float, burst: float, now: float) -> float:
+        """0 when allowed, otherwise ms until the next request would be."""
+        with self._lock:
+            # Least recently touched first; drop buckets that have refilled completely.
+            while self._tats:
+                oldest_key, oldest_tat = next(iter(self._tats.items()))
+                if oldest_tat > now:
+                    break
+                self._tats.pop(oldest_key, None)
+            tat = max(self._tats.get(key, now), now)
+            allow_at = tat + interval - burst
+            if allow_at > now:
+                return allow_at - now
+            self._tats[key] = tat + interval
+            self._tats.move_to_end(key)
+            return 0.0
+
+    async def _take(self, key: str, tier: str) -> float:
+        interval, burst = self._bucket(tier)
+        now = time.time() * 1000
+        client = self._get_redis()
+        if client is not None:
+            try:
+                allowed, wait_ms = await self._gcra(
+                    keys=[REDIS_TAT_KEY.format(key=key)], args=[int(now), interval, burst], client=client
+                )
+                return 0.0 if int(allowed) else float(wait_ms)
+            except redis.RedisError as exc:
+                logger.warning("Redis AI rate limiter unavailable, limiting per worker: %s", exc)
+        return self._take_memory(key, interval, burst, now)
+
+    # --- spend --------------------------------------------------------------
+
+    def _memory_spend(self, day: str) -> dict[str, float]:
+        if self._spend_day != day:
+            self._spend_day = day
+            self._spend = defaultdict(float)
+        return self._spend
+
+    async def _spent(self, scopes: list[str]) -> list[float]:
+        day = _utc_day()
+        client = self._get_redis()
+        if client is not None:
+            try:
+                values = await client.mget([REDIS_SPEND_KEY.format(day=day, scope=scope) for scope in scopes])
+                spent = [float(value or 0) for value in values]
+                if scopes[0] == GLOBAL_SCOPE:
+                    self._redis_spent_today = (day, spent[0])
+                return spent
+            except redis.RedisError as exc:
+                logger.warning("Redis AI spend lookup failed: %s", exc)
+        with self._lock:
+            spend = self._memory_spend(day)
+            return [spend.get(scope, 0.0) for scope in scopes]
+
+    def record_spend(self, user_id: Optional[int], cost_usd: Optional[float]) -> None:
+        """Charge a model call to today's budgets; never waits on redis."""
+        if not cost_usd or cost_usd <= 0:
+            return
+        day = _utc_day()
+        scopes = [GLOBAL_SCOPE] + ([f"user:{user_id}"] if user_id is not None else [])
+        if self.backend == "redis":
+            try:
+                task = asyncio.get_running_loop().create_task(self._record_spend_redis(day, scopes, cost_usd))
+            except RuntimeError:
+                pass  # no running loop (sync caller): count it in this worker
+            else:
+                self._spend_tasks.add(task)
+                task.add_done_callback(self._spend_tasks.discard)
+                return
+        self._record_spend_memory(day, scopes, cost_usd)
+
+    async def _record_spend_redis(self, day: str, scopes: list[str], cost_usd: float) -> None:
+        try:
+            pipe = self._get_redis().pipeline(transaction=False)
+            for scope in scopes:
+                key = REDIS_SPEND_KEY.format(day=day, scope=scope)
+                pipe.incrbyfloat(key, cost_usd)
+                pipe.expire(key, SPEND_KEY_TTL_SECONDS)
+            results = await pipe.execute()
+        except redis.RedisError as exc:
+            logger.warning("Redis AI spend update failed, counting per worker: %s", exc)
+            self._record_spend_memory(day, scopes, cost_usd)
+            return
+        self._redis_spent_today = (day, float(results[0]))
+
+    def _record_spend_memory(self, day: str, scopes: list[str], cost_usd: float) -> None:
+        with self._lock:
+            spend = self._memory_spend(day)
+            for scope in scopes:
+                spend[scope] += cost_usd
+
+    async def _over_budget(self, user_id: Optional[int], tier: str) -> bool:
+        scopes, limits = [], []
+        if self.daily_budget_usd > 0:
+            scopes.append(GLOBAL_SCOPE)
+            limits.append(self.daily_budget_usd)
+        if self.daily_user_budget_usd > 0 and user_id is not None and tier != TIER_ADMIN:
+            scopes.append(f"user:{user_id}")
+            limits.append(self.daily_user_budget_usd)
+        if not scopes:
+            return False
+        return any(spent >= limit for spent, limit in zip(await self._spent(scopes), limits))
+
+    # --- public API ---------------------------------------------------------
+
+    async def check(
+        self, endpoint: str, identity: str, tier: str, user_id: Optional[int] = None
+    ) -> RateLimitDecision:
+        if await self._over_budget(user_id, tier):
+            return RateLimitDecision(False, "budget", _seconds_until_utc_midnight())
+        wait_ms = await self._take(f"{endpoint}:{identity}", tier)
+        if wait_ms > 0:
+            return RateLimitDecision(False, "rate", max(1, math.ceil(wait_ms / 1000)))
+        return RateLimitDecision(True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tats.clear()
+            self._spend_day = ""
+            self._spend = defaultdict(float)
+            self._redis_spent_today = ("", 0.0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            tracked = len(self._tats)
+            spent_today = self._memory_spend(_utc_day()).get(GLOBAL_SCOPE, 0.0)
+        redis_day, redis_spent = self._redis_spent_today
+        if redis_day == _utc_day():
+            # Shared spend as this worker last saw it, plus anything counted here during an outage.
+            spent_today += redis_spent
+        return {
+            "backend": self.backend,
+            "tracked_buckets": tracked,
+            "spent_today_usd": round(spent_today, 6),
+            "daily_budget_usd": self.daily_budget_usd or None,
+        }
@@ -1,22 +1,26 @@
+import asyncio
 import hashlib
 import json
 import logging
 import re
 import threading
 import time
-from collections import OrderedDict, defaultdict, deque
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Literal, Optional
 
 import httpx
 
 from app.core.config import settings
+from app.core.metrics import AI_MODEL_CALL_SECONDS, AI_RATE_LIMITED
 from app.services.ai_prompts import (
     DEV_QNA_PROMPT,
     EDITOR_HELP_PROMPT,
     INTENT_ROUTER_PROMPT,
     SITE_HELP_PROMPT,
 )
+from app.services.ai_cache import AiResponseCache, CachedAiResponse, normalize_prompt
+from app.services.ai_rate_limit import TIER_ADMIN, TIER_ANON, TIER_USER, AiRateLimiter, RateLimitDecision
+from app.services.ai_single_flight import AiSingleFlight, Build
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +29,17 @@ INTENT_SITE_HELP = "SITE_HELP"
 INTENT_EDITOR_HELP = "EDITOR_HELP"
 INTENT_OUT_OF_SCOPE = "OUT_OF_SCOPE"
 
+# Upstream outcomes worth retrying soon: cached only for AI_CACHE_NEGATIVE_TTL_SECONDS.
+MODEL_FAILURE_STATUSES = {
+    "failed",
+    "timeout",
+    "overloaded",
+    "empty_output",
+    "invalid_json",
+    "invalid_schema",
+    "truncated_output",
+}
+
 
 @dataclass
 class ModelCallResult:
@@ -39,92 +54,280 @@ class ModelCallResult:
     cost_usd: Optional[float]
 
 
-class TTLCache:
-    def __init__(self, ttl_seconds: int, max_items: int):
-        self.ttl_seconds = ttl_seconds
-        self.max_items = max_items
-        self._items: OrderedDict[str, tuple[float, Any]] = OrderedDict()
-        self._lock = threading.Lock()
-
-    def get(self, key: str) -> Any | None:
-        now = time.time()
-        with self._lock:
-            item = self._items.get(key)
-            if not item:
-                return None
-            expires_at, value = item
-            if expires_at <= now:
-                self._items.pop(key, None)
-                return None
-            # Keep hot keys at the end.
-            self._items.move_to_end(key)
-            return value
-
-    def set(self, key: str, value: Any) -> None:
-        now = time.time()
-        expires_at = now + self.ttl_seconds
-        with self._lock:
-            self._items[key] = (expires_at, value)
-            self._items.move_to_end(key)
-            self._evict_if_needed(now)
-
-    def _evict_if_needed(self, now: float) -> None:
-        expired_keys = [k for k, (exp, _v) in self._items.items() if exp <= now]
-        for key in expired_keys:
-            self._items.pop(key, None)
-        while len(self._items) > self.max_items:
-            self._items.popitem(last=False)
-
-
-class SlidingWindowRateLimiter:
-    def __init__(self, window_seconds: int, max_requests: int):
-        self.window_seconds = window_seconds
-        self.max_requests = max_requests
-        self._buckets: dict[str, deque[float]] = defaultdict(deque)
-        self._lock = threading.Lock()
-
-    def allow(self, key: str) -> bool:
-        now = time.time()
-        start = now - self.window_seconds
-        with self._lock:
-            bucket = self._buckets[key]
-            while bucket and bucket[0] < start:
-                bucket.popleft()
-            if len(bucket) >= self.max_requests:
-                return False
-            bucket.append(now)
+@dataclass
+class AiStreamEvent:
+    kind: Literal["delta", "reset", "done"]
+    text: str = ""
+    data: Optional[dict[str, Any]] = None
+    result: Optional[ModelCallResult] = None
+
+
+class EditorStreamValidator:
+    """
+    Incremental check of a streamed editor response against `_editor_schema_hint`.
+
+    Only a JSON object (optionally inside a ``` fence) is checked: brackets must match,
+    the top level must be `"key": value` pairs, and keys from the schema must open the
+    right kind of value (string or array; null is tolerated). Anything that does not start like JSON is
+    left to the non-JSON recovery once the stream ends.
+    """
+
+    def __init__(self, schema: dict[str, Any]):
+        self._expected = {key: ("[" if isinstance(value, list) else '"') for key, value in schema.items()}
+        self.status: Optional[str] = None
+        self.error: Optional[str] = None
+        self._mode = "lead"  # lead -> fence -> json -> done | passthrough
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._key_chars: list[str] | None = None
+        self._top = "key_or_end"  # key_or_end, key, colon, value, scalar, after_value
+        self._key = ""
+
+    def feed(self, chunk: str) -> bool:
+        """Consume the next piece of output; True once it can no longer be valid."""
+        if self.status is not None:
             return True
+        for char in chunk:
+            if self._mode in ("done", "passthrough"):
+                return False
+            self._consume(char)
+            if self.status is not None:
+                return True
+        return False
+
+    def _fail(self, status: str, error: str) -> None:
+        self.status = status
+        self.error = error
+
+    def _consume(self, char: str) -> None:
+        if self._mode == "fence":
+            if char == "\n":
+                self._mode = "lead"
+            return
+        if self._mode == "lead":
+            if char.isspace():
+                return
+            if char == "`":
+                self._mode = "fence"
+            elif char == "{":
+                self._mode = "json"
+                self._stack.append("}")
+            else:
+                self._mode = "passthrough"
+            return
+
+        depth = len(self._stack)
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+                if self._key_chars is not None:
+                    self._key = "".join(self._key_chars)
+                    self._key_chars = None
+                    self._top = "colon"
+            elif self._key_chars is not None:
+                self._key_chars.append(char)
+            return
+        if char.isspace():
+            return
+
+        if depth > 1:
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._stack.append("}" if char == "{" else "]")
+            elif char in "}]":
+                if char != self._stack[-1]:
+                    self._fail("invalid_json", f"unexpected {char!r} in editor output")
+                    return
+                self._stack.pop()
+            return
+
+        if self._top in ("after_value", "scalar"):
+            if char == ",":
+                self._top = "key"
+            elif char == "}":
+                self._stack.pop()
+                self._mode = "done"
+            elif self._top == "after_value":
+                self._fail("invalid_json", f"expected ',' or '}}' in editor output, got {char!r}")
+            return
+        self._consume_top_level(char)
+
+    def _consume_top_level(self, char: str) -> None:
+        if self._top in ("key_or_end", "key"):
+            if char == '"':
+                self._in_string = True
+                self._key_chars = []
+            elif char == "}" and self._top == "key_or_end":
+                self._stack.pop()
+                self._mode = "done"
+            else:
+                self._fail("invalid_json", f"expected a key in editor output, got {char!r}")
+        elif self._top == "colon":
+            if char == ":":
+                self._top = "value"
+            else:
+                self._fail("invalid_json", f"expected ':' after {self._key!r} in editor output")
+        elif self._top == "value":
+            expected = self._expected.get(self._key)
+            if expected is not None and char not in (expected, "n"):
+                kind = "an array" if expected == "[" else "a string"
+                self._fail("invalid_schema", f"{self._key!r} must be {kind}")
+                return
+            if char == '"':
+                self._in_string = True
+                self._top = "after_value"
+            elif char in "{[":
+                self._stack.append("}" if char == "{" else "]")
+                self._top = "after_value"
+            else:
+                # Bare scalar (number, true, null): runs until the next ',' or '}'.
+                self._top = "scalar"
 
 
 class AiService:
-    def __init__(self):
-        self._cache = TTLCache(
-            ttl_seconds=max(10, int(settings.AI_CACHE_TTL_SECONDS)),
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None):
+        self._cache = AiResponseCache(
+            backend=settings.AI_CACHE_BACKEND,
             max_items=max(100, int(settings.AI_CACHE_MAX_ITEMS)),
+            max_bytes=max(1, int(settings.AI_CACHE_MAX_BYTES)),
+            max_entry_bytes=max(1, int(settings.AI_CACHE_MAX_ENTRY_BYTES)),
         )
-        self._rate_limiter = SlidingWindowRateLimiter(
+        self._rate_limiter = AiRateLimiter(
+            backend=settings.AI_RATE_LIMIT_BACKEND,
             window_seconds=max(1, int(settings.AI_RATE_LIMIT_WINDOW_SECONDS)),
-            max_requests=max(1, int(settings.AI_RATE_LIMIT_MAX_REQUESTS)),
+            tier_limits={
+                TIER_ANON: settings.AI_RATE_LIMIT_ANON_MAX_REQUESTS,
+                TIER_USER: settings.AI_RATE_LIMIT_MAX_REQUESTS,
+                TIER_ADMIN: settings.AI_RATE_LIMIT_ADMIN_MAX_REQUESTS,
+            },
+            daily_budget_usd=float(settings.AI_DAILY_BUDGET_USD),
+            daily_user_budget_usd=float(settings.AI_DAILY_USER_BUDGET_USD),
         )
+        self._single_flight = AiSingleFlight(
+            enabled=settings.AI_SINGLE_FLIGHT_ENABLED,
+            backend=settings.AI_SINGLE_FLIGHT_BACKEND,
+            timeout_seconds=max(1.0, float(settings.AI_SINGLE_FLIGHT_TIMEOUT_SECONDS)),
+            result_type=ModelCallResult,
+        )
+        # One pooled client (keep-alive, HTTP/2) per event loop, created on first use.
+        self._transport = transport
+        self._http_client: httpx.AsyncClient | None = None
+        self._http_loop: asyncio.AbstractEventLoop | None = None
+        self._model_slots: dict[str, asyncio.Semaphore] = {}
+        self._metrics_lock = threading.Lock()
+        self.metrics = {
+            "rate_limited": 0,
+            "budget_exceeded": 0,
+            "model_calls": 0,
+            "model_overloaded": 0,
+        }
 
     @property
     def is_model_enabled(self) -> bool:
         return bool((settings.AI_API_KEY or "").strip())
 
-    def allow_request(self, endpoint: str, identity: str) -> bool:
-        return self._rate_limiter.allow(f"{endpoint}:{identity}")
+    def _count(self, metric: str) -> None:
+        with self._metrics_lock:
+            self.metrics[metric] += 1
 
-    def build_input_hash(self, payload: dict[str, Any]) -> str:
-        normalized = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    def stats(self) -> dict:
+        with self._metrics_lock:
+            metrics = dict(self.metrics)
+        return {
+            **metrics,
+            "cache": self._cache.stats(),
+            "rate_limit": self._rate_limiter.stats(),
+            "single_flight": self._single_flight.stats(),
+        }
+
+    async def check_rate_limit(
+        self, endpoint: str, identity: str, tier: str, user_id: int | None = None
+    ) -> RateLimitDecision:
+        decision = await self._rate_limiter.check(endpoint, identity, tier, user_id)
+        if not decision.allowed:
+            self._count("rate_limited" if decision.reason == "rate" else "budget_exceeded")
+            AI_RATE_LIMITED.labels(endpoint, decision.reason).inc()
+        return decision
+
+    def record_spend(self, user_id: int | None, cost_usd: float | None) -> None:
+        self._rate_limiter.record_spend(user_id, cost_usd)
+
+    def build_input_hash(self, payload: dict[str, Any], *, fold: bool = True) -> str:
+        """Cache key hash over `payload` with its text normalized (see `normalize_prompt`)."""
+        normalized_payload = {
+            name: normalize_prompt(value, fold=fold) if isinstance(value, str) else value
+            for name, value in payload.items()
+        }
+        normalized = json.dumps(normalized_payload, ensure_ascii=False, sort_keys=True)
         return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
-    def get_cached(self, key: str) -> Any | None:
-        return self._cache.get(key)
+    @staticmethod
+    def cache_ttl(intent: str | None) -> int:
+        ttls = {
+            INTENT_DEV_QNA: settings.AI_CACHE_DEV_QNA_TTL_SECONDS,
+            INTENT_SITE_HELP: settings.AI_CACHE_SITE_HELP_TTL_SECONDS,
+            INTENT_EDITOR_HELP: settings.AI_CACHE_EDITOR_TTL_SECONDS,
+            INTENT_OUT_OF_SCOPE: settings.AI_CACHE_OUT_OF_SCOPE_TTL_SECONDS,
+        }
+        return max(10, int(ttls.get(intent, settings.AI_CACHE_TTL_SECONDS)))
 
-    def set_cached(self, key: str, value: Any) -> None:
-        self._cache.set(key, value)
+    @staticmethod
+    def is_model_failure(status: str | None) -> bool:
+        return status in MODEL_FAILURE_STATUSES
+
+    def get_cached(self, key: str) -> CachedAiResponse | None:
+        return self._cache.get(key)
 
-    def classify_intent(
+    def set_cached(self, key: str, value: Any, *, intent: str | None = None, negative: bool = False) -> None:
+        ttl = settings.AI_CACHE_NEGATIVE_TTL_SECONDS if negative else self.cache_ttl(intent)
+        self._cache.set(key, value, max(1, int(ttl)), negative=negative)
+
+    async def coalesce(self, key: str, endpoint: str, build: Build) -> tuple[dict[str, Any], ModelCallResult, bool]:
+        """
+        Run `build()` (a cache miss for `key`) once for all identical concurrent requests.
+        Returns its (payload, ModelCallResult) and whether this caller only waited for it.
+        """
+        return await self._single_flight.run(key, endpoint, build)
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._http_client is None or self._http_loop is not loop:
+            self._http_client = httpx.AsyncClient(
+                http2=settings.AI_HTTP2_ENABLED,
+                timeout=max(1, int(settings.AI_TIMEOUT_SECONDS)),
+                limits=httpx.Limits(
+                    max_connections=max(1, int(settings.AI_HTTP_MAX_CONNECTIONS)),
+                    max_keepalive_connections=max(1, int(settings.AI_HTTP_MAX_CONNECTIONS)),
+                    keepalive_expiry=max(1, int(settings.AI_HTTP_KEEPALIVE_SECONDS)),
+                ),
+                transport=self._transport,
+            )
+            self._http_loop = loop
+            self._model_slots = {}
+        return self._http_client
+
+    def _model_slot(self, model: str) -> asyncio.Semaphore:
+        slot = self._model_slots.get(model)
+        if slot is None:
+            slot = asyncio.Semaphore(max(1, int(settings.AI_MODEL_MAX_CONCURRENCY)))
+            self._model_slots[model] = slot
+        return slot
+
+    async def aclose(self) -> None:
+        client, self._http_client = self._http_client, None
+        self._http_loop = None
+        if client is not None:
+            await client.aclose()
+        await self._single_flight.aclose()
+        await self._rate_limiter.aclose()
+
+    async def classify_intent(
         self,
         *,
         message: str,
@@ -251,7 +454,7 @@ class AiService:
             return self._coerce_allowed_intent(decision, allowed_intents, source)
 
         if allow_model and self.is_model_enabled:
-            model_decision = self._classify_with_model(
+            model_decision = await self._classify_with_model(
                 message=message,
                 source=source,
                 action=action,
@@ -274,57 +477,90 @@ class AiService:
             "_meta": self._meta_from_model_result(None, "failed", 0.0, "ambiguous_intent"),
         }
 
-    def chat_reply(self, *, intent: str, message: str) -> tuple[dict[str, Any], ModelCallResult]:
+    async def chat_reply(self, *, intent: str, message: str) -> tuple[dict[str, Any], ModelCallResult]:
         if intent == INTENT_OUT_OF_SCOPE:
-            return (
-                {
-                    "answer": self.out_of_scope_refusal(),
-                    "suggested_question": self.out_of_scope_pivot_question(),
-                },
-                ModelCallResult(
-                    text="",
-                    model=None,
-                    status="success",
-                    error_message=None,
-                    latency_ms=0.0,
-                    prompt_tokens=0,
-                    completion_tokens=0,
-                    total_tokens=0,
-                    cost_usd=0.0,
-                ),
-            )
+            return self._out_of_scope_reply()
 
-        if intent == INTENT_DEV_QNA:
-            prompt = DEV_QNA_PROMPT
-            fallback_answer = self._fallback_dev_qna_answer(message)
-        else:
-            prompt = SITE_HELP_PROMPT
-            fallback_answer = self._fallback_site_help_answer(message)
-
-        model_result = self._call_chat_completion(
+        prompt, fallback_answer = self._chat_prompt(intent=intent, message=message)
+        model_result = await self._call_chat_completion(
             model=settings.AI_CHAT_MODEL,
             system_prompt=prompt,
             user_prompt=message,
             max_tokens=settings.AI_CHAT_MAX_TOKENS,
         )
-        if model_result.status == "success" and model_result.text.strip():
-            return (
-                {
-                    "answer": model_result.text.strip(),
-                    "suggested_question": None,
-                },
-                model_result,
-            )
-
+        return self._chat_result(model_result, fallback_answer), model_result
+
+    async def stream_chat_reply(self, *, intent: str, message: str) -> AsyncIterator[AiStreamEvent]:
+        """
+        Streaming `chat_reply`: "delta" events as the model writes, then one "done" event
+        with the same reply and ModelCallResult the non-streaming call would return.
+        A "reset" tells the client to drop what it has shown before the fallback answer.
+        """
+        if intent == INTENT_OUT_OF_SCOPE:
+            reply, model_result = self._out_of_scope_reply()
+            yield AiStreamEvent("delta", text=reply["answer"])
+            yield AiStreamEvent("done", data=reply, result=model_result)
+            return
+
+        prompt, fallback_answer = self._chat_prompt(intent=intent, message=message)
+        streamed: list[str] = []
+        model_result = self._no_result(settings.AI_CHAT_MODEL, "failed", "stream ended without a result")
+        async for event in self._stream_chat_completion(
+            model=settings.AI_CHAT_MODEL,
+            system_prompt=prompt,
+            user_prompt=message,
+            max_tokens=settings.AI_CHAT_MAX_TOKENS,
+        ):
+            if event.kind == "delta":
+                streamed.append(event.text)
+                yield event
+            else:
+                model_result = event.result
+
+        reply = self._chat_result(model_result, fallback_answer)
+        if reply["answer"] == fallback_answer:
+            if streamed:
+                yield AiStreamEvent("reset")
+            yield AiStreamEvent("delta", text=fallback_answer)
+        yield AiStreamEvent("done", data=reply, result=model_result)
+
+    def _out_of_scope_reply(self) -> tuple[dict[str, Any], ModelCallResult]:
         return (
             {
-                "answer": fallback_answer,
-                "suggested_question": None,
+                "answer": self.out_of_scope_refusal(),
+                "suggested_question": self.out_of_scope_pivot_question(),
             },
-            model_result,
+            ModelCallResult(
+                text="",
+                model=None,
+                status="success",
+                error_message=None,
+                latency_ms=0.0,
+                prompt_tokens=0,
+                completion_tokens=0,
+                total_tokens=0,
+                cost_usd=0.0,
+            ),
         )
 
-    def editor_reply(self, *, action: str, text: str, title: str | None, category_slug: str | None) -> tuple[dict[str, Any], ModelCallResult]:
+    def _chat_prompt(self, *, intent: str, message: str) -> tuple[str, str]:
+        if intent == INTENT_DEV_QNA:
+            return DEV_QNA_PROMPT, self._fallback_dev_qna_answer(message)
+        return SITE_HELP_PROMPT, self._fallback_site_help_answer(message)
+
+    @staticmethod
+    def _chat_result(model_result: ModelCallResult, fallback_answer: str) -> dict[str, Any]:
+        if model_result.status == "success" and model_result.text.strip():
+            return {
+                "answer": model_result.text.strip(),
+                "suggested_question": None,
+            }
+        return {
+            "answer": fallback_answer,
+            "suggested_question": None,
+        }
+
+    async def editor_reply(self, *, action: str, text: str, title: str | None, category_slug: str | None) -> tuple[dict[str, Any], ModelCallResult]:
         fallback = self._build_editor_fallback(
             action=action,
             text=text,
@@ -339,28 +575,55 @@ class AiService:
             category_slug=category_slug,
         )
 
-        candidate_models = [str(settings.AI_EDITOR_MODEL or "").strip()]
-        fallback_model = str(settings.AI_EDITOR_FALLBACK_MODEL or "").strip()
-        if fallback_model and fallback_model not in candidate_models:
-            candidate_models.append(fallback_model)
+        last_result = self._no_result(None, "failed", "no editor model configured")
 
-        last_result = ModelCallResult(
-            text="",
-            model=None,
-            status="failed",
-            error_message="no editor model configured",
-            latency_ms=0.0,
-            prompt_tokens=0,
-            completion_tokens=0,
-            total_tokens=0,
-            cost_usd=0.0,
+        for model_name in self._editor_models():
+            model_result = await self._call_chat_completion(
+                model=model_name,
+                system_prompt=EDITOR_HELP_PROMPT,
+                user_prompt=user_prompt,
+                max_tokens=self._resolve_editor_max_tokens(action=action, text=text),
+                temperature=0.0,
+                timeout_seconds=max(1, int(settings.AI_EDITOR_TIMEOUT_SECONDS)),
+                force_json=True,
+            )
+            last_result = model_result
+
+            accepted = self._accept_editor_output(action=action, model_result=model_result, text=text, title=title)
+            if accepted is not None:
+                return accepted, model_result
+
+        return fallback, last_result
+
+    async def stream_editor_reply(
+        self, *, action: str, text: str, title: str | None, category_slug: str | None
+    ) -> AsyncIterator[AiStreamEvent]:
+        """
+        Streaming `editor_reply`. Raw model output is forwarded as "delta" events while an
+        EditorStreamValidator checks it against the action's schema; output that has gone
+        off-schema is cut off there and the next model (or the rule-based fallback) is
+        tried after a "reset". Ends with one "done" event carrying the normalized payload.
+        """
+        fallback = self._build_editor_fallback(
+            action=action,
+            text=text,
+            title=title,
+            category_slug=category_slug,
+        )
+        user_prompt = self._editor_user_prompt(
+            action=action,
+            text=text,
+            title=title,
+            category_slug=category_slug,
         )
 
-        for model_name in candidate_models:
-            if not model_name:
-                continue
+        last_result = self._no_result(None, "failed", "no editor model configured")
 
-            model_result = self._call_chat_completion(
+        for model_name in self._editor_models():
+            validator = EditorStreamValidator(json.loads(self._editor_schema_hint(action)))
+            streamed: list[str] = []
+            model_result = None
+            stream = self._stream_chat_completion(
                 model=model_name,
                 system_prompt=EDITOR_HELP_PROMPT,
                 user_prompt=user_prompt,
@@ -369,55 +632,110 @@ class AiService:
                 timeout_seconds=max(1, int(settings.AI_EDITOR_TIMEOUT_SECONDS)),
                 force_json=True,
             )
+            started = time.perf_counter()
+            try:
+                async for event in stream:
+                    if event.kind == "done":
+                        model_result = event.result
+                        break
+                    streamed.append(event.text)
+                    if validator.feed(event.text):
+                        break
+                    yield event
+            finally:
+                await stream.aclose()
+
+            if model_result is None:
+                # Cut off mid-stream: usage never arrived, so only the latency is known.
+                model_result = self._no_result(model_name, validator.status, validator.error)
+                model_result.text = "".join(streamed)
+                model_result.latency_ms = round((time.perf_counter() - started) * 1000, 2)
             last_result = model_result
 
-            if model_result.status != "success":
-                continue
+            accepted = self._accept_editor_output(action=action, model_result=model_result, text=text, title=title)
+            if accepted is not None:
+                yield AiStreamEvent("done", data=accepted, result=model_result)
+                return
+            if streamed:
+                yield AiStreamEvent("reset")
 
-            if not model_result.text.strip():
-                model_result.status = "empty_output"
-                model_result.error_message = "editor model returned empty content"
-                continue
+        yield AiStreamEvent("done", data=fallback, result=last_result)
 
-            parsed = self._try_parse_json(model_result.text)
-            if not isinstance(parsed, dict):
-                recovered = self._coerce_non_json_editor_output(
-                    action=action,
-                    raw_text=model_result.text,
-                    source_text=text,
-                )
-                if recovered is not None:
-                    model_result.status = "recovered_non_json"
-                    model_result.error_message = "editor model output was recovered from non-JSON text"
-                    return recovered, model_result
-                model_result.status = "invalid_json"
-                model_result.error_message = "editor model output is not valid JSON"
-                continue
+    def _editor_models(self) -> list[str]:
+        candidate_models = [str(settings.AI_EDITOR_MODEL or "").strip()]
+        fallback_model = str(settings.AI_EDITOR_FALLBACK_MODEL or "").strip()
+        if fallback_model and fallback_model not in candidate_models:
+            candidate_models.append(fallback_model)
+        return [model_name for model_name in candidate_models if model_name]
+
+    def _accept_editor_output(
+        self,
+        *,
+        action: str,
+        model_result: ModelCallResult,
+        text: str,
+        title: str | None,
+    ) -> dict[str, Any] | None:
+        """Normalized editor payload from a finished call, or None (with the reason set on model_result)."""
+        if model_result.status != "success":
+            return None
 
-            normalized = self._normalize_editor_json(
+        if not model_result.text.strip():
+            model_result.status = "empty_output"
+            model_result.error_message = "editor model returned empty content"
+            return None
+
+        parsed = self._try_parse_json(model_result.text)
+        if not isinstance(parsed, dict):
+            recovered = self._coerce_non_json_editor_output(
                 action=action,
-                payload=parsed,
+                raw_text=model_result.text,
                 source_text=text,
-                source_title=title,
             )
-            if not normalized:
-                model_result.status = "invalid_schema"
-                model_result.error_message = "editor model output does not match expected schema"
-                continue
+            if recovered is not None:
+                model_result.status = "recovered_non_json"
+                model_result.error_message = "editor model output was recovered from non-JSON text"
+                return recovered
+            model_result.status = "invalid_json"
+            model_result.error_message = "editor model output is not valid JSON"
+            return None
 
-            if action == "proofread" and self._looks_truncated_fulltext(source=text, output=normalized.get("revised_text", "")):
-                model_result.status = "truncated_output"
-                model_result.error_message = "proofread output looks truncated"
-                continue
+        normalized = self._normalize_editor_json(
+            action=action,
+            payload=parsed,
+            source_text=text,
+            source_title=title,
+        )
+        if not normalized:
+            model_result.status = "invalid_schema"
+            model_result.error_message = "editor model output does not match expected schema"
+            return None
 
-            if action == "mask" and self._looks_truncated_fulltext(source=text, output=normalized.get("masked_text", "")):
-                model_result.status = "truncated_output"
-                model_result.error_message = "mask output looks truncated"
-                continue
+        if action == "proofread" and self._looks_truncated_fulltext(source=text, output=normalized.get("revised_text", "")):
+            model_result.status = "truncated_output"
+            model_result.error_message = "proofread output looks truncated"
+            return None
 
-            return normalized, model_result
+        if action == "mask" and self._looks_truncated_fulltext(source=text, output=normalized.get("masked_text", "")):
+            model_result.status = "truncated_output"
+            model_result.error_message = "mask output looks truncated"
+            return None
 
-        return fallback, last_result
+        return normalized
+
+    @staticmethod
+    def _no_result(model: str | None, status: str, error_message: str | None) -> ModelCallResult:
+        return ModelCallResult(
+            text="",
+            model=model,
+            status=status,
+            error_message=error_message,
+            latency_ms=0.0,
+            prompt_tokens=0,
+            completion_tokens=0,
+            total_tokens=0,
+            cost_usd=0.0,
+        )
 
     def out_of_scope_refusal(self) -> str:
         return "요청하신 주제는 이 도우미의 지원 범위를 벗어나서 답변할 수 없습니다."
@@ -425,7 +743,7 @@ class AiService:
     def out_of_scope_pivot_question(self) -> str:
         return "대신 개발 Q&A, 사이트 이용법, 글쓰기 보조 중 어떤 도움을 원하시나요?"
 
-    def _classify_with_model(
+    async def _classify_with_model(
         self,
         *,
         message: str,
@@ -439,7 +757,7 @@ class AiService:
             f"message={message}\n"
             "Return JSON only."
         )
-        model_result = self._call_chat_completion(
+        model_result = await self._call_chat_completion(
             model=settings.AI_ROUTE_MODEL,
             system_prompt=INTENT_ROUTER_PROMPT,
             user_prompt=user_prompt,
@@ -480,7 +798,7 @@ class AiService:
         }
         return self._coerce_allowed_intent(decision, allowed_intents, source)
 
-    def _call_chat_completion(
+    async def _call_chat_completion(
         self,
         *,
         model: str,
@@ -504,6 +822,38 @@ class AiService:
                 cost_usd=0.0,
             )
 
+        url, headers, payload = self._chat_completion_request(
+            model=model,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            force_json=force_json,
+        )
+
+        start = time.perf_counter()
+        result = await self._post_chat_completion(
+            model=model,
+            url=url,
+            headers=headers,
+            payload=payload,
+            timeout_seconds=max(1, int(timeout_seconds or settings.AI_TIMEOUT_SECONDS)),
+            start=start,
+        )
+        self._count("model_calls")
+        AI_MODEL_CALL_SECONDS.labels(model, result.status).observe(time.perf_counter() - start)
+        return result
+
+    def _chat_completion_request(
+        self,
+        *,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        temperature: float,
+        force_json: bool,
+    ) -> tuple[str, dict[str, str], dict[str, Any]]:
         api_key = (settings.AI_API_KEY or "").strip()
         base_url = settings.AI_BASE_URL.rstrip("/")
         url = f"{base_url}/chat/completions"
@@ -532,13 +882,158 @@ class AiService:
         if force_json and self._supports_json_response_format(model):
             payload["response_format"] = {"type": "json_object"}
 
+        return url, headers, payload
+
+    async def _stream_chat_completion(
+        self,
+        *,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        temperature: float = 0.2,
+        timeout_seconds: int | None = None,
+        force_json: bool = False,
+    ) -> AsyncIterator[AiStreamEvent]:
+        """
+        `_call_chat_completion` with `stream=true`: yields a "delta" per content chunk and
+        always finishes with a "done" event whose ModelCallResult holds the full text and
+        the usage the upstream reports in its last chunk.
+        """
+        if not self.is_model_enabled:
+            yield AiStreamEvent("done", result=self._no_result(None, "disabled", "AI_API_KEY is not configured"))
+            return
+
+        url, headers, payload = self._chat_completion_request(
+            model=model,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            force_json=force_json,
+        )
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+
         start = time.perf_counter()
+        slot = self._model_slot(model)
+        client = self._client()
+        try:
+            await asyncio.wait_for(slot.acquire(), timeout=float(settings.AI_MODEL_QUEUE_TIMEOUT_SECONDS))
+        except asyncio.TimeoutError:
+            self._count("model_overloaded")
+            result = self._no_result(
+                model, "overloaded", f"all {settings.AI_MODEL_MAX_CONCURRENCY} slots for {model} are busy"
+            )
+            result.latency_ms = round((time.perf_counter() - start) * 1000, 2)
+            yield AiStreamEvent("done", result=result)
+            return
+
+        chunks: list[str] = []
+        usage: dict[str, Any] = {}
+        status, error_message = "success", None
+        try:
+            async with client.stream(
+                "POST",
+                url,
+                headers=headers,
+                json=payload,
+                timeout=max(1, int(timeout_seconds or settings.AI_TIMEOUT_SECONDS)),
+            ) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    status = "failed"
+                    error_message = self._http_error_detail(response)
+                    logger.warning("AI stream failed: %s", error_message)
+                else:
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        try:
+                            chunk = json.loads(data)
+                        except ValueError:
+                            continue
+                        usage = chunk.get("usage") or usage
+                        for choice in chunk.get("choices") or []:
+                            delta = str((choice.get("delta") or {}).get("content") or "")
+                            if delta:
+                                chunks.append(delta)
+                                yield AiStreamEvent("delta", text=delta)
+        except httpx.TimeoutException:
+            status, error_message = "timeout", "AI request timed out"
+        except httpx.HTTPError as exc:
+            logger.warning("AI stream failed: %s", exc)
+            status, error_message = "failed", str(exc)
+        finally:
+            slot.release()
+            self._count("model_calls")
+            AI_MODEL_CALL_SECONDS.labels(model, status).observe(time.perf_counter() - start)
+
+        prompt_tokens = self._safe_int(usage.get("prompt_tokens"))
+        completion_tokens = self._safe_int(usage.get("completion_tokens"))
+        yield AiStreamEvent(
+            "done",
+            result=ModelCallResult(
+                text="".join(chunks) if status == "success" else "",
+                model=model,
+                status=status,
+                error_message=error_message,
+                latency_ms=round((time.perf_counter() - start) * 1000, 2),
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=self._safe_int(usage.get("total_tokens")),
+                cost_usd=self._estimate_cost(prompt_tokens, completion_tokens),
+            ),
+        )
+
+    @staticmethod
+    def _http_error_detail(response: httpx.Response) -> str:
+        response_body = ""
+        try:
+            response_body = (response.text or "").strip()
+        except Exception:
+            response_body = ""
+        if len(response_body) > 1200:
+            response_body = response_body[:1200] + "..."
+        detail = f"HTTP {response.status_code} from {response.request.url}"
+        if response_body:
+            detail = f"{detail} | body={response_body}"
+        return detail
+
+    async def _post_chat_completion(
+        self,
+        *,
+        model: str,
+        url: str,
+        headers: dict[str, str],
+        payload: dict[str, Any],
+        timeout_seconds: int,
+        start: float,
+    ) -> ModelCallResult:
+        slot = self._model_slot(model)
+        client = self._client()
+        try:
+            await asyncio.wait_for(slot.acquire(), timeout=float(settings.AI_MODEL_QUEUE_TIMEOUT_SECONDS))
+        except asyncio.TimeoutError:
+            self._count("model_overloaded")
+            return ModelCallResult(
+                text="",
+                model=model,
+                status="overloaded",
+                error_message=f"all {settings.AI_MODEL_MAX_CONCURRENCY} slots for {model} are busy",
+                latency_ms=round((time.perf_counter() - start) * 1000, 2),
+                prompt_tokens=0,
+                completion_tokens=0,
+                total_tokens=0,
+                cost_usd=0.0,
+            )
         try:
-            effective_timeout = max(1, int(timeout_seconds or settings.AI_TIMEOUT_SECONDS))
-            with httpx.Client(timeout=effective_timeout) as client:
-                response = client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
-                body = response.json()
+            response = await client.post(url, headers=headers, json=payload, timeout=timeout_seconds)
+            response.raise_for_status()
+            body = response.json()
         except httpx.HTTPStatusError as exc:
             latency_ms = (time.perf_counter() - start) * 1000
             response_body = ""
@@ -590,6 +1085,8 @@ class AiService:
                 total_tokens=0,
                 cost_usd=0.0,
             )
+        finally:
+            slot.release()
 
         latency_ms = (time.perf_counter() - start) * 1000
         usage = body.get("usage") or {}
@@ -0,0 +1,216 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from dataclasses import asdict
+from typing import Any, Awaitable, Callable, Optional
+
+import redis
+import redis.asyncio as redis_async
+
+from app.core.config import settings
+from app.core.metrics import AI_COALESCED_REQUESTS, AI_COALESCED_TOKENS_SAVED
+
+logger = logging.getLogger(__name__)
+
+REDIS_LOCK_KEY = "ai:sf:lock:{key}"
+REDIS_RESULT_KEY = "ai:sf:result:{key}"
+REDIS_RESULT_CHANNEL = "ai:sf:done:{key}"
+# Long enough for a follower that subscribed just after the publish to still find it.
+RESULT_TTL_SECONDS = 10
+# A failed flight is only announced long enough to release its current followers; the
+# next caller should lead a fresh attempt rather than inherit the failure.
+FAILURE_TTL_SECONDS = 1
+FAILURE_MARKER = json.dumps({"error": True})
+
+# Releases the lock only while this worker still holds it (it may have expired and moved on).
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+Build = Callable[[], Awaitable[tuple[dict[str, Any], Any]]]
+
+
+class FlightAbandoned(Exception):
+    """The leading request went away before producing a result."""
+
+
+class AiSingleFlight:
+    """
+    Coalesces identical in-flight AI calls so N concurrent requests for one input
+    hash cost one upstream completion.
+
+    Within a worker, followers await the leader's future. With the redis backend the
+    first worker to take `ai:sf:lock:<key>` leads; the others subscribe to a result
+    channel (backed by a short-lived result key for late subscribers) and hand the
+    result to their own local followers. Followers that wait past `timeout_seconds`,
+    or whose leader fails, make the call themselves; a failing leader publishes an
+    error marker so remote followers do not sit out the timeout. The lock is released
+    however the leader's build ends.
+    """
+
+    def __init__(self, enabled: bool, backend: str, timeout_seconds: float, result_type: type):
+        self.enabled = enabled
+        self.backend = backend
+        self.timeout_seconds = timeout_seconds
+        self._result_type = result_type
+        self._flights: dict[str, asyncio.Future] = {}
+        self._redis: Optional[redis_async.Redis] = None
+        self._redis_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.metrics = {
+            "leaders": 0,
+            "coalesced_local": 0,
+            "coalesced_remote": 0,
+            "tokens_saved": 0,
+            "fallbacks": 0,
+            "errors": 0,
+        }
+
+    def _get_redis(self) -> Optional[redis_async.Redis]:
+        if self.backend != "redis":
+            return None
+        loop = asyncio.get_running_loop()
+        if self._redis is None or self._redis_loop is not loop:
+            self._redis = redis_async.Redis.from_url(settings.REDIS_URL, socket_timeout=1.0)
+            self._redis_loop = loop
+        return self._redis
+
+    async def aclose(self) -> None:
+        client, self._redis, self._redis_loop = self._redis, None, None
+        if client is not None:
+            await client.aclose()
+
+    def _record_follower(self, endpoint: str, scope: str, result: Any) -> None:
+        saved_tokens = int(getattr(result, "total_tokens", 0) or 0)
+        self.metrics[f"coalesced_{scope}"] += 1
+        self.metrics["tokens_saved"] += saved_tokens
+        AI_COALESCED_REQUESTS.labels(endpoint, scope).inc()
+        AI_COALESCED_TOKENS_SAVED.labels(endpoint).inc(saved_tokens)
+
+    async def run(self, key: str, endpoint: str, build: Build) -> tuple[dict[str, Any], Any, bool]:
+        """`build()` once per key across concurrent callers; returns (payload, result, coalesced)."""
+        if not self.enabled:
+            payload, result = await build()
+            return payload, result, False
+
+        flight = self._flights.get(key)
+        if flight is not None and flight.get_loop() is asyncio.get_running_loop():
+            try:
+                payload, result, _coalesced = await asyncio.wait_for(asyncio.shield(flight), self.timeout_seconds)
+            except (asyncio.TimeoutError, FlightAbandoned):
+                self.metrics["fallbacks"] += 1
+                payload, result = await build()
+                return payload, result, False
+            self._record_follower(endpoint, "local", result)
+            return payload, result, True
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        try:
+            outcome = await self._lead(key, endpoint, build)
+            flight.set_result(outcome)
+            return outcome
+        finally:
+            if not flight.done():
+                flight.set_exception(FlightAbandoned())
+                # Marks the exception retrieved when nobody was waiting on it.
+                flight.exception()
+            if self._flights.get(key) is flight:
+                self._flights.pop(key, None)
+
+    async def _lead(self, key: str, endpoint: str, build: Build) -> tuple[dict[str, Any], Any, bool]:
+        client = self._get_redis()
+        token = uuid.uuid4().hex
+        owns_lock = True
+        if client is not None:
+            try:
+                owns_lock = bool(
+                    await client.set(
+                        REDIS_LOCK_KEY.format(key=key), token, nx=True, px=int(self.timeout_seconds * 1000)
+                    )
+                )
+            except redis.RedisError as exc:
+                self.metrics["errors"] += 1
+                logger.warning("AI single-flight lock failed, coalescing per worker: %s", exc)
+                client = None
+
+        if not owns_lock:
+            remote = await self._await_remote(client, key)
+            if remote is not None:
+                payload, result = remote
+                self._record_follower(endpoint, "remote", result)
+                return payload, result, True
+            self.metrics["fallbacks"] += 1
+
+        self.metrics["leaders"] += 1
+        raw: Optional[str] = None
+        try:
+            payload, result = await build()
+            raw = json.dumps({"payload": payload, "result": asdict(result)}, ensure_ascii=False, default=str)
+            return payload, result, False
+        finally:
+            # Runs on failure and cancellation too, so the lock never outlives the build.
+            if client is not None:
+                if raw is not None:
+                    await self._publish(client, key, raw, RESULT_TTL_SECONDS)
+                elif owns_lock:
+                    # Our remote followers would otherwise wait out the timeout for nothing.
+                    await self._publish(client, key, FAILURE_MARKER, FAILURE_TTL_SECONDS)
+                if owns_lock:
+                    await self._release_lock(client, key, token)
+
+    async def _await_remote(self, client: redis_async.Redis, key: str) -> Optional[tuple[dict[str, Any], Any]]:
+        deadline = time.monotonic() + self.timeout_seconds
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(REDIS_RESULT_CHANNEL.format(key=key))
+            # The leader may have finished between our failed SET NX and the subscribe.
+            raw = await client.get(REDIS_RESULT_KEY.format(key=key))
+            while raw is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+                if message is not None and message.get("type") == "message":
+                    raw = message["data"]
+            return self._decode(raw)
+        except redis.RedisError as exc:
+            self.metrics["errors"] += 1
+            logger.warning("AI single-flight wait failed: %s", exc)
+            return None
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    async def _publish(self, client: redis_async.Redis, key: str, raw: str, ttl_seconds: int) -> None:
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.set(REDIS_RESULT_KEY.format(key=key), raw, ex=ttl_seconds)
+            pipe.publish(REDIS_RESULT_CHANNEL.format(key=key), raw)
+            await pipe.execute()
+        except redis.RedisError as exc:
+            self.metrics["errors"] += 1
+            logger.warning("AI single-flight publish failed: %s", exc)
+
+    async def _release_lock(self, client: redis_async.Redis, key: str, token: str) -> None:
+        try:
+            await client.eval(RELEASE_LOCK_SCRIPT, 1, REDIS_LOCK_KEY.format(key=key), token)
+        except redis.RedisError as exc:
+            self.metrics["errors"] += 1
+            logger.warning("AI single-flight lock release failed: %s", exc)
+
+    def _decode(self, raw) -> Optional[tuple[dict[str, Any], Any]]:
+        """The leader's (payload, result), or None when it published a failure."""
+        data = json.loads(raw)
+        if data.get("error"):
+            return None
+        return data["payload"], self._result_type(**data["result"])
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "backend": self.backend, "in_flight": len(self._flights), **self.metrics}
@@ -0,0 +1,100 @@
+import json
+from dataclasses import dataclass
+from typing import Callable
+
+from app.core.config import settings
+from app.services.tiered_cache import TieredCache
+
+REDIS_GRAPH_KEY_PREFIX = "follow-graph"
+
+
+@dataclass(frozen=True)
+class FollowGraph:
+    """One user's slice of the follow/block graph."""
+
+    following: frozenset
+    # Users blocked by, or blocking, this user.
+    blocked: frozenset
+    followers_count: int
+
+    @property
+    def following_count(self) -> int:
+        return len(self.following)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "following": sorted(self.following),
+                "blocked": sorted(self.blocked),
+                "followers_count": self.followers_count,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw) -> "FollowGraph":
+        data = json.loads(raw)
+        return cls(
+            following=frozenset(data["following"]),
+            blocked=frozenset(data["blocked"]),
+            followers_count=int(data["followers_count"]),
+        )
+
+
+class FollowGraphCache:
+    """
+    Per-user adjacency sets (who they follow, who they are blocked with) and follower
+    counts, so follow/block checks and "which of these N users do I follow" are set
+    lookups instead of queries.
+
+    Entries live in a TieredCache: a per-process LRU and, with the redis backend, a
+    shared L2. Follow and block changes invalidate both users after commit. A load
+    that started before an invalidation is not cached, so a stale read cannot outlive
+    the change.
+    """
+
+    def __init__(self, enabled: bool, backend: str, ttl_seconds: int, l1_ttl_seconds: int, max_items: int):
+        self.enabled = enabled
+        self.backend = backend
+        self._graphs = TieredCache(
+            name="Follow graph",
+            backend=backend,
+            key_prefix=REDIS_GRAPH_KEY_PREFIX,
+            ttl_seconds=ttl_seconds,
+            l1_ttl_seconds=l1_ttl_seconds,
+            max_items=max_items,
+            dumps=FollowGraph.to_json,
+            loads=FollowGraph.from_json,
+        )
+
+    def get(self, user_id: int, load: Callable[[int], FollowGraph]) -> FollowGraph:
+        if not self.enabled:
+            return load(user_id)
+        graph, stamp = self._graphs.lookup(user_id)
+        if graph is None:
+            graph = load(user_id)
+            self._graphs.store(user_id, graph, stamp)
+        return graph
+
+    def invalidate(self, *user_ids: int) -> None:
+        if self.enabled:
+            self._graphs.invalidate(*user_ids)
+
+    def clear(self) -> None:
+        self._graphs.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend,
+            "graphs": len(self._graphs),
+            **self._graphs.stats(),
+        }
+
+
+follow_graph_cache = FollowGraphCache(
+    enabled=settings.FOLLOW_GRAPH_CACHE_ENABLED,
+    backend=settings.FOLLOW_GRAPH_CACHE_BACKEND,
+    ttl_seconds=settings.FOLLOW_GRAPH_CACHE_TTL_SECONDS,
+    l1_ttl_seconds=settings.FOLLOW_GRAPH_CACHE_L1_TTL_SECONDS,
+    max_items=settings.FOLLOW_GRAPH_CACHE_MAX_ITEMS,
+)
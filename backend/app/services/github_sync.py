@@ -3,17 +3,27 @@ GitHub 배치 동기화 서비스.
 모든 MCP 서버의 GitHub stars/README를 일괄 업데이트합니다.
 """
 import logging
+import time
 from sqlalchemy.orm import Session
 from app.models.mcp_server import McpServer
 from app.crud.mcp_server import update_github_stats
 from app.services.github import GitHubService
 from app.core.config import settings
+from app.core.metrics import GITHUB_SYNC_SECONDS
 
 logger = logging.getLogger(__name__)
 
 
 async def sync_all_github_stats(db: Session):
     """모든 MCP 서버의 GitHub stats를 동기화합니다. URL별로 그룹화하여 중복 API 호출을 방지합니다."""
+    started = time.perf_counter()
+    try:
+        await _sync_servers(db)
+    finally:
+        GITHUB_SYNC_SECONDS.observe(time.perf_counter() - started)
+
+
+async def _sync_servers(db: Session):
     servers = db.query(McpServer).filter(McpServer.github_url.isnot(None)).all()
     if not servers:
         return
@@ -0,0 +1,424 @@
+import asyncio
+import heapq
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import redis
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.post import Post
+from app.services.periodic_job import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+LIKE_WEIGHT = 3.0
+COMMENT_WEIGHT = 2.0
+VIEW_WEIGHT = 0.2
+
+HOT_WINDOWS = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
+# Every window nests inside the longest one, so only posts this recent are tracked.
+TRACKED_SPAN_SECONDS = max(HOT_WINDOWS.values()).total_seconds()
+
+# Forward-decay multipliers are 2^exponent in a double. The epoch is kept at most
+# DECAY_EPOCH_SPAN half-lives back, so posts older than that weigh 2^-n ~ 0 instead of
+# the newest weighing more than a double holds; MAX_DECAY_EXPONENT leaves headroom for
+# the posts created between rebuilds (and for summing scores) before it clamps.
+DECAY_EPOCH_SPAN = 900
+MAX_DECAY_EXPONENT = 1000
+
+REDIS_CURRENT_KEY = "hot:current"
+REDIS_OLD_GENERATION_TTL_SECONDS = 120
+
+
+def hot_score(likes_count: int, comment_count: int, views: int) -> float:
+    """Raw (undecayed) hot score, the same formula the SQL fallback uses."""
+    return (likes_count or 0) * LIKE_WEIGHT + (comment_count or 0) * COMMENT_WEIGHT + (views or 0) * VIEW_WEIGHT
+
+
+def _to_timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class _MemoryBoard:
+    """Per-process fallback. `top` is O(n log N) via heapq instead of a sorted set."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.epoch = 0.0
+        self._meta: dict[int, tuple[Optional[int], float]] = {}
+        self._scores: dict[int, float] = {}
+        self.ready = False
+
+    def replace(self, epoch: float, entries: list[tuple[int, Optional[int], float, float]]) -> None:
+        with self._lock:
+            self.epoch = epoch
+            self._meta = {post_id: (category_id, created_ts) for post_id, category_id, created_ts, _ in entries}
+            self._scores = {post_id: score for post_id, _, _, score in entries}
+            self.ready = True
+
+    def get_epoch(self) -> float:
+        return self.epoch
+
+    def track(self, post_id: int, category_id: Optional[int], created_ts: float, score: float) -> None:
+        with self._lock:
+            self._meta[post_id] = (category_id, created_ts)
+            self._scores[post_id] = score
+
+    def untrack(self, post_id: int) -> None:
+        with self._lock:
+            self._meta.pop(post_id, None)
+            self._scores.pop(post_id, None)
+
+    def get_meta(self, post_id: int) -> Optional[tuple[Optional[int], float]]:
+        return self._meta.get(post_id)
+
+    def incr(self, post_id: int, delta: float) -> None:
+        with self._lock:
+            if post_id in self._scores:
+                self._scores[post_id] += delta
+
+    def top(
+        self,
+        window: str,
+        limit: int,
+        category_id: Optional[int],
+        now_ts: float,
+    ) -> list[tuple[int, float]]:
+        cutoff_ts = now_ts - HOT_WINDOWS[window].total_seconds()
+        with self._lock:
+            candidates = [
+                (post_id, score)
+                for post_id, score in self._scores.items()
+                if self._meta[post_id][1] >= cutoff_ts
+                and (category_id is None or self._meta[post_id][0] == category_id)
+            ]
+        return heapq.nlargest(limit, candidates, key=lambda item: (item[1], item[0]))
+
+    def prune(self, now_ts: float) -> None:
+        cutoff_ts = now_ts - TRACKED_SPAN_SECONDS
+        with self._lock:
+            expired = [post_id for post_id, (_cat, created_ts) in self._meta.items() if created_ts < cutoff_ts]
+            for post_id in expired:
+                self._meta.pop(post_id, None)
+                self._scores.pop(post_id, None)
+
+
+class _RedisBoard:
+    """
+    Shared sorted sets, one per (window, partition), under a generation prefix.
+    A rebuild writes a new generation and flips `hot:current`, so readers never see
+    a half-built board. Reads are ZREVRANGE: O(log n + N).
+    """
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+
+    def _generation(self) -> Optional[str]:
+        value = self.client.get(REDIS_CURRENT_KEY)
+        return value.decode() if isinstance(value, bytes) else value
+
+    @staticmethod
+    def _key(generation: str, suffix: str) -> str:
+        return f"hot:{generation}:{suffix}"
+
+    @classmethod
+    def _window_keys(cls, generation: str, window: str, category_id: Optional[int]) -> list[str]:
+        keys = [cls._key(generation, f"{window}:all")]
+        if category_id is not None:
+            keys.append(cls._key(generation, f"{window}:cat:{category_id}"))
+        return keys
+
+    @property
+    def ready(self) -> bool:
+        return self._generation() is not None
+
+    def replace(self, epoch: float, entries: list[tuple[int, Optional[int], float, float]]) -> None:
+        old_generation = self._generation()
+        generation = uuid.uuid4().hex[:12]
+        now_ts = time.time()
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(self._key(generation, "epoch"), epoch)
+        for post_id, category_id, created_ts, score in entries:
+            self._write_entry(pipe, generation, now_ts, post_id, category_id, created_ts, score)
+        pipe.execute()
+        self.client.set(REDIS_CURRENT_KEY, generation)
+        if old_generation:
+            for key in self.client.scan_iter(match=f"hot:{old_generation}:*", count=500):
+                self.client.expire(key, REDIS_OLD_GENERATION_TTL_SECONDS)
+
+    def _write_entry(self, pipe, generation, now_ts, post_id, category_id, created_ts, score) -> None:
+        pipe.hset(self._key(generation, "meta"), post_id, f"{category_id or ''}|{created_ts}")
+        pipe.zadd(self._key(generation, "created"), {post_id: created_ts})
+        for window, delta in HOT_WINDOWS.items():
+            if created_ts >= now_ts - delta.total_seconds():
+                for key in self._window_keys(generation, window, category_id):
+                    pipe.zadd(key, {post_id: score})
+
+    def get_epoch(self) -> float:
+        generation = self._generation()
+        if generation is None:
+            return 0.0
+        return float(self.client.get(self._key(generation, "epoch")) or 0.0)
+
+    def track(self, post_id: int, category_id: Optional[int], created_ts: float, score: float) -> None:
+        generation = self._generation()
+        if generation is None:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        self._write_entry(pipe, generation, time.time(), post_id, category_id, created_ts, score)
+        pipe.execute()
+
+    def get_meta(self, post_id: int) -> Optional[tuple[Optional[int], float]]:
+        generation = self._generation()
+        if generation is None:
+            return None
+        return self._parse_meta(self.client.hget(self._key(generation, "meta"), post_id))
+
+    @staticmethod
+    def _parse_meta(raw) -> Optional[tuple[Optional[int], float]]:
+        if raw is None:
+            return None
+        category_raw, created_raw = (raw.decode() if isinstance(raw, bytes) else raw).split("|")
+        return (int(category_raw) if category_raw else None, float(created_raw))
+
+    def untrack(self, post_id: int) -> None:
+        generation = self._generation()
+        meta = self.get_meta(post_id)
+        if generation is None or meta is None:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for window in HOT_WINDOWS:
+            for key in self._window_keys(generation, window, meta[0]):
+                pipe.zrem(key, post_id)
+        pipe.zrem(self._key(generation, "created"), post_id)
+        pipe.hdel(self._key(generation, "meta"), post_id)
+        pipe.execute()
+
+    def incr(self, post_id: int, delta: float) -> None:
+        generation = self._generation()
+        meta = self.get_meta(post_id)
+        if generation is None or meta is None:
+            return
+        category_id, created_ts = meta
+        now_ts = time.time()
+        pipe = self.client.pipeline(transaction=False)
+        for window, window_delta in HOT_WINDOWS.items():
+            if created_ts >= now_ts - window_delta.total_seconds():
+                for key in self._window_keys(generation, window, category_id):
+                    pipe.zincrby(key, delta, post_id)
+        pipe.execute()
+
+    def top(
+        self,
+        window: str,
+        limit: int,
+        category_id: Optional[int],
+        now_ts: float,
+    ) -> list[tuple[int, float]]:
+        generation = self._generation()
+        if generation is None:
+            return []
+        key = self._window_keys(generation, window, category_id)[-1]
+        rows = self.client.zrevrange(key, 0, limit - 1, withscores=True)
+        return [(int(member), float(score)) for member, score in rows]
+
+    def prune(self, now_ts: float) -> None:
+        generation = self._generation()
+        if generation is None:
+            return
+        for window, delta in HOT_WINDOWS.items():
+            cutoff = now_ts - delta.total_seconds()
+            expired = self.client.zrangebyscore(self._key(generation, "created"), "-inf", f"({cutoff}")
+            if not expired:
+                continue
+            metas = self.client.hmget(self._key(generation, "meta"), expired)
+            pipe = self.client.pipeline(transaction=False)
+            for member, raw_meta in zip(expired, metas):
+                meta = self._parse_meta(raw_meta)
+                for key in self._window_keys(generation, window, meta[0] if meta else None):
+                    pipe.zrem(key, member)
+            if delta.total_seconds() >= TRACKED_SPAN_SECONDS:
+                pipe.zrem(self._key(generation, "created"), *expired)
+                pipe.hdel(self._key(generation, "meta"), *expired)
+            pipe.execute()
+
+
+class HotScoreBoard(PeriodicJob):
+    """
+    Precomputed hot-post leaderboard for /community/hot and the weekly summary.
+
+    Scores are kept per window (24h/7d/30d) and per category, bumped on like,
+    comment and view events, and fully rebuilt from the denormalized Post counters
+    every HOT_SCORE_REBUILD_INTERVAL_SECONDS to absorb any missed event. The shared
+    redis board is rebuilt by one worker per pass (see PeriodicJob.singleton); each
+    memory board is rebuilt by its own worker.
+
+    With a decay half-life configured, scores use forward decay: each increment is
+    multiplied by 2^((created_at - epoch) / half_life), which ranks posts exactly like
+    score * 2^(-age / half_life) without ever rewriting stored scores. The epoch is
+    moved up at each rebuild so that exponent stays inside a double (DECAY_EPOCH_SPAN).
+
+    Use the redis backend whenever more than one worker runs: with "memory" each
+    worker only applies the bumps it handled itself, so workers rank differently.
+    """
+
+    name = "hot score rebuild"
+
+    def __init__(self, backend: str, half_life_hours: float, rebuild_interval_seconds: int):
+        super().__init__(rebuild_interval_seconds)
+        self.backend = backend
+        self.half_life_seconds = max(half_life_hours, 0.0) * 3600
+        self._memory = _MemoryBoard()
+        self._redis_board: Optional[_RedisBoard] = None
+        self._last_prune = 0.0
+        self.last_rebuild_at: Optional[datetime] = None
+        self.last_rebuild_size = 0
+
+    @property
+    def singleton(self) -> bool:
+        return self.backend == "redis"
+
+    def _board(self):
+        if self.backend == "redis":
+            if self._redis_board is None:
+                self._redis_board = _RedisBoard(
+                    redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5)
+                )
+            return self._redis_board
+        return self._memory
+
+    def _multiplier(self, created_ts: float, epoch: float) -> float:
+        if not self.half_life_seconds:
+            return 1.0
+        return 2 ** min((created_ts - epoch) / self.half_life_seconds, MAX_DECAY_EXPONENT)
+
+    def _epoch(self, cutoff_ts: float, now_ts: float) -> float:
+        if not self.half_life_seconds:
+            return cutoff_ts
+        return max(cutoff_ts, now_ts - DECAY_EPOCH_SPAN * self.half_life_seconds)
+
+    def rebuild(self, db: Session) -> int:
+        now = datetime.now(timezone.utc)
+        cutoff = now - max(HOT_WINDOWS.values())
+        rows = (
+            db.query(
+                Post.id,
+                Post.category_id,
+                Post.created_at,
+                Post.likes_count,
+                Post.comment_count,
+                Post.views,
+            )
+            .filter(Post.created_at >= cutoff)
+            .all()
+        )
+        epoch = self._epoch(cutoff.timestamp(), now.timestamp())
+        entries = []
+        for post_id, category_id, created_at, likes_count, comment_count, views in rows:
+            created_ts = _to_timestamp(created_at)
+            score = hot_score(likes_count, comment_count, views) * self._multiplier(created_ts, epoch)
+            entries.append((post_id, category_id, created_ts, score))
+        try:
+            self._board().replace(epoch, entries)
+        except redis.RedisError as exc:
+            logger.warning("Hot score rebuild failed: %s", exc)
+            return 0
+        self.last_rebuild_at = now
+        self.last_rebuild_size = len(entries)
+        return len(entries)
+
+    def track_post(self, post: Post) -> None:
+        """Start ranking a newly created post (score 0)."""
+        created_ts = _to_timestamp(post.created_at) if post.created_at else time.time()
+        try:
+            self._board().track(post.id, post.category_id, created_ts, 0.0)
+        except redis.RedisError as exc:
+            logger.warning("Hot score track failed: %s", exc)
+
+    def untrack_post(self, post_id: int) -> None:
+        try:
+            self._board().untrack(post_id)
+        except redis.RedisError as exc:
+            logger.warning("Hot score untrack failed: %s", exc)
+
+    def bump(self, post_id: int, delta: float) -> None:
+        """Apply a raw score change (e.g. LIKE_WEIGHT, -COMMENT_WEIGHT) to a tracked post."""
+        board = self._board()
+        try:
+            meta = board.get_meta(post_id)
+            if meta is None:
+                return  # older than the longest window, or deleted
+            board.incr(post_id, delta * self._multiplier(meta[1], board.get_epoch()))
+        except redis.RedisError as exc:
+            logger.warning("Hot score bump failed: %s", exc)
+
+    def top(
+        self,
+        window: str,
+        limit: int,
+        category_id: Optional[int] = None,
+    ) -> Optional[list[tuple[int, float]]]:
+        """
+        Top `limit` (post_id, score) pairs for the window, best first.
+        Returns None while the board has not been built yet so callers can fall back to SQL.
+        """
+        if window not in HOT_WINDOWS:
+            return None
+        now_ts = time.time()
+        board = self._board()
+        try:
+            if not board.ready:
+                return None
+            if now_ts - self._last_prune >= 60:
+                board.prune(now_ts)
+                self._last_prune = now_ts
+            ranked = board.top(window, limit, category_id, now_ts)
+            epoch = board.get_epoch()
+        except redis.RedisError as exc:
+            logger.warning("Hot score read failed: %s", exc)
+            return None
+
+        if not self.half_life_seconds:
+            return ranked
+        scale = 2 ** (-(now_ts - epoch) / self.half_life_seconds)
+        return [(post_id, score * scale) for post_id, score in ranked]
+
+    async def atop(
+        self,
+        window: str,
+        limit: int,
+        category_id: Optional[int] = None,
+    ) -> Optional[list[tuple[int, float]]]:
+        """`top()` for async routes: the redis board is read off the event loop."""
+        if self.backend != "redis":
+            return self.top(window, limit, category_id)
+        return await asyncio.to_thread(self.top, window, limit, category_id)
+
+    def run(self, db: Session) -> int:
+        return self.rebuild(db)
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "backend": self.backend,
+            "last_rebuild_at": self.last_rebuild_at.isoformat() if self.last_rebuild_at else None,
+            "last_rebuild_size": self.last_rebuild_size,
+        }
+
+
+hot_score_board = HotScoreBoard(
+    backend=settings.HOT_SCORE_BACKEND,
+    half_life_hours=settings.HOT_SCORE_DECAY_HALF_LIFE_HOURS,
+    rebuild_interval_seconds=settings.HOT_SCORE_REBUILD_INTERVAL_SECONDS,
+)
@@ -14,6 +14,7 @@ from mcp.client.stdio import stdio_client
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.metrics import MCP_PLAYGROUND_CONNECTIONS
 from app.crud import mcp_server as crud_mcp_server
 from app.crud import mcp_tool as crud_mcp_tool
 
@@ -120,6 +121,7 @@ class McpConnectionManager:
                 exit_stack=exit_stack,
             )
             self._connections[server_slug] = conn
+            MCP_PLAYGROUND_CONNECTIONS.inc()
             logger.info(f"MCP 실제 연결 성공: {server_slug}")
             return session
 
@@ -128,6 +130,7 @@ class McpConnectionManager:
         async with lock:
             conn = self._connections.pop(server_slug, None)
             if conn:
+                MCP_PLAYGROUND_CONNECTIONS.dec()
                 try:
                     await conn.exit_stack.aclose()
                 except Exception as e:
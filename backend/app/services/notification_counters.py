@@ -0,0 +1,39 @@
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.notification import reconcile_notification_counters
+from app.services.periodic_job import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationCounterReconciler(PeriodicJob):
+    """
+    Periodically repairs drift in user_notification_stats (writes that bypassed
+    the notification CRUD, e.g. seed scripts or cascaded user deletes).
+    The first pass runs one interval after startup, not at boot.
+    """
+
+    name = "notification counter reconciliation"
+    singleton = True
+    run_at_start = False
+
+    def run(self, db: Session) -> int:
+        repaired = reconcile_notification_counters(db)
+        if repaired:
+            logger.info("Notification counters reconciled: repaired=%s", repaired)
+        return repaired
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "last_repaired": self.last_processed,
+            "total_repaired": self.total_processed,
+        }
+
+
+notification_counter_reconciler = NotificationCounterReconciler(
+    interval_seconds=settings.NOTIFICATION_COUNTER_RECONCILE_INTERVAL_SECONDS,
+)
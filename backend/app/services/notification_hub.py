@@ -0,0 +1,270 @@
+import asyncio
+import json
+import logging
+import secrets
+import time
+from collections import OrderedDict, defaultdict
+from typing import Optional
+
+import redis
+import redis.asyncio as redis_async
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_CHANNEL = "notifications:events"
+REDIS_TICKET_KEY = "notifications:ticket:{ticket}"
+RECONNECT_DELAY_SECONDS = 1.0
+EVENT_RESYNC = "resync"
+
+
+class NotificationSubscription:
+    """
+    One open SSE/WebSocket connection. Its queue is bounded: when a slow client
+    falls `queue_size` events behind, the backlog is replaced by a single
+    "resync" event (refetch list + count) instead of growing without limit.
+    """
+
+    def __init__(self, user_id: int, queue_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def offer(self, event: dict) -> bool:
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": EVENT_RESYNC})
+            return False
+
+    async def next_event(self, timeout: float) -> Optional[dict]:
+        """Next event, or None after `timeout` seconds of silence (time for a heartbeat)."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class NotificationHub:
+    """
+    Per-worker registry of open notification streams.
+
+    `publish` may be called from any thread (sync routes run in the threadpool).
+    With the redis backend every event goes through one pub/sub channel and each
+    worker delivers it to its own local connections, so all of a user's tabs get it
+    regardless of which worker created the notification. The "memory" backend only
+    reaches connections on the publishing worker.
+
+    Browsers cannot send headers when opening a stream, so they authenticate with a
+    short-lived, single-use ticket from `issue_ticket` instead of putting the access
+    token in the URL (where access logs would keep it). With the redis backend the
+    ticket can be redeemed on any worker.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        queue_size: int,
+        heartbeat_seconds: float,
+        max_connections: int,
+        ticket_ttl_seconds: int,
+    ):
+        self.backend = backend
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_connections = max_connections
+        self.ticket_ttl_seconds = ticket_ttl_seconds
+        self._subscriptions: dict[int, set[NotificationSubscription]] = defaultdict(set)
+        self._connections = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._redis: Optional[redis.Redis] = None
+        self._async_redis: Optional[redis_async.Redis] = None
+        self._async_redis_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tickets: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self.metrics = {
+            "published": 0,
+            "delivered": 0,
+            "overflows": 0,
+            "rejected": 0,
+            "errors": 0,
+        }
+
+    # --- lifecycle ----------------------------------------------------------
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if self.backend == "redis" and self._listener is None:
+            self._listener = self._loop.create_task(self._listen())
+
+    async def shutdown(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        for subscriptions in list(self._subscriptions.values()):
+            for subscription in list(subscriptions):
+                subscription.offer({"type": "shutdown"})
+        client, self._async_redis, self._async_redis_loop = self._async_redis, None, None
+        if client is not None:
+            await client.aclose()
+
+    async def _listen(self) -> None:
+        while True:
+            client = redis_async.Redis.from_url(settings.REDIS_URL)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(REDIS_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = json.loads(message["data"])
+                    self._deliver(int(data["user_id"]), data["event"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # reconnect on any pub/sub failure
+                self.metrics["errors"] += 1
+                logger.warning("Notification hub listener failed: %s", exc)
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+            finally:
+                try:
+                    await pubsub.aclose()
+                    await client.aclose()
+                except Exception:
+                    pass
+
+    # --- stream tickets -----------------------------------------------------
+
+    def _get_async_redis(self) -> Optional[redis_async.Redis]:
+        if self.backend != "redis":
+            return None
+        loop = asyncio.get_running_loop()
+        if self._async_redis is None or self._async_redis_loop is not loop:
+            self._async_redis = redis_async.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5)
+            self._async_redis_loop = loop
+        return self._async_redis
+
+    async def issue_ticket(self, user_id: int) -> str:
+        """A single-use credential for opening one stream within `ticket_ttl_seconds`."""
+        ticket = secrets.token_urlsafe(32)
+        client = self._get_async_redis()
+        if client is not None:
+            try:
+                await client.set(REDIS_TICKET_KEY.format(ticket=ticket), user_id, ex=self.ticket_ttl_seconds)
+                return ticket
+            except redis.RedisError as exc:
+                self.metrics["errors"] += 1
+                logger.warning("Notification ticket store failed, keeping it on this worker: %s", exc)
+
+        now = time.monotonic()
+        # Every ticket gets the same TTL, so insertion order is expiry order.
+        while self._tickets and (
+            next(iter(self._tickets.values()))[1] <= now or len(self._tickets) >= self.max_connections
+        ):
+            self._tickets.popitem(last=False)
+        self._tickets[ticket] = (user_id, now + self.ticket_ttl_seconds)
+        return ticket
+
+    async def redeem_ticket(self, ticket: Optional[str]) -> Optional[int]:
+        """The ticket's user id, consuming the ticket; None when unknown, spent or expired."""
+        if not ticket:
+            return None
+        local = self._tickets.pop(ticket, None)
+        if local is not None:
+            user_id, expires_at = local
+            return user_id if expires_at > time.monotonic() else None
+        client = self._get_async_redis()
+        if client is None:
+            return None
+        try:
+            user_id = await client.getdel(REDIS_TICKET_KEY.format(ticket=ticket))
+        except redis.RedisError as exc:
+            self.metrics["errors"] += 1
+            logger.warning("Notification ticket lookup failed: %s", exc)
+            return None
+        return int(user_id) if user_id is not None else None
+
+    # --- connections --------------------------------------------------------
+
+    def connect(self, user_id: int) -> Optional[NotificationSubscription]:
+        """Register a connection, or None when this worker is at max_connections."""
+        if self._connections >= self.max_connections:
+            self.metrics["rejected"] += 1
+            return None
+        subscription = NotificationSubscription(user_id, self.queue_size)
+        self._subscriptions[user_id].add(subscription)
+        self._connections += 1
+        return subscription
+
+    def disconnect(self, subscription: NotificationSubscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if not subscriptions or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            self._subscriptions.pop(subscription.user_id, None)
+        self._connections -= 1
+
+    # --- events -------------------------------------------------------------
+
+    def publish(self, user_id: int, event: dict) -> None:
+        """Fan `event` out to every open connection of `user_id` (thread-safe)."""
+        self.metrics["published"] += 1
+        if self.backend == "redis":
+            try:
+                if self._redis is None:
+                    self._redis = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5)
+                self._redis.publish(
+                    REDIS_CHANNEL,
+                    json.dumps({"user_id": user_id, "event": event}, default=str),
+                )
+                return
+            except redis.RedisError as exc:
+                self.metrics["errors"] += 1
+                logger.warning("Notification publish failed, delivering locally: %s", exc)
+
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        # Round-trip through JSON so local and redis delivery carry identical payloads.
+        event = json.loads(json.dumps(event, default=str))
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(user_id, event)
+        else:
+            loop.call_soon_threadsafe(self._deliver, user_id, event)
+
+    def _deliver(self, user_id: int, event: dict) -> None:
+        for subscription in list(self._subscriptions.get(user_id, ())):
+            if subscription.offer(event):
+                self.metrics["delivered"] += 1
+            else:
+                self.metrics["overflows"] += 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "connections": self._connections,
+            "users": len(self._subscriptions),
+            **self.metrics,
+        }
+
+
+notification_hub = NotificationHub(
+    backend=settings.NOTIFICATION_PUSH_BACKEND,
+    queue_size=settings.NOTIFICATION_PUSH_QUEUE_SIZE,
+    heartbeat_seconds=settings.NOTIFICATION_PUSH_HEARTBEAT_SECONDS,
+    max_connections=settings.NOTIFICATION_PUSH_MAX_CONNECTIONS,
+    ticket_ttl_seconds=settings.NOTIFICATION_STREAM_TICKET_TTL_SECONDS,
+)
@@ -0,0 +1,184 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import notification as crud_notification
+from app.services.periodic_job import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY_SECONDS = 600
+
+
+def _merge(events: list) -> dict:
+    """One notification row for a group of outbox events (newest event wins)."""
+    latest = events[-1]
+    content = latest.content
+    template = crud_notification.COALESCED_CONTENT.get(latest.type)
+    if len(events) > 1 and template and latest.actor_name:
+        content = template.format(actor=latest.actor_name, others=len(events) - 1)
+    return {
+        "user_id": latest.user_id,
+        "type": latest.type,
+        "content": content,
+        "related_post_id": latest.related_post_id,
+        "related_comment_id": latest.related_comment_id,
+    }
+
+
+class NotificationOutboxWorker(PeriodicJob):
+    """
+    Drains `notification_outbox` into `notifications` off the request path.
+
+    Each pass locks a batch of due events (SKIP LOCKED, so every worker process can
+    run one), merges events that share a coalesce key, writes them with one
+    multi-row INSERT, deletes the outbox rows and commits, then pushes the new
+    notifications. If a batch fails, its groups are retried one by one so a single
+    bad event cannot hold back the rest; failing events back off exponentially and
+    are left in the table once they reach `max_attempts`.
+    """
+
+    name = "notification outbox drain"
+
+    def __init__(
+        self,
+        batch_size: int,
+        poll_interval_seconds: float,
+        max_attempts: int,
+        retry_base_seconds: float,
+    ):
+        super().__init__(poll_interval_seconds)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self._lock = threading.Lock()
+        self.depth = {"pending": 0, "dead": 0, "oldest_pending_age_seconds": None}
+        self.metrics = {
+            "batches": 0,
+            "events": 0,
+            "notifications": 0,
+            "coalesced": 0,
+            "failed_batches": 0,
+            "failed_events": 0,
+            "last_batch_ms": 0.0,
+        }
+
+    def _count(self, **deltas) -> None:
+        with self._lock:
+            for metric, delta in deltas.items():
+                self.metrics[metric] += delta
+
+    # --- processing ---------------------------------------------------------
+
+    def process_batch(self, db: Session) -> int:
+        """Dispatch one batch; returns the number of outbox events consumed or retried."""
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        events = crud_notification.claim_outbox_events(db, self.batch_size, now, self.max_attempts)
+        if not events:
+            db.rollback()
+            return 0
+
+        groups: dict = {}
+        for event in sorted(events, key=lambda item: item.id):
+            groups.setdefault(event.coalesce_key or f"id:{event.id}", []).append(event)
+        # Plain data only: a rollback below expires the ORM rows.
+        plans = [
+            ([event.id for event in group], max(event.attempts for event in group), _merge(group))
+            for group in groups.values()
+        ]
+
+        try:
+            payloads = self._dispatch(db, plans)
+        except Exception as exc:
+            db.rollback()
+            self._count(failed_batches=1)
+            logger.warning("Notification outbox batch failed, retrying per group: %s", exc)
+            payloads = []
+            for plan in plans:
+                payloads.extend(self._dispatch_alone(db, plan, now))
+
+        crud_notification.publish_notifications(db, payloads)
+        self._count(
+            batches=1,
+            events=len(events),
+            notifications=len(payloads),
+            coalesced=len(events) - len(plans),
+        )
+        with self._lock:
+            self.metrics["last_batch_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return len(events)
+
+    @staticmethod
+    def _dispatch(db: Session, plans: list) -> list[dict]:
+        payloads = crud_notification.dispatch_outbox_events(
+            db,
+            [row for _ids, _attempts, row in plans],
+            [event_id for ids, _attempts, _row in plans for event_id in ids],
+        )
+        db.commit()
+        return payloads
+
+    def _dispatch_alone(self, db: Session, plan: tuple, now: datetime) -> list[dict]:
+        event_ids, attempts, _row = plan
+        try:
+            locked = crud_notification.lock_outbox_events(db, event_ids)
+            if len(locked) != len(event_ids):
+                # Taken by another worker (or deleted with its post) since the rollback.
+                db.rollback()
+                return []
+            return self._dispatch(db, [plan])
+        except Exception as exc:
+            db.rollback()
+            delay = min(self.retry_base_seconds * (2 ** attempts), MAX_RETRY_DELAY_SECONDS)
+            crud_notification.record_outbox_failure(db, event_ids, repr(exc), now + timedelta(seconds=delay))
+            db.commit()
+            self._count(failed_events=len(event_ids))
+            logger.warning("Notification outbox events %s failed: %s", event_ids, exc)
+            return []
+
+    def run(self, db: Session) -> int:
+        processed = 0
+        while True:
+            handled = self.process_batch(db)
+            processed += handled
+            if handled < self.batch_size:
+                break
+        self._refresh_depth(db)
+        return processed
+
+    def _refresh_depth(self, db: Session) -> None:
+        depth = crud_notification.get_outbox_depth(db, self.max_attempts)
+        db.rollback()
+        oldest = depth["oldest_created_at"]
+        if oldest is not None and oldest.tzinfo is None:
+            oldest = oldest.replace(tzinfo=timezone.utc)
+        with self._lock:
+            self.depth = {
+                "pending": depth["pending"],
+                "dead": depth["dead"],
+                "oldest_pending_age_seconds": (
+                    round((datetime.now(timezone.utc) - oldest).total_seconds(), 1) if oldest else None
+                ),
+            }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "batch_size": self.batch_size,
+                "max_attempts": self.max_attempts,
+                **self.depth,
+                **self.metrics,
+            }
+
+
+notification_outbox_worker = NotificationOutboxWorker(
+    batch_size=settings.NOTIFICATION_OUTBOX_BATCH_SIZE,
+    poll_interval_seconds=settings.NOTIFICATION_OUTBOX_POLL_INTERVAL_SECONDS,
+    max_attempts=settings.NOTIFICATION_OUTBOX_MAX_ATTEMPTS,
+    retry_base_seconds=settings.NOTIFICATION_OUTBOX_RETRY_BASE_SECONDS,
+)
@@ -0,0 +1,59 @@
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.notification import archive_notifications
+from app.services.periodic_job import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationArchiver(PeriodicJob):
+    """
+    Keeps the hot `notifications` table (and its (user_id, created_at, id) index)
+    bounded: periodically moves read notifications past `retention_days`, and
+    anything beyond each user's newest `inbox_max_items`, to notifications_archive.
+    Either limit is off when 0; with both off the job never starts.
+    """
+
+    name = "notification archiving"
+    singleton = True
+
+    def __init__(self, retention_days: int, inbox_max_items: int, interval_seconds: int, batch_size: int):
+        super().__init__(interval_seconds)
+        self.retention_days = retention_days
+        self.inbox_max_items = inbox_max_items
+        self.batch_size = batch_size
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval_seconds > 0 and (self.retention_days > 0 or self.inbox_max_items > 0)
+
+    def run(self, db: Session) -> int:
+        archived = archive_notifications(
+            db,
+            retention_days=self.retention_days,
+            inbox_max_items=self.inbox_max_items,
+            batch_size=self.batch_size,
+        )
+        if archived:
+            logger.info("Notifications archived: %s", archived)
+        return archived
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "retention_days": self.retention_days,
+            "inbox_max_items": self.inbox_max_items,
+            "last_archived": self.last_processed,
+            "total_archived": self.total_processed,
+        }
+
+
+notification_archiver = NotificationArchiver(
+    retention_days=settings.NOTIFICATION_RETENTION_DAYS,
+    inbox_max_items=settings.NOTIFICATION_INBOX_MAX_ITEMS,
+    interval_seconds=settings.NOTIFICATION_ARCHIVE_INTERVAL_SECONDS,
+    batch_size=settings.NOTIFICATION_ARCHIVE_BATCH_SIZE,
+)
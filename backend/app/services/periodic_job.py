@@ -0,0 +1,127 @@
+import asyncio
+import hashlib
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def advisory_lock_key(name: str) -> int:
+    """A stable signed 64-bit Postgres advisory lock key for `name`."""
+    return int.from_bytes(hashlib.sha256(f"periodic-job:{name}".encode()).digest()[:8], "big", signed=True)
+
+
+@contextmanager
+def job_lock(session_factory: Callable[[], Session], name: str) -> Iterator[bool]:
+    """
+    Yields True in the one process that may run `name` right now.
+
+    On PostgreSQL this is pg_try_advisory_xact_lock held by a transaction of its own
+    for the whole block, so it survives the job's batch commits and is safe behind a
+    transaction-pooling pgbouncer. Other databases have no cross-process lock and
+    always yield True (single-process dev/test setups).
+    """
+    db = session_factory()
+    try:
+        if db.get_bind().dialect.name != "postgresql":
+            yield True
+            return
+        yield bool(db.execute(select(func.pg_try_advisory_xact_lock(advisory_lock_key(name)))).scalar())
+    finally:
+        db.rollback()
+        db.close()
+
+
+class PeriodicJob:
+    """
+    A maintenance pass run from a background task every `interval_seconds`.
+
+    Subclasses implement `run(db)` and return how many rows it handled. The pass runs
+    in a worker thread with its own session; `run_at_start` decides whether the first
+    pass runs at boot or one interval later. Every worker process starts the loop, so
+    jobs that must not overlap set `singleton`: each pass then only runs in the
+    worker holding the job's advisory lock and is skipped everywhere else.
+    """
+
+    name = "periodic job"
+    singleton = False
+    run_at_start = True
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self.last_run_at: Optional[datetime] = None
+        self.last_processed = 0
+        self.total_processed = 0
+        self.skipped_runs = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval_seconds > 0
+
+    def run(self, db: Session) -> int:
+        raise NotImplementedError
+
+    def run_with_session(self, session_factory: Callable[[], Session]) -> Optional[int]:
+        """One pass; None when another worker holds a singleton job's lock."""
+        if not self.singleton:
+            return self._run(session_factory)
+        with job_lock(session_factory, self.name) as acquired:
+            if not acquired:
+                self.skipped_runs += 1
+                return None
+            return self._run(session_factory)
+
+    def _run(self, session_factory: Callable[[], Session]) -> int:
+        db = session_factory()
+        try:
+            processed = self.run(db)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        self.last_run_at = datetime.now(timezone.utc)
+        self.last_processed = processed
+        self.total_processed += processed
+        return processed
+
+    async def _loop(self, session_factory: Callable[[], Session]) -> None:
+        if not self.run_at_start:
+            await asyncio.sleep(self.interval_seconds)
+        while True:
+            try:
+                await asyncio.to_thread(self.run_with_session, session_factory)
+            except Exception as exc:
+                logger.warning("%s failed: %s", self.name.capitalize(), exc)
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        if not self.enabled:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(session_factory))
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        stats = {
+            "enabled": self.enabled,
+            "interval_seconds": self.interval_seconds,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
+        if self.singleton:
+            stats["skipped_runs"] = self.skipped_runs
+        return stats
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.crud import user as crud_user
+from app.models.user import User
+from app.services.tiered_cache import TieredCache
+from app.services.ttl_cache import TTLCache
+
+REDIS_PRINCIPAL_KEY_PREFIX = "principal"
+SESSION_INFO_KEY = "principal_cache_invalidations"
+
+# Columns routes read from current_user. hashed_password is deliberately left out so
+# it is never copied into the cache; it is lazy-loaded on the rare route that needs it.
+PRINCIPAL_FIELDS = (
+    "id",
+    "email",
+    "username",
+    "has_local_password",
+    "email_verified",
+    "email_verified_at",
+    "is_admin",
+    "created_at",
+    "profile_image_url",
+    "bio",
+    "experience_points",
+    "level",
+    "badge",
+)
+_DATETIME_FIELDS = {"email_verified_at", "created_at"}
+
+
+def _token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class PrincipalCache:
+    """
+    Resolves bearer tokens to users without a signature check and a `users` SELECT
+    on every request.
+
+    Decoded JWT payloads are cached per process by token hash until the token's own
+    `exp`. User snapshots (PRINCIPAL_FIELDS) live in a TieredCache: a short-TTL
+    per-process LRU and, with the redis backend, a shared L2. A cached snapshot is
+    merged into the request's session without loading, so routes still get a
+    session-bound `User` they can update. Any committed User update/delete, and block
+    changes, drop the snapshot.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        backend: str,
+        ttl_seconds: int,
+        l1_ttl_seconds: int,
+        max_items: int,
+        token_cache_max_items: int,
+    ):
+        self.enabled = enabled
+        self.backend = backend
+        self._principals = TieredCache(
+            name="Principal",
+            backend=backend,
+            key_prefix=REDIS_PRINCIPAL_KEY_PREFIX,
+            ttl_seconds=ttl_seconds,
+            l1_ttl_seconds=l1_ttl_seconds,
+            max_items=max_items,
+            dumps=_dumps,
+            loads=_loads,
+        )
+        self._tokens = TTLCache(token_cache_max_items)
+        self._lock = threading.Lock()
+        self.metrics = {"token_hits": 0, "token_misses": 0}
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self.metrics[metric] += 1
+
+    # --- tokens -------------------------------------------------------------
+
+    def decode_token(self, token: str) -> Optional[dict]:
+        if not self.enabled:
+            return decode_access_token(token)
+
+        key = _token_hash(token)
+        now = time.time()
+        with self._lock:
+            payload = self._tokens.get(key, now)
+        if payload is not None:
+            self._count("token_hits")
+            return payload
+
+        self._count("token_misses")
+        payload = decode_access_token(token)
+        # Only valid tokens are cached, and never past their own expiry.
+        if payload and isinstance(payload.get("exp"), (int, float)):
+            with self._lock:
+                self._tokens.set(key, payload, float(payload["exp"]))
+        return payload
+
+    # --- principals ---------------------------------------------------------
+
+    def get_user(self, db: Session, user_id: int) -> Optional[User]:
+        if not self.enabled:
+            return crud_user.get_user_by_id(db, user_id)
+
+        fields, stamp = self._principals.lookup(user_id)
+        if fields is not None:
+            return self._attach(db, fields)
+
+        user = crud_user.get_user_by_id(db, user_id)
+        if user is not None:
+            self._principals.store(user_id, {name: getattr(user, name) for name in PRINCIPAL_FIELDS}, stamp)
+        return user
+
+    @staticmethod
+    def _attach(db: Session, fields: dict) -> User:
+        user = User(**fields)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def invalidate(self, *user_ids: int) -> None:
+        if self.enabled:
+            self._principals.invalidate(*user_ids)
+
+    def clear(self) -> None:
+        self._principals.clear()
+        with self._lock:
+            self._tokens.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            metrics = dict(self.metrics)
+            tokens = len(self._tokens)
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend,
+            "principals": len(self._principals),
+            "tokens": tokens,
+            **self._principals.stats(),
+            **metrics,
+        }
+
+
+def _dumps(fields: dict) -> str:
+    return json.dumps(
+        {
+            name: value.isoformat() if name in _DATETIME_FIELDS and value is not None else value
+            for name, value in fields.items()
+        }
+    )
+
+
+def _loads(raw) -> dict:
+    fields = json.loads(raw)
+    for name in _DATETIME_FIELDS:
+        if fields.get(name):
+            fields[name] = datetime.fromisoformat(fields[name])
+    return fields
+
+
+principal_cache = PrincipalCache(
+    enabled=settings.PRINCIPAL_CACHE_ENABLED,
+    backend=settings.PRINCIPAL_CACHE_BACKEND,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    l1_ttl_seconds=settings.PRINCIPAL_CACHE_L1_TTL_SECONDS,
+    max_items=settings.PRINCIPAL_CACHE_MAX_ITEMS,
+    token_cache_max_items=settings.TOKEN_CACHE_MAX_ITEMS,
+)
+
+
+# Invalidate after commit (not at flush) so a concurrent request cannot re-cache the
+# pre-commit row between the two.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _queue_principal_invalidation(_mapper, _connection, target: User) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(SESSION_INFO_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_principal_invalidations(session: Session) -> None:
+    user_ids = session.info.pop(SESSION_INFO_KEY, None)
+    if user_ids:
+        principal_cache.invalidate(*user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_invalidations(session: Session) -> None:
+    session.info.pop(SESSION_INFO_KEY, None)
@@ -0,0 +1,516 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+import redis
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_ENTRY_KEY = "rc:entry:{key}"
+REDIS_TAG_VERSION_KEY = "rc:tagseq:{tag}"
+REDIS_SEQUENCE_KEY = "rc:seq"
+REDIS_LOCK_KEY = "rc:lock:{key}"
+LOCK_POLL_INTERVAL_SECONDS = 0.05
+
+# A tag's version is the invalidation sequence number of its latest bump, so a build
+# can tell whether any of its tags was bumped after it started.
+INVALIDATE_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+for i = 2, #KEYS do
+    redis.call('SET', KEYS[i], seq)
+end
+return seq
+"""
+
+# Deletes the lock only while it still holds this builder's token: once the lock has
+# expired it may belong to the next builder.
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+TAG_BOARD = "board"
+TAG_CATEGORIES = "categories"
+TAG_MCP_SERVERS = "mcp-servers"
+TAG_BLOG = "blog"
+# Listings ordered by engagement (likes, comments, views, hot score). Post tags alone
+# only cover a listed post's own fields; this tag lets likes, comments and view flushes
+# re-rank the pages as well.
+TAG_RANKINGS = "rankings"
+
+
+def post_tag(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def category_tag(category_id: Optional[int]) -> str:
+    return f"category:{category_id}"
+
+
+def mcp_server_tag(server_id: int) -> str:
+    return f"mcp-server:{server_id}"
+
+
+def blog_post_tag(post_id: int) -> str:
+    return f"blog-post:{post_id}"
+
+
+def build_cache_key(namespace: str, params: dict) -> str:
+    """Stable key for a route + its parsed query params (None/blank values dropped)."""
+    normalized = {
+        name: value
+        for name, value in sorted(params.items())
+        if value is not None and value != ""
+    }
+    digest = hashlib.sha1(
+        json.dumps(normalized, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def _etag_for(body: bytes) -> str:
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+@dataclass
+class CachedBody:
+    body: bytes
+    etag: str
+    tag_versions: dict[str, int]
+    expires_at: float
+    status: str = field(default="miss", compare=False)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "body": self.body.decode("utf-8"),
+                "etag": self.etag,
+                "tags": self.tag_versions,
+                "expires_at": self.expires_at,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw) -> "CachedBody":
+        data = json.loads(raw)
+        return cls(
+            body=data["body"].encode("utf-8"),
+            etag=data["etag"],
+            tag_versions={tag: int(version) for tag, version in data["tags"].items()},
+            expires_at=float(data["expires_at"]),
+        )
+
+
+class ResponseCache:
+    """
+    Shared cache for public, anonymous-equivalent JSON read responses.
+
+    Entries live in a per-process L1 (bounded LRU) and, with the redis backend, in a
+    shared L2. Invalidation is tag based: every entry records the version of each of
+    its tags when it was built, and `invalidate(tag)` bumps that version, so stale
+    entries are detected on read in every worker without tracking key lists.
+    Concurrent misses for the same key are coalesced (single-flight) in-process and,
+    with redis, across workers through a short SET NX lock. A build whose tags were
+    invalidated while it ran is returned but not stored, since it may predate the write.
+
+    The memory backend only sees this worker's invalidations, so other workers keep
+    serving pre-write bodies until the TTL; use redis whenever more than one worker
+    runs. The async API does its redis I/O in a thread so it never blocks the loop.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        backend: str,
+        ttl_seconds: int,
+        l1_max_items: int,
+        lock_timeout_seconds: float,
+    ):
+        self.enabled = enabled
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.l1_max_items = l1_max_items
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self._l1: OrderedDict[str, CachedBody] = OrderedDict()
+        self._tag_versions: dict[str, int] = {}
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._inflight: dict[str, threading.Lock] = {}
+        self._async_inflight: dict[str, asyncio.Lock] = {}
+        self._redis: Optional[redis.Redis] = None
+        self._invalidate_script = None
+        self.metrics = {
+            "hits_l1": 0,
+            "hits_l2": 0,
+            "misses": 0,
+            "stale": 0,
+            "coalesced": 0,
+            "invalidations": 0,
+            "stale_builds": 0,
+            "errors": 0,
+        }
+
+    def _get_redis(self) -> Optional[redis.Redis]:
+        if self.backend != "redis":
+            return None
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5)
+            self._invalidate_script = self._redis.register_script(INVALIDATE_SCRIPT)
+            self._release_lock_script = self._redis.register_script(RELEASE_LOCK_SCRIPT)
+        return self._redis
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self.metrics[metric] += 1
+
+    async def _off_loop(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a helper that may make blocking redis calls without stalling the event loop."""
+        if self._get_redis() is None:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    # --- tag versions -------------------------------------------------------
+
+    def _current_versions(self, tags: Iterable[str]) -> dict[str, int]:
+        tags = list(tags)
+        client = self._get_redis()
+        if client is not None and tags:
+            try:
+                values = client.mget([REDIS_TAG_VERSION_KEY.format(tag=tag) for tag in tags])
+                return {tag: int(value or 0) for tag, value in zip(tags, values)}
+            except redis.RedisError as exc:
+                self._count("errors")
+                logger.warning("Response cache tag lookup failed: %s", exc)
+        with self._lock:
+            return {tag: self._tag_versions.get(tag, 0) for tag in tags}
+
+    def _sequence_snapshot(self) -> int:
+        """The invalidation sequence right now; taken before a build starts."""
+        client = self._get_redis()
+        if client is not None:
+            try:
+                return int(client.get(REDIS_SEQUENCE_KEY) or 0)
+            except redis.RedisError as exc:
+                self._count("errors")
+                logger.warning("Response cache sequence lookup failed: %s", exc)
+        with self._lock:
+            return self._sequence
+
+    def _is_fresh(self, entry: CachedBody, now: float) -> bool:
+        if entry.expires_at <= now:
+            return False
+        return self._current_versions(entry.tag_versions) == entry.tag_versions
+
+    def invalidate(self, *tags: str) -> None:
+        """Mark every entry carrying any of `tags` as stale (all workers, with redis)."""
+        tags = [tag for tag in tags if tag]
+        if not tags or not self.enabled:
+            return
+        with self._lock:
+            self._sequence += 1
+            for tag in tags:
+                self._tag_versions[tag] = self._sequence
+            self.metrics["invalidations"] += len(tags)
+        client = self._get_redis()
+        if client is not None:
+            try:
+                self._invalidate_script(
+                    keys=[REDIS_SEQUENCE_KEY] + [REDIS_TAG_VERSION_KEY.format(tag=tag) for tag in tags],
+                    client=client,
+                )
+            except redis.RedisError as exc:
+                self._count("errors")
+                logger.warning("Response cache invalidation failed: %s", exc)
+
+    async def ainvalidate(self, *tags: str) -> None:
+        """`invalidate` for async routes."""
+        await self._off_loop(self.invalidate, *tags)
+
+    # --- storage ------------------------------------------------------------
+
+    def _read(self, key: str, now: float) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._l1.get(key)
+            if entry is not None:
+                self._l1.move_to_end(key)
+        if entry is not None:
+            if self._is_fresh(entry, now):
+                self._count("hits_l1")
+                return replace(entry, status="hit")
+            self._count("stale")
+            with self._lock:
+                self._l1.pop(key, None)
+
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            raw = client.get(REDIS_ENTRY_KEY.format(key=key))
+        except redis.RedisError as exc:
+            self._count("errors")
+            logger.warning("Response cache read failed: %s", exc)
+            return None
+        if raw is None:
+            return None
+        entry = CachedBody.from_json(raw)
+        if not self._is_fresh(entry, now):
+            self._count("stale")
+            return None
+        self._count("hits_l2")
+        self._store_l1(key, entry)
+        return replace(entry, status="hit")
+
+    def _store_l1(self, key: str, entry: CachedBody) -> None:
+        with self._lock:
+            self._l1[key] = entry
+            self._l1.move_to_end(key)
+            while len(self._l1) > self.l1_max_items:
+                self._l1.popitem(last=False)
+
+    def _write(self, key: str, entry: CachedBody, ttl: int) -> None:
+        self._store_l1(key, entry)
+        client = self._get_redis()
+        if client is not None:
+            try:
+                client.set(REDIS_ENTRY_KEY.format(key=key), entry.to_json(), ex=ttl)
+            except redis.RedisError as exc:
+                self._count("errors")
+                logger.warning("Response cache write failed: %s", exc)
+
+    # --- single-flight ------------------------------------------------------
+
+    def _acquire_shared_lock(self, key: str) -> tuple[bool, Optional[str]]:
+        """(may build, token to release with); without redis there is nothing to release."""
+        client = self._get_redis()
+        if client is None:
+            return True, None
+        token = uuid.uuid4().hex
+        try:
+            acquired = client.set(
+                REDIS_LOCK_KEY.format(key=key),
+                token,
+                nx=True,
+                px=int(self.lock_timeout_seconds * 1000),
+            )
+        except redis.RedisError:
+            return True, None
+        return (True, token) if acquired else (False, None)
+
+    def _release_shared_lock(self, key: str, token: Optional[str]) -> None:
+        if token is None:
+            return
+        try:
+            self._release_lock_script(keys=[REDIS_LOCK_KEY.format(key=key)], args=[token])
+        except redis.RedisError:
+            pass
+
+    def _wait_for_other_worker(self, key: str) -> Optional[CachedBody]:
+        deadline = time.monotonic() + self.lock_timeout_seconds
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL_SECONDS)
+            entry = self._read(key, time.time())
+            if entry is not None:
+                return entry
+        return None
+
+    async def _await_other_worker(self, key: str) -> Optional[CachedBody]:
+        deadline = time.monotonic() + self.lock_timeout_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL_SECONDS)
+            entry = await self._off_loop(self._read, key, time.time())
+            if entry is not None:
+                return entry
+        return None
+
+    def _store_built(
+        self,
+        key: str,
+        payload: Any,
+        tags: Iterable[str],
+        ttl: int,
+        started_at: int,
+    ) -> CachedBody:
+        body = _dump(payload)
+        entry = CachedBody(
+            body=body,
+            etag=_etag_for(body),
+            tag_versions=self._current_versions(set(tags)),
+            expires_at=time.time() + ttl,
+            status="miss",
+        )
+        if any(version > started_at for version in entry.tag_versions.values()):
+            # Invalidated mid-build: serve it to this caller, but the next read rebuilds.
+            self._count("stale_builds")
+            return entry
+        self._write(key, entry, ttl)
+        return entry
+
+    def get_or_build(
+        self,
+        key: str,
+        build: Callable[[], tuple[Any, Iterable[str]]],
+        ttl_seconds: Optional[int] = None,
+    ) -> CachedBody:
+        """
+        Return the cached JSON body for `key`, or call `build()` once (even under
+        concurrency) to produce `(payload, tags)` and cache it.
+        """
+        ttl = ttl_seconds or self.ttl_seconds
+        if not self.enabled:
+            payload, _tags = build()
+            body = _dump(payload)
+            return CachedBody(body, _etag_for(body), {}, 0.0, status="bypass")
+
+        entry = self._read(key, time.time())
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            flight = self._inflight.setdefault(key, threading.Lock())
+        with flight:
+            # Another thread may have filled the entry while we waited for the flight.
+            entry = self._read(key, time.time())
+            if entry is not None:
+                self._count("coalesced")
+                return entry
+
+            may_build, lock_token = self._acquire_shared_lock(key)
+            try:
+                if not may_build:
+                    entry = self._wait_for_other_worker(key)
+                    if entry is not None:
+                        self._count("coalesced")
+                        return entry
+
+                self._count("misses")
+                started_at = self._sequence_snapshot()
+                payload, tags = build()
+                return self._store_built(key, payload, tags, ttl, started_at)
+            finally:
+                self._release_shared_lock(key, lock_token)
+                with self._lock:
+                    if self._inflight.get(key) is flight:
+                        self._inflight.pop(key, None)
+
+    async def aget_or_build(
+        self,
+        key: str,
+        build: Callable[[], Awaitable[tuple[Any, Iterable[str]]]],
+        ttl_seconds: Optional[int] = None,
+    ) -> CachedBody:
+        """
+        `get_or_build` for async routes: `build` is awaited, and concurrent misses
+        wait on an asyncio lock instead of blocking the event loop.
+        """
+        ttl = ttl_seconds or self.ttl_seconds
+        if not self.enabled:
+            payload, _tags = await build()
+            body = _dump(payload)
+            return CachedBody(body, _etag_for(body), {}, 0.0, status="bypass")
+
+        entry = await self._off_loop(self._read, key, time.time())
+        if entry is not None:
+            return entry
+
+        flight = self._async_inflight.setdefault(key, asyncio.Lock())
+        async with flight:
+            entry = await self._off_loop(self._read, key, time.time())
+            if entry is not None:
+                self._count("coalesced")
+                return entry
+
+            may_build, lock_token = await self._off_loop(self._acquire_shared_lock, key)
+            try:
+                if not may_build:
+                    entry = await self._await_other_worker(key)
+                    if entry is not None:
+                        self._count("coalesced")
+                        return entry
+
+                self._count("misses")
+                started_at = await self._off_loop(self._sequence_snapshot)
+                payload, tags = await build()
+                return await self._off_loop(self._store_built, key, payload, tags, ttl, started_at)
+            finally:
+                if lock_token is not None:
+                    await self._off_loop(self._release_shared_lock, key, lock_token)
+                if self._async_inflight.get(key) is flight:
+                    self._async_inflight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._l1.clear()
+            self._tag_versions.clear()
+            self._sequence = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            metrics = dict(self.metrics)
+            l1_items = len(self._l1)
+        lookups = metrics["hits_l1"] + metrics["hits_l2"] + metrics["misses"]
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend,
+            "l1_items": l1_items,
+            "hit_ratio": round((metrics["hits_l1"] + metrics["hits_l2"]) / lookups, 4) if lookups else None,
+            **metrics,
+        }
+
+
+def _dump(payload: Any) -> bytes:
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def cached_json_response(
+    request: Request,
+    entry: CachedBody,
+    overlay: Optional[Callable[[Any], Any]] = None,
+) -> Response:
+    """
+    Serve a cached body with ETag/304 handling. `overlay` patches per-viewer fields
+    (e.g. is_liked) into a copy of the shared body before it is sent.
+    """
+    body, etag = entry.body, entry.etag
+    if overlay is not None:
+        body = _dump(overlay(json.loads(body)))
+        etag = _etag_for(body)
+
+    headers = {
+        "ETag": etag,
+        "X-Cache": entry.status.upper(),
+        "Vary": "Authorization",
+        "Cache-Control": (
+            "public, max-age=0, must-revalidate"
+            if overlay is None
+            else "private, max-age=0, must-revalidate"
+        ),
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [value.strip() for value in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache(
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+    backend=settings.RESPONSE_CACHE_BACKEND,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    l1_max_items=settings.RESPONSE_CACHE_L1_MAX_ITEMS,
+    lock_timeout_seconds=settings.RESPONSE_CACHE_LOCK_TIMEOUT_SECONDS,
+)
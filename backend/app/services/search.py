@@ -0,0 +1,183 @@
+import html
+import re
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from sqlalchemy import and_, case, func, literal, literal_column, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+SEARCH_BACKEND_AUTO = "auto"
+SEARCH_BACKEND_POSTGRES = "postgres"
+SEARCH_BACKEND_BASIC = "basic"
+
+# Korean has no stemmer in stock Postgres; the "simple" config only lowercases and
+# splits on whitespace/punctuation. Substrings inside a word are covered by pg_trgm.
+TS_CONFIG = "simple"
+SEARCH_VECTOR_COLUMN = "search_vector"
+
+MAX_SEARCH_TERMS = 8
+MAX_TERM_LENGTH = 64
+SNIPPET_RADIUS = 60
+
+_FIELD_WEIGHTS = {"A": 4, "B": 2, "C": 1}
+
+
+@dataclass(frozen=True)
+class SearchSpec:
+    """
+    Searchable fields of one table, as (column, weight) pairs with weights A > B > C.
+    On PostgreSQL the table carries a generated `search_vector` tsvector built from
+    the same fields (see the 202610170002 migration).
+    """
+
+    table: str
+    fields: tuple
+
+    @property
+    def columns(self) -> list:
+        return [column for column, _ in self.fields]
+
+
+def parse_search_terms(search: Optional[str]) -> list[str]:
+    if not search:
+        return []
+    terms = []
+    for term in search.split():
+        term = term[:MAX_TERM_LENGTH]
+        if term and term.lower() not in {t.lower() for t in terms}:
+            terms.append(term)
+        if len(terms) >= MAX_SEARCH_TERMS:
+            break
+    return terms
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _term_matches(spec: SearchSpec, term: str):
+    pattern = _like_pattern(term)
+    return or_(*[column.ilike(pattern, escape="\\") for column in spec.columns])
+
+
+class BasicSearchBackend:
+    """
+    Portable backend (SQLite tests, or Postgres without the search migration).
+    Every term must appear somewhere in the fields; rank is the weighted count of
+    (term, field) hits, so title hits outrank body hits.
+    """
+
+    name = SEARCH_BACKEND_BASIC
+
+    def filter(self, spec: SearchSpec, terms: Sequence[str]):
+        return and_(*[_term_matches(spec, term) for term in terms])
+
+    def rank(self, spec: SearchSpec, terms: Sequence[str]):
+        hits = [
+            case((column.ilike(_like_pattern(term), escape="\\"), _FIELD_WEIGHTS[weight]), else_=0)
+            for term in terms
+            for column, weight in spec.fields
+        ]
+        return sum(hits[1:], hits[0]) if hits else literal(0)
+
+
+class PostgresSearchBackend(BasicSearchBackend):
+    """
+    tsvector/GIN for whole-word matches plus pg_trgm GIN indexes for substrings
+    (Korean compounds, partial identifiers). Both predicates are index-backed, so the
+    planner can BitmapOr them instead of scanning every body.
+    """
+
+    name = SEARCH_BACKEND_POSTGRES
+
+    @staticmethod
+    def _vector(spec: SearchSpec):
+        return literal_column(f"{spec.table}.{SEARCH_VECTOR_COLUMN}")
+
+    @staticmethod
+    def _tsquery(terms: Sequence[str]):
+        return func.plainto_tsquery(literal_column(f"'{TS_CONFIG}'::regconfig"), " ".join(terms))
+
+    def filter(self, spec: SearchSpec, terms: Sequence[str]):
+        return or_(
+            self._vector(spec).op("@@")(self._tsquery(terms)),
+            super().filter(spec, terms),
+        )
+
+    def rank(self, spec: SearchSpec, terms: Sequence[str]):
+        title = spec.fields[0][0]
+        # ts_rank_cd normalization 32 maps into [0, 1); word_similarity breaks ties
+        # for substring-only hits that the tsvector cannot see.
+        return func.ts_rank_cd(self._vector(spec), self._tsquery(terms), 32) + func.word_similarity(
+            " ".join(terms), title
+        )
+
+
+_BACKENDS = {
+    SEARCH_BACKEND_BASIC: BasicSearchBackend(),
+    SEARCH_BACKEND_POSTGRES: PostgresSearchBackend(),
+}
+
+
+def get_search_backend(db: Session) -> BasicSearchBackend:
+    backend = (settings.SEARCH_BACKEND or SEARCH_BACKEND_AUTO).lower()
+    if backend == SEARCH_BACKEND_AUTO:
+        is_postgres = db.get_bind().dialect.name == "postgresql"
+        backend = SEARCH_BACKEND_POSTGRES if is_postgres else SEARCH_BACKEND_BASIC
+    return _BACKENDS.get(backend, _BACKENDS[SEARCH_BACKEND_BASIC])
+
+
+def apply_search(db: Session, query, spec: SearchSpec, search: Optional[str]):
+    """Filter `query` to rows matching every term of `search` (no-op when empty)."""
+    terms = parse_search_terms(search)
+    if not terms:
+        return query
+    return query.filter(get_search_backend(db).filter(spec, terms))
+
+
+def search_rank(db: Session, spec: SearchSpec, search: Optional[str]):
+    """Relevance expression (higher is better), or None when there is nothing to rank."""
+    terms = parse_search_terms(search)
+    if not terms:
+        return None
+    return get_search_backend(db).rank(spec, terms)
+
+
+def build_snippet(text: Optional[str], search: Optional[str], radius: int = SNIPPET_RADIUS) -> Optional[str]:
+    """
+    HTML-escaped excerpt around the first hit with every hit wrapped in <mark>.
+    Built in Python for the page being returned only, instead of ts_headline on
+    every matching row.
+    """
+    terms = parse_search_terms(search)
+    if not text or not terms:
+        return None
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    first = pattern.search(text)
+    if first is None:
+        return None
+
+    start = max(first.start() - radius, 0)
+    end = min(first.end() + radius, len(text))
+    excerpt = " ".join(text[start:end].split())
+
+    pieces = []
+    cursor = 0
+    for match in pattern.finditer(excerpt):
+        pieces.append(html.escape(excerpt[cursor:match.start()]))
+        pieces.append(f"<mark>{html.escape(match.group(0))}</mark>")
+        cursor = match.end()
+    pieces.append(html.escape(excerpt[cursor:]))
+    return ("…" if start > 0 else "") + "".join(pieces) + ("…" if end < len(text) else "")
+
+
+def first_snippet(values: Sequence[Optional[str]], search: Optional[str]) -> Optional[str]:
+    """Snippet from the first field (in priority order) that contains a hit."""
+    for value in values:
+        snippet = build_snippet(value, search)
+        if snippet:
+            return snippet
+    return None
@@ -0,0 +1,222 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import redis
+
+from app.core.config import settings
+from app.services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Drops each entry and bumps its version, so a store stamped before this call fails.
+INVALIDATE_SCRIPT = """
+for i = 1, #KEYS, 2 do
+    redis.call('DEL', KEYS[i])
+    redis.call('INCR', KEYS[i + 1])
+    redis.call('EXPIRE', KEYS[i + 1], ARGV[1])
+end
+return #KEYS / 2
+"""
+
+# Writes the entry only if its version is still the one read before the load.
+STORE_IF_CURRENT_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+# Versions outlive the entries by a wide margin; one that expires reads as 0, which
+# can only fail a pending store unless it also expired in the middle of a load.
+VERSION_TTL_FACTOR = 10
+
+
+class TieredCache:
+    """
+    A per-process LRU (L1) in front of an optional shared Redis L2, for per-id
+    entries that writers invalidate after commit.
+
+    `lookup()` returns the cached value, or None plus a stamp; the caller loads the
+    value itself and hands it to `store()` with that stamp. An invalidation in
+    between turns the store into a no-op, so a load that raced a write is not cached.
+    The stamp carries this worker's generation for the key and, with redis, the
+    key's shared version: invalidate() INCRs it and the L2 write is a compare-and-set
+    against it, so a slow load on one worker cannot re-cache a row another worker
+    has since changed.
+
+    Invalidations reach other workers' L1 only through its TTL, so `l1_ttl_seconds`
+    is the bound on cross-worker staleness with either backend.
+
+    Generations come from one counter and only the `max_items` most recently
+    invalidated keys keep theirs; every other key reads the highest generation
+    evicted so far. An eviction can therefore refuse an unrelated store, but never
+    lets a stale one through.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        backend: str,
+        key_prefix: str,
+        ttl_seconds: int,
+        l1_ttl_seconds: int,
+        max_items: int,
+        dumps: Callable[[Any], str],
+        loads: Callable[[Any], Any],
+    ):
+        self.name = name
+        self.backend = backend
+        self.key_prefix = key_prefix
+        self.ttl_seconds = ttl_seconds
+        self.l1_ttl_seconds = l1_ttl_seconds
+        self._dumps = dumps
+        self._loads = loads
+        self._items = TTLCache(max_items)
+        self._generations: OrderedDict = OrderedDict()
+        self._max_generations = max_items
+        self._generation_clock = 0
+        self._generation_floor = 0
+        self._lock = threading.Lock()
+        self._redis: Optional[redis.Redis] = None
+        self.metrics = {
+            "hits_l1": 0,
+            "hits_l2": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "stale_stores": 0,
+            "errors": 0,
+        }
+
+    def _get_redis(self) -> Optional[redis.Redis]:
+        if self.backend != "redis":
+            return None
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5)
+            self._invalidate_script = self._redis.register_script(INVALIDATE_SCRIPT)
+            self._store_script = self._redis.register_script(STORE_IF_CURRENT_SCRIPT)
+        return self._redis
+
+    def _redis_key(self, key) -> str:
+        return f"{self.key_prefix}:{key}"
+
+    def _version_key(self, key) -> str:
+        return f"{self.key_prefix}:version:{key}"
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def _redis_error(self, action: str, exc: redis.RedisError) -> None:
+        self._count("errors")
+        logger.warning("%s cache %s failed: %s", self.name, action, exc)
+
+    def lookup(self, key) -> tuple[Any, tuple[int, bytes]]:
+        """(value, stamp); on a miss the value is None and the stamp goes to `store()`."""
+        now = time.time()
+        with self._lock:
+            value = self._items.get(key, now)
+            generation = self._generation(key)
+        version = b"0"
+        if value is not None:
+            self._count("hits_l1")
+            return value, (generation, version)
+
+        client = self._get_redis()
+        if client is not None:
+            try:
+                raw, current_version = client.mget(self._redis_key(key), self._version_key(key))
+            except redis.RedisError as exc:
+                self._redis_error("read", exc)
+                raw, current_version = None, None
+            if raw is not None:
+                value = self._loads(raw)
+                self._count("hits_l2")
+                self._store_l1(key, value, generation)
+                return value, (generation, version)
+            version = current_version or version
+
+        self._count("misses")
+        return None, (generation, version)
+
+    def store(self, key, value, stamp: tuple[int, bytes]) -> None:
+        """Cache a freshly loaded value unless `key` was invalidated since `lookup()`."""
+        generation, version = stamp
+        if not self._store_l1(key, value, generation):
+            self._count("stale_stores")
+            return
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            stored = self._store_script(
+                keys=[self._redis_key(key), self._version_key(key)],
+                args=[version, self._dumps(value), self.ttl_seconds],
+            )
+        except redis.RedisError as exc:
+            self._redis_error("write", exc)
+            return
+        if not stored:
+            # Another worker invalidated mid-load: drop the L1 copy too.
+            with self._lock:
+                self._items.pop(key)
+            self._count("stale_stores")
+
+    def _generation(self, key) -> int:
+        return self._generations.get(key, self._generation_floor)
+
+    def _store_l1(self, key, value, generation: int) -> bool:
+        with self._lock:
+            if self._generation(key) != generation:
+                return False
+            self._items.set(key, value, time.time() + self.l1_ttl_seconds)
+        return True
+
+    def invalidate(self, *keys) -> None:
+        keys = [key for key in keys if key is not None]
+        if not keys:
+            return
+        with self._lock:
+            for key in keys:
+                self._items.pop(key)
+                self._generation_clock += 1
+                self._generations[key] = self._generation_clock
+                self._generations.move_to_end(key)
+            while len(self._generations) > self._max_generations:
+                _key, evicted = self._generations.popitem(last=False)
+                self._generation_floor = max(self._generation_floor, evicted)
+            self.metrics["invalidations"] += len(keys)
+        client = self._get_redis()
+        if client is None:
+            return
+        redis_keys = []
+        for key in keys:
+            redis_keys += [self._redis_key(key), self._version_key(key)]
+        try:
+            self._invalidate_script(keys=redis_keys, args=[self.ttl_seconds * VERSION_TTL_FACTOR])
+        except redis.RedisError as exc:
+            self._redis_error("invalidation", exc)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._generations.clear()
+            # Loads started before the clear must not be stored afterwards.
+            self._generation_clock += 1
+            self._generation_floor = self._generation_clock
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def stats(self) -> dict:
+        with self._lock:
+            metrics = dict(self.metrics)
+        lookups = metrics["hits_l1"] + metrics["hits_l2"] + metrics["misses"]
+        return {
+            "hit_ratio": round((metrics["hits_l1"] + metrics["hits_l2"]) / lookups, 4) if lookups else None,
+            **metrics,
+        }
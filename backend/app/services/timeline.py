@@ -0,0 +1,50 @@
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.timeline import trim_timelines
+from app.services.periodic_job import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+
+class TimelineTrimmer(PeriodicJob):
+    """
+    Keeps `timeline_entries` bounded: periodically drops everything past each
+    follower's newest `max_entries` posts. Scrolling past the cap still works, the
+    following feed falls back to reading the followed authors' posts directly.
+    """
+
+    name = "timeline trimming"
+    singleton = True
+
+    def __init__(self, max_entries: int, interval_seconds: int, batch_size: int):
+        super().__init__(interval_seconds)
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval_seconds > 0 and self.max_entries > 0
+
+    def run(self, db: Session) -> int:
+        trimmed = trim_timelines(db, max_entries=self.max_entries, batch_size=self.batch_size)
+        if trimmed:
+            logger.info("Timeline entries trimmed: %s", trimmed)
+        return trimmed
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "max_entries": self.max_entries,
+            "last_trimmed": self.last_processed,
+            "total_trimmed": self.total_processed,
+        }
+
+
+timeline_trimmer = TimelineTrimmer(
+    max_entries=settings.TIMELINE_MAX_ENTRIES,
+    interval_seconds=settings.TIMELINE_TRIM_INTERVAL_SECONDS,
+    batch_size=settings.TIMELINE_TRIM_BATCH_SIZE,
+)
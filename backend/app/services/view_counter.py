@@ -0,0 +1,301 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Callable, Optional
+
+import redis
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.blog_post import BlogPost
+from app.models.post import Post
+from app.services.hot_score import VIEW_WEIGHT, hot_score_board
+from app.services.response_cache import TAG_RANKINGS, response_cache
+
+logger = logging.getLogger(__name__)
+
+VIEW_TARGET_POST = "post"
+VIEW_TARGET_BLOG = "blog"
+
+VIEW_TARGET_MODELS = {
+    VIEW_TARGET_POST: Post,
+    VIEW_TARGET_BLOG: BlogPost,
+}
+
+REDIS_PENDING_KEY = "views:pending:{target}"
+REDIS_SEEN_KEY = "views:seen:{target}:{object_id}:{viewer}"
+
+# Dedupe and increment in one round trip; returns {counted, pending for the object}.
+RECORD_VIEW_SCRIPT = """
+if KEYS[2] and not redis.call('SET', KEYS[2], 1, 'NX', 'EX', ARGV[2]) then
+    return {0, tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or '0')}
+end
+return {1, redis.call('HINCRBY', KEYS[1], ARGV[1], 1)}
+"""
+
+# Takes a whole batch atomically, so a failure can never strand it half-drained.
+DRAIN_SCRIPT = """
+local rows = redis.call('HGETALL', KEYS[1])
+redis.call('DEL', KEYS[1])
+return rows
+"""
+
+
+def build_viewer_key(user_id: Optional[int], client_host: Optional[str]) -> Optional[str]:
+    if user_id is not None:
+        return f"user:{user_id}"
+    if client_host:
+        return f"ip:{client_host}"
+    return None
+
+
+class _SeenWindow:
+    """Bounded (target, id, viewer) -> expiry map used for per-viewer dedupe in memory."""
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._items: OrderedDict[tuple, float] = OrderedDict()
+
+    def mark(self, key: tuple, window_seconds: int, now: float) -> bool:
+        """Return True when `key` was not seen inside the window (and remember it)."""
+        expires_at = self._items.get(key)
+        if expires_at is not None and expires_at > now:
+            return False
+        self._items[key] = now + window_seconds
+        self._items.move_to_end(key)
+        # Entries are appended in expiry order, so the head is always the oldest.
+        while self._items:
+            oldest_key, oldest_expiry = next(iter(self._items.items()))
+            if oldest_expiry > now and len(self._items) <= self.max_items:
+                break
+            self._items.pop(oldest_key, None)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class ViewCounter:
+    """
+    Accumulates detail-page view increments off the request path and writes them
+    back in batched `UPDATE ... SET views = views + n` statements.
+
+    The memory backend is per-process; the redis backend shares pending counts and
+    dedupe windows across uvicorn workers and survives a worker restart. Async
+    routes use `acount_view()`, which keeps the redis round trip off the event loop.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        flush_interval_seconds: int,
+        dedupe_window_seconds: int,
+        max_seen_items: int,
+    ):
+        self.backend = backend
+        self.flush_interval_seconds = flush_interval_seconds
+        self.dedupe_window_seconds = dedupe_window_seconds
+        self._pending: dict[str, defaultdict[int, int]] = {
+            target: defaultdict(int) for target in VIEW_TARGET_MODELS
+        }
+        self._seen = _SeenWindow(max_seen_items)
+        self._lock = threading.Lock()
+        self._redis: Optional[redis.Redis] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self.flushed_total = 0
+        self.deduped_total = 0
+
+    def _get_redis(self) -> Optional[redis.Redis]:
+        if self.backend != "redis":
+            return None
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5)
+            self._record_script = self._redis.register_script(RECORD_VIEW_SCRIPT)
+            self._drain_script = self._redis.register_script(DRAIN_SCRIPT)
+        return self._redis
+
+    def record_view(self, target: str, object_id: int, viewer_key: Optional[str]) -> bool:
+        """Count one view unless `viewer_key` already viewed this object inside the window."""
+        counted, _pending = self._record(target, object_id, viewer_key)
+        return counted
+
+    def count_view(self, target: str, object_id: int, viewer_key: Optional[str]) -> int:
+        """Record a view as `record_view` does; returns the object's pending increments for display."""
+        _counted, pending = self._record(target, object_id, viewer_key)
+        return pending
+
+    async def acount_view(self, target: str, object_id: int, viewer_key: Optional[str]) -> int:
+        if self._get_redis() is None:
+            return self.count_view(target, object_id, viewer_key)
+        return await asyncio.to_thread(self.count_view, target, object_id, viewer_key)
+
+    def _record(self, target: str, object_id: int, viewer_key: Optional[str]) -> tuple[bool, int]:
+        dedupe = bool(viewer_key) and self.dedupe_window_seconds > 0
+        client = self._get_redis()
+        if client is not None:
+            keys = [REDIS_PENDING_KEY.format(target=target)]
+            if dedupe:
+                keys.append(REDIS_SEEN_KEY.format(target=target, object_id=object_id, viewer=viewer_key))
+            try:
+                counted, pending = self._record_script(keys=keys, args=[object_id, self.dedupe_window_seconds])
+            except redis.RedisError as exc:
+                logger.warning("Redis view counter unavailable, buffering in memory: %s", exc)
+            else:
+                with self._lock:
+                    self.deduped_total += int(not counted)
+                    pending += self._pending[target].get(object_id, 0)
+                return bool(counted), int(pending)
+
+        now = time.monotonic()
+        with self._lock:
+            counted = not dedupe or self._seen.mark(
+                (target, object_id, viewer_key), self.dedupe_window_seconds, now
+            )
+            if counted:
+                self._pending[target][object_id] += 1
+            else:
+                self.deduped_total += 1
+            return counted, self._pending[target].get(object_id, 0)
+
+    def pending_for(self, target: str, object_id: int) -> int:
+        """Views recorded but not yet written to the database, for read-your-own-view display."""
+        with self._lock:
+            pending = self._pending[target].get(object_id, 0)
+        client = self._get_redis()
+        if client is not None:
+            try:
+                pending += int(client.hget(REDIS_PENDING_KEY.format(target=target), object_id) or 0)
+            except redis.RedisError:
+                pass
+        return pending
+
+    def pending_increments(self) -> int:
+        """Total buffered increments across all targets (exported as a health metric)."""
+        with self._lock:
+            pending = sum(sum(counts.values()) for counts in self._pending.values())
+        client = self._get_redis()
+        if client is not None:
+            try:
+                for target in VIEW_TARGET_MODELS:
+                    pending += sum(
+                        int(value)
+                        for value in client.hvals(REDIS_PENDING_KEY.format(target=target))
+                    )
+            except redis.RedisError:
+                pass
+        return pending
+
+    def _drain(self) -> dict[str, dict[int, int]]:
+        with self._lock:
+            drained = {
+                target: dict(counts) for target, counts in self._pending.items() if counts
+            }
+            for target in drained:
+                self._pending[target] = defaultdict(int)
+
+        client = self._get_redis()
+        if client is None:
+            return drained
+
+        for target in VIEW_TARGET_MODELS:
+            key = REDIS_PENDING_KEY.format(target=target)
+            try:
+                # Atomic per key, so exactly one worker takes each batch.
+                flat = self._drain_script(keys=[key])
+            except redis.RedisError as exc:
+                logger.warning("Redis view counter drain failed: %s", exc)
+                continue
+            counts = drained.setdefault(target, {})
+            for object_id, increment in zip(flat[::2], flat[1::2]):
+                counts[int(object_id)] = counts.get(int(object_id), 0) + int(increment)
+        return drained
+
+    def _requeue(self, target: str, counts: dict[int, int]) -> None:
+        with self._lock:
+            for object_id, increment in counts.items():
+                self._pending[target][object_id] += increment
+
+    def flush(self, db: Session) -> int:
+        """Write every pending increment in one executemany UPDATE per target table."""
+        drained = self._drain()
+        written = 0
+        for target, counts in drained.items():
+            if not counts:
+                continue
+            table = VIEW_TARGET_MODELS[target].__table__
+            statement = (
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values(views=table.c.views + bindparam("b_increment"))
+            )
+            try:
+                db.execute(
+                    statement,
+                    [
+                        {"b_id": object_id, "b_increment": increment}
+                        for object_id, increment in counts.items()
+                    ],
+                )
+                db.commit()
+            except Exception as exc:
+                db.rollback()
+                self._requeue(target, counts)
+                logger.warning("View counter flush failed for %s: %s", target, exc)
+                continue
+            written += sum(counts.values())
+            if target == VIEW_TARGET_POST:
+                for object_id, increment in counts.items():
+                    hot_score_board.bump(object_id, increment * VIEW_WEIGHT)
+                # One re-rank per flush, not per view.
+                response_cache.invalidate(TAG_RANKINGS)
+        self.flushed_total += written
+        return written
+
+    def flush_with_session(self, session_factory: Callable[[], Session]) -> int:
+        db = session_factory()
+        try:
+            return self.flush(db)
+        finally:
+            db.close()
+
+    async def _flush_loop(self, session_factory: Callable[[], Session]) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await asyncio.to_thread(self.flush_with_session, session_factory)
+            except Exception as exc:
+                logger.warning("View counter flush loop error: %s", exc)
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop(session_factory))
+
+    async def shutdown(self, session_factory: Callable[[], Session]) -> None:
+        """Stop the periodic flush and write out whatever is still buffered."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await asyncio.to_thread(self.flush_with_session, session_factory)
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "pending_increments": self.pending_increments(),
+            "flushed_total": self.flushed_total,
+            "deduped_total": self.deduped_total,
+        }
+
+
+view_counter = ViewCounter(
+    backend=settings.VIEW_COUNT_BACKEND,
+    flush_interval_seconds=settings.VIEW_COUNT_FLUSH_INTERVAL_SECONDS,
+    dedupe_window_seconds=settings.VIEW_COUNT_DEDUPE_WINDOW_SECONDS,
+    max_seen_items=settings.VIEW_COUNT_DEDUPE_MAX_ITEMS,
+)
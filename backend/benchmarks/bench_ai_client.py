@@ -0,0 +1,154 @@
+"""
+AI 모델 호출 방식 비교 벤치마크 (로컬 OpenAI 호환 스텁 서버 사용)
+
+실행 방법:
+python -m benchmarks.bench_ai_client --requests 200 --concurrency 50 --latency-ms 300
+
+스텁 서버는 /chat/completions 요청마다 --latency-ms 만큼 기다렸다가 고정 응답을 돌려준다.
+- per-call: 예전 방식. 스레드풀(기본 40개) 안에서 호출마다 httpx.Client 를 새로 연다.
+- pooled:   AiService 의 공유 httpx.AsyncClient + 모델별 동시성 제한(--model-slots).
+스레드풀 방식은 느린 호출이 스레드를 붙잡아 다른 요청까지 밀리고, 풀 방식은
+모델 슬롯만큼만 업스트림에 보내고 나머지는 이벤트 루프에서 기다린다.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+# AiService 만 쓰므로 DB/Redis 설정은 자리만 채운다.
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from starlette.applications import Starlette  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.services.ai_service import INTENT_DEV_QNA, AiService  # noqa: E402
+
+THREADPOOL_SIZE = 40  # anyio default used by FastAPI for sync handlers
+
+
+def _stub_app(latency_ms: int) -> Starlette:
+    async def completions(request):
+        await request.body()
+        await asyncio.sleep(latency_ms / 1000)
+        return JSONResponse(
+            {
+                "choices": [{"message": {"content": "stub answer"}}],
+                "usage": {"prompt_tokens": 20, "completion_tokens": 5, "total_tokens": 25},
+            }
+        )
+
+    return Starlette(routes=[Route("/v1/chat/completions", completions, methods=["POST"])])
+
+
+def _start_stub(latency_ms: int) -> tuple[uvicorn.Server, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(_stub_app(latency_ms), host="127.0.0.1", port=port, log_level="warning", backlog=4096)
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}/v1"
+
+
+def _per_call_request(base_url: str) -> float:
+    started = time.perf_counter()
+    with httpx.Client(timeout=settings.AI_TIMEOUT_SECONDS) as client:
+        response = client.post(
+            f"{base_url}/chat/completions",
+            headers={"Authorization": "Bearer bench"},
+            json={"model": settings.AI_CHAT_MODEL, "messages": [{"role": "user", "content": "q"}]},
+        )
+        response.raise_for_status()
+    return (time.perf_counter() - started) * 1000
+
+
+async def run_per_call(base_url: str, requests: int, concurrency: int) -> list[float]:
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=THREADPOOL_SIZE)
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one() -> float:
+        async with gate:
+            started = time.perf_counter()
+            await loop.run_in_executor(executor, _per_call_request, base_url)
+            return (time.perf_counter() - started) * 1000
+
+    try:
+        return await asyncio.gather(*[one() for _ in range(requests)])
+    finally:
+        executor.shutdown(wait=False)
+
+
+async def run_pooled(service: AiService, requests: int, concurrency: int) -> list[float]:
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> float:
+        async with gate:
+            started = time.perf_counter()
+            _reply, result = await service.chat_reply(intent=INTENT_DEV_QNA, message=f"질문 {index}")
+            if result.status != "success":
+                raise RuntimeError(f"{result.status}: {result.error_message}")
+            return (time.perf_counter() - started) * 1000
+
+    try:
+        return await asyncio.gather(*[one(index) for index in range(requests)])
+    finally:
+        await service.aclose()
+
+
+def _report(label: str, samples: list[float], wall_seconds: float) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"{label:>10}{wall_seconds * 1000:>12.0f}{len(samples) / wall_seconds:>12.1f}"
+        f"{statistics.median(ordered):>12.1f}{p95:>12.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=int, default=300)
+    parser.add_argument("--model-slots", type=int, default=50)
+    args = parser.parse_args()
+
+    server, base_url = _start_stub(args.latency_ms)
+    settings.AI_API_KEY = "bench"
+    settings.AI_BASE_URL = base_url
+    settings.AI_MODEL_MAX_CONCURRENCY = args.model_slots
+    settings.AI_MODEL_QUEUE_TIMEOUT_SECONDS = 60.0
+    settings.AI_HTTP_MAX_CONNECTIONS = args.model_slots
+    try:
+        print(f"{'mode':>10}{'wall ms':>12}{'req/s':>12}{'p50 ms':>12}{'p95 ms':>12}")
+        started = time.perf_counter()
+        samples = asyncio.run(run_per_call(base_url, args.requests, args.concurrency))
+        _report("per-call", samples, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        samples = asyncio.run(run_pooled(AiService(), args.requests, args.concurrency))
+        _report("pooled", samples, time.perf_counter() - started)
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
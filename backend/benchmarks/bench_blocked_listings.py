@@ -0,0 +1,173 @@
+"""
+차단 목록 크기별 목록 조회 지연 벤치마크
+
+실행 방법 (빈 벤치마크용 DB를 가리키는 DATABASE_URL 필요):
+python -m benchmarks.bench_blocked_listings --seed --users 5000 --posts 200000
+
+뷰어가 차단한 사용자 수(--blocks)를 바꿔 가며 게시글 목록(offset/cursor),
+인기글 SQL 폴백, 댓글 목록을 잰다. 차단 목록은 요청당 한 번 읽어
+(follow graph 캐시) NOT IN 한 번으로 걸러내므로 차단 수와 무관하게 평평해야 한다.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.crud import comment as crud_comment  # noqa: E402
+from app.crud import community as crud_community  # noqa: E402
+from app.crud import follow as crud_follow  # noqa: E402
+from app.crud import post as crud_post  # noqa: E402
+from app.db.base import Base, engine  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.models.category import Category  # noqa: E402
+from app.models.comment import Comment  # noqa: E402
+from app.models.post import Post  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.user_block import UserBlock  # noqa: E402
+
+BATCH_SIZE = 10_000
+VIEWER_EMAIL = "bench-viewer@example.com"
+
+
+def seed(users: int, posts: int, comments: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        viewer = User(email=VIEWER_EMAIL, username="bench-viewer", hashed_password="x")
+        category = Category(name="벤치마크", slug="bench-blocks")
+        db.add_all([viewer, category])
+        db.commit()
+        db.execute(
+            insert(User),
+            [
+                {"email": f"bench-author{i}@example.com", "username": f"bench-author{i}", "hashed_password": "x"}
+                for i in range(users)
+            ],
+        )
+        db.commit()
+        author_ids = [
+            user_id
+            for (user_id,) in db.query(User.id).filter(User.id != viewer.id).order_by(User.id)
+        ]
+
+        rng = random.Random(7)
+        start = datetime.now(timezone.utc)
+        for offset in range(0, posts, BATCH_SIZE):
+            db.execute(
+                insert(Post),
+                [
+                    {
+                        "title": f"bench post {index}",
+                        "content": "benchmark body",
+                        "user_id": rng.choice(author_ids),
+                        "category_id": category.id,
+                        "views": index % 997,
+                        "likes_count": rng.randint(0, 50),
+                        "comment_count": rng.randint(0, 20),
+                        "created_at": start - timedelta(seconds=index * 3),
+                        "post_type": "NORMAL",
+                    }
+                    for index in range(offset, min(offset + BATCH_SIZE, posts))
+                ],
+            )
+            db.commit()
+
+        # One busy thread so the comment listing has something to filter.
+        (thread_id,) = db.query(Post.id).order_by(Post.id).first()
+        db.execute(
+            insert(Comment),
+            [
+                {"post_id": thread_id, "user_id": rng.choice(author_ids), "content": "c"}
+                for _ in range(comments)
+            ],
+        )
+        db.commit()
+        print(f"seeded {users} users, {posts} posts, {comments} comments")
+    finally:
+        db.close()
+
+
+def _timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _block(db, viewer_id: int, count: int) -> None:
+    db.query(UserBlock).filter(UserBlock.blocker_id == viewer_id).delete(synchronize_session=False)
+    blocked = [
+        user_id
+        for (user_id,) in db.query(User.id).filter(User.id != viewer_id).order_by(User.id).limit(count)
+    ]
+    if blocked:
+        db.execute(insert(UserBlock), [{"blocker_id": viewer_id, "blocked_id": user_id} for user_id in blocked])
+    db.commit()
+    crud_follow.follow_graph_cache.invalidate(viewer_id)
+
+
+def run(block_counts: list[int], page_size: int, repeat: int) -> None:
+    db = SessionLocal()
+    try:
+        viewer_id = db.query(User.id).filter(User.email == VIEWER_EMAIL).scalar()
+        (thread_id,) = db.query(Post.id).order_by(Post.id).first()
+        print(
+            f"{'blocks':>8}{'offset ms':>12}{'cursor ms':>12}{'hot sql ms':>12}"
+            f"{'comments ms':>14}{'set load ms':>14}"
+        )
+        for count in block_counts:
+            _block(db, viewer_id, count)
+            load = _timed(lambda: crud_follow._load_follow_graph(db, viewer_id), repeat)
+            # What a request does: one cached lookup, then one filtered query.
+            blocked = crud_follow.get_blocked_user_ids(db, viewer_id)
+            offset = _timed(
+                lambda: crud_post.get_posts(
+                    db, skip=page_size * 10, limit=page_size, exclude_author_ids=blocked, total_mode="none"
+                ),
+                repeat,
+            )
+            cursor = _timed(
+                lambda: crud_post.get_posts_by_cursor(db, limit=page_size, exclude_author_ids=blocked),
+                repeat,
+            )
+            hot = _timed(
+                lambda: crud_community.get_hot_posts(db, window="30d", limit=6, exclude_author_ids=blocked),
+                repeat,
+            )
+            comments = _timed(
+                lambda: crud_comment.get_comments_by_post(db, thread_id, exclude_author_ids=blocked),
+                repeat,
+            )
+            print(f"{count:>8}{offset:>12.2f}{cursor:>12.2f}{hot:>12.2f}{comments:>14.2f}{load:>14.2f}")
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", action="store_true", help="insert users/posts/comments first")
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--posts", type=int, default=200_000)
+    parser.add_argument("--comments", type=int, default=2_000)
+    parser.add_argument("--blocks", default="0,10,100,1000,3000")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.users, args.posts, args.comments)
+    run([int(count) for count in args.blocks.split(",")], args.page_size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+인기글(/community/hot) SQL 집계 vs 사전 계산된 hot score 보드 벤치마크
+
+실행 방법 (빈 벤치마크용 DB를 가리키는 DATABASE_URL 필요):
+python -m benchmarks.bench_hot_posts --seed --posts 50000 --likes 1000000
+
+"sql (group by)" 는 likes/comments 를 매 요청 GROUP BY 하던 기존 쿼리,
+"sql (counters)" 는 비정규화 카운터 컬럼을 쓰는 현재 폴백 쿼리,
+"board" 는 hot_score_board.top() (읽기 경로에서 DB 를 건드리지 않음) 이다.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import desc, func, insert  # noqa: E402
+
+from app.crud import community as crud_community  # noqa: E402
+from app.crud import post as crud_post  # noqa: E402
+from app.db.base import Base, engine  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.models.category import Category  # noqa: E402
+from app.models.comment import Comment  # noqa: E402
+from app.models.like import Like  # noqa: E402
+from app.models.post import Post  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.hot_score import HOT_WINDOWS, HotScoreBoard  # noqa: E402
+
+BATCH_SIZE = 10_000
+
+
+def seed(posts: int, likes: int, users: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        category = Category(name="벤치마크", slug="bench-hot")
+        db.add(category)
+        db.commit()
+
+        db.execute(
+            insert(User),
+            [
+                {"email": f"hot{index}@example.com", "username": f"hot{index}", "hashed_password": "x"}
+                for index in range(users)
+            ],
+        )
+        db.commit()
+        user_ids = [row[0] for row in db.query(User.id).all()]
+
+        start = datetime.now(timezone.utc)
+        for offset in range(0, posts, BATCH_SIZE):
+            db.execute(
+                insert(Post),
+                [
+                    {
+                        "title": f"hot post {index}",
+                        "content": "benchmark body",
+                        "user_id": user_ids[index % len(user_ids)],
+                        "category_id": category.id,
+                        "views": index % 997,
+                        "created_at": start - timedelta(minutes=index % (60 * 24 * 30)),
+                        "post_type": "NORMAL",
+                    }
+                    for index in range(offset, min(offset + BATCH_SIZE, posts))
+                ],
+            )
+            db.commit()
+        post_ids = [row[0] for row in db.query(Post.id).all()]
+
+        # (post_id, user_id) is unique; _insert_likes drops collisions, so the total is approximate.
+        rng = random.Random(42)
+        batch = []
+        for index in range(likes):
+            batch.append(
+                {
+                    "post_id": post_ids[rng.randrange(len(post_ids))],
+                    "user_id": user_ids[index % len(user_ids)],
+                }
+            )
+            if len(batch) >= BATCH_SIZE:
+                _insert_likes(db, batch)
+                batch = []
+        if batch:
+            _insert_likes(db, batch)
+
+        comments = [
+            {
+                "post_id": post_ids[rng.randrange(len(post_ids))],
+                "user_id": user_ids[index % len(user_ids)],
+                "content": "bench comment",
+            }
+            for index in range(likes // 4)
+        ]
+        for offset in range(0, len(comments), BATCH_SIZE):
+            db.execute(insert(Comment), comments[offset:offset + BATCH_SIZE])
+            db.commit()
+
+        crud_post.reconcile_engagement_counters(db)
+        print(f"seeded {posts} posts, ~{likes} likes, {len(comments)} comments")
+    finally:
+        db.close()
+
+
+def _insert_likes(db, batch: list[dict]) -> None:
+    unique = {(row["post_id"], row["user_id"]): row for row in batch}
+    existing = set(
+        db.query(Like.post_id, Like.user_id)
+        .filter(Like.post_id.in_({post_id for post_id, _ in unique}))
+        .all()
+    )
+    rows = [row for key, row in unique.items() if key not in existing]
+    if rows:
+        db.execute(insert(Like), rows)
+    db.commit()
+
+
+def _legacy_group_by_hot_posts(db, window: str, limit: int) -> list:
+    """The pre-counter query: GROUP BY over every like and comment per call."""
+    window_start = datetime.now(timezone.utc) - HOT_WINDOWS[window]
+    likes_sq = (
+        db.query(Like.post_id, func.count(Like.id).label("likes_count"))
+        .group_by(Like.post_id)
+        .subquery()
+    )
+    comments_sq = (
+        db.query(Comment.post_id, func.count(Comment.id).label("comment_count"))
+        .group_by(Comment.post_id)
+        .subquery()
+    )
+    likes_count = func.coalesce(likes_sq.c.likes_count, 0)
+    comment_count = func.coalesce(comments_sq.c.comment_count, 0)
+    score = (likes_count * 3 + comment_count * 2 + Post.views * 0.2).label("score")
+    return (
+        db.query(Post, likes_count, comment_count, score)
+        .outerjoin(likes_sq, likes_sq.c.post_id == Post.id)
+        .outerjoin(comments_sq, comments_sq.c.post_id == Post.id)
+        .filter(Post.created_at >= window_start)
+        .order_by(desc("score"))
+        .limit(limit)
+        .all()
+    )
+
+
+def _timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(limit: int, repeat: int) -> None:
+    db = SessionLocal()
+    board = HotScoreBoard(backend="memory", half_life_hours=0, rebuild_interval_seconds=300)
+    try:
+        started = time.perf_counter()
+        tracked = board.rebuild(db)
+        print(f"board rebuild: {tracked} posts in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        print(f"{'window':<8}{'sql (group by) ms':>20}{'sql (counters) ms':>20}{'board ms':>12}{'board+load ms':>16}")
+        for window in HOT_WINDOWS:
+            legacy = _timed(lambda: _legacy_group_by_hot_posts(db, window, limit), repeat)
+            counters = _timed(
+                lambda: crud_community.get_hot_posts(db, window=window, limit=limit), repeat
+            )
+            top = _timed(lambda: board.top(window, limit), repeat)
+            loaded = _timed(
+                lambda: crud_community.get_ranked_posts(db, board.top(window, limit)), repeat
+            )
+            print(f"{window:<8}{legacy:>20.2f}{counters:>20.2f}{top:>12.3f}{loaded:>16.2f}")
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", action="store_true", help="insert posts/likes/comments first")
+    parser.add_argument("--posts", type=int, default=50_000)
+    parser.add_argument("--likes", type=int, default=1_000_000, help="e.g. 100000 or 1000000")
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--limit", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.posts, args.likes, args.users)
+    run(args.limit, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
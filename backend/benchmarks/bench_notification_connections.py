@@ -0,0 +1,139 @@
+"""
+알림 푸시 연결 수 확장성 벤치마크
+
+두 가지 모드:
+
+1) hub — 프로세스 내에서 NotificationHub 에 구독 N 개를 만들고 구독당 메모리와
+   publish → 전 구독 전달 지연을 잰다 (서버/DB 불필요).
+   python -m benchmarks.bench_notification_connections --mode hub --connections 50000
+
+2) sse — 실행 중인 서버의 /api/v1/notifications/stream 에 SSE 연결 N 개를 열어 유지하고
+   연결 수립 시간(첫 unread_count 이벤트까지), 실패 수, 하트비트 수신 수를 잰다.
+   python -m benchmarks.bench_notification_connections --mode sse --connections 10000 \
+       --base-url http://localhost:8000 --token <access token> --duration 60
+   (클라이언트/서버 모두 ulimit -n 을 연결 수보다 크게 잡아야 한다.)
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+import httpx  # noqa: E402
+
+
+async def bench_hub(connections: int, users: int, publishes: int) -> None:
+    from app.services.notification_hub import NotificationHub
+
+    hub = NotificationHub(
+        backend="memory",
+        queue_size=100,
+        heartbeat_seconds=25,
+        max_connections=connections,
+    )
+    hub.start()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    subscriptions = [hub.connect(index % users) for index in range(connections)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"subscriptions: {connections} over {users} users")
+    print(f"memory per subscription: {(after - before) / connections:.0f} bytes")
+
+    # Every subscription waits like an idle stream would.
+    waiters = [asyncio.create_task(sub.next_event(60)) for sub in subscriptions]
+    await asyncio.sleep(0)
+
+    samples = []
+    for round_index in range(publishes):
+        started = time.perf_counter()
+        for user_id in range(users):
+            hub.publish(user_id, {"type": "unread_count", "unread_count": round_index})
+        await asyncio.gather(*waiters)
+        samples.append((time.perf_counter() - started) * 1000)
+        waiters = [asyncio.create_task(sub.next_event(60)) for sub in subscriptions]
+        await asyncio.sleep(0)
+
+    for waiter in waiters:
+        waiter.cancel()
+    print(
+        f"fan-out to all {connections} connections: "
+        f"median {statistics.median(samples):.1f} ms, max {max(samples):.1f} ms"
+    )
+
+
+async def _hold_sse(client: httpx.AsyncClient, deadline: float, results: dict) -> None:
+    started = time.perf_counter()
+    try:
+        async with client.stream("GET", "/api/v1/notifications/stream") as response:
+            if response.status_code != 200:
+                results["failed"] += 1
+                return
+            connected = False
+            async for line in response.aiter_lines():
+                if not connected and line.startswith("data:"):
+                    results["connect_ms"].append((time.perf_counter() - started) * 1000)
+                    connected = True
+                elif line.startswith(": ping"):
+                    results["heartbeats"] += 1
+                if time.perf_counter() >= deadline:
+                    return
+    except httpx.HTTPError:
+        results["failed"] += 1
+
+
+async def bench_sse(base_url: str, token: str, connections: int, duration: float, ramp: float) -> None:
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=0)
+    timeout = httpx.Timeout(connect=30, read=None, write=30, pool=None)
+    results = {"connect_ms": [], "failed": 0, "heartbeats": 0}
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        headers={"Authorization": f"Bearer {token}"},
+        limits=limits,
+        timeout=timeout,
+    ) as client:
+        deadline = time.perf_counter() + ramp + duration
+        tasks = []
+        for _ in range(connections):
+            tasks.append(asyncio.create_task(_hold_sse(client, deadline, results)))
+            if ramp:
+                await asyncio.sleep(ramp / connections)
+        await asyncio.sleep(max(0.0, deadline - time.perf_counter()))
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    connect_ms = sorted(results["connect_ms"])
+    print(f"connected: {len(connect_ms)}/{connections}, failed: {results['failed']}")
+    if connect_ms:
+        p99 = connect_ms[min(len(connect_ms) - 1, int(len(connect_ms) * 0.99))]
+        print(f"time to first event: median {statistics.median(connect_ms):.1f} ms, p99 {p99:.1f} ms")
+    print(f"heartbeats received: {results['heartbeats']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode", choices=("hub", "sse"), default="hub")
+    parser.add_argument("--connections", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=5_000, help="hub mode: distinct users")
+    parser.add_argument("--publishes", type=int, default=5, help="hub mode: fan-out rounds")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", default="", help="sse mode: access token")
+    parser.add_argument("--duration", type=float, default=60.0, help="sse mode: hold seconds")
+    parser.add_argument("--ramp", type=float, default=10.0, help="sse mode: seconds to open all connections")
+    args = parser.parse_args()
+
+    if args.mode == "hub":
+        asyncio.run(bench_hub(args.connections, args.users, args.publishes))
+    else:
+        asyncio.run(bench_sse(args.base_url, args.token, args.connections, args.duration, args.ramp))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+게시글 목록 offset vs cursor 페이지네이션 벤치마크
+
+실행 방법 (빈 벤치마크용 DB를 가리키는 DATABASE_URL 필요):
+python -m benchmarks.bench_post_pagination --rows 1000000 --page 500
+
+`--seed` 를 주면 posts 테이블에 --rows 만큼 글을 채운 뒤 측정한다.
+"""
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.crud import post as crud_post  # noqa: E402
+from app.db.base import Base, engine  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.models.category import Category  # noqa: E402
+from app.models.post import Post  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+BATCH_SIZE = 10_000
+
+
+def seed(rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = User(email="bench@example.com", username="bench", hashed_password="x")
+        category = Category(name="벤치마크", slug="bench")
+        db.add_all([user, category])
+        db.commit()
+
+        start = datetime.now(timezone.utc)
+        for offset in range(0, rows, BATCH_SIZE):
+            batch = [
+                {
+                    "title": f"bench post {index}",
+                    "content": "benchmark body",
+                    "user_id": user.id,
+                    "category_id": category.id,
+                    "views": index % 997,
+                    "created_at": start - timedelta(seconds=index),
+                    "post_type": "NORMAL",
+                }
+                for index in range(offset, min(offset + BATCH_SIZE, rows))
+            ]
+            db.execute(insert(Post), batch)
+            db.commit()
+        print(f"seeded {rows} posts")
+    finally:
+        db.close()
+
+
+def _timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _cursor_for_page(db, sort: str, page: int, page_size: int):
+    """Cursor pointing at the last row of page-1, computed once outside the timer."""
+    if page <= 1:
+        return None
+    query, sort_keys = crud_post._apply_sort_keys(
+        db,
+        crud_post._build_listing_query(
+            db, None, None, sort, "30d", None, None, None, None, False, None
+        ),
+        sort,
+    )
+    row = (
+        crud_post._order_by_sort_keys(
+            query.with_entities(*[expr for expr, _ in sort_keys]),
+            sort_keys,
+        )
+        .offset((page - 1) * page_size - 1)
+        .limit(1)
+        .one()
+    )
+    return crud_post.encode_post_cursor(sort, list(row))
+
+
+def run(page: int, page_size: int, repeat: int, sorts: list[str]) -> None:
+    db = SessionLocal()
+    try:
+        print(f"{'sort':<10}{'mode':<18}{'page 1 ms':>12}{f'page {page} ms':>14}")
+        for sort in sorts:
+            for label, total_mode in (("offset+count", "exact"), ("offset", "none")):
+                first = _timed(
+                    lambda: crud_post.get_posts(
+                        db, skip=0, limit=page_size, sort=sort, window="30d", total_mode=total_mode
+                    ),
+                    repeat,
+                )
+                deep = _timed(
+                    lambda: crud_post.get_posts(
+                        db,
+                        skip=(page - 1) * page_size,
+                        limit=page_size,
+                        sort=sort,
+                        window="30d",
+                        total_mode=total_mode,
+                    ),
+                    repeat,
+                )
+                print(f"{sort:<10}{label:<18}{first:>12.2f}{deep:>14.2f}")
+
+            deep_cursor = _cursor_for_page(db, sort, page, page_size)
+            first = _timed(
+                lambda: crud_post.get_posts_by_cursor(db, limit=page_size, sort=sort, window="30d"),
+                repeat,
+            )
+            deep = _timed(
+                lambda: crud_post.get_posts_by_cursor(
+                    db, cursor=deep_cursor, limit=page_size, sort=sort, window="30d"
+                ),
+                repeat,
+            )
+            print(f"{sort:<10}{'cursor':<18}{first:>12.2f}{deep:>14.2f}")
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", action="store_true", help="insert --rows posts first")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sorts", default="latest,views,likes,comments,hot")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.rows)
+    run(args.page, args.page_size, args.repeat, args.sorts.split(","))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+읽기 엔드포인트 부하 테스트 (sync def + threadpool vs async def + get_async_db 비교용)
+
+실행 중인 API 서버에 동시 클라이언트 N 개로 요청을 보내 requests/sec 와 p50/p99 지연을 잰다.
+비교하려면 같은 데이터/같은 워커 수(예: uvicorn --workers 4)로 변경 전 커밋과 현재 커밋의
+서버를 각각 띄우고 동일한 옵션으로 실행한다:
+
+python -m benchmarks.bench_read_endpoints --base-url http://localhost:8000 --concurrency 200 --duration 30
+
+응답 캐시가 결과를 가리지 않도록 서버는 RESPONSE_CACHE_ENABLED=false 로 띄우는 것을 권장한다.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+DEFAULT_PATHS = (
+    "/api/v1/posts/?page=1&page_size=20",
+    "/api/v1/posts/{post_id}",
+    "/api/v1/comments/post/{post_id}",
+    "/api/v1/community/hot?window=7d",
+    "/api/v1/community/pinned",
+)
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _worker(client: httpx.AsyncClient, path: str, deadline: float, latencies: list, errors: list) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as exc:
+            errors.append(type(exc).__name__)
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def run_path(base_url: str, path: str, concurrency: int, duration: float, headers: dict) -> dict:
+    latencies: list[float] = []
+    errors: list = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, headers=headers, timeout=30) as client:
+        await client.get(path)  # warm-up
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(
+            *[_worker(client, path, deadline, latencies, errors) for _ in range(concurrency)]
+        )
+        elapsed = time.perf_counter() - started
+
+    return {
+        "path": path,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p99": _percentile(latencies, 0.99),
+    }
+
+
+async def main_async(args) -> None:
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    paths = args.path or [path.format(post_id=args.post_id) for path in DEFAULT_PATHS]
+    print(f"{'path':<45}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for path in paths:
+        result = await run_path(args.base_url, path, args.concurrency, args.duration, headers)
+        print(
+            f"{result['path']:<45}{result['requests']:>10}{result['errors']:>8}"
+            f"{result['rps']:>10.1f}{result['p50']:>10.1f}{result['p99']:>10.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per path")
+    parser.add_argument("--post-id", type=int, default=1)
+    parser.add_argument("--token", default=None, help="optional access token (per-viewer flags)")
+    parser.add_argument("--path", action="append", help="override the default path list")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
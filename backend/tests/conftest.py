@@ -12,8 +12,25 @@ if str(BACKEND_DIR) not in sys.path:
 os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
 os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
 os.environ.setdefault("SECRET_KEY", "test-secret-key")
+# No Redis server in tests: keep cross-worker features on their in-process backends.
+os.environ.setdefault("NOTIFICATION_PUSH_BACKEND", "memory")
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "memory")
+os.environ.setdefault("HOT_SCORE_BACKEND", "memory")
+os.environ.setdefault("AI_RATE_LIMIT_BACKEND", "memory")
 
 from app.main import app  # noqa: E402
+from app.services.follow_graph import follow_graph_cache  # noqa: E402
+from app.services.principal_cache import principal_cache  # noqa: E402
+from app.services.response_cache import response_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def reset_response_cache():
+    # Tests rebuild the database between cases; cached bodies and users must not leak across them.
+    response_cache.clear()
+    principal_cache.clear()
+    follow_graph_cache.clear()
+    yield
 
 
 @pytest.fixture()
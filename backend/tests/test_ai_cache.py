@@ -0,0 +1,110 @@
+import unicodedata
+
+from prometheus_client import REGISTRY
+
+from app.services import ai_cache
+from app.services.ai_cache import AiResponseCache, normalize_prompt
+from app.services.ai_service import INTENT_DEV_QNA, INTENT_OUT_OF_SCOPE, ai_service
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+class _SharedRedis:
+    """The two calls the L2 makes, backed by a dict shared between caches."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value.encode("utf-8")
+
+
+def _cache(**overrides) -> AiResponseCache:
+    options = {"backend": "memory", "max_items": 100, "max_bytes": 100_000, "max_entry_bytes": 10_000}
+    options.update(overrides)
+    return AiResponseCache(**options)
+
+
+def test_prompt_normalization_shares_keys_across_spacing_case_and_unicode_forms():
+    decomposed = unicodedata.normalize("NFD", "FastAPI  배포\n에러")
+    assert normalize_prompt(decomposed) == "fastapi 배포 에러"
+    assert ai_service.build_input_hash({"message": decomposed}) == ai_service.build_input_hash(
+        {"message": " fastapi 배포 에러 "}
+    )
+    # Editor text keeps case and line breaks: the model's output echoes them.
+    assert ai_service.build_input_hash({"text": "A\nb"}, fold=False) != ai_service.build_input_hash(
+        {"text": "a b"}, fold=False
+    )
+
+
+def test_l1_expires_due_entries_and_evicts_by_size(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(ai_cache, "time", clock)
+    cache = _cache(max_bytes=350)
+
+    cache.set("chat:short", {"answer": "a"}, ttl_seconds=10)
+    cache.set("chat:long", {"answer": "b"}, ttl_seconds=100)
+    clock.now += 20
+    cache.set("chat:new", {"answer": "c"}, ttl_seconds=100)
+    assert cache.get("chat:short") is None
+    assert cache.get("chat:long").value == {"answer": "b"}
+    assert cache.stats()["l1_items"] == 2
+
+    # Over the byte budget the least recently used entries go first.
+    cache.set("chat:big", {"answer": "x" * 200}, ttl_seconds=100)
+    assert cache.get("chat:new") is None
+    assert cache.get("chat:big") is not None
+    assert cache.stats()["l1_bytes"] <= 350
+    assert cache.stats()["evictions"] >= 1
+
+    cache.set("chat:huge", {"answer": "x" * 20_000}, ttl_seconds=100)
+    assert cache.get("chat:huge") is None
+    assert cache.stats()["oversized"] == 1
+
+
+def test_redis_l2_is_shared_between_workers():
+    shared = _SharedRedis()
+    worker_a, worker_b = _cache(backend="redis"), _cache(backend="redis")
+    worker_a._redis = worker_b._redis = shared
+
+    worker_a.set("route:abc", {"intent": "DEV_QNA"}, ttl_seconds=60)
+    entry = worker_b.get("route:abc")
+
+    assert (entry.value, entry.tier) == ({"intent": "DEV_QNA"}, "l2")
+    assert worker_b.get("route:abc").tier == "l1"
+    assert worker_b.stats()["hits_l2"] == 1 and worker_b.stats()["hits_l1"] == 1
+
+
+def test_negative_entries_use_the_short_ttl_and_count_per_endpoint(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(ai_cache, "time", clock)
+    cache = _cache()
+    monkeypatch.setattr(ai_service, "_cache", cache)
+    before = REGISTRY.get_sample_value(
+        "ai_cache_lookups_total", {"endpoint": "editor:v2:tags", "result": "negative_hit"}
+    ) or 0.0
+
+    ai_service.set_cached("editor:v2:tags:h1", {"status": "timeout"}, negative=True)
+    ai_service.set_cached("chat:h2", {"answer": "ok"}, intent=INTENT_OUT_OF_SCOPE)
+    assert ai_service.get_cached("editor:v2:tags:h1").negative is True
+    assert ai_service.get_cached("chat:h3") is None
+
+    clock.now += ai_service.cache_ttl(INTENT_DEV_QNA)
+    assert ai_service.get_cached("editor:v2:tags:h1") is None
+    assert ai_service.get_cached("chat:h2") is not None
+
+    endpoints = ai_service.stats()["cache"]["endpoints"]
+    assert endpoints["chat"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+    assert endpoints["editor:v2:tags"]["hits"] == 1
+    assert REGISTRY.get_sample_value(
+        "ai_cache_lookups_total", {"endpoint": "editor:v2:tags", "result": "negative_hit"}
+    ) == before + 1
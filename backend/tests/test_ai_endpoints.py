@@ -1,38 +1,45 @@
+import asyncio
+import json
+
+import httpx
 import pytest
 
+from app.core.config import settings
 from app.schemas.ai import AiEditorRequest
 from app.services.ai_service import (
     INTENT_DEV_QNA,
     INTENT_EDITOR_HELP,
     INTENT_OUT_OF_SCOPE,
+    AiService,
+    EditorStreamValidator,
     ai_service,
 )
 
 
 def test_intent_router_classifies_dev_qna():
-    decision = ai_service.classify_intent(
+    decision = asyncio.run(ai_service.classify_intent(
         message="FastAPI API 에러 디버깅 순서를 알려줘",
         source="sidebar_chat",
         allowed_intents={INTENT_DEV_QNA, "SITE_HELP", INTENT_OUT_OF_SCOPE},
         allow_model=False,
-    )
+    ))
     assert decision["intent"] == INTENT_DEV_QNA
 
 
 def test_chat_reply_out_of_scope_shape():
-    reply, meta = ai_service.chat_reply(intent=INTENT_OUT_OF_SCOPE, message="로또 번호 알려줘")
+    reply, meta = asyncio.run(ai_service.chat_reply(intent=INTENT_OUT_OF_SCOPE, message="로또 번호 알려줘"))
     assert isinstance(reply["answer"], str) and reply["answer"].strip()
     assert isinstance(reply["suggested_question"], str) and reply["suggested_question"].strip()
     assert meta.status == "success"
 
 
 def test_editor_tags_response_is_json_shape():
-    payload, meta = ai_service.editor_reply(
+    payload, meta = asyncio.run(ai_service.editor_reply(
         action="tags",
         text="nginx, docker compose, fastapi 배포 이슈를 정리했습니다.",
         title="FastAPI 배포 삽질기",
         category_slug="qna",
-    )
+    ))
     assert isinstance(payload["tags"], list)
     assert len(payload["tags"]) >= 1
     assert meta.status in {"success", "disabled", "failed", "timeout", "invalid_json", "invalid_schema"}
@@ -49,12 +56,12 @@ def test_editor_request_rejects_empty_text_and_title():
 
 
 def test_intent_router_returns_editor_help_for_editor_source():
-    decision = ai_service.classify_intent(
+    decision = asyncio.run(ai_service.classify_intent(
         message="제목을 추천해줘",
         source="editor_action",
         action="title",
         allow_model=False,
-    )
+    ))
     assert decision["intent"] == INTENT_EDITOR_HELP
 
 
@@ -67,3 +74,119 @@ def test_fallback_title_candidates_are_not_generic():
     assert all("경험 공유" not in title for title in titles)
     assert all("적용 이슈 정리" not in title for title in titles)
     assert any("케이뱅크" in title for title in titles)
+
+
+def _completion(content: str) -> dict:
+    return {
+        "choices": [{"message": {"content": content}}],
+        "usage": {"prompt_tokens": 12, "completion_tokens": 5, "total_tokens": 17},
+    }
+
+
+def test_model_calls_share_one_pooled_client_and_queue_per_model(monkeypatch):
+    monkeypatch.setattr(settings, "AI_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "AI_MODEL_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "AI_MODEL_QUEUE_TIMEOUT_SECONDS", 0.05)
+    requests = []
+
+    async def upstream(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json=_completion("pooled answer"))
+
+    service = AiService(transport=httpx.MockTransport(upstream))
+
+    async def run():
+        first = await service.chat_reply(intent=INTENT_DEV_QNA, message="fastapi 질문")
+        client = service._client()
+        # The only slot for the model is busy, so the second caller gives up and falls back.
+        racing = await asyncio.gather(
+            service.chat_reply(intent=INTENT_DEV_QNA, message="동시 질문 1"),
+            service.chat_reply(intent=INTENT_DEV_QNA, message="동시 질문 2"),
+        )
+        assert service._client() is client
+        await service.aclose()
+        return first, racing
+
+    (reply, result), racing = asyncio.run(run())
+    assert reply["answer"] == "pooled answer"
+    assert (result.status, result.total_tokens) == ("success", 17)
+    assert sorted(meta.status for _reply, meta in racing) == ["overloaded", "success"]
+    assert len(requests) == 2
+    assert service.stats()["model_overloaded"] == 1
+
+
+def _sse_completion(*deltas: str) -> bytes:
+    chunks = [{"choices": [{"delta": {"content": delta}}]} for delta in deltas]
+    chunks.append({"choices": [], "usage": {"prompt_tokens": 30, "completion_tokens": 9, "total_tokens": 39}})
+    lines = [f"data: {json.dumps(chunk, ensure_ascii=False)}" for chunk in chunks]
+    return ("\n\n".join(lines + ["data: [DONE]"]) + "\n\n").encode()
+
+
+def _collect(stream) -> list:
+    async def run():
+        return [event async for event in stream]
+
+    return asyncio.run(run())
+
+
+def test_stream_chat_reply_forwards_deltas_and_reports_usage(monkeypatch):
+    monkeypatch.setattr(settings, "AI_API_KEY", "test-key")
+    requests = []
+
+    async def upstream(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, content=_sse_completion("스트리밍 ", "답변"))
+
+    service = AiService(transport=httpx.MockTransport(upstream))
+    events = _collect(service.stream_chat_reply(intent=INTENT_DEV_QNA, message="fastapi 질문"))
+
+    assert [event.text for event in events if event.kind == "delta"] == ["스트리밍 ", "답변"]
+    done = events[-1]
+    assert done.kind == "done"
+    assert done.data["answer"] == "스트리밍 답변"
+    assert (done.result.status, done.result.total_tokens) == ("success", 39)
+    assert requests[0]["stream"] is True
+
+
+def test_stream_editor_reply_cuts_off_off_schema_output_and_falls_back(monkeypatch):
+    monkeypatch.setattr(settings, "AI_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "AI_EDITOR_MODEL", "editor-main")
+    monkeypatch.setattr(settings, "AI_EDITOR_FALLBACK_MODEL", "editor-backup")
+
+    async def upstream(request: httpx.Request) -> httpx.Response:
+        if json.loads(request.content)["model"] == "editor-main":
+            # "tags" must be an array: the stream is abandoned at the opening quote.
+            return httpx.Response(200, content=_sse_completion('{"tags": ', '"fastapi, docker"', "}"))
+        return httpx.Response(200, content=_sse_completion('{"tags": ["fastapi", ', '"docker"]}'))
+
+    service = AiService(transport=httpx.MockTransport(upstream))
+    events = _collect(
+        service.stream_editor_reply(action="tags", text="FastAPI 와 Docker 배포", title=None, category_slug=None)
+    )
+
+    kinds = [event.kind for event in events]
+    assert kinds == ["delta", "reset", "delta", "delta", "done"]
+    assert events[-1].data == {"tags": ["fastapi", "docker"]}
+    assert (events[-1].result.model, events[-1].result.total_tokens) == ("editor-backup", 39)
+
+
+def test_editor_stream_validator_checks_json_incrementally():
+    schema = json.loads(ai_service._editor_schema_hint("proofread"))
+
+    validator = EditorStreamValidator(schema)
+    for piece in ['```json\n{"revised_text": "a \\"}\\" b",', ' "changes": [{"x": [1]}], "note": null}']:
+        assert validator.feed(piece) is False
+    assert validator.status is None
+
+    validator = EditorStreamValidator(schema)
+    assert validator.feed('{"revised_text": ["a"]') is True
+    assert validator.status == "invalid_schema"
+
+    validator = EditorStreamValidator(schema)
+    assert validator.feed('{"changes": ["a"}') is True
+    assert validator.status == "invalid_json"
+
+    # Plain text is left for the non-JSON recovery after the stream ends.
+    assert EditorStreamValidator(schema).feed("수정된 본문입니다 {") is False
+
@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.deps import get_current_active_admin
+from app.crud import ai_action_log as crud_ai_action_log
+from app.db.base import Base
+from app.db.session import get_db
+from app.main import app
+from app.models.ai_action_log import AiActionLog
+from app.models.ai_usage_rollup import AiUsageRollup
+from app.models.user import User
+from app.services.ai_log_writer import AiLogWriter
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ai_logs.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+def _record_call(writer: AiLogWriter, **overrides) -> bool:
+    row = {
+        "user_id": None,
+        "endpoint": "chat",
+        "source": "sidebar_chat",
+        "intent": "DEV_QNA",
+        "action": None,
+        "input_hash": "h",
+        "status": "success",
+        "model": "gpt-4.1-mini",
+        "latency_ms": 300.0,
+        "prompt_tokens": 10,
+        "completion_tokens": 5,
+        "total_tokens": 15,
+        "cost_usd": 0.001,
+        "error_message": None,
+    }
+    row.update(overrides)
+    return writer.record(**row)
+
+
+def test_flush_writes_batches_and_rolls_up_upstream_calls(session_factory):
+    writer = AiLogWriter(batch_size=2, flush_interval_ms=1000, max_buffer=100)
+    for latency_ms in (80.0, 300.0, 300.0, 1500.0):
+        _record_call(writer, latency_ms=latency_ms)
+    _record_call(writer, status="timeout", latency_ms=12_000.0, total_tokens=0, cost_usd=0.0)
+    # Neither of these reached the model: they are logged but not rolled up.
+    _record_call(writer, status="cached", model=None, latency_ms=None)
+    _record_call(writer, status="coalesced", total_tokens=0, cost_usd=0.0)
+
+    assert writer.flush_with_session(session_factory) == 7
+    assert writer.stats()["batches"] == 4
+    assert writer.stats()["buffered"] == 0
+
+    with session_factory() as db:
+        assert db.query(AiActionLog).count() == 7
+        assert db.query(AiUsageRollup).count() == 4
+        summary = crud_ai_action_log.get_usage_summary(db, hours=1)
+
+    (item,) = summary["items"]
+    assert (item["model"], item["intent"], item["requests"], item["failures"]) == ("gpt-4.1-mini", "DEV_QNA", 5, 1)
+    assert item["total_tokens"] == 60
+    assert item["cost_usd"] == pytest.approx(0.004)
+    # 80 | 300 300 | 1500 | 12000 over the 100/500/2000/15000 ms buckets.
+    assert 250 < item["p50_latency_ms"] <= 500
+    assert 8000 < item["p95_latency_ms"] <= 15000
+    assert summary["total_requests"] == 5
+
+    # A later flush for the same hour adds onto the existing rollup rows.
+    _record_call(writer, latency_ms=90.0)
+    writer.flush_with_session(session_factory)
+    with session_factory() as db:
+        assert db.query(AiUsageRollup).count() == 4
+        assert crud_ai_action_log.get_usage_summary(db, hours=1)["items"][0]["requests"] == 6
+
+
+def test_full_buffer_drops_rows_and_failed_batches_are_retried_then_dropped(tmp_path):
+    writer = AiLogWriter(batch_size=10, flush_interval_ms=1000, max_buffer=3)
+    accepted = [_record_call(writer) for _ in range(5)]
+    assert accepted == [True, True, True, False, False]
+    assert writer.stats()["dropped_full"] == 2
+
+    # No tables in this database, so every flush fails.
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    broken = sessionmaker(bind=engine)
+    assert writer.flush_with_session(broken) == 0
+    assert writer.stats()["buffered"] == 3
+    writer.flush_with_session(broken)
+    writer.flush_with_session(broken)
+    engine.dispose()
+
+    stats = writer.stats()
+    assert (stats["buffered"], stats["dropped_failed"], stats["flush_failures"]) == (0, 3, 3)
+
+
+def test_background_flush_and_shutdown_write_everything(session_factory):
+    writer = AiLogWriter(batch_size=2, flush_interval_ms=60_000, max_buffer=100)
+
+    async def run():
+        writer.start(session_factory)
+        _record_call(writer)
+        _record_call(writer)  # a full batch wakes the flush before the interval
+        for _ in range(50):
+            if writer.stats()["written"] == 2:
+                break
+            await asyncio.sleep(0.02)
+        written_early = writer.stats()["written"]
+        _record_call(writer)
+        await writer.shutdown(session_factory)
+        return written_early
+
+    assert asyncio.run(run()) == 2
+    with session_factory() as db:
+        assert db.query(AiActionLog).count() == 3
+
+
+def test_usage_summary_requires_admin(client, session_factory):
+    assert client.get("/api/ai/admin/usage").status_code == 403
+
+    writer = AiLogWriter(batch_size=10, flush_interval_ms=1000, max_buffer=100)
+    _record_call(writer, intent=None, endpoint="editor:tags", model="gpt-4.1-nano")
+    writer.flush_with_session(session_factory)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    overrides = {
+        get_db: override_get_db,
+        get_current_active_admin: lambda: User(id=1, username="admin", is_admin=True),
+    }
+    app.dependency_overrides.update(overrides)
+    try:
+        response = client.get("/api/ai/admin/usage?hours=6")
+    finally:
+        for dependency in overrides:
+            app.dependency_overrides.pop(dependency, None)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_requests"] == 1
+    assert body["items"][0]["model"] == "gpt-4.1-nano"
+    assert body["items"][0]["intent"] is None
+    assert body["items"][0]["p50_latency_ms"] is not None
@@ -0,0 +1,107 @@
+import asyncio
+
+from app.services import ai_rate_limit
+from app.services.ai_rate_limit import TIER_ADMIN, TIER_ANON, TIER_USER, AiRateLimiter
+from app.services.ai_service import ai_service
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+def _limiter(**overrides) -> AiRateLimiter:
+    options = {
+        "backend": "memory",
+        "window_seconds": 60,
+        "tier_limits": {TIER_ANON: 2, TIER_USER: 4, TIER_ADMIN: 8},
+        "daily_budget_usd": 0.0,
+        "daily_user_budget_usd": 0.0,
+    }
+    options.update(overrides)
+    return AiRateLimiter(**options)
+
+
+def _check(limiter: AiRateLimiter, *args, **kwargs):
+    return asyncio.run(limiter.check(*args, **kwargs))
+
+
+def test_token_bucket_is_tiered_refills_and_forgets_idle_identities(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(ai_rate_limit, "time", clock)
+    limiter = _limiter()
+
+    anon = [_check(limiter, "chat", "ip:1.2.3.4", TIER_ANON).allowed for _ in range(3)]
+    admin = [_check(limiter, "chat", "user:1", TIER_ADMIN).allowed for _ in range(9)]
+    assert anon == [True, True, False]
+    assert admin == [True] * 8 + [False]
+
+    rejected = _check(limiter, "chat", "ip:1.2.3.4", TIER_ANON)
+    assert (rejected.reason, rejected.retry_after_seconds) == ("rate", 30)
+
+    # One emission interval later exactly one more request fits.
+    clock.now += 30
+    assert _check(limiter, "chat", "ip:1.2.3.4", TIER_ANON).allowed
+    assert not _check(limiter, "chat", "ip:1.2.3.4", TIER_ANON).allowed
+
+    clock.now += 120
+    assert _check(limiter, "route", "ip:5.6.7.8", TIER_ANON).allowed
+    assert limiter.stats()["tracked_buckets"] == 1
+
+
+def test_daily_budgets_block_after_logged_spend():
+    limiter = _limiter(daily_budget_usd=1.0, daily_user_budget_usd=0.25)
+
+    limiter.record_spend(7, 0.3)
+    assert _check(limiter, "chat", "user:7", TIER_USER, user_id=7).reason == "budget"
+    assert _check(limiter, "chat", "user:8", TIER_USER, user_id=8).allowed
+    # Admins skip the per-user cap but not the global one.
+    limiter.record_spend(9, 0.3)
+    assert _check(limiter, "chat", "user:9", TIER_ADMIN, user_id=9).allowed
+
+    limiter.record_spend(None, 0.5)
+    decision = _check(limiter, "chat", "user:9", TIER_ADMIN, user_id=9)
+    assert (decision.allowed, decision.reason) == (False, "budget")
+    assert decision.retry_after_seconds > 0
+    assert limiter.stats()["spent_today_usd"] == 1.1
+
+
+def test_redis_outage_falls_back_to_per_worker_buckets(monkeypatch):
+    monkeypatch.setattr(ai_rate_limit.settings, "REDIS_URL", "redis://127.0.0.1:1/0")
+    limiter = _limiter(backend="redis", daily_budget_usd=1.0)
+
+    assert [_check(limiter, "chat", "ip:1", TIER_ANON).allowed for _ in range(3)] == [True, True, False]
+
+
+def test_spend_is_sent_in_the_background_and_kept_locally_when_redis_is_down(monkeypatch):
+    monkeypatch.setattr(ai_rate_limit.settings, "REDIS_URL", "redis://127.0.0.1:1/0")
+    limiter = _limiter(backend="redis", daily_budget_usd=1.0)
+
+    async def run():
+        # Called from sync logging code on the event loop: returns before redis answers.
+        limiter.record_spend(3, 1.5)
+        pending = len(limiter._spend_tasks)
+        await limiter.aclose()
+        return pending, await limiter.check("chat", "user:3", TIER_USER, user_id=3)
+
+    pending, decision = asyncio.run(run())
+
+    assert pending == 1
+    assert decision.reason == "budget"
+    assert limiter.stats()["spent_today_usd"] == 1.5
+
+
+def test_rate_limited_endpoint_returns_retry_after(client, monkeypatch):
+    monkeypatch.setattr(ai_service, "_rate_limiter", _limiter())
+    body = {"source": "sidebar_chat", "message": "FastAPI 질문"}
+
+    statuses = [client.post("/api/ai/route", json=body).status_code for _ in range(2)]
+    response = client.post("/api/ai/route", json=body)
+
+    assert statuses == [200, 200]
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert ai_service.stats()["rate_limited"] >= 1
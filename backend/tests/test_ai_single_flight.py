@@ -0,0 +1,161 @@
+import asyncio
+import json
+from dataclasses import asdict
+
+import httpx
+from prometheus_client import REGISTRY
+
+from app.core.config import settings
+from app.services import ai_single_flight
+from app.services.ai_service import INTENT_DEV_QNA, AiService, ModelCallResult
+from app.services.ai_single_flight import AiSingleFlight
+
+
+def _coalesced(endpoint: str, scope: str) -> float:
+    return REGISTRY.get_sample_value("ai_coalesced_requests_total", {"endpoint": endpoint, "scope": scope}) or 0.0
+
+
+def test_identical_concurrent_requests_share_one_upstream_call(monkeypatch):
+    monkeypatch.setattr(settings, "AI_API_KEY", "test-key")
+    calls = []
+
+    async def upstream(request: httpx.Request) -> httpx.Response:
+        calls.append(json.loads(request.content))
+        await asyncio.sleep(0.1)
+        return httpx.Response(
+            200,
+            json={
+                "choices": [{"message": {"content": "shared answer"}}],
+                "usage": {"prompt_tokens": 12, "completion_tokens": 5, "total_tokens": 17},
+            },
+        )
+
+    service = AiService(transport=httpx.MockTransport(upstream))
+    before = _coalesced("chat", "local")
+
+    async def build():
+        reply, result = await service.chat_reply(intent=INTENT_DEV_QNA, message="같은 질문")
+        return reply, result
+
+    async def run():
+        outcomes = await asyncio.gather(*[service.coalesce("chat:same", "chat", build) for _ in range(5)])
+        # A later request is a new flight, not a follower of the finished one.
+        later = await service.coalesce("chat:same", "chat", build)
+        await service.aclose()
+        return outcomes, later
+
+    outcomes, later = asyncio.run(run())
+
+    assert len(calls) == 2
+    assert all(payload["answer"] == "shared answer" for payload, _result, _coalesced_flag in outcomes)
+    assert sorted(flag for _payload, _result, flag in outcomes) == [False, True, True, True, True]
+    assert later[2] is False
+    stats = service.stats()["single_flight"]
+    assert (stats["coalesced_local"], stats["tokens_saved"], stats["in_flight"]) == (4, 68, 0)
+    assert _coalesced("chat", "local") == before + 4
+
+
+def _result(total_tokens: int) -> ModelCallResult:
+    return ModelCallResult("", "m", "success", None, 1.0, 0, 0, total_tokens, 0.0)
+
+
+def test_followers_make_their_own_call_when_the_leader_fails():
+    flight = AiSingleFlight(enabled=True, backend="memory", timeout_seconds=5, result_type=ModelCallResult)
+    builds = []
+
+    async def build():
+        builds.append(len(builds))
+        await asyncio.sleep(0.05)
+        if len(builds) == 1:
+            raise RuntimeError("upstream exploded")
+        return {"n": len(builds)}, _result(3)
+
+    async def run():
+        return await asyncio.gather(*[flight.run("k", "chat", build) for _ in range(3)], return_exceptions=True)
+
+    leader, *followers = asyncio.run(run())
+
+    assert isinstance(leader, RuntimeError)
+    assert all(coalesced is False for _payload, _result_, coalesced in followers)
+    assert len(builds) == 3
+    assert flight.stats()["fallbacks"] == 2
+
+
+def test_redis_outage_still_coalesces_within_the_worker(monkeypatch):
+    monkeypatch.setattr(ai_single_flight.settings, "REDIS_URL", "redis://127.0.0.1:1/0")
+    flight = AiSingleFlight(enabled=True, backend="redis", timeout_seconds=5, result_type=ModelCallResult)
+    builds = []
+
+    async def build():
+        builds.append(1)
+        await asyncio.sleep(0.05)
+        return {"answer": "ok"}, _result(10)
+
+    async def run():
+        outcomes = await asyncio.gather(*[flight.run("k", "editor:tags", build) for _ in range(3)])
+        await flight.aclose()
+        return outcomes
+
+    outcomes = asyncio.run(run())
+
+    assert len(builds) == 1
+    assert [coalesced for _payload, _result_, coalesced in outcomes].count(True) == 2
+    assert flight.stats()["errors"] >= 1
+
+
+class _RecordingPipeline:
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+
+    def set(self, name, value, ex=None):
+        self._commands.append(("set", name, value, ex))
+
+    def publish(self, channel, message):
+        self._commands.append(("publish", channel, message))
+
+    async def execute(self):
+        self._client.calls.extend(self._commands)
+
+
+class _RecordingRedis:
+    """Just enough of redis.asyncio for a leader: SET NX, a pipelined publish and EVAL."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def set(self, name, value, nx=False, px=None):
+        self.calls.append(("lock", name))
+        return True
+
+    def pipeline(self, transaction=True):
+        return _RecordingPipeline(self)
+
+    async def eval(self, script, numkeys, *args):
+        self.calls.append(("release", args[0]))
+        return 1
+
+
+def test_failed_leader_releases_the_lock_and_tells_remote_followers():
+    flight = AiSingleFlight(enabled=True, backend="redis", timeout_seconds=5, result_type=ModelCallResult)
+    client = _RecordingRedis()
+    flight._get_redis = lambda: client
+
+    async def build():
+        raise RuntimeError("upstream exploded")
+
+    async def run():
+        try:
+            await flight.run("k", "chat", build)
+        except RuntimeError:
+            return "raised"
+
+    assert asyncio.run(run()) == "raised"
+
+    kinds = [call[0] for call in client.calls]
+    assert kinds == ["lock", "set", "publish", "release"]
+    published = client.calls[2][2]
+    assert client.calls[1][3] == ai_single_flight.FAILURE_TTL_SECONDS
+    # A follower receiving the marker falls back at once instead of waiting out the timeout.
+    assert flight._decode(published) is None
+    assert flight._decode(json.dumps({"payload": {"a": 1}, "result": asdict(_result(2))}))[0] == {"a": 1}
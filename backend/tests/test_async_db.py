@@ -0,0 +1,170 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.deps import get_current_user, get_current_verified_user
+from app.db.base import Base, build_async_database_url
+from app.db.session import get_async_db, get_async_read_db, get_db, get_read_db
+from app.main import app
+from app.models.category import Category
+from app.models.comment import Comment
+from app.models.post import Post
+from app.models.user import User
+from app.services.response_cache import ResponseCache
+
+
+def test_build_async_database_url_swaps_driver():
+    assert (
+        build_async_database_url("postgresql://u:p@db:5432/board")
+        == "postgresql+asyncpg://u:p@db:5432/board"
+    )
+    assert (
+        build_async_database_url("postgresql+psycopg2://u:p@db/board")
+        == "postgresql+asyncpg://u:p@db/board"
+    )
+    assert build_async_database_url("sqlite+pysqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+    with pytest.raises(ValueError):
+        build_async_database_url("mysql://u:p@db/board")
+
+
+@pytest.fixture()
+def file_db_client(tmp_path):
+    # :memory: SQLite is per connection, so sync and async sessions need a shared file.
+    db_path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    SyncSession = sessionmaker(bind=sync_engine, autoflush=False)
+    AsyncSession = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    Base.metadata.create_all(bind=sync_engine)
+
+    def override_get_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    overrides = {
+        get_db: override_get_db,
+        get_read_db: override_get_db,
+        get_async_db: override_get_async_db,
+        get_async_read_db: override_get_async_db,
+    }
+    app.dependency_overrides.update(overrides)
+    try:
+        with TestClient(app) as client:
+            yield client, SyncSession
+    finally:
+        for dependency in overrides:
+            app.dependency_overrides.pop(dependency, None)
+        asyncio.run(async_engine.dispose())
+        sync_engine.dispose()
+
+
+def test_async_read_routes_serve_rows_written_through_sync_sessions(file_db_client):
+    client, SyncSession = file_db_client
+    with SyncSession() as db:
+        user = User(email="async@example.com", username="async", hashed_password="x")
+        category = Category(name="자유", slug="free")
+        db.add_all([user, category])
+        db.flush()
+        post = Post(title="async post", content="body", user_id=user.id, category_id=category.id)
+        db.add(post)
+        db.flush()
+        db.add(Comment(content="first", post_id=post.id, user_id=user.id))
+        db.commit()
+        post_id = post.id
+
+    detail = client.get(f"/api/v1/posts/{post_id}")
+    assert detail.status_code == 200
+    assert detail.json()["author_username"] == "async"
+    assert detail.json()["category_slug"] == "free"
+
+    assert client.get("/api/v1/posts/999999").status_code == 404
+
+    listing = client.get("/api/v1/posts/")
+    assert listing.status_code == 200
+    assert [item["id"] for item in listing.json()["posts"]] == [post_id]
+
+    comments = client.get(f"/api/v1/comments/post/{post_id}")
+    assert comments.status_code == 200
+    assert [item["content"] for item in comments.json()] == ["first"]
+    # The unpaginated listing is capped; whole threads are read page by page.
+    assert client.get(f"/api/v1/comments/post/{post_id}?limit=101").status_code == 400
+    page = client.get(f"/api/v1/comments/post/{post_id}/page?limit=1")
+    assert [item["content"] for item in page.json()["comments"]] == ["first"]
+
+    hot = client.get("/api/v1/community/hot?window=24h")
+    assert hot.status_code == 200
+    assert [item["id"] for item in hot.json()] == [post_id]
+
+
+def test_likes_and_comments_re_rank_cached_engagement_listings(file_db_client):
+    client, SyncSession = file_db_client
+    with SyncSession() as db:
+        author = User(email="rank@example.com", username="rank", hashed_password="x")
+        fan = User(email="fan@example.com", username="fan", hashed_password="x")
+        category = Category(name="자유", slug="free")
+        db.add_all([author, fan, category])
+        db.flush()
+        first = Post(
+            title="first", content="c", user_id=author.id, category_id=category.id, likes_count=1, comment_count=1
+        )
+        second = Post(title="second", content="c", user_id=author.id, category_id=category.id)
+        db.add_all([first, second])
+        db.commit()
+        first_id, second_id, fan_id = first.id, second.id, fan.id
+
+    def ranked(path: str) -> list[int]:
+        body = client.get(path).json()
+        return [item["id"] for item in (body["posts"] if isinstance(body, dict) else body)]
+
+    # One-item pages: the post that overtakes is not on them, so its own tag cannot help.
+    top_pages = ["/api/v1/posts/?sort=likes&page_size=1", "/api/v1/posts/?sort=comments&page_size=1"]
+    top_pages.append("/api/v1/community/hot?window=24h&limit=1")
+    assert [ranked(path) for path in top_pages] == [[first_id]] * 3
+
+    def current_fan():
+        with SyncSession() as db:
+            return db.get(User, fan_id)
+
+    app.dependency_overrides.update({get_current_user: current_fan, get_current_verified_user: current_fan})
+    try:
+        assert client.post(f"/api/v1/likes/posts/{second_id}/like").status_code in (200, 201)
+        for content in ("nice", "really nice"):
+            response = client.post("/api/v1/comments/", json={"post_id": second_id, "content": content})
+            assert response.status_code in (200, 201)
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+        app.dependency_overrides.pop(get_current_verified_user, None)
+
+    # Likes tie at one each and the newer post wins; it leads on comments and hot score.
+    assert [ranked(path) for path in top_pages] == [[second_id]] * 3
+
+
+def test_async_cache_builds_once_for_concurrent_misses():
+    cache = ResponseCache(
+        enabled=True, backend="memory", ttl_seconds=30, l1_max_items=10, lock_timeout_seconds=1.0
+    )
+    calls = {"count": 0}
+
+    async def build():
+        calls["count"] += 1
+        await asyncio.sleep(0.05)
+        return {"ok": True}, {"board"}
+
+    async def run():
+        return await asyncio.gather(*[cache.aget_or_build("k", build) for _ in range(10)])
+
+    entries = asyncio.run(run())
+    assert calls["count"] == 1
+    assert {entry.etag for entry in entries} == {entries[0].etag}
+    assert cache.stats()["coalesced"] == 9
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import comment as crud_comment
+from app.crud import community as crud_community
+from app.crud import follow as crud_follow
+from app.crud import post as crud_post
+from app.db.base import Base
+from app.models.category import Category
+from app.models.comment import Comment
+from app.models.post import Post
+from app.models.user import User
+
+
+@pytest.fixture()
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'blocks.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_listings_hide_users_blocked_in_either_direction(db):
+    users = [
+        User(email=f"blocks{i}@example.com", username=f"blocks{i}", hashed_password="x")
+        for i in range(4)
+    ]
+    category = Category(name="자유", slug="free")
+    db.add_all([*users, category])
+    db.flush()
+    viewer, blocked, blocker, friend = (user.id for user in users)
+    posts = {
+        author_id: Post(title="t", content="c", user_id=author_id, category_id=category.id, likes_count=3)
+        for author_id in (blocked, blocker, friend)
+    }
+    db.add_all(posts.values())
+    db.flush()
+    db.add_all([Comment(post_id=posts[friend].id, user_id=author_id, content="c") for author_id in posts])
+    db.commit()
+
+    crud_follow.create_block(db, blocker_id=viewer, blocked_id=blocked)
+    crud_follow.create_block(db, blocker_id=blocker, blocked_id=viewer)
+    hidden = crud_follow.get_blocked_user_ids(db, viewer)
+    assert hidden == {blocked, blocker}
+
+    listed, total = crud_post.get_posts(db, exclude_author_ids=hidden)
+    assert ([post.user_id for post in listed], total) == ([friend], 1)
+    listed, _total, _cursor = crud_post.get_posts_by_cursor(db, exclude_author_ids=hidden)
+    assert [post.user_id for post in listed] == [friend]
+
+    comments = crud_comment.get_comments_by_post(db, posts[friend].id, exclude_author_ids=hidden)
+    assert [comment.user_id for comment in comments] == [friend]
+
+    hot = crud_community.get_hot_posts(db, window="24h", exclude_author_ids=hidden)
+    assert [row["post"].user_id for row in hot] == [friend]
+    ranked = [(post.id, 1.0) for post in posts.values()]
+    assert [row["post"].user_id for row in crud_community.get_ranked_posts(db, ranked, hidden)] == [friend]
+
+    # Unblocking is picked up on the next request.
+    crud_follow.delete_block(db, blocker_id=viewer, blocked_id=blocked)
+    assert crud_follow.get_blocked_user_ids(db, viewer) == {blocker}
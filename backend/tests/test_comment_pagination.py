@@ -0,0 +1,92 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1 import comments as comment_routes
+from app.crud import comment as crud_comment
+from app.db.base import Base
+from app.models.category import Category
+from app.models.comment import Comment
+from app.models.post import Post
+from app.models.user import User
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'comments.db'}")
+    Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    factory = sessionmaker(bind=engine)
+    factory.statements = statements
+    try:
+        yield factory
+    finally:
+        engine.dispose()
+
+
+def _seed_thread(db, count: int) -> int:
+    users = [
+        User(email=f"thread{i}@example.com", username=f"thread{i}", hashed_password="x")
+        for i in range(3)
+    ]
+    category = Category(name="자유", slug="free")
+    db.add_all([*users, category])
+    db.flush()
+    post = Post(title="busy", content="body", user_id=users[0].id, category_id=category.id)
+    db.add(post)
+    db.flush()
+    now = datetime.now(timezone.utc)
+    db.add_all(
+        [
+            Comment(
+                content=f"comment {index}",
+                post_id=post.id,
+                user_id=users[index % 3].id,
+                # Pairs of identical timestamps exercise the id tie-breaker.
+                created_at=now - timedelta(minutes=count - index // 2),
+            )
+            for index in range(count)
+        ]
+    )
+    db.commit()
+    return post.id
+
+
+def test_cursor_pages_cover_the_thread_with_authors_batch_loaded(session_factory):
+    with session_factory() as db:
+        post_id = _seed_thread(db, 9)
+        expected = [comment.id for comment in crud_comment.get_comments_by_post(db, post_id)]
+
+    with session_factory() as db:
+        session_factory.statements.clear()
+        seen, cursor, pages = [], None, 0
+        while True:
+            page, cursor = crud_comment.get_comments_by_post_cursor(db, post_id, cursor, limit=4)
+            assert all(comment.author.username.startswith("thread") for comment in page)
+            seen.extend(comment.id for comment in page)
+            pages += 1
+            if cursor is None:
+                break
+        assert seen == expected
+        # One comment SELECT plus one author SELECT per page, however many rows.
+        assert len(session_factory.statements) == pages * 2
+
+        with pytest.raises(ValueError):
+            crud_comment.get_comments_by_post_cursor(db, post_id, "not-a-cursor")
+
+
+def test_export_streams_the_whole_thread_oldest_first(session_factory, monkeypatch):
+    with session_factory() as db:
+        post_id = _seed_thread(db, 5)
+    monkeypatch.setattr(comment_routes, "ReadSessionLocal", session_factory)
+    monkeypatch.setattr(comment_routes, "COMMENT_EXPORT_BATCH_SIZE", 2)
+
+    exported = json.loads("".join(comment_routes._stream_comment_export(post_id)))
+
+    assert [item["content"] for item in exported] == [f"comment {index}" for index in range(5)]
+    assert exported[0]["author_username"] == "thread0"
+    assert json.loads("".join(comment_routes._stream_comment_export(post_id + 1))) == []
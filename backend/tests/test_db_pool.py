@@ -0,0 +1,125 @@
+import pytest
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db import pool as db_pool
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, engine_options
+
+
+def test_engine_options_leave_sqlite_on_default_pool():
+    assert engine_options("sqlite:///./x.db") == {}
+    assert engine_options("sqlite+aiosqlite:///./x.db", is_async=True) == {}
+
+
+def test_engine_options_apply_pool_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 3)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    monkeypatch.setattr(settings, "DB_PGBOUNCER_TRANSACTION_MODE", False)
+
+    options = engine_options("postgresql://u:p@db/board")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert (options["pool_size"], options["max_overflow"]) == (7, 3)
+    assert options["pool_pre_ping"] is True
+    # The statement timeout is set per transaction, never per connection.
+    assert "connect_args" not in options
+
+    async_options = engine_options("postgresql+asyncpg://u:p@db/board", is_async=True)
+    assert async_options["poolclass"] is InstrumentedAsyncAdaptedQueuePool
+    assert "connect_args" not in async_options
+
+
+def test_pgbouncer_mode_disables_prepared_statements_and_startup_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    monkeypatch.setattr(settings, "DB_PGBOUNCER_TRANSACTION_MODE", True)
+
+    assert "connect_args" not in engine_options("postgresql://u:p@db/board")
+
+    connect_args = engine_options("postgresql+asyncpg://u:p@db/board", is_async=True)["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["prepared_statement_name_func"]() != connect_args["prepared_statement_name_func"]()
+    assert "server_settings" not in connect_args
+
+
+def test_instrumented_pool_reports_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    db_pool.instrument_engine(engine, "test")
+    try:
+        with engine.connect() as first:
+            first.execute(text("SELECT 1"))
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+        stats = db_pool.pool_stats()["test"]
+        assert stats["checkouts"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["size"] == 1
+        assert stats["checked_out"] == 0
+    finally:
+        db_pool._pool_metrics.pop("test", None)
+        engine.dispose()
+
+
+class _BeginningConnection:
+    def __init__(self, **execution_options):
+        self.execution_options = execution_options
+        self.statements = []
+
+    def get_execution_options(self):
+        return self.execution_options
+
+    def exec_driver_sql(self, statement):
+        self.statements.append(statement)
+
+
+@pytest.mark.parametrize("pgbouncer", [False, True])
+def test_statement_timeout_is_set_locally_and_can_be_overridden(monkeypatch, pgbouncer):
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    monkeypatch.setattr(settings, "DB_PGBOUNCER_TRANSACTION_MODE", pgbouncer)
+
+    default = _BeginningConnection()
+    db_pool._set_local_statement_timeout(default)
+    assert default.statements == ["SET LOCAL statement_timeout = 5000"]
+
+    export = _BeginningConnection(**{db_pool.STATEMENT_TIMEOUT_OPTION: 300000})
+    db_pool._set_local_statement_timeout(export)
+    assert export.statements == ["SET LOCAL statement_timeout = 300000"]
+
+    unlimited = _BeginningConnection(**{db_pool.STATEMENT_TIMEOUT_OPTION: 0})
+    db_pool._set_local_statement_timeout(unlimited)
+    assert unlimited.statements == ["SET LOCAL statement_timeout = 0"]
+
+
+def test_no_statement_timeout_sends_nothing(monkeypatch):
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 0)
+    connection = _BeginningConnection()
+    db_pool._set_local_statement_timeout(connection)
+    assert connection.statements == []
+
+
+def test_with_statement_timeout_only_applies_to_the_next_transaction():
+    engine = create_engine("sqlite://")
+    seen = []
+    event.listen(
+        engine,
+        "begin",
+        lambda connection: seen.append(connection.get_execution_options().get(db_pool.STATEMENT_TIMEOUT_OPTION)),
+    )
+    db = sessionmaker(bind=engine)()
+    try:
+        db_pool.with_statement_timeout(db, 300000)
+        db.execute(text("SELECT 1"))
+        db.commit()
+        db.execute(text("SELECT 1"))
+        assert seen == [300000, None]
+    finally:
+        db.close()
+        engine.dispose()
@@ -0,0 +1,166 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import follow as crud_follow
+from app.db.base import Base
+from app.models.user import User
+from app.models.user_follow import UserFollow
+from app.services.follow_graph import FollowGraph, FollowGraphCache
+
+
+@pytest.fixture()
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'graph.db'}")
+    Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session = sessionmaker(bind=engine)()
+    session.info["statements"] = statements
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _users(db, count: int) -> list[int]:
+    users = [
+        User(email=f"graph{i}@example.com", username=f"graph{i}", hashed_password="x")
+        for i in range(count)
+    ]
+    db.add_all(users)
+    db.commit()
+    return [user.id for user in users]
+
+
+def test_follow_checks_and_counts_are_served_from_the_cache(db):
+    viewer_id, *others = _users(db, 5)
+    for user_id in others[:3]:
+        crud_follow.create_follow(db, follower_id=viewer_id, following_id=user_id)
+    crud_follow.create_follow(db, follower_id=others[0], following_id=viewer_id)
+
+    assert crud_follow.get_follow_counts(db, viewer_id) == (1, 3)
+    statements = db.info["statements"]
+    statements.clear()
+    assert crud_follow.get_following_among(db, viewer_id, others) == set(others[:3])
+    assert crud_follow.is_following(db, viewer_id, others[0])
+    assert not crud_follow.is_following(db, viewer_id, others[3])
+    assert not crud_follow.is_blocked_between(db, viewer_id, others[3])
+    assert statements == []
+
+    # Every write path drops both users' entries.
+    crud_follow.delete_follow(db, follower_id=viewer_id, following_id=others[0])
+    assert crud_follow.get_follow_counts(db, viewer_id) == (1, 2)
+    assert crud_follow.get_follow_counts(db, others[0]) == (0, 1)
+
+    crud_follow.remove_follower(db, user_id=viewer_id, follower_id=others[0])
+    assert crud_follow.get_follow_counts(db, viewer_id) == (0, 2)
+
+    crud_follow.create_block(db, blocker_id=others[1], blocked_id=viewer_id)
+    assert crud_follow.is_blocked_between(db, viewer_id, others[1])
+    assert crud_follow.is_blocked_between(db, others[1], viewer_id)
+    assert crud_follow.get_following_user_ids(db, viewer_id) == [others[2]]
+
+    crud_follow.delete_block(db, blocker_id=others[1], blocked_id=viewer_id)
+    assert not crud_follow.is_blocked_between(db, viewer_id, others[1])
+
+    rows, total = crud_follow.get_followings(db, user_id=viewer_id)
+    assert (total, [user.id for user, _follow in rows]) == (1, [others[2]])
+
+
+def test_load_racing_an_invalidation_is_not_cached():
+    cache = FollowGraphCache(enabled=True, backend="memory", ttl_seconds=60, l1_ttl_seconds=60, max_items=10)
+    stale = FollowGraph(following=frozenset({2}), blocked=frozenset(), followers_count=0)
+    fresh = FollowGraph(following=frozenset(), blocked=frozenset(), followers_count=0)
+
+    def load_then_unfollow(user_id: int) -> FollowGraph:
+        # The unfollow commits while this load is still reading the old rows.
+        cache.invalidate(user_id)
+        return stale
+
+    assert cache.get(1, load_then_unfollow) is stale
+    assert cache.get(1, lambda user_id: fresh) is fresh
+    assert cache.get(1, lambda user_id: stale) is fresh
+    assert cache.stats()["hits_l1"] == 1
+
+
+def test_raw_rows_show_up_after_invalidation(db):
+    first_id, second_id = _users(db, 2)
+    assert crud_follow.get_follow_counts(db, second_id) == (0, 0)
+    db.add(UserFollow(follower_id=first_id, following_id=second_id))
+    db.commit()
+    assert crud_follow.get_follow_counts(db, second_id) == (0, 0)
+
+    crud_follow.follow_graph_cache.invalidate(first_id, second_id)
+    assert crud_follow.get_follow_counts(db, second_id) == (1, 0)
+    assert crud_follow.is_following(db, first_id, second_id)
+
+
+class _VersionedRedis:
+    """Stands in for the L2: MGET sees version 3, and the compare-and-set store finds 4."""
+
+    def __init__(self):
+        self.store_calls = []
+
+    def mget(self, *keys):
+        return [None, b"3"]
+
+    def store_script(self, keys, args):
+        self.store_calls.append((keys, args))
+        return 0
+
+
+def test_store_refused_by_a_newer_shared_version_is_dropped_everywhere():
+    cache = FollowGraphCache(enabled=True, backend="redis", ttl_seconds=60, l1_ttl_seconds=5, max_items=10)
+    client = _VersionedRedis()
+    cache._graphs._get_redis = lambda: client
+    cache._graphs._store_script = client.store_script
+    graph = FollowGraph(following=frozenset({2}), blocked=frozenset(), followers_count=0)
+
+    assert cache.get(1, lambda user_id: graph) is graph
+
+    ((keys, args),) = client.store_calls
+    assert keys == ["follow-graph:1", "follow-graph:version:1"]
+    assert args[0] == b"3"
+    stats = cache.stats()
+    assert (stats["graphs"], stats["stale_stores"]) == (0, 1)
+
+
+def test_memory_backend_keeps_graphs_only_for_the_l1_ttl(monkeypatch):
+    cache = FollowGraphCache(enabled=True, backend="memory", ttl_seconds=300, l1_ttl_seconds=10, max_items=10)
+    now = [1000.0]
+    monkeypatch.setattr("app.services.tiered_cache.time.time", lambda: now[0])
+    loads = []
+
+    def load(user_id: int) -> FollowGraph:
+        loads.append(user_id)
+        return FollowGraph(following=frozenset(), blocked=frozenset(), followers_count=len(loads))
+
+    cache.get(1, load)
+    now[0] += 9
+    cache.get(1, load)
+    # Another worker's invalidation never reaches this one, so the L1 TTL, not the
+    # shared TTL, bounds how long it can keep serving the old graph.
+    now[0] += 2
+    assert cache.get(1, load).followers_count == 2
+    assert loads == [1, 1]
+
+
+def test_invalidated_generations_stay_bounded_and_still_refuse_stale_loads():
+    cache = FollowGraphCache(enabled=True, backend="memory", ttl_seconds=60, l1_ttl_seconds=60, max_items=3)
+    tiered = cache._graphs
+    graph = FollowGraph(following=frozenset(), blocked=frozenset(), followers_count=0)
+
+    _value, stamp = tiered.lookup(1)
+    tiered.invalidate(1)
+    # Key 1's generation is evicted long before its load finishes.
+    tiered.invalidate(*range(2, 100))
+    assert len(tiered._generations) == 3
+
+    tiered.store(1, graph, stamp)
+    assert tiered.lookup(1)[0] is None
+
+    _value, stamp = tiered.lookup(1)
+    tiered.store(1, graph, stamp)
+    assert tiered.lookup(1)[0] is graph
@@ -0,0 +1,200 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from app.crud import community as crud_community
+from app.db.base import Base, engine
+from app.db.session import SessionLocal
+from app.models.category import Category
+from app.models.post import Post
+from app.models.user import User
+from app.services import periodic_job
+from app.services.hot_score import COMMENT_WEIGHT, LIKE_WEIGHT, HotScoreBoard
+
+
+def _reset_db() -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def _seed() -> dict:
+    _reset_db()
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        user = User(email="hot@example.com", username="hot", hashed_password="x")
+        free = Category(name="자유", slug="free")
+        qna = Category(name="질문", slug="qna")
+        db.add_all([user, free, qna])
+        db.flush()
+
+        def make(title, category, age, likes=0, comments=0, views=0):
+            return Post(
+                title=title,
+                content="c",
+                user_id=user.id,
+                category_id=category.id,
+                created_at=now - age,
+                likes_count=likes,
+                comment_count=comments,
+                views=views,
+            )
+
+        posts = {
+            "fresh": make("fresh", free, timedelta(hours=1), likes=2),
+            "fresh_qna": make("fresh_qna", qna, timedelta(hours=2), likes=1, comments=1),
+            "week": make("week", free, timedelta(days=3), likes=10),
+            "month": make("month", qna, timedelta(days=20), likes=50),
+            "old": make("old", free, timedelta(days=60), likes=100),
+        }
+        db.add_all(posts.values())
+        db.commit()
+        return {name: post.id for name, post in posts.items()}
+
+
+def _new_board() -> HotScoreBoard:
+    return HotScoreBoard(backend="memory", half_life_hours=0, rebuild_interval_seconds=300)
+
+
+def test_board_is_not_ready_until_rebuilt():
+    board = _new_board()
+    assert board.top("24h", 5) is None
+
+
+def test_rebuild_matches_sql_ranking_per_window():
+    ids = _seed()
+    board = _new_board()
+    with SessionLocal() as db:
+        assert board.rebuild(db) == 4  # "old" is outside every window
+
+        for window in ("24h", "7d", "30d"):
+            expected = [
+                row["post"].id for row in crud_community.get_hot_posts(db, window=window, limit=10)
+            ]
+            assert [post_id for post_id, _ in board.top(window, 10)] == expected
+
+    assert [post_id for post_id, _ in board.top("24h", 10)] == [ids["fresh"], ids["fresh_qna"]]
+
+
+def test_category_partition():
+    ids = _seed()
+    board = _new_board()
+    with SessionLocal() as db:
+        board.rebuild(db)
+        qna_id = db.query(Category.id).filter(Category.slug == "qna").scalar()
+
+    assert [post_id for post_id, _ in board.top("30d", 10, category_id=qna_id)] == [
+        ids["month"],
+        ids["fresh_qna"],
+    ]
+
+
+def test_bump_reorders_and_ignores_untracked_posts():
+    ids = _seed()
+    board = _new_board()
+    with SessionLocal() as db:
+        board.rebuild(db)
+
+    board.bump(ids["fresh_qna"], LIKE_WEIGHT)
+    board.bump(ids["fresh_qna"], COMMENT_WEIGHT)
+    board.bump(ids["old"], LIKE_WEIGHT)
+
+    ranked = board.top("24h", 10)
+    assert [post_id for post_id, _ in ranked] == [ids["fresh_qna"], ids["fresh"]]
+    assert ranked[0][1] == 1 * 3 + 1 * 2 + LIKE_WEIGHT + COMMENT_WEIGHT
+    assert ids["old"] not in [post_id for post_id, _ in board.top("30d", 10)]
+
+
+def test_track_and_untrack_post():
+    ids = _seed()
+    board = _new_board()
+    with SessionLocal() as db:
+        board.rebuild(db)
+        user_id = db.query(User.id).scalar()
+        category_id = db.query(Category.id).filter(Category.slug == "free").scalar()
+        new_post = Post(title="new", content="c", user_id=user_id, category_id=category_id)
+        db.add(new_post)
+        db.commit()
+        db.refresh(new_post)
+
+        board.track_post(new_post)
+        board.bump(new_post.id, LIKE_WEIGHT * 5)
+        assert board.top("24h", 1)[0][0] == new_post.id
+
+        board.untrack_post(new_post.id)
+        assert new_post.id not in [post_id for post_id, _ in board.top("24h", 10)]
+
+    board.untrack_post(ids["fresh"])
+    assert [post_id for post_id, _ in board.top("24h", 10)] == [ids["fresh_qna"]]
+
+
+def test_decay_prefers_newer_posts_with_equal_engagement():
+    _reset_db()
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        user = User(email="decay@example.com", username="decay", hashed_password="x")
+        category = Category(name="자유", slug="free")
+        db.add_all([user, category])
+        db.flush()
+        older = Post(
+            title="older", content="c", user_id=user.id, category_id=category.id,
+            created_at=now - timedelta(hours=20), likes_count=4,
+        )
+        newer = Post(
+            title="newer", content="c", user_id=user.id, category_id=category.id,
+            created_at=now - timedelta(hours=2), likes_count=4,
+        )
+        db.add_all([older, newer])
+        db.commit()
+        older_id, newer_id = older.id, newer.id
+
+        board = HotScoreBoard(backend="memory", half_life_hours=6, rebuild_interval_seconds=300)
+        board.rebuild(db)
+
+    ranked = board.top("24h", 10)
+    assert [post_id for post_id, _ in ranked] == [newer_id, older_id]
+    # Displayed scores are decayed to "now": 12 * 2^(-2/6) for the newer post.
+    assert abs(ranked[0][1] - 12 * 2 ** (-2 / 6)) < 0.01
+
+
+def test_short_half_life_does_not_overflow_the_30d_window():
+    ids = _seed()
+    # 30 days is ~1440 half-lives here: 2^1440 does not fit in a float.
+    board = HotScoreBoard(backend="memory", half_life_hours=0.5, rebuild_interval_seconds=300)
+    with SessionLocal() as db:
+        assert board.rebuild(db) == 4
+
+    ranked = board.top("30d", 10)
+    assert [post_id for post_id, _ in ranked][:3] == [ids["fresh"], ids["fresh_qna"], ids["week"]]
+    board.bump(ids["fresh"], LIKE_WEIGHT)
+    assert board.top("30d", 1)[0][0] == ids["fresh"]
+
+
+def test_shared_board_is_rebuilt_by_one_worker_and_memory_boards_by_each(monkeypatch):
+    @contextmanager
+    def held_elsewhere(_session_factory, _name):
+        yield False
+
+    monkeypatch.setattr(periodic_job, "job_lock", held_elsewhere)
+    _seed()
+
+    shared = HotScoreBoard(backend="redis", half_life_hours=0, rebuild_interval_seconds=300)
+    assert shared.run_with_session(SessionLocal) is None
+    assert shared.stats()["skipped_runs"] == 1
+
+    local = _new_board()
+    assert local.run_with_session(SessionLocal) == 4
+    assert local.top("24h", 1) is not None
+
+
+def test_async_reads_of_the_redis_board_leave_the_event_loop_thread(monkeypatch):
+    board = HotScoreBoard(backend="redis", half_life_hours=0, rebuild_interval_seconds=300)
+    threads = []
+
+    def top(window, limit, category_id=None):
+        threads.append(threading.current_thread())
+        return [(1, 1.0)]
+
+    monkeypatch.setattr(board, "top", top)
+    assert asyncio.run(board.atop("24h", 5)) == [(1, 1.0)]
+    assert threads and threads[0] is not threading.main_thread()
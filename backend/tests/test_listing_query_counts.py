@@ -0,0 +1,140 @@
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.session import get_async_db, get_async_read_db, get_db, get_read_db
+from app.main import app
+from app.models.category import Category
+from app.models.post import Post
+from app.models.recruit_meta import RecruitMeta
+from app.models.user import User
+from app.services.response_cache import response_cache
+
+# Statement budgets per listing page. They must not depend on how many posts, authors
+# or categories the page holds: a lazy load per row blows straight through them.
+LISTING_QUERY_BUDGETS = {
+    # count, pinned, pinned recruit meta, page, page recruit meta
+    "/api/v1/posts/?page_size=20": 5,
+    "/api/v1/posts/?page_size=20&pagination=cursor": 4,
+    "/api/v1/posts/?page_size=20&post_type=RECRUIT&sort=deadline": 3,
+    "/api/v1/community/pinned?limit=10": 2,
+    "/api/v1/community/hot?window=24h&limit=20": 2,
+}
+
+
+@pytest.fixture()
+def counted_client(tmp_path):
+    # Listings run on the async read session; count what both engines send to SQLite.
+    db_path = tmp_path / "listing.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    SyncSession = sessionmaker(bind=sync_engine, autoflush=False)
+    AsyncSession = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    Base.metadata.create_all(bind=sync_engine)
+
+    statements = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    for engine in (sync_engine, async_engine.sync_engine):
+        event.listen(engine, "before_cursor_execute", record)
+
+    @contextmanager
+    def count_queries():
+        statements.clear()
+        yield statements
+
+    def override_get_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    overrides = {
+        get_db: override_get_db,
+        get_read_db: override_get_db,
+        get_async_db: override_get_async_db,
+        get_async_read_db: override_get_async_db,
+    }
+    app.dependency_overrides.update(overrides)
+    try:
+        with TestClient(app) as client:
+            yield client, SyncSession, count_queries
+    finally:
+        for dependency in overrides:
+            app.dependency_overrides.pop(dependency, None)
+        asyncio.run(async_engine.dispose())
+        sync_engine.dispose()
+
+
+def _seed_posts(db, start: int, count: int) -> None:
+    # One author and category per post: the worst case for per-row lazy loads.
+    now = datetime.now(timezone.utc)
+    for index in range(start, start + count):
+        author = User(email=f"list{index}@example.com", username=f"list{index}", hashed_password="x")
+        category = Category(name=f"게시판{index}", slug=f"board-{index}")
+        db.add_all([author, category])
+        db.flush()
+        is_recruit = index % 2 == 0
+        post = Post(
+            title=f"post {index}",
+            content="body",
+            user_id=author.id,
+            category_id=category.id,
+            post_type="RECRUIT" if is_recruit else "NORMAL",
+            is_pinned=index % 5 == 0,
+            likes_count=index,
+            created_at=now - timedelta(minutes=index),
+        )
+        db.add(post)
+        db.flush()
+        if is_recruit:
+            db.add(
+                RecruitMeta(
+                    post_id=post.id,
+                    recruit_type="STUDY",
+                    schedule_text="weekly",
+                    headcount_max=4,
+                    deadline_at=now + timedelta(days=index + 1),
+                )
+            )
+    db.commit()
+
+
+def _measure(client, count_queries, url: str) -> tuple[int, int]:
+    response_cache.clear()
+    with count_queries() as statements:
+        response = client.get(url)
+    assert response.status_code == 200, url
+    body = response.json()
+    rows = body["posts"] if isinstance(body, dict) else body
+    assert all(row["author_username"] and row["category_slug"] for row in rows), url
+    return len(statements), len(rows)
+
+
+def test_listing_endpoints_stay_within_a_fixed_query_budget(counted_client):
+    client, SyncSession, count_queries = counted_client
+    with SyncSession() as db:
+        _seed_posts(db, 0, 3)
+    small = {url: _measure(client, count_queries, url) for url in LISTING_QUERY_BUDGETS}
+
+    with SyncSession() as db:
+        _seed_posts(db, 3, 12)
+    for url, budget in LISTING_QUERY_BUDGETS.items():
+        queries, rows = _measure(client, count_queries, url)
+        assert rows > small[url][1], url
+        assert queries <= budget, f"{url} ran {queries} statements (budget {budget})"
+        assert queries == small[url][0], url
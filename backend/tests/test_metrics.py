@@ -0,0 +1,19 @@
+from app.core.config import settings
+
+
+def test_metrics_exports_route_level_request_counters(client, monkeypatch):
+    assert client.get("/health").status_code == 200
+    assert client.get("/no/such/page").status_code == 404
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in body
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in body
+    assert 'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/health",status="200"}' in body
+    assert "mcp_playground_connections" in body
+
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+    assert client.get("/metrics").status_code == 404
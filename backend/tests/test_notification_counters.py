@@ -0,0 +1,167 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import notification as crud_notification
+from app.crud import post as crud_post
+from app.db.base import Base
+from app.models.category import Category
+from app.models.notification import Notification
+from app.models.post import Post
+from app.models.user import User
+from app.models.user_notification_stats import UserNotificationStats
+from app.schemas.notification import NotificationCreate
+
+
+@pytest.fixture()
+def file_db(tmp_path):
+    # Threads need one shared database, so use a file instead of the in-memory default.
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'counters.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield sessionmaker(bind=engine)
+    finally:
+        engine.dispose()
+
+
+def _create_users(db, count: int) -> list[int]:
+    users = [
+        User(email=f"notify{i}@example.com", username=f"notify{i}", hashed_password="x")
+        for i in range(count)
+    ]
+    db.add_all(users)
+    db.commit()
+    return [user.id for user in users]
+
+
+def _notify(db, user_id: int, **kwargs) -> Notification:
+    return crud_notification.create_notification(
+        db,
+        NotificationCreate(user_id=user_id, type="like", content="someone liked your post.", **kwargs),
+    )
+
+
+def _counters(db, user_id: int) -> tuple[int, int]:
+    return (
+        crud_notification.get_user_notifications_count(db, user_id),
+        crud_notification.get_unread_notifications_count(db, user_id),
+    )
+
+
+def _actual(db, user_id: int) -> tuple[int, int]:
+    stats = crud_notification.get_notification_stats(db, user_id)
+    notifications = db.query(Notification).filter(Notification.user_id == user_id).all()
+    unread = [item for item in notifications if not crud_notification.is_notification_read(item, stats)]
+    return len(notifications), len(unread)
+
+
+def test_counters_follow_create_read_mark_all_and_delete(file_db):
+    with file_db() as db:
+        (user_id,) = _create_users(db, 1)
+        assert _counters(db, user_id) == (0, 0)
+
+        first, second, third = (_notify(db, user_id) for _ in range(3))
+        assert _counters(db, user_id) == (3, 3)
+
+        crud_notification.mark_notification_as_read(db, first.id)
+        crud_notification.mark_notification_as_read(db, first.id)
+        assert _counters(db, user_id) == (3, 2)
+
+        crud_notification.mark_all_notifications_as_read(db, user_id)
+        assert _counters(db, user_id) == (3, 0)
+        # mark-all only moves the watermark; the rows themselves are untouched.
+        assert db.query(Notification).filter(Notification.is_read == False).count() == 2
+
+        fourth = _notify(db, user_id)
+        assert _counters(db, user_id) == (4, 1)
+
+        crud_notification.delete_notification(db, second.id)
+        assert _counters(db, user_id) == (3, 1)
+        crud_notification.delete_notification(db, fourth.id)
+        assert _counters(db, user_id) == (2, 0)
+        assert _counters(db, user_id) == _actual(db, user_id)
+
+
+def test_counters_stay_exact_under_concurrent_storms(file_db):
+    with file_db() as db:
+        recipient_id, other_id = _create_users(db, 2)
+        seeded_ids = [_notify(db, recipient_id).id for _ in range(10)]
+
+    errors = []
+
+    def run(action):
+        db = file_db()
+        try:
+            action(db)
+        except Exception as exc:  # surfaced by the assertion below
+            errors.append(exc)
+        finally:
+            db.close()
+
+    actions = []
+    for _ in range(40):
+        actions.append(lambda db: _notify(db, recipient_id))
+        actions.append(lambda db: _notify(db, other_id))
+    for notification_id in seeded_ids:
+        # Every seeded notification is marked read twice in parallel; only one may count.
+        actions.append(lambda db, nid=notification_id: crud_notification.mark_notification_as_read(db, nid))
+        actions.append(lambda db, nid=notification_id: crud_notification.mark_notification_as_read(db, nid))
+    actions.append(lambda db: crud_notification.mark_all_notifications_as_read(db, other_id))
+    actions.append(lambda db: crud_notification.delete_notification(db, seeded_ids[0]))
+
+    threads = [threading.Thread(target=run, args=(action,)) for action in actions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+    with file_db() as db:
+        assert _counters(db, recipient_id) == _actual(db, recipient_id) == (49, 40)
+        assert _counters(db, other_id) == _actual(db, other_id)
+        assert _counters(db, other_id)[0] == 40
+        assert crud_notification.reconcile_notification_counters(db) == 0
+
+
+def test_reconcile_repairs_drift_from_direct_writes(file_db):
+    with file_db() as db:
+        first_id, second_id = _create_users(db, 2)
+        _notify(db, first_id)
+        db.add_all([Notification(user_id=second_id, type="like", content="raw") for _ in range(2)])
+        db.query(UserNotificationStats).filter(
+            UserNotificationStats.user_id == first_id
+        ).update({UserNotificationStats.unread_count: 9})
+        db.commit()
+        assert _counters(db, first_id) == (1, 9)
+        assert _counters(db, second_id) == (0, 0)
+
+        assert crud_notification.reconcile_notification_counters(db) == 2
+        assert _counters(db, first_id) == (1, 1)
+        assert _counters(db, second_id) == (2, 2)
+        assert crud_notification.reconcile_notification_counters(db) == 0
+
+
+def test_deleting_a_post_takes_its_notifications_off_the_counters(file_db):
+    with file_db() as db:
+        author_id, reader_id = _create_users(db, 2)
+        category = Category(name="자유", slug="free")
+        db.add(category)
+        db.flush()
+        post = Post(title="noisy", content="body", user_id=author_id, category_id=category.id)
+        db.add(post)
+        db.commit()
+
+        _notify(db, author_id, related_post_id=post.id)
+        _notify(db, author_id, related_post_id=post.id)
+        _notify(db, author_id)
+        _notify(db, reader_id, related_post_id=post.id)
+
+        assert crud_post.delete_post(db, post.id) is True
+        assert _counters(db, author_id) == (1, 1)
+        assert _counters(db, reader_id) == (0, 0)
+        assert crud_notification.reconcile_notification_counters(db) == 0
@@ -0,0 +1,145 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.crud import comment as crud_comment
+from app.crud import like as crud_like
+from app.crud import notification as crud_notification
+from app.db.base import Base
+from app.models.category import Category
+from app.models.notification import Notification
+from app.models.notification_outbox import NotificationOutbox
+from app.models.post import Post
+from app.models.user import User
+from app.schemas.comment import CommentCreate
+from app.schemas.notification import NotificationEvent
+from app.services.notification_outbox import NotificationOutboxWorker
+
+
+@pytest.fixture()
+def file_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_OUTBOX_COALESCE_WINDOW_SECONDS", 0)
+    engine = create_engine(f"sqlite:///{tmp_path / 'outbox.db'}")
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield sessionmaker(bind=engine)
+    finally:
+        engine.dispose()
+
+
+def _new_worker(batch_size: int = 100, max_attempts: int = 3) -> NotificationOutboxWorker:
+    return NotificationOutboxWorker(
+        batch_size=batch_size,
+        poll_interval_seconds=1,
+        max_attempts=max_attempts,
+        retry_base_seconds=0,
+    )
+
+
+def _setup(db, fans: int = 0) -> tuple[int, int, list[User]]:
+    users = [
+        User(email=f"outbox{i}@example.com", username=f"outbox{i}", hashed_password="x")
+        for i in range(fans + 1)
+    ]
+    category = Category(name="자유", slug="free")
+    db.add_all([*users, category])
+    db.flush()
+    post = Post(title="popular", content="body", user_id=users[0].id, category_id=category.id)
+    db.add(post)
+    db.commit()
+    return users[0].id, post.id, users[1:]
+
+
+def _like_event(author_id: int, post_id: int, fan: User) -> NotificationEvent:
+    return NotificationEvent(
+        user_id=author_id,
+        type="like",
+        content=f"{fan.username}님이 회원님의 게시글을 좋아합니다.",
+        related_post_id=post_id,
+        actor_name=fan.username,
+    )
+
+
+def test_like_burst_is_queued_with_the_like_and_coalesced(file_db):
+    worker = _new_worker()
+    with file_db() as db:
+        author_id, post_id, fans = _setup(db, fans=5)
+        for fan in fans:
+            crud_like.create_like(db, post_id, fan.id, notification=_like_event(author_id, post_id, fan))
+        assert db.query(NotificationOutbox).count() == 5
+        assert db.query(Notification).count() == 0
+
+        # A like that fails its own transaction must not leave an event behind.
+        with pytest.raises(IntegrityError):
+            crud_like.create_like(db, post_id, fans[0].id, notification=_like_event(author_id, post_id, fans[0]))
+        db.rollback()
+        assert db.query(NotificationOutbox).count() == 5
+
+        assert worker.process_batch(db) == 5
+        notifications = db.query(Notification).all()
+        assert [item.content for item in notifications] == ["outbox5님 외 4명이 회원님의 게시글을 좋아합니다."]
+        assert crud_notification.get_unread_notifications_count(db, author_id) == 1
+        assert db.query(NotificationOutbox).count() == 0
+        assert worker.stats()["coalesced"] == 4
+
+
+def test_comment_events_point_at_their_comment_and_are_not_merged(file_db):
+    worker = _new_worker()
+    with file_db() as db:
+        author_id, post_id, fans = _setup(db, fans=2)
+        comment_ids = []
+        for fan in fans:
+            comment = crud_comment.create_comment(
+                db,
+                CommentCreate(content="hi", post_id=post_id),
+                fan.id,
+                notification=NotificationEvent(
+                    user_id=author_id,
+                    type="comment",
+                    content=f"{fan.username}님이 댓글을 남겼습니다: hi",
+                    related_post_id=post_id,
+                    actor_name=fan.username,
+                ),
+            )
+            comment_ids.append(comment.id)
+
+        assert worker.process_batch(db) == 2
+        related = sorted(item.related_comment_id for item in db.query(Notification).all())
+        assert related == comment_ids
+        assert crud_notification.get_user_notifications_count(db, author_id) == 2
+
+
+def test_failing_event_is_retried_without_blocking_the_batch(file_db, monkeypatch):
+    worker = _new_worker(max_attempts=2)
+    with file_db() as db:
+        author_id, post_id, fans = _setup(db, fans=1)
+        for content in ("good", "poison"):
+            crud_notification.enqueue_notification(
+                db,
+                NotificationEvent(user_id=author_id, type="mention", content=content),
+            )
+        db.commit()
+
+        create_notifications = crud_notification.create_notifications
+
+        def flaky_create(db, rows):
+            if any(row["content"] == "poison" for row in rows):
+                raise RuntimeError("boom")
+            return create_notifications(db, rows)
+
+        monkeypatch.setattr(crud_notification, "create_notifications", flaky_create)
+
+        assert worker.process_batch(db) == 2
+        assert [item.content for item in db.query(Notification).all()] == ["good"]
+        poison = db.query(NotificationOutbox).one()
+        assert (poison.attempts, "boom" in poison.last_error) == (1, True)
+
+        # Retried (zero backoff here) until max_attempts, then left behind as dead.
+        assert worker.process_batch(db) == 1
+        assert worker.process_batch(db) == 0
+        worker._refresh_depth(db)
+        stats = worker.stats()
+        assert (stats["pending"], stats["dead"]) == (0, 1)
+        assert (stats["failed_batches"], stats["failed_events"]) == (2, 2)
@@ -0,0 +1,185 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.deps import get_current_user
+from app.api.v1 import notifications as notifications_api
+from app.core.security import create_access_token
+from app.crud import notification as crud_notification
+from app.db.base import Base
+from app.main import app
+from app.models.user import User
+from app.schemas.notification import NotificationCreate
+from app.services.notification_hub import NotificationHub, notification_hub
+
+
+def _new_hub(queue_size: int = 10, max_connections: int = 100) -> NotificationHub:
+    return NotificationHub(
+        backend="memory",
+        queue_size=queue_size,
+        heartbeat_seconds=0.05,
+        max_connections=max_connections,
+        ticket_ttl_seconds=30,
+    )
+
+
+def test_hub_delivers_events_published_from_worker_threads():
+    hub = _new_hub()
+
+    async def run():
+        hub.start()
+        first = hub.connect(1)
+        second = hub.connect(1)
+        other = hub.connect(2)
+        threading.Thread(target=hub.publish, args=(1, {"type": "unread_count", "unread_count": 3})).start()
+        received = [await first.next_event(1.0), await second.next_event(1.0)]
+        silent = await other.next_event(0.05)
+        return received, silent
+
+    received, silent = asyncio.run(run())
+    assert received == [{"type": "unread_count", "unread_count": 3}] * 2
+    assert silent is None
+    assert hub.stats()["delivered"] == 2
+
+
+def test_slow_consumer_backlog_collapses_to_resync():
+    hub = _new_hub(queue_size=3)
+
+    async def run():
+        hub.start()
+        subscription = hub.connect(1)
+        for count in range(5):
+            hub.publish(1, {"type": "unread_count", "unread_count": count})
+        events = []
+        while not subscription.queue.empty():
+            events.append(subscription.queue.get_nowait())
+        return events
+
+    events = asyncio.run(run())
+    assert events[0] == {"type": "resync"}
+    assert events[-1] == {"type": "unread_count", "unread_count": 4}
+    assert len(events) <= 3
+    assert hub.stats()["overflows"] == 1
+
+
+def test_hub_rejects_connections_over_the_limit():
+    hub = _new_hub(max_connections=1)
+    first = hub.connect(1)
+    assert first is not None
+    assert hub.connect(2) is None
+    hub.disconnect(first)
+    assert hub.connect(2) is not None
+    assert hub.stats()["rejected"] == 1
+
+
+@pytest.fixture()
+def file_db(tmp_path, monkeypatch):
+    db_path = tmp_path / "push.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    monkeypatch.setattr(
+        notifications_api,
+        "AsyncSessionLocal",
+        async_sessionmaker(bind=async_engine, expire_on_commit=False),
+    )
+    try:
+        yield sessionmaker(bind=sync_engine)
+    finally:
+        asyncio.run(async_engine.dispose())
+        sync_engine.dispose()
+
+
+def test_websocket_receives_notifications_created_through_crud(file_db):
+    with file_db() as db:
+        user = User(email="push@example.com", username="push", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    ticket = asyncio.run(notification_hub.issue_ticket(user_id))
+
+    with TestClient(app) as client:
+        with client.websocket_connect(f"/api/v1/notifications/ws?ticket={ticket}") as websocket:
+            assert websocket.receive_json() == {"type": "unread_count", "unread_count": 0}
+
+            with file_db() as db:
+                crud_notification.create_notification(
+                    db,
+                    NotificationCreate(user_id=user_id, type="like", content="alice liked your post."),
+                )
+
+            event = websocket.receive_json()
+            while event["type"] == "ping":
+                event = websocket.receive_json()
+            assert event["type"] == "notification"
+            assert event["unread_count"] == 1
+            assert event["notification"]["content"] == "alice님이 회원님의 게시글을 좋아합니다."
+
+
+def test_websocket_rejects_missing_ticket_and_access_tokens_in_the_url(file_db):
+    token = create_access_token({"sub": "1"})
+    with TestClient(app) as client:
+        for url in ("/api/v1/notifications/ws", f"/api/v1/notifications/ws?ticket={token}"):
+            with pytest.raises(WebSocketDisconnect) as disconnect:
+                with client.websocket_connect(url) as websocket:
+                    websocket.receive_json()
+            assert disconnect.value.code == 1008
+
+
+def test_stream_tickets_are_single_use_and_expire(monkeypatch):
+    hub = _new_hub()
+    clock = {"now": 100.0}
+    monkeypatch.setattr("app.services.notification_hub.time.monotonic", lambda: clock["now"])
+
+    async def run():
+        ticket = await hub.issue_ticket(7)
+        first, second = await hub.redeem_ticket(ticket), await hub.redeem_ticket(ticket)
+        stale = await hub.issue_ticket(7)
+        clock["now"] += 31
+        return first, second, await hub.redeem_ticket(stale), await hub.redeem_ticket(None)
+
+    assert asyncio.run(run()) == (7, None, None, None)
+
+
+def test_stream_ticket_endpoint_requires_a_signed_in_user():
+    with TestClient(app) as client:
+        assert client.post("/api/v1/notifications/stream-ticket").status_code == 403
+
+        app.dependency_overrides[get_current_user] = lambda: User(id=9, username="push")
+        try:
+            response = client.post("/api/v1/notifications/stream-ticket")
+        finally:
+            app.dependency_overrides.pop(get_current_user, None)
+
+    assert response.status_code == 200
+    assert response.json()["expires_in"] == 30
+    assert asyncio.run(notification_hub.redeem_ticket(response.json()["ticket"])) == 9
+
+
+def test_sse_stream_starts_with_unread_count_then_heartbeats(file_db, monkeypatch):
+    hub = _new_hub()
+    monkeypatch.setattr(notifications_api, "notification_hub", hub)
+
+    async def run():
+        hub.start()
+        subscription = hub.connect(42)
+        stream = notifications_api._stream_events(subscription)
+        chunks = [await stream.__anext__() for _ in range(3)]
+        hub.publish(42, {"type": "unread_count", "unread_count": 5})
+        chunks.append(await stream.__anext__())
+        await stream.aclose()
+        return chunks
+
+    retry, initial, heartbeat, pushed = asyncio.run(run())
+    assert retry.startswith("retry:")
+    assert initial.startswith("event: unread_count\n")
+    assert '"unread_count":0' in initial
+    assert heartbeat == ": ping\n\n"
+    assert '"unread_count":5' in pushed
+    assert hub.stats()["connections"] == 0
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import notification as crud_notification
+from app.db.base import Base
+from app.models.notification import Notification
+from app.models.notification_archive import NotificationArchive
+from app.models.user import User
+
+
+@pytest.fixture()
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'retention.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _user(db) -> int:
+    user = User(email="inbox@example.com", username="inbox", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def _seed(db, user_id: int, ages_in_days: list[int]) -> list[int]:
+    """One notification per age (oldest first), with explicit timestamps, via the counted path."""
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "user_id": user_id,
+            "type": "like",
+            "content": f"{age} days ago",
+            "created_at": now - timedelta(days=age),
+        }
+        for age in ages_in_days
+    ]
+    notifications = crud_notification.create_notifications(db, rows)
+    db.commit()
+    return [item.id for item in notifications]
+
+
+def _counters(db, user_id: int) -> tuple[int, int]:
+    return (
+        crud_notification.get_user_notifications_count(db, user_id),
+        crud_notification.get_unread_notifications_count(db, user_id),
+    )
+
+
+def test_keyset_pages_match_offset_order(db):
+    user_id = _user(db)
+    # Several rows share a timestamp, so the id tiebreak has to hold across pages.
+    _seed(db, user_id, [5, 4, 4, 4, 3, 2, 2, 1, 0])
+
+    expected = [item.id for item in crud_notification.get_user_notifications(db, user_id, limit=100)]
+    seen, cursor = [], None
+    while True:
+        page, cursor = crud_notification.get_user_notifications_by_cursor(db, user_id, cursor, limit=2)
+        seen.extend(item.id for item in page)
+        if cursor is None:
+            break
+    assert seen == expected
+
+    with pytest.raises(ValueError):
+        crud_notification.get_user_notifications_by_cursor(db, user_id, "not-a-cursor")
+
+
+def test_archive_moves_only_expired_read_notifications(db):
+    user_id = _user(db)
+    # A mark-all watermark counts as read even though the row's own flag is untouched.
+    (old_watermarked,) = _seed(db, user_id, [100])
+    crud_notification.mark_all_notifications_as_read(db, user_id)
+    old_read, old_unread, recent_read = _seed(db, user_id, [100, 100, 1])
+    crud_notification.mark_notification_as_read(db, old_read)
+    crud_notification.mark_notification_as_read(db, recent_read)
+    assert _counters(db, user_id) == (4, 1)
+
+    archived = crud_notification.archive_notifications(db, retention_days=30, inbox_max_items=0)
+
+    assert archived == 2
+    assert sorted(item.id for item in db.query(NotificationArchive).all()) == [old_watermarked, old_read]
+    assert sorted(item.id for item in db.query(Notification).all()) == [old_unread, recent_read]
+    assert _counters(db, user_id) == (2, 1)
+    assert crud_notification.reconcile_notification_counters(db) == 0
+
+
+def test_archive_enforces_inbox_cap(db):
+    user_id = _user(db)
+    ids = _seed(db, user_id, [5, 4, 3, 2, 1])
+
+    archived = crud_notification.archive_notifications(db, retention_days=0, inbox_max_items=3)
+
+    assert archived == 2
+    assert sorted(item.id for item in db.query(NotificationArchive).all()) == ids[:2]
+    assert _counters(db, user_id) == (3, 3)
+    assert crud_notification.archive_notifications(db, retention_days=0, inbox_max_items=3) == 0
@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.services import periodic_job
+from app.services.notification_counters import notification_counter_reconciler
+from app.services.notification_retention import notification_archiver
+from app.services.periodic_job import PeriodicJob, advisory_lock_key
+from app.services.timeline import timeline_trimmer
+
+
+class _CountingJob(PeriodicJob):
+    name = "counting job"
+    singleton = True
+
+    def __init__(self):
+        super().__init__(interval_seconds=60)
+        self.runs = 0
+
+    def run(self, db) -> int:
+        self.runs += 1
+        return 3
+
+
+@pytest.fixture()
+def session_factory():
+    engine = create_engine("sqlite://")
+    try:
+        yield sessionmaker(bind=engine)
+    finally:
+        engine.dispose()
+
+
+def test_singleton_job_runs_without_a_cross_process_lock_off_postgres(session_factory):
+    job = _CountingJob()
+
+    assert job.run_with_session(session_factory) == 3
+    assert job.run_with_session(session_factory) == 3
+
+    assert job.runs == 2
+    assert job.total_processed == 6
+    assert job.stats()["skipped_runs"] == 0
+    assert job.stats()["last_run_at"] is not None
+
+
+def test_singleton_job_skips_the_pass_when_another_worker_holds_the_lock(session_factory, monkeypatch):
+    @contextmanager
+    def held_elsewhere(_session_factory, _name):
+        yield False
+
+    monkeypatch.setattr(periodic_job, "job_lock", held_elsewhere)
+    job = _CountingJob()
+
+    assert job.run_with_session(session_factory) is None
+    assert job.runs == 0
+    assert job.last_run_at is None
+    assert job.stats()["skipped_runs"] == 1
+
+
+def test_maintenance_jobs_are_singletons_with_distinct_lock_keys():
+    jobs = [notification_counter_reconciler, notification_archiver, timeline_trimmer]
+
+    assert all(job.singleton for job in jobs)
+    keys = {advisory_lock_key(job.name) for job in jobs}
+    assert len(keys) == len(jobs)
+    assert all(-(2 ** 63) <= key < 2 ** 63 for key in keys)
+    assert advisory_lock_key("timeline trimming") == advisory_lock_key(timeline_trimmer.name)
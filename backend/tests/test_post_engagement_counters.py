@@ -0,0 +1,104 @@
+from app.crud import bookmark as crud_bookmark
+from app.crud import comment as crud_comment
+from app.crud import like as crud_like
+from app.crud import post as crud_post
+from app.db.base import Base, engine
+from app.db.session import SessionLocal
+from app.models.category import Category
+from app.models.comment import Comment
+from app.models.like import Like
+from app.models.post import Post
+from app.models.user import User
+from app.schemas.comment import CommentCreate
+
+
+def _reset_db() -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def _create_post(db) -> tuple[Post, list[User]]:
+    users = [
+        User(email=f"counter{i}@example.com", username=f"counter{i}", hashed_password="x")
+        for i in range(3)
+    ]
+    category = Category(name="자유", slug="free")
+    db.add_all([*users, category])
+    db.flush()
+    post = Post(title="counted", content="body", user_id=users[0].id, category_id=category.id)
+    db.add(post)
+    db.commit()
+    return post, users
+
+
+def _counters(db, post_id: int) -> tuple[int, int, int]:
+    post = db.query(Post).filter(Post.id == post_id).one()
+    db.refresh(post)
+    return post.likes_count, post.comment_count, post.bookmark_count
+
+
+def test_counters_follow_like_comment_and_bookmark_writes():
+    _reset_db()
+    with SessionLocal() as db:
+        post, users = _create_post(db)
+        post_id = post.id
+
+        for user in users:
+            crud_like.create_like(db, post_id, user.id)
+        crud_bookmark.create_bookmark(db, post_id, users[1].id)
+        first = crud_comment.create_comment(db, CommentCreate(content="a", post_id=post_id), users[1].id)
+        crud_comment.create_comment(db, CommentCreate(content="b", post_id=post_id), users[2].id)
+        assert _counters(db, post_id) == (3, 2, 1)
+
+        crud_like.delete_like(db, post_id, users[0].id)
+        crud_bookmark.delete_bookmark(db, post_id, users[1].id)
+        crud_comment.delete_comment(db, first.id)
+        assert _counters(db, post_id) == (2, 1, 0)
+
+        # Deleting something that is already gone must not push a counter negative.
+        assert crud_bookmark.delete_bookmark(db, post_id, users[1].id) is False
+        assert _counters(db, post_id) == (2, 1, 0)
+
+
+def test_reconcile_repairs_drift_from_direct_writes():
+    _reset_db()
+    with SessionLocal() as db:
+        post, users = _create_post(db)
+        post_id = post.id
+        db.add_all([Like(post_id=post_id, user_id=user.id) for user in users])
+        db.add(Comment(post_id=post_id, user_id=users[0].id, content="raw"))
+        db.query(Post).filter(Post.id == post_id).update({Post.bookmark_count: 7})
+        db.commit()
+        assert _counters(db, post_id) == (0, 0, 7)
+
+        assert crud_post.reconcile_engagement_counters(db) == 1
+        assert _counters(db, post_id) == (3, 1, 0)
+        assert crud_post.reconcile_engagement_counters(db) == 0
+
+
+def test_racing_deletes_decrement_counters_once(monkeypatch):
+    _reset_db()
+    with SessionLocal() as db, SessionLocal() as other:
+        post, users = _create_post(db)
+        post_id = post.id
+        for user in users[:2]:
+            crud_like.create_like(db, post_id, user.id)
+        comment = crud_comment.create_comment(db, CommentCreate(content="a", post_id=post_id), users[1].id)
+        comment_id = comment.id
+        assert _counters(db, post_id) == (2, 1, 0)
+
+        assert crud_like.delete_like(other, post_id, users[0].id) is True
+        assert crud_like.delete_like(db, post_id, users[0].id) is False
+        assert _counters(db, post_id) == (1, 1, 0)
+
+        # The second request deletes the comment after the first already loaded it.
+        discard = crud_comment.discard_related_notifications
+
+        def delete_concurrently(session, **kwargs):
+            monkeypatch.setattr(crud_comment, "discard_related_notifications", discard)
+            assert crud_comment.delete_comment(other, comment_id) is True
+            discard(session, **kwargs)
+
+        monkeypatch.setattr(crud_comment, "discard_related_notifications", delete_concurrently)
+        assert crud_comment.delete_comment(db, comment_id) is False
+        assert _counters(db, post_id) == (1, 0, 0)
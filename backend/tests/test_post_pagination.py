@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.crud import post as crud_post
+from app.db.base import Base, engine
+from app.db.session import SessionLocal
+from app.models.category import Category
+from app.models.comment import Comment
+from app.models.like import Like
+from app.models.post import Post
+from app.models.recruit_meta import RecruitMeta
+from app.models.user import User
+
+
+def _reset_db() -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def _seed_posts(db, count: int = 23) -> None:
+    users = [
+        User(email=f"pager{i}@example.com", username=f"pager{i}", hashed_password="x")
+        for i in range(3)
+    ]
+    category = Category(name="자유", slug="free")
+    recruit_category = Category(name="팀 모집", slug="team-recruit")
+    db.add_all([*users, category, recruit_category])
+    db.flush()
+
+    now = datetime.now(timezone.utc)
+    for index in range(count):
+        post = Post(
+            title=f"post {index}",
+            content="content",
+            user_id=users[index % 3].id,
+            category_id=category.id,
+            # Groups of identical timestamps exercise the id tie-breaker.
+            created_at=now - timedelta(minutes=index // 4),
+            views=(index * 7) % 5,
+            is_pinned=index == 0,
+        )
+        db.add(post)
+        db.flush()
+        for user in users[: index % 4]:
+            db.add(Like(post_id=post.id, user_id=user.id))
+        for _ in range(index % 3):
+            db.add(Comment(post_id=post.id, user_id=users[0].id, content="c"))
+
+    for index in range(7):
+        post = Post(
+            title=f"recruit {index}",
+            content="content",
+            user_id=users[0].id,
+            category_id=recruit_category.id,
+            post_type="RECRUIT",
+            created_at=now - timedelta(minutes=index),
+        )
+        db.add(post)
+        db.flush()
+        db.add(
+            RecruitMeta(
+                post_id=post.id,
+                recruit_type="STUDY",
+                schedule_text="weekly",
+                headcount_max=4,
+                deadline_at=now + timedelta(days=index % 3),
+            )
+        )
+    db.commit()
+    crud_post.reconcile_engagement_counters(db)
+
+
+def _walk_cursor(db, sort: str, page_size: int) -> list[int]:
+    ids: list[int] = []
+    cursor = None
+    for _ in range(50):
+        posts, _total, cursor = crud_post.get_posts_by_cursor(
+            db, cursor=cursor, limit=page_size, sort=sort
+        )
+        ids.extend(post.id for post in posts)
+        if cursor is None:
+            return ids
+    raise AssertionError("cursor pagination did not terminate")
+
+
+@pytest.mark.parametrize("sort", list(crud_post.POST_SORTS))
+def test_cursor_pages_match_offset_order(sort):
+    _reset_db()
+    with SessionLocal() as db:
+        _seed_posts(db)
+        expected, total = crud_post.get_posts(db, skip=0, limit=1000, sort=sort)
+        walked = _walk_cursor(db, sort, page_size=4)
+
+    assert walked == [post.id for post in expected]
+    assert len(set(walked)) == len(walked)
+    assert total == len(expected)
+
+
+def test_cursor_mode_skips_count_unless_requested():
+    _reset_db()
+    with SessionLocal() as db:
+        _seed_posts(db)
+        _posts, total, next_cursor = crud_post.get_posts_by_cursor(db, limit=5)
+        assert total is None
+        assert next_cursor is not None
+
+        _posts, total, _cursor = crud_post.get_posts_by_cursor(
+            db, limit=5, total_mode=crud_post.TOTAL_MODE_EXACT
+        )
+        assert total == 30
+
+
+def test_cursor_rejects_tampered_or_mismatched_values():
+    _reset_db()
+    with SessionLocal() as db:
+        _seed_posts(db)
+        _posts, _total, next_cursor = crud_post.get_posts_by_cursor(db, limit=5, sort="views")
+
+        with pytest.raises(ValueError):
+            crud_post.get_posts_by_cursor(db, cursor="not-a-cursor", sort="views")
+        with pytest.raises(ValueError):
+            crud_post.get_posts_by_cursor(db, cursor=next_cursor, sort="latest")
+
+
+class _ExplainingSession:
+    """Just enough of a PostgreSQL session for `_estimate_row_count`."""
+
+    def __init__(self):
+        self.dialect = postgresql.psycopg2.dialect()
+        self.statements = []
+
+    def get_bind(self):
+        return self
+
+    def connection(self):
+        return self
+
+    def exec_driver_sql(self, statement, params):
+        self.statements.append((statement, params))
+        return self
+
+    def scalar(self):
+        return [{"Plan": {"Plan Rows": 42}}]
+
+
+def test_estimate_renders_expanding_in_parameters():
+    db = SessionLocal()
+    try:
+        query = db.query(Post).filter(Post.user_id.in_([1, 2]), Post.id.not_in([5]))
+    finally:
+        db.close()
+    explaining = _ExplainingSession()
+
+    assert crud_post._estimate_row_count(explaining, query) == 42
+
+    (statement, params), = explaining.statements
+    assert statement.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "POSTCOMPILE" not in statement
+    assert sorted(params.values()) == [1, 2, 5]
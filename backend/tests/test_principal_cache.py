@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from sqlalchemy import event
+
+from app.core.security import create_access_token, verify_password
+from app.crud import user as crud_user
+from app.db.base import Base, engine
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.services.principal_cache import PrincipalCache, _dumps, _loads
+
+
+def _reset_db() -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def _new_cache() -> PrincipalCache:
+    return PrincipalCache(
+        enabled=True,
+        backend="memory",
+        ttl_seconds=30,
+        l1_ttl_seconds=5,
+        max_items=100,
+        token_cache_max_items=100,
+    )
+
+
+def _seed_user() -> int:
+    with SessionLocal() as db:
+        user = User(email="p@example.com", username="principal", hashed_password="x", email_verified=True)
+        db.add(user)
+        db.commit()
+        return user.id
+
+
+class _StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *_args, **_kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *_exc):
+        event.remove(engine, "before_cursor_execute", self)
+
+
+def test_cached_principal_skips_the_users_select():
+    _reset_db()
+    user_id = _seed_user()
+    cache = _new_cache()
+
+    with SessionLocal() as db:
+        assert cache.get_user(db, user_id).username == "principal"
+
+    with SessionLocal() as db, _StatementCounter() as counter:
+        user = cache.get_user(db, user_id)
+        assert (user.id, user.username, user.email_verified) == (user_id, "principal", True)
+        assert counter.count == 0
+
+    assert cache.stats()["hits_l1"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cached_principal_is_session_bound_and_updates_invalidate_it(monkeypatch):
+    _reset_db()
+    user_id = _seed_user()
+    cache = _new_cache()
+    monkeypatch.setattr("app.services.principal_cache.principal_cache", cache)
+
+    with SessionLocal() as db:
+        cache.get_user(db, user_id)
+
+    with SessionLocal() as db:
+        user = cache.get_user(db, user_id)
+        # A cached principal can still be written through the request session
+        # (hashed_password is not cached and loads on demand).
+        crud_user.update_password(db, user, "new-password-1!")
+        crud_user.update_username(db, user, "renamed")
+
+    assert cache.stats()["invalidations"] >= 1
+    with SessionLocal() as db:
+        user = cache.get_user(db, user_id)
+        assert user.username == "renamed"
+        assert verify_password("new-password-1!", user.hashed_password)
+        assert db.query(User).count() == 1
+
+
+def test_token_cache_reuses_decoded_payload_until_expiry():
+    cache = _new_cache()
+    token = create_access_token({"sub": "7"})
+    assert cache.decode_token(token)["sub"] == "7"
+    assert cache.decode_token(token)["sub"] == "7"
+    assert (cache.stats()["token_misses"], cache.stats()["token_hits"]) == (1, 1)
+
+    expired = create_access_token({"sub": "7"}, expires_delta=timedelta(seconds=-1))
+    assert cache.decode_token(expired) is None
+    assert cache.decode_token("not-a-jwt") is None
+    assert cache.stats()["tokens"] == 1
+
+
+def test_redis_payload_round_trips_datetimes():
+    _reset_db()
+    user_id = _seed_user()
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        fields = {"id": user.id, "created_at": user.created_at, "email_verified_at": None}
+    assert _loads(_dumps(fields)) == fields
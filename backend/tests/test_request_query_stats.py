@@ -0,0 +1,52 @@
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.db.pool import instrument_engine
+from app.db.query_stats import begin_request_stats, current_query_stats, end_request_stats
+
+
+def _observed_statements(route: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "http_request_db_statements_count", {"method": "GET", "route": route}
+    )
+    return value or 0.0
+
+
+def test_statements_are_counted_only_inside_a_request(tmp_path):
+    engine = instrument_engine(create_engine(f"sqlite:///{tmp_path / 'stats.db'}"), "stats_test")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert current_query_stats() is None
+
+        stats, token = begin_request_stats()
+        try:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        finally:
+            end_request_stats(token)
+        conn.execute(text("SELECT 3"))
+
+    assert stats.statements == 2
+    assert stats.db_time_ms >= stats.slowest_ms > 0
+    assert stats.slowest_statement_preview() in {"SELECT 1", "SELECT 2"}
+    engine.dispose()
+
+
+def test_middleware_reports_per_route_statement_counts(client, monkeypatch):
+    monkeypatch.setattr(settings, "REQUEST_DB_DEBUG_HEADERS", True)
+    before = _observed_statements("/health/detailed")
+
+    response = client.get("/health/detailed")
+
+    assert int(response.headers["X-DB-Statements"]) >= 1
+    assert float(response.headers["X-DB-Time-Ms"]) >= float(response.headers["X-DB-Slowest-Ms"])
+    assert _observed_statements("/health/detailed") == before + 1
+
+    # Unknown paths share one label instead of one series per URL.
+    before = _observed_statements("unmatched")
+    assert client.get("/no/such/page/123").status_code == 404
+    assert _observed_statements("unmatched") == before + 1
+
+    monkeypatch.setattr(settings, "REQUEST_DB_DEBUG_HEADERS", False)
+    assert "X-DB-Statements" not in client.get("/health/detailed").headers
@@ -0,0 +1,251 @@
+import asyncio
+import json
+import threading
+import time
+
+from starlette.requests import Request
+
+from app.services.response_cache import (
+    ResponseCache,
+    TAG_BOARD,
+    build_cache_key,
+    cached_json_response,
+    post_tag,
+)
+
+
+def _new_cache(ttl_seconds: int = 30) -> ResponseCache:
+    return ResponseCache(
+        enabled=True,
+        backend="memory",
+        ttl_seconds=ttl_seconds,
+        l1_max_items=100,
+        lock_timeout_seconds=1.0,
+    )
+
+
+def _request(headers: dict | None = None) -> Request:
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+
+def _counting_builder(payload, tags):
+    calls = {"count": 0}
+
+    def build():
+        calls["count"] += 1
+        return payload, tags
+
+    return build, calls
+
+
+def test_cache_key_ignores_param_order_and_blank_values():
+    assert build_cache_key("posts", {"page": 1, "search": None, "sort": "latest"}) == build_cache_key(
+        "posts", {"sort": "latest", "page": 1, "search": ""}
+    )
+    assert build_cache_key("posts", {"page": 1}) != build_cache_key("posts", {"page": 2})
+
+
+def test_second_read_is_a_hit_until_a_tag_is_invalidated():
+    cache = _new_cache()
+    build, calls = _counting_builder({"posts": [{"id": 1}]}, {TAG_BOARD, post_tag(1)})
+
+    first = cache.get_or_build("k", build)
+    second = cache.get_or_build("k", build)
+    assert (first.status, second.status) == ("miss", "hit")
+    assert first.etag == second.etag
+    assert calls["count"] == 1
+
+    cache.invalidate(post_tag(2))  # unrelated tag
+    assert cache.get_or_build("k", build).status == "hit"
+
+    cache.invalidate(post_tag(1))
+    assert cache.get_or_build("k", build).status == "miss"
+    assert calls["count"] == 2
+
+    stats = cache.stats()
+    assert stats["hits_l1"] == 2
+    assert stats["misses"] == 2
+    assert stats["stale"] == 1
+
+
+def test_entries_expire_after_ttl():
+    cache = _new_cache(ttl_seconds=1)
+    build, calls = _counting_builder({"ok": True}, set())
+    cache.get_or_build("k", build)
+    entry = cache._l1["k"]
+    entry.expires_at = time.time() - 1
+    assert cache.get_or_build("k", build).status == "miss"
+    assert calls["count"] == 2
+
+
+def test_concurrent_misses_are_coalesced():
+    cache = _new_cache()
+    calls = {"count": 0}
+
+    def slow_build():
+        calls["count"] += 1
+        time.sleep(0.1)
+        return {"ok": True}, {TAG_BOARD}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_build("k", slow_build)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls["count"] == 1
+    assert len(results) == 8
+    assert cache.stats()["coalesced"] == 7
+
+
+def test_etag_revalidation_returns_304():
+    cache = _new_cache()
+    entry = cache.get_or_build("k", lambda: ({"ok": True}, set()))
+
+    response = cached_json_response(_request(), entry)
+    assert response.status_code == 200
+    assert response.headers["etag"] == entry.etag
+    assert json.loads(response.body) == {"ok": True}
+
+    not_modified = cached_json_response(_request({"If-None-Match": entry.etag}), entry)
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+
+
+def test_viewer_overlay_patches_a_copy_of_the_shared_body():
+    cache = _new_cache()
+    entry = cache.get_or_build(
+        "k",
+        lambda: ({"posts": [{"id": 1, "is_liked": False}, {"id": 2, "is_liked": False}]}, set()),
+    )
+
+    def overlay(body):
+        for item in body["posts"]:
+            item["is_liked"] = item["id"] == 2
+        return body
+
+    personalized = cached_json_response(_request(), entry, overlay)
+    assert [item["is_liked"] for item in json.loads(personalized.body)["posts"]] == [False, True]
+    assert personalized.headers["cache-control"].startswith("private")
+    assert personalized.headers["etag"] != entry.etag
+
+    shared = cached_json_response(_request(), cache.get_or_build("k", lambda: ({}, set())))
+    assert [item["is_liked"] for item in json.loads(shared.body)["posts"]] == [False, False]
+
+
+def test_disabled_cache_always_builds():
+    cache = ResponseCache(
+        enabled=False, backend="memory", ttl_seconds=30, l1_max_items=10, lock_timeout_seconds=1.0
+    )
+    build, calls = _counting_builder({"ok": True}, set())
+    assert cache.get_or_build("k", build).status == "bypass"
+    assert cache.get_or_build("k", build).status == "bypass"
+    assert calls["count"] == 2
+
+
+def test_build_invalidated_while_running_is_served_but_not_stored():
+    cache = _new_cache()
+    state = {"v": 1}
+
+    def racing_build():
+        payload = dict(state)
+        # A write lands after the build read its data but before it was stored.
+        state["v"] = 2
+        cache.invalidate(TAG_BOARD)
+        return payload, {TAG_BOARD}
+
+    first = cache.get_or_build("k", racing_build)
+    assert json.loads(first.body) == {"v": 1}
+
+    build, calls = _counting_builder(state, {TAG_BOARD})
+    second = cache.get_or_build("k", build)
+    assert second.status == "miss" and json.loads(second.body) == {"v": 2}
+    assert cache.get_or_build("k", build).status == "hit"
+    assert calls["count"] == 1
+    assert cache.stats()["stale_builds"] == 1
+
+
+class _ThreadRecordingRedis:
+    """Enough of redis for a miss + store, remembering which thread made each call."""
+
+    def __init__(self):
+        self.values = {}
+        self.threads = set()
+
+    def _seen(self):
+        self.threads.add(threading.get_ident())
+
+    def get(self, key):
+        self._seen()
+        return self.values.get(key)
+
+    def mget(self, keys):
+        self._seen()
+        return [self.values.get(key) for key in keys]
+
+    def set(self, key, value, nx=False, px=None, ex=None):
+        self._seen()
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    def delete(self, key):
+        self._seen()
+        self.values.pop(key, None)
+
+    def release_lock(self, keys, args):
+        self._seen()
+        if self.values.get(keys[0]) != args[0]:
+            return 0
+        del self.values[keys[0]]
+        return 1
+
+
+def _redis_backed_cache() -> ResponseCache:
+    cache = ResponseCache(
+        enabled=True, backend="redis", ttl_seconds=30, l1_max_items=100, lock_timeout_seconds=1.0
+    )
+    cache._redis = _ThreadRecordingRedis()
+    cache._release_lock_script = cache._redis.release_lock
+    return cache
+
+
+def test_async_path_keeps_redis_calls_off_the_event_loop():
+    cache = _redis_backed_cache()
+
+    async def build():
+        return {"ok": True}, {TAG_BOARD}
+
+    async def run():
+        loop_thread = threading.get_ident()
+        first = await cache.aget_or_build("k", build)
+        second = await cache.aget_or_build("k", build)
+        return loop_thread, first.status, second.status
+
+    loop_thread, first, second = asyncio.run(run())
+    assert (first, second) == ("miss", "hit")
+    assert cache._redis.threads and loop_thread not in cache._redis.threads
+
+
+def test_builder_whose_lock_expired_leaves_the_next_holders_lock_alone():
+    cache = _redis_backed_cache()
+    lock_key = "rc:lock:k"
+
+    def slow_build():
+        # The lock timed out mid-build and another worker took it.
+        assert cache._redis.values[lock_key] != "other-worker"
+        cache._redis.values[lock_key] = "other-worker"
+        return {"ok": True}, {TAG_BOARD}
+
+    cache.get_or_build("k", slow_build)
+    assert cache._redis.values[lock_key] == "other-worker"
+
+    # A builder that still holds its own lock releases it.
+    cache.get_or_build("k2", lambda: ({"ok": True}, {TAG_BOARD}))
+    assert "rc:lock:k2" not in cache._redis.values
@@ -0,0 +1,159 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud import blog_post as crud_blog
+from app.crud import mcp_server as crud_mcp_server
+from app.crud import post as crud_post
+from app.db.base import Base, engine
+from app.db.session import SessionLocal
+from app.models.blog_post import BlogPost
+from app.models.category import Category
+from app.models.mcp_server import McpServer
+from app.models.post import Post
+from app.models.user import User
+from app.services.search import (
+    PostgresSearchBackend,
+    build_snippet,
+    parse_search_terms,
+)
+
+
+def _reset_db() -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def _seed_posts(db) -> dict:
+    user = User(email="search@example.com", username="search", hashed_password="x")
+    category = Category(name="자유", slug="free")
+    db.add_all([user, category])
+    db.flush()
+
+    now = datetime.now(timezone.utc)
+    rows = {
+        "title_hit": ("FastAPI 게시판 만들기", "본문에는 아무것도 없음"),
+        "body_hit": ("일상 이야기", "오늘은 fastapi 로 게시판을 만들었다"),
+        "both_terms_body": ("잡담", "fastapi 와 redis 를 같이 쓰는 법"),
+        "percent": ("할인 100% 이벤트", "퍼센트 기호 테스트"),
+        "miss": ("전혀 관계 없는 글", "django 이야기"),
+    }
+    ids = {}
+    for index, (name, (title, content)) in enumerate(rows.items()):
+        post = Post(
+            title=title,
+            content=content,
+            user_id=user.id,
+            category_id=category.id,
+            created_at=now - timedelta(minutes=index),
+        )
+        db.add(post)
+        db.flush()
+        ids[name] = post.id
+    db.commit()
+    return ids
+
+
+def test_parse_search_terms_dedupes_and_caps():
+    assert parse_search_terms(None) == []
+    assert parse_search_terms("  FastAPI fastapi  게시판 ") == ["FastAPI", "게시판"]
+    assert len(parse_search_terms(" ".join(f"t{i}" for i in range(20)))) == 8
+
+
+def test_post_search_requires_every_term_and_matches_korean_substrings():
+    _reset_db()
+    with SessionLocal() as db:
+        ids = _seed_posts(db)
+
+        posts, total = crud_post.get_posts(db, search="게시판", limit=20)
+        assert {post.id for post in posts} == {ids["title_hit"], ids["body_hit"]}
+        assert total == 2
+
+        posts, _ = crud_post.get_posts(db, search="fastapi redis", limit=20)
+        assert [post.id for post in posts] == [ids["both_terms_body"]]
+
+
+def test_post_search_escapes_like_wildcards():
+    _reset_db()
+    with SessionLocal() as db:
+        ids = _seed_posts(db)
+        posts, _ = crud_post.get_posts(db, search="100%", limit=20)
+        assert [post.id for post in posts] == [ids["percent"]]
+        posts, _ = crud_post.get_posts(db, search="%", limit=20)
+        assert [post.id for post in posts] == [ids["percent"]]
+
+
+def test_relevance_sort_ranks_title_hits_first_and_pages_by_cursor():
+    _reset_db()
+    with SessionLocal() as db:
+        ids = _seed_posts(db)
+
+        posts, _ = crud_post.get_posts(db, search="fastapi", sort="relevance", limit=20)
+        assert posts[0].id == ids["title_hit"]
+        assert {post.id for post in posts} == {
+            ids["title_hit"],
+            ids["body_hit"],
+            ids["both_terms_body"],
+        }
+
+        seen = []
+        cursor = None
+        while True:
+            page, _, cursor = crud_post.get_posts_by_cursor(
+                db, cursor=cursor, limit=1, search="fastapi", sort="relevance"
+            )
+            seen.extend(post.id for post in page)
+            if cursor is None:
+                break
+        assert seen == [post.id for post in posts]
+
+
+def test_blog_and_mcp_search_use_the_same_engine():
+    _reset_db()
+    with SessionLocal() as db:
+        user = User(email="blog@example.com", username="blog", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add_all(
+            [
+                BlogPost(title="배포 회고", slug="a", content="쿠버네티스 배포", user_id=user.id, is_published=True),
+                BlogPost(title="쿠버네티스 입문", slug="b", content="기초", user_id=user.id, is_published=True),
+                BlogPost(title="쿠버네티스 초안", slug="c", content="x", user_id=user.id, is_published=False),
+                McpServer(name="github-server", slug="github", description="GitHub 리포지토리 검색"),
+                McpServer(name="slack", slug="slack", description="메시지 전송", short_description="github 알림"),
+                McpServer(name="memory", slug="memory", description="지식 그래프"),
+            ]
+        )
+        db.commit()
+
+        posts, total = crud_blog.get_blog_posts(db, search="쿠버네티스")
+        assert total == 2
+        assert [post.slug for post in posts] == ["b", "a"]  # title hit outranks content hit
+
+        servers, total = crud_mcp_server.get_mcp_servers(db, search="github", sort_by="relevance")
+        assert total == 2
+        assert [server.slug for server in servers] == ["github", "slack"]
+
+
+def test_build_snippet_highlights_and_escapes():
+    text = "앞부분 " * 30 + "<b>FastAPI</b> 로 만든 게시판" + " 뒷부분" * 30
+    snippet = build_snippet(text, "fastapi 게시판")
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert "&lt;b&gt;<mark>FastAPI</mark>&lt;/b&gt;" in snippet
+    assert "<mark>게시판</mark>" in snippet
+    assert build_snippet("no hits here", "fastapi") is None
+    assert build_snippet(None, "fastapi") is None
+
+
+def test_postgres_backend_compiles_to_tsquery_and_trigram_predicates():
+    backend = PostgresSearchBackend()
+    clause = backend.filter(crud_post.POST_SEARCH, ["fastapi", "게시판"])
+    sql = str(clause.compile(dialect=postgresql.dialect()))
+    assert "posts.search_vector @@ plainto_tsquery('simple'::regconfig" in sql
+    assert "ILIKE" in sql
+
+    rank_sql = str(
+        backend.rank(crud_post.POST_SEARCH, ["fastapi"]).compile(dialect=postgresql.dialect())
+    )
+    assert "ts_rank_cd(posts.search_vector" in rank_sql
+    assert "word_similarity" in rank_sql
@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.crud import follow as crud_follow
+from app.crud import post as crud_post
+from app.crud import timeline as crud_timeline
+from app.db.base import Base
+from app.models.category import Category
+from app.models.post import Post
+from app.models.timeline_entry import TimelineEntry
+from app.models.user import User
+from app.schemas.post import PostCreate
+
+
+@pytest.fixture()
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'timeline.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _setup(db, count: int) -> tuple[list[int], int]:
+    users = [
+        User(email=f"feed{i}@example.com", username=f"feed{i}", hashed_password="x")
+        for i in range(count)
+    ]
+    category = Category(name="자유", slug="free")
+    db.add_all([*users, category])
+    db.commit()
+    return [user.id for user in users], category.id
+
+
+def _timeline(db, follower_id: int) -> list[int]:
+    rows = (
+        db.query(TimelineEntry.post_id)
+        .filter(TimelineEntry.follower_id == follower_id)
+        .order_by(TimelineEntry.post_id)
+    )
+    return [post_id for (post_id,) in rows]
+
+
+def _seed_posts(db, author_ids: list[int], category_id: int, count: int) -> list[int]:
+    """Posts with explicit timestamps (several shared) fanned out like create_post does."""
+    now = datetime.now(timezone.utc)
+    post_ids = []
+    for index in range(count):
+        post = Post(
+            title=f"post {index}",
+            content="body",
+            user_id=author_ids[index % len(author_ids)],
+            category_id=category_id,
+            created_at=now - timedelta(minutes=count - index // 3),
+        )
+        db.add(post)
+        db.flush()
+        crud_timeline.fan_out_post(db, post.id, post.user_id, max_followers=2)
+        post_ids.append(post.id)
+    db.commit()
+    return post_ids
+
+
+def _read_all(db, follower_id: int, limit: int) -> list[int]:
+    seen, cursor = [], None
+    while True:
+        posts, cursor = crud_post.get_following_timeline(db, follower_id, cursor, limit=limit)
+        seen.extend(post.id for post in posts)
+        if cursor is None:
+            return seen
+
+
+def test_timeline_follows_posts_follows_and_blocks(db):
+    (reader_id, author_id, other_id), category_id = _setup(db, 3)
+    early = crud_post.create_post(db, PostCreate(title="early", content="x", category_id=category_id), author_id)
+
+    # Following backfills the author's recent posts; new posts are fanned out on write.
+    crud_follow.create_follow(db, follower_id=reader_id, following_id=author_id)
+    crud_follow.create_follow(db, follower_id=reader_id, following_id=other_id)
+    late = crud_post.create_post(db, PostCreate(title="late", content="x", category_id=category_id), author_id)
+    other = crud_post.create_post(db, PostCreate(title="other", content="x", category_id=category_id), other_id)
+    assert _timeline(db, reader_id) == [early.id, late.id, other.id]
+    assert _timeline(db, author_id) == []
+
+    assert crud_post.delete_post(db, early.id) is True
+    assert _timeline(db, reader_id) == [late.id, other.id]
+
+    crud_follow.delete_follow(db, follower_id=reader_id, following_id=author_id)
+    assert _timeline(db, reader_id) == [other.id]
+
+    crud_follow.create_block(db, blocker_id=other_id, blocked_id=reader_id)
+    assert _timeline(db, reader_id) == []
+
+
+def test_timeline_pages_merge_pull_authors_and_fall_back_past_the_cap(db):
+    (reader_id, crowd_id, author_id, popular_id, *fans), category_id = _setup(db, 7)
+    crud_follow.create_follow(db, follower_id=reader_id, following_id=author_id)
+    crud_follow.create_follow(db, follower_id=crowd_id, following_id=author_id)
+    # Three followers is past max_followers=2, so the popular author is read-time only.
+    for follower_id in (reader_id, *fans):
+        crud_follow.create_follow(db, follower_id=follower_id, following_id=popular_id)
+
+    _seed_posts(db, [author_id, popular_id, crowd_id], category_id, count=18)
+    assert crud_timeline.is_pull_author(db, popular_id)
+    assert crud_timeline.get_followed_pull_author_ids(db, reader_id) == [popular_id]
+
+    expected, _total = crud_post.get_posts(
+        db, limit=100, author_ids=[author_id, popular_id], total_mode=crud_post.TOTAL_MODE_NONE
+    )
+    expected_ids = [post.id for post in expected]
+    assert len(expected_ids) == 12
+    assert _read_all(db, reader_id, limit=4) == expected_ids
+
+    # Trimming keeps the newest entries; older pages are read from the followed authors.
+    assert crud_timeline.trim_timelines(db, max_entries=2, batch_size=1) == 8
+    assert len(_timeline(db, reader_id)) == 2
+    assert _read_all(db, reader_id, limit=5) == expected_ids
+
+    with pytest.raises(ValueError):
+        crud_post.get_following_timeline(db, reader_id, "not-a-cursor")
+
+
+def test_timeline_reads_past_each_authors_backfill_without_gaps(db, monkeypatch):
+    monkeypatch.setattr(settings, "TIMELINE_BACKFILL_POSTS", 2)
+    (reader_id, *author_ids), category_id = _setup(db, 4)
+    # Five posts per author, each author active in a different hour.
+    now = datetime.now(timezone.utc)
+    for rank, author_id in enumerate(author_ids):
+        for index in range(5):
+            db.add(Post(
+                title=f"{author_id}-{index}",
+                content="body",
+                user_id=author_id,
+                category_id=category_id,
+                created_at=now - timedelta(hours=rank, minutes=10 * index),
+            ))
+    db.commit()
+    # Following copies only the latest 2 posts of each author.
+    for author_id in author_ids:
+        crud_follow.create_follow(db, follower_id=reader_id, following_id=author_id)
+    assert len(_timeline(db, reader_id)) == 6
+
+    expected, _total = crud_post.get_posts(
+        db, limit=100, author_ids=author_ids, total_mode=crud_post.TOTAL_MODE_NONE
+    )
+    expected_ids = [post.id for post in expected]
+    assert len(expected_ids) == 15
+    for limit in (1, 2, 3, 4, 7, 20):
+        assert _read_all(db, reader_id, limit=limit) == expected_ids
+
+    # Posts written after the follow fan out on top of the backfilled ones.
+    newest = Post(
+        title="new", content="x", user_id=author_ids[1], category_id=category_id,
+        created_at=now + timedelta(minutes=1),
+    )
+    db.add(newest)
+    db.flush()
+    assert crud_timeline.fan_out_post(db, newest.id, newest.user_id, max_followers=10) == 1
+    db.commit()
+    assert _read_all(db, reader_id, limit=4) == [newest.id, *expected_ids]
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+
+from app.db.base import Base, engine
+from app.db.session import SessionLocal
+from app.models.blog_post import BlogPost
+from app.models.category import Category
+from app.models.post import Post
+from app.models.user import User
+from app.services.view_counter import (
+    VIEW_TARGET_BLOG,
+    VIEW_TARGET_POST,
+    ViewCounter,
+    build_viewer_key,
+)
+
+
+def _reset_db() -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def _new_counter(dedupe_window_seconds: int = 60) -> ViewCounter:
+    return ViewCounter(
+        backend="memory",
+        flush_interval_seconds=60,
+        dedupe_window_seconds=dedupe_window_seconds,
+        max_seen_items=1000,
+    )
+
+
+def test_same_viewer_is_counted_once_per_window():
+    counter = _new_counter()
+    viewer = build_viewer_key(7, "10.0.0.1")
+
+    assert counter.record_view(VIEW_TARGET_POST, 1, viewer) is True
+    assert counter.record_view(VIEW_TARGET_POST, 1, viewer) is False
+    assert counter.record_view(VIEW_TARGET_POST, 1, build_viewer_key(None, "10.0.0.1")) is True
+    assert counter.record_view(VIEW_TARGET_POST, 2, viewer) is True
+
+    assert counter.pending_for(VIEW_TARGET_POST, 1) == 2
+    assert counter.pending_increments() == 3
+    assert counter.stats()["deduped_total"] == 1
+
+
+def test_count_view_returns_pending_increments_for_display():
+    counter = _new_counter()
+    viewer = build_viewer_key(7, None)
+
+    assert counter.count_view(VIEW_TARGET_POST, 1, viewer) == 1
+    # A deduped view still reports what is pending, it just adds nothing.
+    assert counter.count_view(VIEW_TARGET_POST, 1, viewer) == 1
+    assert asyncio.run(counter.acount_view(VIEW_TARGET_POST, 1, None)) == 2
+    assert counter.stats()["deduped_total"] == 1
+
+
+def test_async_count_view_keeps_the_redis_script_off_the_event_loop():
+    counter = ViewCounter(backend="redis", flush_interval_seconds=60, dedupe_window_seconds=60, max_seen_items=10)
+    calls = []
+
+    def record_script(keys, args):
+        calls.append((threading.get_ident(), keys, args))
+        return [1, 4]
+
+    counter._get_redis = lambda: object()
+    counter._record_script = record_script
+
+    async def run():
+        return threading.get_ident(), await counter.acount_view(VIEW_TARGET_POST, 9, "user:1")
+
+    loop_thread, pending = asyncio.run(run())
+
+    assert pending == 4
+    ((script_thread, keys, args),) = calls
+    assert script_thread != loop_thread
+    assert keys == ["views:pending:post", "views:seen:post:9:user:1"]
+    assert args == [9, 60]
+
+
+def test_flush_applies_batched_increments_and_clears_pending():
+    _reset_db()
+    with SessionLocal() as db:
+        user = User(email="viewer@example.com", username="viewer", hashed_password="x")
+        category = Category(name="자유", slug="free")
+        db.add_all([user, category])
+        db.flush()
+        posts = [
+            Post(title=f"p{i}", content="c", user_id=user.id, category_id=category.id, views=5)
+            for i in range(2)
+        ]
+        blog = BlogPost(title="b", slug="b", content="c", user_id=user.id, views=1)
+        db.add_all([*posts, blog])
+        db.commit()
+        post_ids = [post.id for post in posts]
+        blog_id = blog.id
+
+    counter = _new_counter(dedupe_window_seconds=0)
+    for _ in range(3):
+        counter.record_view(VIEW_TARGET_POST, post_ids[0], None)
+    counter.record_view(VIEW_TARGET_POST, post_ids[1], None)
+    counter.record_view(VIEW_TARGET_BLOG, blog_id, None)
+
+    assert counter.flush_with_session(SessionLocal) == 5
+    assert counter.pending_increments() == 0
+    assert counter.flush_with_session(SessionLocal) == 0
+
+    with SessionLocal() as db:
+        views = dict(db.query(Post.id, Post.views).all())
+        assert views == {post_ids[0]: 8, post_ids[1]: 6}
+        assert db.query(BlogPost.views).filter(BlogPost.id == blog_id).scalar() == 2
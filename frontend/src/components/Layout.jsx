@@ -5,7 +5,7 @@ import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
 import useAuthStore from '../stores/authStore';
 import LoginModal from './LoginModal';
 import SidebarChatWidget from './ai/SidebarChatWidget';
-import { notificationsAPI } from '../services/api';
+import { API_BASE_URL, notificationsAPI } from '../services/api';
 import { getAvatarInitial, resolveProfileImageUrl } from '../utils/userProfile';
 
 const formatNotificationContent = (notification) => {
@@ -45,6 +45,7 @@ function Layout() {
   const [searchParams, setSearchParams] = useSearchParams();
   const [showLoginModal, setShowLoginModal] = useState(false);
   const [showNotificationPanel, setShowNotificationPanel] = useState(false);
+  const [notificationStreamOpen, setNotificationStreamOpen] = useState(false);
 
   const notificationButtonRef = useRef(null);
   const notificationPanelRef = useRef(null);
@@ -77,9 +78,79 @@ function Layout() {
     queryKey: ['notifications-unread-count'],
     queryFn: () => notificationsAPI.getUnreadCount(),
     enabled: !!token,
-    refetchInterval: 30000,
+    // Pushes keep the badge current; a slow poll still catches anything a stream missed.
+    refetchInterval: notificationStreamOpen ? 120000 : 30000,
   });
 
+  useEffect(() => {
+    if (!token || typeof EventSource === 'undefined') {
+      return undefined;
+    }
+
+    let source = null;
+    let reconnectTimer = null;
+    let closed = false;
+
+    const applyUnreadCount = (event) => {
+      const payload = JSON.parse(event.data);
+      queryClient.setQueryData(['notifications-unread-count'], (cached) => ({
+        ...(cached || {}),
+        data: { ...(cached?.data || {}), unread_count: payload.unread_count },
+      }));
+      return payload;
+    };
+
+    const scheduleReconnect = () => {
+      if (!closed) {
+        reconnectTimer = setTimeout(connect, 5000);
+      }
+    };
+
+    // Tickets are single use, so reconnects fetch a new one here instead of letting
+    // EventSource retry the spent URL. The access token never goes into the URL.
+    const connect = async () => {
+      let ticket;
+      try {
+        const { data } = await notificationsAPI.createStreamTicket();
+        ticket = data.ticket;
+      } catch {
+        scheduleReconnect();
+        return;
+      }
+      if (closed) {
+        return;
+      }
+
+      source = new EventSource(
+        `${API_BASE_URL}/api/v1/notifications/stream?ticket=${encodeURIComponent(ticket)}`
+      );
+      source.onopen = () => setNotificationStreamOpen(true);
+      source.onerror = () => {
+        setNotificationStreamOpen(false);
+        source.close();
+        scheduleReconnect();
+      };
+      source.addEventListener('unread_count', applyUnreadCount);
+      source.addEventListener('notification', (event) => {
+        applyUnreadCount(event);
+        queryClient.invalidateQueries(['my-notifications']);
+      });
+      source.addEventListener('resync', () => {
+        queryClient.invalidateQueries(['notifications-unread-count']);
+        queryClient.invalidateQueries(['my-notifications']);
+      });
+    };
+
+    connect();
+
+    return () => {
+      closed = true;
+      clearTimeout(reconnectTimer);
+      source?.close();
+      setNotificationStreamOpen(false);
+    };
+  }, [token, queryClient]);
+
   const { data: notificationsData, isLoading: notificationsLoading } = useQuery({
     queryKey: ['my-notifications'],
     queryFn: () => notificationsAPI.getMyNotifications(1, 30),
@@ -1,4 +1,4 @@
-﻿import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+﻿import { useInfiniteQuery, useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { useParams, useNavigate, Link } from 'react-router-dom';
 import { useEffect, useState, useRef } from 'react';
 import { toast } from 'sonner';
@@ -185,9 +185,17 @@ function PostDetail() {
     queryFn: () => postsAPI.getPost(id),
   });
 
-  const { data: commentsData, isLoading: commentsLoading } = useQuery({
+  const {
+    data: commentsData,
+    isLoading: commentsLoading,
+    fetchNextPage: fetchMoreComments,
+    hasNextPage: hasMoreComments,
+    isFetchingNextPage: commentsFetchingMore,
+  } = useInfiniteQuery({
     queryKey: ['comments', id],
-    queryFn: () => commentsAPI.getComments(id),
+    queryFn: ({ pageParam }) => commentsAPI.getCommentPage(id, pageParam),
+    initialPageParam: null,
+    getNextPageParam: (lastPage) => lastPage.data?.next_cursor || undefined,
   });
 
   const deletePostMutation = useMutation({
@@ -367,7 +375,7 @@ function PostDetail() {
   const isFollowingAuthor = Boolean(followStatusData?.data?.is_following);
   const isFollowActionPending = followMutation.isPending || unfollowMutation.isPending;
   const showFollowButton = Boolean(post?.user_id) && (!token || (user && user.id !== post.user_id));
-  const comments = commentsData?.data || [];
+  const comments = commentsData?.pages.flatMap((page) => page.data?.comments || []) || [];
   const postContent = post?.content || '';
   const postMarkdownContent = isLikelyHtml(postContent)
     ? convertHtmlContentToMarkdown(postContent)
@@ -810,7 +818,7 @@ function PostDetail() {
         )}
 
         <div className="px-6 sm:px-8 py-6 border-t border-ink-100">
-          <h2 className="text-sm font-semibold text-ink-700 mb-5">댓글 {comments.length}개</h2>
+          <h2 className="text-sm font-semibold text-ink-700 mb-5">댓글 {post?.comment_count ?? comments.length}개</h2>
 
           {token ? (
             <form onSubmit={handleCommentSubmit} className="mb-6">
@@ -907,6 +915,19 @@ function PostDetail() {
                   </div>
                 );
               })}
+
+              {hasMoreComments && (
+                <div className="flex justify-center pt-2">
+                  <button
+                    type="button"
+                    onClick={() => fetchMoreComments()}
+                    disabled={commentsFetchingMore}
+                    className="text-sm text-ink-500 hover:text-ink-800"
+                  >
+                    {commentsFetchingMore ? '불러오는 중...' : '댓글 더 보기'}
+                  </button>
+                </div>
+              )}
             </div>
           )}
         </div>
@@ -149,7 +149,8 @@ export const postsAPI = {
 
 // Comments API
 export const commentsAPI = {
-  getComments: (postId) => api.get(`/comments/post/${postId}`),
+  getCommentPage: (postId, cursor, limit = 50) =>
+    api.get(`/comments/post/${postId}/page`, { params: { cursor: cursor || undefined, limit } }),
   createComment: (data) => api.post('/comments/', data),
   deleteComment: (id) => api.delete(`/comments/${id}`),
 };
@@ -203,6 +204,7 @@ export const notificationsAPI = {
   markAsRead: (notificationId) => api.patch(`/notifications/${notificationId}/read`),
   markAllAsRead: () => api.patch('/notifications/me/read-all'),
   deleteNotification: (notificationId) => api.delete(`/notifications/${notificationId}`),
+  createStreamTicket: () => api.post('/notifications/stream-ticket'),
 };
 
 // Analytics API